@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Admin Client
+调用任意服务上的 AdminService: 在线性能分析、线程栈、内存快照、故障注入
+
+示例:
+    python admin_client.py --target localhost:50053 profile --mode sampling --duration 10 -o fresh.collapsed
+    python admin_client.py --target localhost:50053 profile --mode cprofile --duration 10 -o fresh.pstats
+    python admin_client.py --target localhost:50050 stacks
+    python admin_client.py --target localhost:50053 tracemalloc start
+    python admin_client.py --target localhost:50053 tracemalloc snapshot -o fresh.tracemalloc
+    python admin_client.py --target localhost:50053 metrics --prefix dedup.
+    python admin_client.py --target localhost:50053 faults set "PlaceOrder=delay:lognormal:5:1,error:UNAVAILABLE@0.01"
+    python admin_client.py --target localhost:50053 faults clear
+"""
+
+import argparse
+import sys
+import time
+
+import grpc
+
+import warehouse_pb2
+import warehouse_pb2_grpc
+
+
+def run_profile(stub, args):
+    """启动分析, 等待指定时长后取回结果并写入文件"""
+    response = stub.StartProfiler(warehouse_pb2.StartProfilerRequest(
+        mode=args.mode,
+        duration_seconds=args.duration,
+        interval_ms=args.interval_ms,
+    ))
+    if not response.success:
+        print(f"❌ StartProfiler failed: {response.message}")
+        return 1
+    print(f"⏱️ {response.message}, collecting for {args.duration}s...")
+    time.sleep(args.duration)
+
+    result = stub.StopProfiler(warehouse_pb2.StopProfilerRequest())
+    if not result.success:
+        print(f"❌ StopProfiler failed: {result.message}")
+        return 1
+
+    output = args.output or f"profile.{'collapsed' if result.format == 'collapsed' else 'pstats'}"
+    with open(output, "wb") as f:
+        f.write(result.data)
+    print(f"✅ {result.mode}: {result.samples} samples in {result.duration_seconds:.1f}s → {output}")
+    if result.format == "collapsed":
+        print(f"💡 flamegraph.pl {output} > flame.svg")
+    else:
+        print(f"💡 python -m pstats {output}")
+    return 0
+
+
+def run_stacks(stub, args):
+    """打印所有线程栈"""
+    response = stub.DumpStacks(warehouse_pb2.DumpStacksRequest())
+    print(f"🧵 {response.thread_count} threads")
+    print(response.stacks)
+    return 0
+
+
+def run_tracemalloc(stub, args):
+    """tracemalloc 控制与快照"""
+    response = stub.TraceMalloc(warehouse_pb2.TraceMallocRequest(
+        action=args.action,
+        nframes=args.nframes,
+        top=args.top,
+    ))
+    if not response.success:
+        print(f"❌ TraceMalloc failed: {response.message}")
+        return 1
+    print(f"✅ {response.message}")
+    if args.action == "snapshot":
+        print(f"📊 current={response.current_bytes} bytes, peak={response.peak_bytes} bytes")
+        print(response.top_stats)
+        if args.output:
+            with open(args.output, "wb") as f:
+                f.write(response.snapshot)
+            print(f"💾 Snapshot saved → {args.output} (tracemalloc.Snapshot.load)")
+    return 0
+
+
+def run_metrics(stub, args):
+    """打印运行指标"""
+    response = stub.GetMetrics(warehouse_pb2.MetricsRequest(prefix=args.prefix))
+    for name in sorted(response.values):
+        print(f"{name:40s} {response.values[name]:g}")
+    return 0
+
+
+def run_faults(stub, args):
+    """设置、清除或查看故障注入规则"""
+    response = stub.Faults(warehouse_pb2.FaultsRequest(action=args.action, spec=args.spec, seed=args.seed))
+    if not response.success:
+        print(f"❌ Faults failed: {response.message}")
+        return 1
+    print(f"💥 {response.message}" if args.action != "show" else f"💥 {response.spec or '(no faults)'}")
+    return 0
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Warehouse AdminService client")
+    parser.add_argument("--target", default="localhost:50050", help="host:port of the service")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    profile = sub.add_parser("profile", help="collect a sampling or cProfile profile")
+    profile.add_argument("--mode", choices=["sampling", "cprofile"], default="sampling")
+    profile.add_argument("--duration", type=float, default=10.0)
+    profile.add_argument("--interval-ms", type=int, default=5)
+    profile.add_argument("-o", "--output")
+
+    sub.add_parser("stacks", help="dump all thread stacks")
+
+    trace = sub.add_parser("tracemalloc", help="control tracemalloc / take a snapshot")
+    trace.add_argument("action", choices=["start", "snapshot", "stop"])
+    trace.add_argument("--nframes", type=int, default=25)
+    trace.add_argument("--top", type=int, default=20)
+    trace.add_argument("-o", "--output")
+
+    metrics = sub.add_parser("metrics", help="print runtime metrics")
+    metrics.add_argument("--prefix", default="")
+
+    fault = sub.add_parser("faults", help="set / clear / show injected faults")
+    fault.add_argument("action", choices=["set", "clear", "show"])
+    fault.add_argument("spec", nargs="?", default="",
+                       help="method=fault[,fault...][;...], fault = delay:DIST:ARGS | error[:CODE] | drop[:SECONDS], "
+                            "each with an optional @probability")
+    fault.add_argument("--seed", type=int, default=0)
+
+    args = parser.parse_args()
+    commands = {"profile": run_profile, "stacks": run_stacks, "tracemalloc": run_tracemalloc,
+                "metrics": run_metrics, "faults": run_faults}
+
+    with grpc.insecure_channel(args.target) as channel:
+        stub = warehouse_pb2_grpc.AdminServiceStub(channel)
+        try:
+            return commands[args.command](stub, args)
+        except grpc.RpcError as e:
+            print(f"❌ gRPC error: {e.code()} {e.details()}")
+            return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
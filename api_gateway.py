@@ -6,13 +6,73 @@ API Gateway - 顶层服务
 """
 
 import grpc
+import queue
+import threading
 import time
+import uuid
 import signal
 import sys
 from concurrent import futures
 
 import warehouse_pb2
 import warehouse_pb2_grpc
+from common import sku, transport
+from common.admin import AdminService
+from common.admission import AdmissionController, AdmissionInterceptor
+from common.config import env_int, env_str
+
+
+class _StockForwarder:
+    """
+    ImportStock 下游转发器
+    把路由到同一子树的行攒成大块, 经有界队列喂给下游的客户端流
+    """
+    
+    def __init__(self, service_name, stub, chunk_size):
+        self.service_name = service_name
+        self.chunk_size = chunk_size
+        self.rows = []
+        self.chunks = 0
+        # 有界队列提供背压: 下游消费慢时阻塞网关读取上游
+        self.queue = queue.Queue(maxsize=4)
+        self.future = stub.ImportStock.future(self._requests())
+    
+    def _requests(self):
+        while True:
+            chunk = self.queue.get()
+            if chunk is None:
+                return
+            yield chunk
+    
+    def _put(self, item):
+        while True:
+            try:
+                self.queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                # 下游已经结束 (通常是出错), 丢弃剩余数据
+                if self.future.done():
+                    return
+    
+    def add(self, row):
+        self.rows.append(row)
+        if len(self.rows) >= self.chunk_size:
+            self.flush()
+    
+    def flush(self):
+        if self.rows:
+            self._put(warehouse_pb2.ImportStockChunk(rows=self.rows))
+            self.chunks += 1
+            self.rows = []
+    
+    def finish(self):
+        """发送剩余数据并等待下游响应"""
+        self.flush()
+        self._put(None)
+        return self.future.result()
+    
+    def cancel(self):
+        self.future.cancel()
 
 
 class APIGateway(warehouse_pb2_grpc.OrderServiceServicer):
@@ -23,13 +83,21 @@ class APIGateway(warehouse_pb2_grpc.OrderServiceServicer):
     
     def __init__(self, 
                  food_service_host='food-service', food_service_port=50052,
-                 electronics_service_host='electronics-service', electronics_service_port=50051):
-        """Initialize API Gateway"""
+                 electronics_service_host='electronics-service', electronics_service_port=50051,
+                 import_chunk_size=5000, checkout_timeout=5.0, commit_retries=3,
+                 food_service_channel=None, electronics_service_channel=None):
+        """Initialize API Gateway (传入 *_channel 时不建立网络连接, 用于进程内拓扑)"""
+        self.import_chunk_size = import_chunk_size
+        # Checkout 两阶段提交的单阶段超时与提交重试次数
+        self.checkout_timeout = checkout_timeout
+        self.commit_retries = commit_retries
+        
         # 连接中层服务
-        self.food_service_channel = grpc.insecure_channel(f'{food_service_host}:{food_service_port}')
+        self.food_service_channel = food_service_channel or grpc.insecure_channel(f'{food_service_host}:{food_service_port}')
         self.food_service_stub = warehouse_pb2_grpc.OrderServiceStub(self.food_service_channel)
         
-        self.electronics_service_channel = grpc.insecure_channel(f'{electronics_service_host}:{electronics_service_port}')
+        self.electronics_service_channel = (electronics_service_channel
+                                            or grpc.insecure_channel(f'{electronics_service_host}:{electronics_service_port}'))
         self.electronics_service_stub = warehouse_pb2_grpc.OrderServiceStub(self.electronics_service_channel)
         
         print("🌐 API Gateway initialized")
@@ -37,8 +105,22 @@ class APIGateway(warehouse_pb2_grpc.OrderServiceServicer):
         print("   📍 ElectronicsService: electronics-service:50051")
     
     def _route_request(self, request):
-        """根据请求类别路由到相应服务"""
-        category = request.category.lower()
+        """根据请求类别路由到相应服务 (协议 v2 的请求按 sku_id 的命名空间路由)"""
+        sku_id = sku.request_sku_id(request)
+        if sku_id is not None:
+            return self._route_namespace(sku.namespace_of(sku_id))
+        return self._route_category(request.category)
+    
+    def _route_namespace(self, namespace):
+        """根据 SKU 命名空间选择中层服务"""
+        if namespace == sku.FRESH:
+            return self.food_service_stub
+        # APPLIANCE 及未知命名空间路由到ElectronicsService (与类别路由的默认值一致)
+        return self.electronics_service_stub
+    
+    def _route_category(self, category):
+        """根据类别名选择中层服务"""
+        category = category.lower()
         
         if category in ['food', 'fruits', 'vegetables', 'fresh']:
             return self.food_service_stub
@@ -210,6 +292,450 @@ class APIGateway(warehouse_pb2_grpc.OrderServiceServicer):
             print(f"   📤 Response: {len(response.items)} items")
             return response
     
+    def StockHistory(self, request, context):
+        """库存时间序列 - 路由到相应服务"""
+        try:
+            print(f"🌐 [RECEIVED] API Gateway - StockHistory Request:")
+            print(f"   📥 Category: {request.category}")
+            print(f"   📥 Subcategory: {request.subcategory}")
+            print(f"   📥 Client IP: {context.peer()}")
+            
+            target_service = self._route_request(request)
+            service_name = self._service_name(target_service)
+            print(f"   🎯 [ROUTING] Selected service: {service_name}")
+            
+            response = target_service.StockHistory(request)
+            print(f"   📨 [RECEIVED] Response from {service_name}: found={response.found}, {len(response.series)} series")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] API Gateway StockHistory gRPC error: {e}")
+            return warehouse_pb2.StockHistoryResponse(found=False, message="Service unavailable")
+    
+    def TopSellers(self, request, context):
+        """畅销排行 - 指定类别时路由到相应服务, 否则并行查询两个子树并按件数合并"""
+        print(f"🌐 [RECEIVED] API Gateway - TopSellers Request:")
+        print(f"   📥 Category: {request.category or 'all'}")
+        print(f"   📥 Limit: {request.limit or 'all'}")
+        print(f"   📥 Client IP: {context.peer()}")
+        
+        if request.category:
+            stubs = [self._route_category(request.category)]
+        else:
+            stubs = [self.food_service_stub, self.electronics_service_stub]
+        calls = [(stub, stub.TopSellers.future(request)) for stub in stubs]
+        
+        merged = warehouse_pb2.TopSellersResponse()
+        messages = []
+        for stub, call in calls:
+            service_name = self._service_name(stub)
+            try:
+                response = call.result()
+            except grpc.RpcError as e:
+                print(f"❌ [ERROR] API Gateway TopSellers gRPC error from {service_name}: {e}")
+                messages.append(f"{service_name}: Service unavailable")
+                continue
+            print(f"   📨 [RECEIVED] Response from {service_name}: {len(response.sellers)} sellers")
+            merged.sellers.extend(response.sellers)
+            merged.error_bound = max(merged.error_bound, response.error_bound)
+            merged.window_seconds = max(merged.window_seconds, response.window_seconds)
+            if response.message:
+                messages.append(f"{service_name}: {response.message}")
+        
+        # 各子树的 SKU 互不重叠, 合并时只需重新排序截断
+        sellers = sorted(merged.sellers, key=lambda seller: -seller.units)
+        if request.limit:
+            sellers = sellers[:request.limit]
+        del merged.sellers[:]
+        merged.sellers.extend(sellers)
+        merged.message = "; ".join(messages)
+        print(f"   ✅ [SENDING] TopSellers: {len(merged.sellers)} sellers")
+        return merged
+    
+    def Reserve(self, request, context):
+        """购物车预留 - 路由到相应服务"""
+        try:
+            print(f"🌐 [RECEIVED] API Gateway - Reserve Request:")
+            print(f"   📥 Category: {request.category}")
+            print(f"   📥 Subcategory: {request.subcategory}")
+            print(f"   📥 Quantity: {request.quantity}, TTL: {request.ttl_seconds or 'default'}")
+            print(f"   📥 Client IP: {context.peer()}")
+            
+            target_service = self._route_request(request)
+            service_name = self._service_name(target_service)
+            print(f"   🎯 [ROUTING] Selected service: {service_name}")
+            
+            response = target_service.Reserve(request)
+            print(f"   📨 [RECEIVED] Response from {service_name}: success={response.success}, hold_id={response.hold_id}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] API Gateway Reserve gRPC error: {e}")
+            return warehouse_pb2.ReserveResponse(success=False, message="Service unavailable")
+    
+    def CommitHold(self, request, context):
+        """提交预留 - 按预留编号的命名空间路由"""
+        return self._forward_hold("CommitHold", request)
+    
+    def ReleaseHold(self, request, context):
+        """释放预留 - 按预留编号的命名空间路由"""
+        return self._forward_hold("ReleaseHold", request)
+    
+    def _forward_hold(self, method, request):
+        try:
+            print(f"🌐 [RECEIVED] API Gateway - {method}: {request.hold_id}")
+            target_service = self._route_namespace(sku.namespace_of(request.hold_id))
+            service_name = self._service_name(target_service)
+            print(f"   🎯 [ROUTING] Selected service: {service_name}")
+            
+            response = getattr(target_service, method)(request)
+            print(f"   📨 [RECEIVED] Response from {service_name}: success={response.success}, message={response.message}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] API Gateway {method} gRPC error: {e}")
+            return warehouse_pb2.HoldResponse(success=False, message="Service unavailable")
+    
+    def _scan_targets(self, request):
+        """
+        确定扫描需要经过的子树及各自的起始游标
+        前缀包含完整类别时只扫描对应子树; 否则依次扫描 FoodService、ElectronicsService
+        """
+        subtrees = [("FoodService", self.food_service_stub),
+                    ("ElectronicsService", self.electronics_service_stub)]
+        prefix = request.prefix.lower()
+        if "/" in prefix:
+            stub = self._route_category(prefix.split("/", 1)[0])
+            subtrees = [s for s in subtrees if s[1] == stub]
+        
+        cursor = request.cursor.lower()
+        if not cursor:
+            return [(name, stub, "") for name, stub in subtrees]
+        # 游标所在子树之前的子树已经扫描完毕
+        cursor_stub = self._route_category(cursor.split("/", 1)[0])
+        targets = []
+        for name, stub in subtrees:
+            if stub == cursor_stub:
+                targets.append((name, stub, cursor))
+            elif targets:
+                targets.append((name, stub, ""))
+        return targets
+    
+    def ScanInventory(self, request, context):
+        """流式扫描库存 - 按子树依次转发, 不在网关缓存结果"""
+        print(f"🌐 [RECEIVED] API Gateway - ScanInventory Request:")
+        print(f"   📥 Prefix: {request.prefix!r}, Cursor: {request.cursor!r}")
+        print(f"   📥 Page size: {request.page_size}, Chunk size: {request.chunk_size}")
+        print(f"   📥 Client IP: {context.peer()}")
+        
+        targets = self._scan_targets(request)
+        remaining = request.page_size
+        next_cursor = request.cursor
+        total = 0
+        for index, (service_name, stub, cursor) in enumerate(targets):
+            print(f"   🎯 [ROUTING] Streaming from {service_name} (cursor={cursor!r})")
+            sub_request = warehouse_pb2.ScanInventoryRequest(
+                prefix=request.prefix,
+                cursor=cursor,
+                page_size=remaining,
+                chunk_size=request.chunk_size,
+            )
+            responses = stub.ScanInventory(sub_request)
+            context.add_callback(responses.cancel)
+            has_more = False
+            try:
+                for chunk in responses:
+                    total += len(chunk.entries)
+                    if chunk.next_cursor:
+                        next_cursor = chunk.next_cursor
+                    has_more = chunk.has_more
+                    yield chunk
+            except grpc.RpcError as e:
+                if e.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                    return
+                print(f"❌ [ERROR] API Gateway ScanInventory gRPC error: {e}")
+                context.abort(grpc.StatusCode.UNAVAILABLE, f"{service_name} unavailable after {total} entries")
+            
+            if has_more:
+                break
+            if request.page_size:
+                remaining = request.page_size - total
+                if remaining <= 0:
+                    if index + 1 < len(targets):
+                        # 本页已满但后续子树尚未扫描
+                        yield warehouse_pb2.ScanInventoryChunk(next_cursor=next_cursor, has_more=True)
+                    break
+        print(f"   ✅ [SENT] ScanInventory streamed {total} entries")
+    
+    def ImportStock(self, request_iterator, context):
+        """批量导入库存 - 按类别把行路由到各子树的下游流"""
+        print(f"🌐 [RECEIVED] API Gateway - ImportStock stream:")
+        print(f"   📥 Client IP: {context.peer()}")
+        started = time.time()
+        forwarders = {}
+        routes = {}
+        rows_in = 0
+        try:
+            for chunk in request_iterator:
+                for row in chunk.rows:
+                    # 类别数量很少, 缓存路由结果避免逐行小写化与比较
+                    stub = routes.get(row.category)
+                    if stub is None:
+                        stub = routes[row.category] = self._route_category(row.category)
+                    forwarder = forwarders.get(stub)
+                    if forwarder is None:
+                        service_name = "FoodService" if stub == self.food_service_stub else "ElectronicsService"
+                        print(f"   🎯 [ROUTING] Opening import stream to {service_name}")
+                        forwarder = forwarders[stub] = _StockForwarder(service_name, stub, self.import_chunk_size)
+                    forwarder.add(row)
+                rows_in += len(chunk.rows)
+            
+            success = True
+            messages = []
+            totals = warehouse_pb2.ImportStockResponse()
+            for forwarder in forwarders.values():
+                try:
+                    response = forwarder.finish()
+                except grpc.RpcError as e:
+                    print(f"❌ [ERROR] API Gateway ImportStock gRPC error from {forwarder.service_name}: {e}")
+                    success = False
+                    messages.append(f"{forwarder.service_name}: Service unavailable")
+                    continue
+                print(f"   📨 [RECEIVED] {forwarder.service_name}: {response.message}")
+                success = success and response.success
+                messages.append(f"{forwarder.service_name}: {response.message}")
+                totals.rows_applied += response.rows_applied
+                totals.rows_rejected += response.rows_rejected
+                totals.units_added += response.units_added
+                totals.chunks += forwarder.chunks
+            
+            totals.success = success
+            totals.message = "; ".join(messages) or "No rows received"
+            totals.elapsed_seconds = time.time() - started
+            print(f"   ✅ [SENDING] ImportStock: {rows_in} rows in {totals.elapsed_seconds:.2f}s")
+            print(f"   📤 Response: success={totals.success}, message={totals.message}")
+            return totals
+            
+        except Exception as e:
+            print(f"❌ [ERROR] API Gateway ImportStock error: {e}")
+            for forwarder in forwarders.values():
+                forwarder.cancel()
+            response = warehouse_pb2.ImportStockResponse(
+                success=False,
+                message=f"Error: {str(e)}",
+                elapsed_seconds=time.time() - started
+            )
+            print(f"   📤 Response: success={response.success}, message={response.message}")
+            return response
+    
+    def ExportInventory(self, request, context):
+        """导出库存快照 - 按类别路由, 逐块转发"""
+        print(f"🌐 [RECEIVED] API Gateway - ExportInventory Request:")
+        print(f"   📥 Category: {request.category}")
+        print(f"   📥 Prefix: {request.prefix!r}")
+        print(f"   📥 Client IP: {context.peer()}")
+        
+        target_service = self._route_request(request)
+        service_name = "FoodService" if target_service == self.food_service_stub else "ElectronicsService"
+        print(f"   🎯 [ROUTING] Selected service: {service_name}")
+        
+        responses = target_service.ExportInventory(request)
+        context.add_callback(responses.cancel)
+        sent = 0
+        try:
+            for chunk in responses:
+                sent += len(chunk.data)
+                yield chunk
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                return
+            print(f"❌ [ERROR] API Gateway ExportInventory gRPC error: {e}")
+            context.abort(grpc.StatusCode.UNAVAILABLE, f"{service_name} unavailable after {sent} bytes")
+        print(f"   ✅ [SENT] Forwarded {sent} bytes from {service_name}")
+    
+    def _watch_targets(self, request):
+        """
+        确定订阅需要经过的子树及各自的前缀
+        包含完整类别的前缀只发往对应子树, 其余前缀 (或不带前缀) 发往全部子树
+        """
+        subtrees = [self.food_service_stub, self.electronics_service_stub]
+        if not request.prefixes:
+            return [(stub, []) for stub in subtrees]
+        prefixes = {stub: [] for stub in subtrees}
+        for prefix in request.prefixes:
+            prefix = prefix.lower()
+            if "/" in prefix:
+                prefixes[self._route_category(prefix.split("/", 1)[0])].append(prefix)
+            else:
+                for stub in subtrees:
+                    prefixes[stub].append(prefix)
+        return [(stub, prefixes[stub]) for stub in subtrees if prefixes[stub]]
+    
+    def WatchInventory(self, request, context):
+        """订阅库存变更流 - 合并各子树的响应流, 每个子树由一个读线程拉取"""
+        print(f"🌐 [RECEIVED] API Gateway - WatchInventory Request:")
+        print(f"   📥 Prefixes: {list(request.prefixes)}")
+        print(f"   📥 Resume from: {dict(request.resume_from)}")
+        print(f"   📥 Client IP: {context.peer()}")
+        
+        # 有界队列: 客户端消费慢时读线程阻塞, 背压传回底层服务的合并缓冲
+        merged = queue.Queue(maxsize=64)
+        stopped = threading.Event()
+        streams = []
+        
+        def pump(service_name, responses):
+            try:
+                for batch in responses:
+                    while not stopped.is_set():
+                        try:
+                            merged.put(batch, timeout=1.0)
+                            break
+                        except queue.Full:
+                            pass
+                    if stopped.is_set():
+                        return
+                item = (service_name, None)
+            except grpc.RpcError as e:
+                item = (service_name, e)
+            while not stopped.is_set():
+                try:
+                    merged.put(item, timeout=1.0)
+                    return
+                except queue.Full:
+                    pass
+        
+        def stop():
+            stopped.set()
+            for responses in streams:
+                responses.cancel()
+        
+        context.add_callback(stop)
+        for stub, prefixes in self._watch_targets(request):
+            service_name = self._service_name(stub)
+            print(f"   🎯 [ROUTING] Watching {service_name} (prefixes={prefixes})")
+            sub_request = warehouse_pb2.WatchInventoryRequest(
+                prefixes=prefixes,
+                resume_from=request.resume_from,
+                max_batch=request.max_batch,
+            )
+            responses = stub.WatchInventory(sub_request)
+            streams.append(responses)
+            threading.Thread(target=pump, args=(service_name, responses),
+                             name=f"watch-{service_name}", daemon=True).start()
+        
+        open_streams = len(streams)
+        batches = 0
+        try:
+            while open_streams and context.is_active():
+                try:
+                    item = merged.get(timeout=1.0)
+                except queue.Empty:
+                    continue
+                if isinstance(item, warehouse_pb2.WatchInventoryResponse):
+                    batches += 1
+                    yield item
+                    continue
+                service_name, error = item
+                open_streams -= 1
+                if error is None:
+                    continue
+                if error.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                    return
+                print(f"❌ [ERROR] API Gateway WatchInventory gRPC error from {service_name}: {error}")
+                if error.code() in (grpc.StatusCode.OUT_OF_RANGE, grpc.StatusCode.RESOURCE_EXHAUSTED):
+                    context.abort(error.code(), error.details())
+                context.abort(grpc.StatusCode.UNAVAILABLE, f"{service_name} unavailable")
+        finally:
+            stop()
+        print(f"   ✅ [SENT] WatchInventory streamed {batches} batches")
+    
+    def _service_name(self, stub):
+        return "FoodService" if stub == self.food_service_stub else "ElectronicsService"
+    
+    def _finish_transaction(self, method, stubs, txn_id):
+        """并行向各子树发送 CommitOrder / AbortOrder, 失败时重试"""
+        pending = list(stubs)
+        for attempt in range(self.commit_retries):
+            calls = [(stub, getattr(stub, method).future(
+                warehouse_pb2.TxnRequest(txn_id=txn_id), timeout=self.checkout_timeout)) for stub in pending]
+            pending = []
+            for stub, call in calls:
+                try:
+                    response = call.result()
+                    print(f"   📨 [RECEIVED] {method} from {self._service_name(stub)}: {response.message}")
+                except grpc.RpcError as e:
+                    print(f"   ⚠️ {method} to {self._service_name(stub)} failed (attempt {attempt + 1}): {e.code()}")
+                    pending.append(stub)
+            if not pending:
+                return True
+        return False
+    
+    def Checkout(self, request, context):
+        """结账 - 按子树拆分购物车, 并行两阶段提交, 全部成功或全部回滚"""
+        try:
+            txn_id = uuid.uuid4().hex
+            print(f"🌐 [RECEIVED] API Gateway - Checkout Request:")
+            print(f"   📥 Lines: {len(request.orders)}")
+            print(f"   📥 Transaction: {txn_id}")
+            print(f"   📥 Client IP: {context.peer()}")
+            
+            # 按子树分组, 记录每行在原请求中的位置
+            groups = {}
+            for index, order in enumerate(request.orders):
+                groups.setdefault(self._route_request(order), []).append(index)
+            
+            # 阶段一: 并行预留
+            prepares = {}
+            for stub, indexes in groups.items():
+                print(f"   🎯 [ROUTING] {len(indexes)} lines → {self._service_name(stub)}")
+                prepares[stub] = stub.PrepareOrder.future(
+                    warehouse_pb2.PrepareOrderRequest(
+                        txn_id=txn_id,
+                        orders=[request.orders[i] for i in indexes]
+                    ),
+                    timeout=self.checkout_timeout
+                )
+            
+            results = [warehouse_pb2.OrderResponse(status="aborted", left=0) for _ in request.orders]
+            status = "ok"
+            for stub, call in prepares.items():
+                try:
+                    response = call.result()
+                except grpc.RpcError as e:
+                    print(f"   ❌ PrepareOrder to {self._service_name(stub)} failed: {e.code()}")
+                    if status == "ok":
+                        status = "service unavailable"
+                    continue
+                print(f"   📨 [RECEIVED] PrepareOrder from {self._service_name(stub)}: {response.status}")
+                if not response.success and status == "ok":
+                    status = response.status
+                for index, line in zip(groups[stub], response.results):
+                    results[index].CopyFrom(line)
+            
+            # 阶段二: 全部预留成功则提交, 否则回滚所有子树 (包括超时的, 回滚会拒绝迟到的预留)
+            if status == "ok":
+                committed = self._finish_transaction("CommitOrder", groups, txn_id)
+                message = "committed" if committed else "prepared, commit delivery pending"
+            else:
+                self._finish_transaction("AbortOrder", groups, txn_id)
+                message = "aborted"
+                for result in results:
+                    if result.status == "ok":
+                        result.status = "aborted"
+                        result.left = 0
+            
+            print(f"   {'✅' if status == 'ok' else '❌'} [SENDING] Checkout {status} ({message})")
+            response = warehouse_pb2.CheckoutResponse(status=status, message=f"{txn_id}: {message}", results=results)
+            print(f"   📤 Response: status={response.status}, message={response.message}")
+            return response
+            
+        except Exception as e:
+            print(f"❌ [ERROR] API Gateway Checkout error: {e}")
+            print(f"   📤 [SENDING] Error response")
+            response = warehouse_pb2.CheckoutResponse(status="error", message=f"Error: {str(e)}")
+            print(f"   📤 Response: status={response.status}, message={response.message}")
+            return response
+    
     def close(self):
         """关闭连接"""
         if self.food_service_channel:
@@ -220,13 +746,22 @@ class APIGateway(warehouse_pb2_grpc.OrderServiceServicer):
 
 def run_api_gateway(port=50050):
     """运行API Gateway"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    api_gateway = APIGateway()
+    admin_service = AdminService("APIGateway")
+    # 准入控制在最外层, 超限的调用不进入其他拦截器与处理函数
+    admission = AdmissionController.from_env()
+    admin_service.register_metrics("admission", admission.stats)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10),
+                         interceptors=[AdmissionInterceptor(admission), admin_service.interceptor,
+                                       admin_service.fault_interceptor])
+    # 下游地址可分别配置为 host:port 或 unix:路径 (common/transport.py)
+    api_gateway = APIGateway(food_service_channel=transport.dial_env("FOOD_SERVICE_ADDR"),
+                             electronics_service_channel=transport.dial_env("ELECTRONICS_SERVICE_ADDR"))
     warehouse_pb2_grpc.add_OrderServiceServicer_to_server(api_gateway, server)
-    server.add_insecure_port(f'[::]:{port}')
+    warehouse_pb2_grpc.add_AdminServiceServicer_to_server(admin_service, server)
+    addresses = transport.listen(server, port, env_str("SERVICE_SOCKET"))
     server.start()
     
-    print(f"🌐 API Gateway started on port {port}")
+    print(f"🌐 API Gateway started on {', '.join(addresses)}")
     print("🎯 Ready to accept client requests")
     
     try:
@@ -239,4 +774,5 @@ def run_api_gateway(port=50050):
 
 
 if __name__ == "__main__":
-    run_api_gateway()
+    # SERVICE_PORT 覆盖监听端口; SERVICE_SOCKET 另外监听 Unix 域套接字
+    run_api_gateway(env_int("SERVICE_PORT", 50050))
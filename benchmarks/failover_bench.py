@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+热备切换 (common/replication.py + common/failover.py) 的基准测试
+启动一个 FreshService 主机与一个热备 (独立进程, STANDBY_OF), 在本进程中运行带自动切换的 FoodService
+(直接调用处理函数), --clients 个线程持续经 FoodService 下单; --before 秒后让主机故障, 再运行 --after 秒:
+    - kill: SIGKILL 主机 (进程退出, 连接被拒, 由请求的 UNAVAILABLE 触发切换)
+    - hang: SIGSTOP 主机 (进程挂起, 连接仍在, 由探测超时触发切换)
+统计:
+    - 故障到切换完成的时间 (检测 + 提升备机), 其中 Promote 的耗时; 故障到切换后第一笔成功订单的时间
+    - 失败的订单 (返回 service unavailable 等) 与耗时超过 --stall-ms 的订单 (卡住等待切换)
+    - 丢失/重复的件数: 结束后备机的库存总数与 (初始库存 - 成功订单) 之差;
+      为负表示主机已确认但尚未复制的订单丢失, 为正表示主机已执行并复制、但回复前宕机的订单在备机上重试了一次
+
+用法: PYTHONPATH=. python benchmarks/failover_bench.py [--mode both|kill|hang] [--clients 8] [--before 3] [--after 5]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+import grpc
+
+import warehouse_pb2
+import warehouse_pb2_grpc
+from services.food_service import FoodService
+
+
+class _Context:
+    def peer(self):
+        return "bench"
+
+    def time_remaining(self):
+        return None
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def _start(port, env):
+    """以独立进程启动 FreshService"""
+    env = dict(os.environ, PYTHONPATH=os.getcwd(), SERVICE_PORT=str(port), **env)
+    return subprocess.Popen([sys.executable, "services/fresh_service.py"], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _status(stub):
+    return stub.ReplicaStatus(warehouse_pb2.ReplicaStatusRequest(), timeout=10, wait_for_ready=True)
+
+
+def _wait_synced(primary, standby, timeout=30.0):
+    """等待备机追上主机的变更序号"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        status = _status(standby)
+        if status.connected and status.seq == _status(primary).seq:
+            return
+        time.sleep(0.05)
+    raise RuntimeError("standby did not catch up")
+
+
+def _client(food, skus, stop, results, seed):
+    rng = random.Random(seed)
+    context = _Context()
+    while not stop.is_set():
+        request = warehouse_pb2.OrderRequest(category="bench", subcategory=f"sku{rng.randrange(skus)}", quantity=1)
+        started = time.perf_counter()
+        response = food.PlaceOrder(request, context)
+        results.append((started, time.perf_counter(), response.status))
+
+
+def _total_stock(stub, skus):
+    return sum(int(stub.ListItems(warehouse_pb2.ListItemsRequest(category="bench", subcategory=f"sku{i}")).items[0])
+               for i in range(skus))
+
+
+def run(mode, args):
+    primary_address, standby_address = f"localhost:{args.port}", f"localhost:{args.port + 1}"
+    primary = _start(args.port, {})
+    standby = _start(args.port + 1, {"STANDBY_OF": primary_address})
+    food = None
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            primary_stub = warehouse_pb2_grpc.OrderServiceStub(grpc.insecure_channel(primary_address))
+            standby_stub = warehouse_pb2_grpc.OrderServiceStub(grpc.insecure_channel(standby_address))
+            _status(primary_stub)
+            food = FoodService(fresh_service_channel=grpc.insecure_channel(primary_address),
+                               fresh_standby_channel=grpc.insecure_channel(standby_address))
+            for i in range(args.skus):
+                food.PutItem(warehouse_pb2.PutItemRequest(category="bench", subcategory=f"sku{i}",
+                                                          quantity=args.stock), _Context())
+            _wait_synced(primary_stub, standby_stub)
+
+            stop = threading.Event()
+            results = []
+            clients = [threading.Thread(target=_client, args=(food, args.skus, stop, results, seed))
+                       for seed in range(args.clients)]
+            for client in clients:
+                client.start()
+            time.sleep(args.before)
+            failed_at = time.perf_counter()
+            primary.send_signal(signal.SIGKILL if mode == "kill" else signal.SIGSTOP)
+            time.sleep(args.after)
+            stop.set()
+            for client in clients:
+                client.join()
+            failover = food.fresh_service_stub.stats()
+            failed_over_at = food.fresh_service_stub.failed_over_at
+            final = _total_stock(standby_stub, args.skus)
+    finally:
+        if food is not None:
+            food.close()
+        for process in (primary, standby):
+            process.send_signal(signal.SIGCONT)
+            process.kill()
+            process.wait()
+
+    ok = [(started, ended) for started, ended, status in results if status == "ok"]
+    failed = [status for _, _, status in results if status != "ok"]
+    switched = failed_over_at is not None
+    recovered = min((ended for _, ended in ok if switched and ended > failed_over_at), default=None)
+    before = [ended - started for started, ended in ok if ended < failed_at]
+    after = [ended - started for started, ended in ok if started > recovered] if recovered else []
+    latencies = [ended - started for started, ended, _ in results]
+    stalled = sum(latency * 1000 > args.stall_ms for latency in latencies)
+    drift = (args.skus * args.stock - len(ok)) - final
+
+    print(f"[{mode}] {args.clients} clients, primary {'killed' if mode == 'kill' else 'stopped'} "
+          f"after {args.before:.0f}s, {len(results)} orders")
+    print(f"   failover time            {(failed_over_at - failed_at) * 1000 if switched else float('nan'):8.1f} ms "
+          f"fault -> switched to the standby")
+    print(f"   first order on standby   {(recovered - failed_at) * 1000 if recovered else float('nan'):8.1f} ms "
+          f"after the fault")
+    print(f"   promote                  {failover['failover_ms']:8.1f} ms, "
+          f"{failover['failed_probes']} failed probes, {failover['retried']} orders retried on the standby")
+    print(f"   failed orders            {len(failed):8d} {sorted(set(failed))}")
+    print(f"   stalled orders           {stalled:8d} over {args.stall_ms:.0f}ms, "
+          f"max {max(latencies) * 1000:.0f}ms")
+    print(f"   order p50 before / after {_percentile(before, 0.5) * 1e3:8.2f} / {_percentile(after, 0.5) * 1e3:.2f} ms, "
+          f"{len(before) / args.before:.0f} / {len(after) / max(args.after - (recovered - failed_at), 1e-9):.0f} orders/s"
+          if recovered else "   no order succeeded after the fault")
+    print(f"   units lost (-) / duplicated (+) on the standby: {drift:+d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot standby failover benchmark")
+    parser.add_argument("--mode", choices=("both", "kill", "hang"), default="both")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--skus", type=int, default=100)
+    parser.add_argument("--stock", type=int, default=1000000)
+    parser.add_argument("--before", type=float, default=3.0, help="seconds of load before the fault")
+    parser.add_argument("--after", type=float, default=5.0, help="seconds of load after the fault")
+    parser.add_argument("--stall-ms", type=float, default=100.0)
+    parser.add_argument("--port", type=int, default=50153, help="primary port (standby uses port + 1)")
+    args = parser.parse_args()
+
+    for mode in ("kill", "hang") if args.mode == "both" else (args.mode,):
+        run(mode, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+故障与延迟注入 (common/faults.py) 的场景测试
+五个服务以 gRPC (localhost 套接字, 各自的线程池与拦截器) 运行在本进程中 (in_process.py, transport="grpc"),
+规则经各层的 AdminService.Faults 在运行时下发。负载为开环: 按 --rate 固定间隔发出 PlaceOrder (经网关),
+由 --concurrency 个客户端线程执行, 延迟从计划发出的时刻算起 (请求排队等待客户端线程的时间也计入,
+避免 coordinated omission)。客户端截止时间为 --deadline 秒。
+
+场景 (--scenarios):
+    baseline   无注入
+    tail       FreshService 1% 的 PlaceOrder 慢 50ms
+    lognormal  FreshService 每次 PlaceOrder 延迟服从对数正态 (中位数 2ms, sigma 1)
+    two-hops   FoodService 与 FreshService 各 1% 慢 50ms (两跳的尾部叠加)
+    errors     FreshService 5% 的 PlaceOrder 返回 UNAVAILABLE
+    drops      FreshService 1% 的 PlaceOrder 被吞掉 2 秒 (中层调用底层不带截止时间, 线程被占住)
+每个场景输出 p50 / p99 / p999、成功吞吐与各类结果的计数。
+
+--sweep 在 FreshService 每次 PlaceOrder 延迟 --sweep-delay-ms 的条件下逐级提高发送速率,
+输出每一级的成功吞吐与延迟, 找出吞吐不再跟随发送速率 (成功吞吐 < 95% 发送速率) 的崩溃点。
+
+用法: PYTHONPATH=. python benchmarks/fault_bench.py [--rate 200] [--duration 10]
+          [--scenarios baseline tail lognormal two-hops errors drops] [--sweep] [--rates 50 100 200 400 800]
+"""
+
+import argparse
+import contextlib
+import os
+import time
+from concurrent import futures
+
+import grpc
+
+import warehouse_pb2
+from common.events import EventPipeline
+from in_process import InProcessTopology
+from services.fresh_service import FreshService
+
+
+SCENARIOS = {
+    "baseline": {},
+    "tail": {"FreshService": "PlaceOrder=delay:fixed:50@0.01"},
+    "lognormal": {"FreshService": "PlaceOrder=delay:lognormal:2:1"},
+    "two-hops": {"FoodService": "PlaceOrder=delay:fixed:50@0.01",
+                 "FreshService": "PlaceOrder=delay:fixed:50@0.01"},
+    "errors": {"FreshService": "PlaceOrder=error:UNAVAILABLE@0.05"},
+    "drops": {"FreshService": "PlaceOrder=drop:2@0.01"},
+}
+LAYERS = ("APIGateway", "FoodService", "ElectronicsService", "FreshService", "ApplianceService")
+SKUS = 100
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else float("nan")
+
+
+def _set_faults(topology, faults, seed):
+    for layer in LAYERS:
+        response = topology.admin_stub(layer).Faults(warehouse_pb2.FaultsRequest(
+            action="set", spec=faults.get(layer, ""), seed=seed))
+        assert response.success, response.message
+
+
+def _order(stub, index, scheduled, deadline):
+    request = warehouse_pb2.OrderRequest(category="fresh", subcategory=f"sku{index % SKUS}", quantity=1)
+    try:
+        status = stub.PlaceOrder(request, timeout=deadline).status
+    except grpc.RpcError as e:
+        status = e.code().name
+    return scheduled, time.perf_counter() - scheduled, status
+
+
+def load(topology, rate, duration, concurrency, deadline):
+    """开环负载: 按固定间隔发出 rate * duration 个请求, 返回 (开始时刻, [(计划发出时刻, 延迟秒, 结果)])"""
+    stub = topology.stub
+    count = int(rate * duration)
+    results = []
+    with futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        pending = []
+        for index in range(count):
+            scheduled = started + index / rate
+            wait = scheduled - time.perf_counter()
+            if wait > 0:
+                time.sleep(wait)
+            pending.append(pool.submit(_order, stub, index, scheduled, deadline))
+        for future in pending:
+            results.append(future.result())
+    return started, results
+
+
+def summarize(label, rate, duration, started, results):
+    # 成功吞吐只计发送窗口内完成的成功请求, 窗口结束后才处理完的积压不算
+    end = started + duration
+    ok = sum(status == "ok" and scheduled + latency <= end for scheduled, latency, status in results)
+    counts = {}
+    for _, _, status in results:
+        counts[status] = counts.get(status, 0) + 1
+    goodput = ok / duration
+    latencies = [latency for _, latency, _ in results]
+    print(f"{label:<12} {rate:>6.0f} {goodput:>8.0f} {_percentile(latencies, 0.5) * 1e3:>8.2f} "
+          f"{_percentile(latencies, 0.99) * 1e3:>8.2f} {_percentile(latencies, 0.999) * 1e3:>8.2f} "
+          f"{max(latencies) * 1e3:>8.0f}  "
+          + ", ".join(f"{status}={count}" for status, count in sorted(counts.items(), key=lambda item: -item[1])))
+    return goodput
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fault / latency injection scenarios")
+    parser.add_argument("--rate", type=float, default=200.0, help="offered PlaceOrder rate per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--concurrency", type=int, default=256, help="client threads")
+    parser.add_argument("--deadline", type=float, default=1.0, help="client deadline in seconds")
+    parser.add_argument("--scenarios", nargs="*", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--sweep", action="store_true", help="offered-rate sweep under a fixed FreshService delay")
+    parser.add_argument("--sweep-delay-ms", type=float, default=10.0)
+    parser.add_argument("--rates", nargs="+", type=float, default=[50, 100, 200, 300, 400, 600, 800])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        topology = InProcessTopology("grpc", fresh_service=FreshService(event_pipeline=EventPipeline("fresh", None)))
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for index in range(SKUS):
+                topology.stub.PutItem(warehouse_pb2.PutItemRequest(
+                    category="fresh", subcategory=f"sku{index}", quantity=10_000_000))
+            # 预热 (建立连接、分配 SKU 编号)
+            load(topology, 100, 1, args.concurrency, args.deadline)
+
+        print(f"PlaceOrder via gateway, open loop, {args.concurrency} client threads, deadline {args.deadline:.1f}s")
+        print(f"{'scenario':<12} {'rate/s':>6} {'ok/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'p999 ms':>8} "
+              f"{'max ms':>8}  results")
+        for name in args.scenarios:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                _set_faults(topology, SCENARIOS[name], args.seed)
+                started, results = load(topology, args.rate, args.duration, args.concurrency, args.deadline)
+                # drop 挂起的调用在清除规则时放行, 等它们结束后再进入下一个场景
+                _set_faults(topology, {}, args.seed)
+                time.sleep(0.5)
+            summarize(name, args.rate, args.duration, started, results)
+
+        if args.sweep:
+            spec = f"PlaceOrder=delay:fixed:{args.sweep_delay_ms:g}"
+            print(f"\nsweep: FreshService {spec}")
+            collapse = None
+            for rate in args.rates:
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    _set_faults(topology, {"FreshService": spec}, args.seed)
+                    started, results = load(topology, rate, args.duration, args.concurrency, args.deadline)
+                    _set_faults(topology, {}, args.seed)
+                goodput = summarize("sweep", rate, args.duration, started, results)
+                if collapse is None and goodput < 0.95 * rate:
+                    collapse = rate
+                # 等上一级积压的请求处理完
+                time.sleep(args.deadline)
+            print(f"collapse point: {f'{collapse:.0f}/s offered' if collapse else 'not reached'}")
+    finally:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            topology.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+处理函数级的微基准与回归比较
+对五个服务的每个 OrderService 方法直接调用处理函数 (假的 context, 不经过 gRPC), 在几种库存规模下计时:
+    - 服务之间用进程内拓扑 (in_process.py) 连接, 网关与中层的用例包含下游处理函数的耗时
+    - 日志照常格式化, 输出到 /dev/null
+    - 每个用例先按 --round-ms 校准每轮调用次数, 再测 --rounds 轮, 记录每轮的平均单次耗时 (微秒);
+      计时期间关闭 GC (同 timeit), 依赖前置状态的调用 (CommitOrder、CommitHold 等) 在轮外准备与清理
+    - 新增了 RPC 却没有用例时直接报错, 保证覆盖所有方法
+compare 对两份结果中的同名用例做 Mann-Whitney U 检验 (单侧), 中位数变慢超过 --threshold 且 p < --alpha
+时判为回归, 有回归时退出码为 1
+
+用法: PYTHONPATH=. python benchmarks/handler_bench.py run [--sizes 1000 100000] [--rounds 10] [--filter Fresh]
+          [-o benchmarks/baselines/handlers.json]
+      PYTHONPATH=. python benchmarks/handler_bench.py compare benchmarks/baselines/handlers.json new.json
+          [--alpha 0.01] [--threshold 0.10]
+"""
+
+import argparse
+import contextlib
+import datetime
+import gc
+import itertools
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+
+import warehouse_pb2
+from common.events import EventPipeline
+from in_process import InProcessTopology
+from services.fresh_service import FreshService
+
+
+SERVICES = ("APIGateway", "FoodService", "ElectronicsService", "FreshService", "ApplianceService")
+# 单轮调用次数上限 (WatchInventory 等每次调用留下一个最多 1 秒才退出的读线程)
+_MAX_CALLS = {"WatchInventory": 20}
+_CHUNK_ROWS = 5000
+STOCK = 1_000_000_000
+
+
+class _Abort(Exception):
+    pass
+
+
+class _Context:
+    """处理函数需要的最小 ServicerContext"""
+
+    def __init__(self):
+        self._callbacks = []
+        self._active = True
+
+    def peer(self):
+        return "bench"
+
+    def time_remaining(self):
+        return None
+
+    def is_active(self):
+        return self._active
+
+    def add_callback(self, callback):
+        self._callbacks.append(callback)
+        return True
+
+    def invocation_metadata(self):
+        return ()
+
+    def abort(self, code, details):
+        raise _Abort(f"{code.name}: {details}")
+
+    def finish(self):
+        """调用结束: 执行取消回调 (流式处理函数据此停止读线程与订阅)"""
+        self._active = False
+        for callback in self._callbacks:
+            callback()
+
+
+class _Subtree:
+    """一棵底层子树的测试数据: FreshService 为 (类别, 子类别), ApplianceService 为 (类别, 子类别, 商品)"""
+
+    def __init__(self, source, category, size):
+        self.source = source
+        self.category = category
+        self.size = size
+
+    def fields(self, index):
+        if self.source == "fresh":
+            return {"category": self.category, "subcategory": f"f{index}"}
+        return {"category": self.category, "subcategory": f"s{index // 100}", "item": f"i{index}"}
+
+    def rows(self, indices, quantity):
+        return [warehouse_pb2.StockRow(quantity=quantity, **self.fields(index)) for index in indices]
+
+    def order(self, index):
+        return warehouse_pb2.OrderRequest(quantity=1, **self.fields(index))
+
+
+class Case:
+    """
+    一个用例: call(参数) 为计时的调用;
+    setup(n) 在轮外生成 n 个参数 (默认为调用编号), teardown(参数, 返回值) 在轮外清理
+    """
+
+    def __init__(self, call, setup=None, teardown=None):
+        self.call = call
+        self.setup = setup or range
+        self.teardown = teardown
+
+
+def _drain(responses):
+    for _ in responses:
+        pass
+
+
+def _first(handler, request):
+    """流式调用只取第一条消息, 然后结束调用"""
+    context = _Context()
+    responses = handler(request, context)
+    next(responses)
+    responses.close()
+    context.finish()
+
+
+def _snapshot(service):
+    """Replicate: 接收完整的快照后断开"""
+    context = _Context()
+    responses = service.Replicate(warehouse_pb2.ReplicateRequest(replica="bench"), context)
+    for batch in responses:
+        if batch.snapshot_done:
+            break
+    responses.close()
+    context.finish()
+
+
+_txn_ids = itertools.count(1)
+
+
+def build_cases(service, subtree, feeds, rng, other=None):
+    """
+    服务 (处理函数所在的对象) 的用例; 请求落在 subtree 上, feeds 为该服务能看到的变更流,
+    other 为网关 Checkout 的第二棵子树
+    """
+    def pick():
+        return rng.randrange(subtree.size)
+
+    def txn_ids(n):
+        return [f"bench-{next(_txn_ids)}" for _ in range(n)]
+
+    def prepared(n):
+        ids = txn_ids(n)
+        for txn_id in ids:
+            response = service.PrepareOrder(warehouse_pb2.PrepareOrderRequest(
+                txn_id=txn_id, orders=[subtree.order(pick())]), _Context())
+            assert response.success, response
+        return ids
+
+    def abort_all(ids, responses):
+        for txn_id in ids:
+            service.AbortOrder(warehouse_pb2.TxnRequest(txn_id=txn_id), _Context())
+
+    def reserved(n):
+        hold_ids = []
+        for _ in range(n):
+            response = service.Reserve(warehouse_pb2.ReserveRequest(quantity=1, **subtree.fields(pick())), _Context())
+            assert response.success, response
+            hold_ids.append(response.hold_id)
+        return hold_ids
+
+    def release_all(args, responses):
+        for response in responses:
+            service.ReleaseHold(warehouse_pb2.HoldRequest(hold_id=response.hold_id), _Context())
+
+    def watch_requests(n):
+        # 从最近的一条变更续传, 第一条消息立即可用
+        service.PutItem(warehouse_pb2.PutItemRequest(quantity=1, **subtree.fields(pick())), _Context())
+        request = warehouse_pb2.WatchInventoryRequest(
+            resume_from={feed.source: feed.seq - 1 for feed in feeds}, max_batch=1)
+        return [request] * n
+
+    def unary(method, make_request):
+        handler = getattr(service, method)
+        return Case(lambda index: handler(make_request(), _Context()))
+
+    cases = {
+        "PlaceOrder": unary("PlaceOrder", lambda: subtree.order(pick())),
+        "PutItem": unary("PutItem", lambda: warehouse_pb2.PutItemRequest(quantity=1, **subtree.fields(pick()))),
+        "UpdateItem": unary("UpdateItem", lambda: warehouse_pb2.UpdateItemRequest(
+            category=subtree.category, subcategory=subtree.fields(pick())["subcategory"], item=STOCK)),
+        "ListItems": unary("ListItems", lambda: warehouse_pb2.ListItemsRequest(
+            category=subtree.category, subcategory=subtree.fields(pick())["subcategory"])),
+        "StockHistory": unary("StockHistory", lambda: warehouse_pb2.StockHistoryRequest(**subtree.fields(pick()))),
+        "TopSellers": unary("TopSellers", lambda: warehouse_pb2.TopSellersRequest(
+            category=subtree.category, limit=10)),
+        "ImportStock": Case(lambda index: service.ImportStock(iter([warehouse_pb2.ImportStockChunk(
+            rows=subtree.rows([pick() for _ in range(100)], 1))]), _Context())),
+        "ScanInventory": Case(lambda index: _drain(service.ScanInventory(warehouse_pb2.ScanInventoryRequest(
+            prefix=f"{subtree.category}/", page_size=1000), _Context()))),
+        "ExportInventory": Case(lambda index: _drain(service.ExportInventory(warehouse_pb2.ExportInventoryRequest(
+            category=subtree.category), _Context()))),
+        "WatchInventory": Case(lambda request: _first(service.WatchInventory, request), watch_requests),
+        "PrepareOrder": Case(lambda txn_id: service.PrepareOrder(warehouse_pb2.PrepareOrderRequest(
+            txn_id=txn_id, orders=[subtree.order(pick())]), _Context()), txn_ids, abort_all),
+        "CommitOrder": Case(lambda txn_id: service.CommitOrder(warehouse_pb2.TxnRequest(txn_id=txn_id), _Context()),
+                            prepared),
+        "AbortOrder": Case(lambda txn_id: service.AbortOrder(warehouse_pb2.TxnRequest(txn_id=txn_id), _Context()),
+                           prepared),
+        "Reserve": Case(lambda index: service.Reserve(warehouse_pb2.ReserveRequest(
+            quantity=1, **subtree.fields(pick())), _Context()), teardown=release_all),
+        "CommitHold": Case(lambda hold_id: service.CommitHold(warehouse_pb2.HoldRequest(hold_id=hold_id), _Context()),
+                           reserved),
+        "ReleaseHold": Case(lambda hold_id: service.ReleaseHold(warehouse_pb2.HoldRequest(hold_id=hold_id),
+                                                                _Context()), reserved),
+        "Replicate": Case(lambda index: _snapshot(service)),
+        "Promote": unary("Promote", lambda: warehouse_pb2.PromoteRequest(reason="bench")),
+        "ReplicaStatus": unary("ReplicaStatus", warehouse_pb2.ReplicaStatusRequest),
+    }
+    if other is not None:
+        cases["Checkout"] = unary("Checkout", lambda: warehouse_pb2.CheckoutRequest(
+            orders=[subtree.order(pick()), other.order(rng.randrange(other.size))]))
+    # 只保留服务实现了的方法
+    implemented = {method for method in _order_methods() if method in type(service).__dict__}
+    missing = implemented - set(cases)
+    if missing:
+        raise RuntimeError(f"{type(service).__name__} has no benchmark case for {sorted(missing)}")
+    return {method: case for method, case in cases.items() if method in implemented}
+
+
+def _order_methods():
+    return [method.name for method in warehouse_pb2.DESCRIPTOR.services_by_name["OrderService"].methods]
+
+
+def _timed_round(case, n):
+    """一轮: 轮外准备参数, 计时调用 n 次, 轮外清理; 返回单次平均耗时 (秒)"""
+    args = list(case.setup(n))
+    call = case.call
+    results = []
+    append = results.append
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for arg in args:
+            append(call(arg))
+        elapsed = time.perf_counter() - started
+    finally:
+        if gc_enabled:
+            gc.enable()
+    if case.teardown:
+        case.teardown(args, results)
+    return elapsed / n
+
+
+def measure(case, method, rounds, round_seconds):
+    """校准每轮次数后测 rounds 轮, 返回 (每轮次数, [每轮单次平均微秒])"""
+    limit = _MAX_CALLS.get(method, 100000)
+    n = 1
+    while True:
+        per_call = _timed_round(case, n)
+        if per_call * n >= round_seconds or n >= limit:
+            break
+        n = min(limit, max(n * 2, int(round_seconds / max(per_call, 1e-7) * 1.2)))
+    return n, [round(_timed_round(case, n) * 1e6, 3) for _ in range(rounds)]
+
+
+def _populate(service, subtree):
+    """用 ImportStock 放入 size 个 SKU, 每个 STOCK 件"""
+    chunks = (warehouse_pb2.ImportStockChunk(rows=subtree.rows(range(start, min(start + _CHUNK_ROWS, subtree.size)),
+                                                              STOCK))
+              for start in range(0, subtree.size, _CHUNK_ROWS))
+    response = service.ImportStock(chunks, _Context())
+    assert response.success and response.rows_applied == subtree.size, response
+
+
+def run_size(size, rounds, round_seconds, pattern, seed, report):
+    """在 size 个 SKU (每个底层服务) 上跑所有用例; 处理函数的日志输出到 /dev/null, 结果由 report 输出"""
+    rng = random.Random(seed)
+    results = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        topology = InProcessTopology(fresh_service=FreshService(event_pipeline=EventPipeline("fresh", None)))
+        try:
+            fresh, appliance = _Subtree("fresh", "fruits", size), _Subtree("appliance", "kitchen", size)
+            feeds = {"fresh": topology.fresh.feed, "appliance": topology.appliance.feed}
+            _populate(topology.fresh, fresh)
+            _populate(topology.appliance, appliance)
+            services = {
+                "APIGateway": build_cases(topology.gateway, fresh, feeds.values(), rng, other=appliance),
+                "FoodService": build_cases(topology.food, fresh, [feeds["fresh"]], rng),
+                "ElectronicsService": build_cases(topology.electronics, appliance, [feeds["appliance"]], rng),
+                "FreshService": build_cases(topology.fresh, fresh, [feeds["fresh"]], rng),
+                "ApplianceService": build_cases(topology.appliance, appliance, [feeds["appliance"]], rng),
+            }
+            for service_name in SERVICES:
+                for method, case in services[service_name].items():
+                    name = f"{service_name}.{method}@{size}"
+                    if pattern and pattern not in name:
+                        continue
+                    calls, samples = measure(case, method, rounds, round_seconds)
+                    results[name] = {"calls_per_round": calls, "samples_us": samples}
+                    report(name, calls, samples)
+            # 等 WatchInventory 留下的读线程退出
+            time.sleep(1.5)
+        finally:
+            topology.close()
+    return results
+
+
+def _median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def mann_whitney_greater(base, new):
+    """Mann-Whitney U 检验 (正态近似, 含并列校正): new 随机地大于 base 的单侧 p 值"""
+    combined = sorted([(value, 0) for value in base] + [(value, 1) for value in new])
+    ranks = [0.0] * len(combined)
+    tie_term = 0.0
+    start = 0
+    while start < len(combined):
+        end = start
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        ties = end - start + 1
+        tie_term += ties ** 3 - ties
+        start = end + 1
+    n1, n2 = len(base), len(new)
+    total = n1 + n2
+    u_new = sum(rank for rank, (_, group) in zip(ranks, combined) if group) - n2 * (n2 + 1) / 2
+    variance = n1 * n2 / 12 * ((total + 1) - tie_term / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_new - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(base, new, alpha, threshold):
+    """返回 [(用例, 基线中位数, 新中位数, 变化比例, 单侧 p (变慢), 单侧 p (变快), 判定)]"""
+    rows = []
+    for name in sorted(set(base) & set(new)):
+        before, after = base[name]["samples_us"], new[name]["samples_us"]
+        base_median, new_median = _median(before), _median(after)
+        change = new_median / base_median - 1
+        slower = mann_whitney_greater(before, after)
+        faster = mann_whitney_greater(after, before)
+        if slower < alpha and change > threshold:
+            verdict = "REGRESSION"
+        elif faster < alpha and change < -threshold:
+            verdict = "improved"
+        else:
+            verdict = ""
+        rows.append((name, base_median, new_median, change, slower, faster, verdict))
+    return rows
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def command_run(args):
+    out = sys.stdout
+
+    def report(name, calls, samples):
+        print(f"{name:<44} {_median(samples):>10.2f} {min(samples):>10.2f} {max(samples):>10.2f} {calls:>7}",
+              file=out, flush=True)
+
+    print(f"{'case':<44} {'median us':>10} {'min us':>10} {'max us':>10} {'calls':>7}")
+    results = {}
+    for size in args.sizes:
+        results.update(run_size(size, args.rounds, args.round_ms / 1000, args.filter, args.seed, report))
+    document = {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.node(),
+            "cpus": os.cpu_count(),
+            "sizes": args.sizes,
+            "rounds": args.rounds,
+            "round_ms": args.round_ms,
+        },
+        "results": results,
+    }
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=1, sort_keys=True)
+            f.write("\n")
+        print(f"💾 {len(results)} cases → {args.output}")
+    return 0
+
+
+def command_compare(args):
+    with open(args.baseline) as f:
+        base = json.load(f)
+    with open(args.current) as f:
+        new = json.load(f)
+    for key in ("python", "platform", "machine"):
+        if base["meta"].get(key) != new["meta"].get(key):
+            print(f"⚠️ {key} differs: {base['meta'].get(key)} vs {new['meta'].get(key)}")
+    rows = compare(base["results"], new["results"], args.alpha, args.threshold)
+    print(f"{'case':<44} {'base us':>10} {'new us':>10} {'change':>8} {'p slower':>9} {'p faster':>9}")
+    for name, base_median, new_median, change, slower, faster, verdict in rows:
+        if verdict or args.all:
+            print(f"{name:<44} {base_median:>10.2f} {new_median:>10.2f} {change:>+8.1%} {slower:>9.4f} "
+                  f"{faster:>9.4f}  {verdict}")
+    regressions = sum(row[-1] == "REGRESSION" for row in rows)
+    improved = sum(row[-1] == "improved" for row in rows)
+    only = sorted(set(base["results"]) ^ set(new["results"]))
+    print(f"{len(rows)} cases compared: {regressions} regressions, {improved} improvements "
+          f"(p < {args.alpha}, change > {args.threshold:.0%})" + (f", {len(only)} cases in only one file" if only
+                                                                   else ""))
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Handler-level microbenchmarks with regression comparison")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="benchmark every RPC handler")
+    run.add_argument("--sizes", nargs="+", type=int, default=[1000, 100000], help="SKUs per bottom service")
+    run.add_argument("--rounds", type=int, default=10)
+    run.add_argument("--round-ms", type=float, default=50.0, help="target duration of one round")
+    run.add_argument("--filter", default="", help="only cases whose name contains this string")
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("-o", "--output", help="write results as JSON (e.g. benchmarks/baselines/handlers.json)")
+
+    comparison = sub.add_parser("compare", help="compare two result files")
+    comparison.add_argument("baseline")
+    comparison.add_argument("current")
+    comparison.add_argument("--alpha", type=float, default=0.01, help="significance level (one-sided)")
+    comparison.add_argument("--threshold", type=float, default=0.10, help="minimum relative change of the median")
+    comparison.add_argument("--all", action="store_true", help="print every case, not only flagged ones")
+
+    args = parser.parse_args()
+    return command_run(args) if args.command == "run" else command_compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+购物车预留 (common/holds.py) 的基准测试
+在 FreshService 中创建 --holds 个有效预留 (分布在 --skus 个 SKU 上, 有效期在 --horizon 秒内均匀分布), 然后:
+    - 预留: 每次 Reserve 的耗时 (直接调用处理函数) 与每个预留占用的内存 (tracemalloc)
+    - 下单: PlaceOrder 的 p50 / p99 耗时, 与没有预留时对比 (按可售检查只多一次字典查找)
+    - 结束: 提交与释放各 --finish 个预留 (在时间轮中惰性跳过)
+    - 过期: 用虚拟时钟把 --horizon 按 tick 走完, 统计每个 tick 的 expire_holds 耗时与单批最长持锁时间
+结束后校验: 所有预留都已提交、释放或过期, 预留件数归零
+
+用法: PYTHONPATH=. python benchmarks/holds_bench.py [--holds 1000000] [--skus 1000] [--orders 100000] [--batch 1000]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import threading
+import time
+import tracemalloc
+
+import warehouse_pb2
+from common import sku
+from common.events import EventPipeline
+from common.holds import HoldTable
+from common.store import DictStore
+from services.fresh_service import FreshService
+
+
+class _Context:
+    def peer(self):
+        return "bench"
+
+
+class _TimedLock:
+    """记录每次持锁时长的锁"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.held_ms = []
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._acquired = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.held_ms.append((time.perf_counter() - self._acquired) * 1000)
+        self._lock.release()
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _orders(service, skus, count, rng):
+    context = _Context()
+    latencies = []
+    for _ in range(count):
+        request = warehouse_pb2.OrderRequest(category="fresh", subcategory=f"sku{rng.randrange(skus)}", quantity=1)
+        started = time.perf_counter()
+        response = service.PlaceOrder(request, context)
+        latencies.append(time.perf_counter() - started)
+        assert response.status == "ok", response
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cart hold (Reserve) benchmark")
+    parser.add_argument("--holds", type=int, default=1000000)
+    parser.add_argument("--skus", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--finish", type=int, default=100000, help="holds committed and released each")
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--horizon", type=float, default=900.0, help="holds expire within this many seconds")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    clock = _Clock(1_700_000_000.0)
+    context = _Context()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # 每个 SKU 的库存足够所有预留与下单
+        store = DictStore(2)
+        for i in range(args.skus):
+            store.set(("fresh", f"sku{i}"), (args.holds // args.skus + 1) * 3 + args.orders * 2)
+        table = HoldTable(sku.FRESH, max_ttl=args.horizon, batch_size=args.batch, clock=clock)
+        service = FreshService(event_pipeline=EventPipeline("fresh", None), store=store, hold_table=table)
+        service.stop_lot_expiry()
+        service.stop_hold_expiry()
+        base_latencies = _orders(service, args.skus, args.orders, rng)
+
+        # 内存单独用一个 HoldTable 测量 (tracemalloc 会拖慢计时)
+        tracemalloc.start()
+        measured = HoldTable(sku.FRESH, max_ttl=args.horizon, clock=clock)
+        paths = [("fresh", f"sku{i}") for i in range(args.skus)]
+        for i in range(args.holds):
+            measured.add(paths[i % args.skus], 1, 1 + rng.random() * args.horizon)
+        hold_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del measured
+
+        hold_ids = []
+        started = time.perf_counter()
+        for i in range(args.holds):
+            response = service.Reserve(warehouse_pb2.ReserveRequest(
+                category="fresh", subcategory=f"sku{i % args.skus}", quantity=rng.randint(1, 3),
+                ttl_seconds=1 + rng.random() * (args.horizon - 1)), context)
+            hold_ids.append(response.hold_id)
+        reserve_us = (time.perf_counter() - started) / args.holds * 1e6
+        assert table.stats()["active"] == args.holds
+        hold_latencies = _orders(service, args.skus, args.orders, rng)
+
+        rng.shuffle(hold_ids)
+        finished = hold_ids[:2 * args.finish]
+        started = time.perf_counter()
+        for hold_id in finished[:args.finish]:
+            assert service.CommitHold(warehouse_pb2.HoldRequest(hold_id=hold_id), context).success
+        for hold_id in finished[args.finish:]:
+            assert service.ReleaseHold(warehouse_pb2.HoldRequest(hold_id=hold_id), context).success
+        finish_us = (time.perf_counter() - started) / len(finished) * 1e6
+
+        tick_ms = []
+        service.lock = _TimedLock()
+        expired = 0
+        for _ in range(int(args.horizon) + 2):
+            clock.now += 1.0
+            started = time.perf_counter()
+            expired += service.expire_holds()
+            tick_ms.append((time.perf_counter() - started) * 1000)
+        stats = table.stats()
+
+    assert stats["active"] == 0 and stats["held_units"] == 0, stats
+    assert expired == args.holds - len(finished), (expired, stats)
+    print(f"holds={args.holds} skus={args.skus} ({args.holds // args.skus} holds per SKU), batch={args.batch}")
+    print(f"Reserve                 {reserve_us:8.2f} us/hold, {hold_bytes / args.holds:6.0f} bytes/hold "
+          f"({hold_bytes / 2 ** 20:.0f} MB)")
+    print(f"PlaceOrder no holds     {_percentile(base_latencies, 0.5) * 1e6:8.2f} us p50, "
+          f"{_percentile(base_latencies, 0.99) * 1e6:8.2f} us p99")
+    print(f"PlaceOrder with holds   {_percentile(hold_latencies, 0.5) * 1e6:8.2f} us p50, "
+          f"{_percentile(hold_latencies, 0.99) * 1e6:8.2f} us p99")
+    print(f"CommitHold/ReleaseHold  {finish_us:8.2f} us each ({len(finished)} holds)")
+    print(f"expire per 1s tick      {sum(tick_ms) / len(tick_ms):8.2f} ms mean, {max(tick_ms):8.2f} ms max, "
+          f"{expired} holds expired")
+    print(f"expire lock hold        {max(service.lock.held_ms):8.2f} ms max per batch of {args.batch}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+进程内拓扑的负载生成器
+经网关发送混合请求 (PutItem / PlaceOrder / ListItems, 新鲜食品与家电两个子树), 统计每种 RPC 的端到端延迟:
+    - inprocess:  层间直接调用处理函数, 只剩我们自己的代码 (含日志格式化, 输出到 /dev/null)
+    - serialized: 同上, 但每一跳做 protobuf 往返
+    - grpc:       同一进程内各层经 localhost 套接字通信, 与 inprocess 的差值即网络/gRPC 开销
+--profile N 对 inprocess 运行做 cProfile (单线程), 输出自身耗时最多的 N 个函数
+
+用法: PYTHONPATH=. python benchmarks/inprocess_bench.py [--requests 5000] [--threads 1]
+          [--transports inprocess serialized grpc] [--profile 25]
+"""
+
+import argparse
+import contextlib
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+
+import warehouse_pb2
+from common.events import EventPipeline
+from in_process import InProcessTopology
+from services.fresh_service import FreshService
+
+
+def _workload():
+    """一轮请求: 补货后下单, 库存保持不变"""
+    return [
+        ("PutItem", warehouse_pb2.PutItemRequest(category="fruits", subcategory="apple", item="1")),
+        ("PlaceOrder", warehouse_pb2.OrderRequest(category="fruits", subcategory="apple", item="1")),
+        ("ListItems", warehouse_pb2.ListItemsRequest(category="fruits", subcategory="apple")),
+        ("PutItem", warehouse_pb2.PutItemRequest(category="kitchen", subcategory="microwave", item="microwave")),
+        ("PlaceOrder", warehouse_pb2.OrderRequest(category="kitchen", subcategory="microwave", item="microwave")),
+        ("ListItems", warehouse_pb2.ListItemsRequest(category="kitchen", subcategory="microwave")),
+    ]
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run(transport, rounds, threads, profile=0):
+    """返回 ({method: [延迟秒]}, 总耗时, pstats 文本)"""
+    serialize = transport == "serialized"
+    latencies = {}
+    lock = threading.Lock()
+    profile_text = ""
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        fresh = FreshService(event_pipeline=EventPipeline("fresh", None))
+        topology = InProcessTopology("grpc" if transport == "grpc" else "inprocess", serialize, fresh_service=fresh)
+        stub = topology.stub
+        workload = _workload()
+
+        def worker(count):
+            local = {}
+            for _ in range(count):
+                for method, request in workload:
+                    started = time.perf_counter()
+                    getattr(stub, method)(request)
+                    local.setdefault(method, []).append(time.perf_counter() - started)
+            with lock:
+                for method, values in local.items():
+                    latencies.setdefault(method, []).extend(values)
+
+        # 预热 (建立连接、分配 SKU 编号)
+        worker(10)
+        latencies.clear()
+        profiler = None
+        started = time.perf_counter()
+        if profile:
+            # cProfile 只记录启用它的线程, 剖析时在主线程上单线程运行
+            profiler = cProfile.Profile()
+            profiler.runcall(worker, rounds)
+        else:
+            workers = [threading.Thread(target=worker, args=(rounds // threads,)) for _ in range(threads)]
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+        elapsed = time.perf_counter() - started
+        topology.close()
+    if profiler:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("tottime").print_stats(profile)
+        profile_text = out.getvalue()
+    return latencies, elapsed, profile_text
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process topology load generator")
+    parser.add_argument("--requests", type=int, default=5000, help="rounds of the 6-request workload")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--transports", nargs="+", default=["inprocess", "serialized", "grpc"])
+    parser.add_argument("--profile", type=int, default=0, metavar="N",
+                        help="cProfile the inprocess run and print the top N functions")
+    args = parser.parse_args()
+
+    print(f"{'transport':<11} {'method':<11} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'calls/s':>10}")
+    profiles = []
+    for transport in args.transports:
+        profile = args.profile if transport == "inprocess" else 0
+        latencies, elapsed, profile_text = run(transport, args.requests, args.threads, profile)
+        total = sum(len(values) for values in latencies.values())
+        for method, values in latencies.items():
+            print(f"{transport:<11} {method:<11} {sum(values) / len(values) * 1e6:>9.1f} "
+                  f"{_percentile(values, 0.5) * 1e6:>9.1f} {_percentile(values, 0.99) * 1e6:>9.1f} {'':>10}")
+        print(f"{transport:<11} {'total':<11} {'':>9} {'':>9} {'':>9} {total / elapsed:>10,.0f}")
+        if profile_text:
+            profiles.append(profile_text)
+    for profile_text in profiles:
+        print()
+        print(profile_text)
+
+
+if __name__ == "__main__":
+    main()
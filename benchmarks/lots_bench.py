@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+FreshService 批次跟踪 (common/lots.py) 的基准测试
+在 FreshService 中装入 --lots 个批次 (分布在 --skus 个 SKU 上, 过期时间在一小时内均匀分布), 然后:
+    - 创建: 每个批次的 PutItem 耗时 (直接调用处理函数) 与批次占用的内存 (tracemalloc)
+    - 下单: PlaceOrder 的 p50 / p99 耗时, 每单从最早过期的批次开始消耗; 与装入前 (没有批次) 对比
+    - 过期: 用虚拟时钟把一小时按 tick 走完, 统计每个 tick 的 expire_lots 耗时与单批最长持锁时间
+装入前后与一小时结束后校验: 库存总数 = 不过期库存 + 批次内剩余件数
+
+用法: PYTHONPATH=. python benchmarks/lots_bench.py [--lots 1000000] [--skus 1000] [--orders 100000] [--batch 1000]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import threading
+import time
+import tracemalloc
+
+import warehouse_pb2
+from common.events import EventPipeline
+from common.lots import LotTracker
+from common.store import DictStore
+from services.fresh_service import FreshService
+
+
+class _Context:
+    def peer(self):
+        return "bench"
+
+
+class _TimedLock:
+    """记录每次持锁时长的锁"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.held_ms = []
+
+    def __enter__(self):
+        self._lock.acquire()
+        self._acquired = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.held_ms.append((time.perf_counter() - self._acquired) * 1000)
+        self._lock.release()
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _orders(service, skus, count, rng):
+    context = _Context()
+    latencies = []
+    for _ in range(count):
+        request = warehouse_pb2.OrderRequest(category="fresh", subcategory=f"sku{rng.randrange(skus)}", quantity=1)
+        started = time.perf_counter()
+        service.PlaceOrder(request, context)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def _total(service):
+    return sum(count for _, count in service.store.scan())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Perishable lot tracking benchmark")
+    parser.add_argument("--lots", type=int, default=1000000)
+    parser.add_argument("--skus", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--horizon", type=float, default=3600.0, help="lots expire within this many seconds")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    clock = _Clock(1_700_000_000.0)
+    start = clock.now
+    context = _Context()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        # 不过期的底数保证下单不会缺货, 批次消耗后还能继续下单
+        store = DictStore(2)
+        for i in range(args.skus):
+            store.set(("fresh", f"sku{i}"), args.orders * 3)
+        tracker = LotTracker(tick=1.0, batch_size=args.batch, clock=clock)
+        service = FreshService(event_pipeline=EventPipeline("fresh", None), store=store, lot_tracker=tracker)
+        service.stop_lot_expiry()
+        base_latencies = _orders(service, args.skus, args.orders, rng)
+
+        # 内存单独用一个 LotTracker 测量 (tracemalloc 会拖慢计时)
+        tracemalloc.start()
+        measured = LotTracker(tick=1.0, clock=clock)
+        paths = [("fresh", f"sku{i}") for i in range(args.skus)]
+        for i in range(args.lots):
+            measured.add(paths[i % args.skus], 3, start + rng.random() * args.horizon)
+        lot_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del measured
+
+        started = time.perf_counter()
+        for i in range(args.lots):
+            service.PutItem(warehouse_pb2.PutItemRequest(
+                category="fresh", subcategory=f"sku{i % args.skus}", quantity=rng.randint(1, 5),
+                expires_at=start + rng.random() * args.horizon), context)
+        put_us = (time.perf_counter() - started) / args.lots * 1e6
+        lot_units = tracker.stats()["units"]
+        lot_latencies = _orders(service, args.skus, args.orders, rng)
+        consumed = lot_units - tracker.stats()["units"]
+
+        total_before = _total(service)
+        tick_ms = []
+        service.lock = _TimedLock()
+        removed = 0
+        for _ in range(int(args.horizon) + 2):
+            clock.now += 1.0
+            started = time.perf_counter()
+            removed += service.expire_lots()
+            tick_ms.append((time.perf_counter() - started) * 1000)
+        total_after = _total(service)
+        stats = tracker.stats()
+
+    assert total_before - total_after == removed, (total_before, total_after, removed)
+    assert stats["lots"] == 0 and stats["units"] == 0, stats
+    print(f"lots={args.lots} skus={args.skus} ({args.lots // args.skus} lots per SKU), batch={args.batch}")
+    print(f"PutItem with lot       {put_us:8.2f} us/lot, {lot_bytes / args.lots:6.0f} bytes/lot "
+          f"({lot_bytes / 2 ** 20:.0f} MB)")
+    print(f"PlaceOrder no lots     {_percentile(base_latencies, 0.5) * 1e6:8.2f} us p50, "
+          f"{_percentile(base_latencies, 0.99) * 1e6:8.2f} us p99")
+    print(f"PlaceOrder with lots   {_percentile(lot_latencies, 0.5) * 1e6:8.2f} us p50, "
+          f"{_percentile(lot_latencies, 0.99) * 1e6:8.2f} us p99 ({consumed} units from lots)")
+    print(f"expire per 1s tick     {sum(tick_ms) / len(tick_ms):8.2f} ms mean, {max(tick_ms):8.2f} ms max, "
+          f"{removed} units / {stats['expired_lots']} lots removed")
+    print(f"expire lock hold       {max(service.lock.held_ms):8.2f} ms max per batch of {args.batch}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+协议 v2 (sku_id / quantity) 基准测试
+对比旧格式 (类别名 + 字符串数量)、v2 格式、迁移期两者都带的消息:
+    - 序列化后的字节数
+    - 反序列化耗时
+    - 底层服务解析请求 (_request_path + 数量) 的耗时
+    - FreshService.PlaceOrder 处理函数整体耗时 (日志输出到 /dev/null)
+
+用法: PYTHONPATH=. python benchmarks/protocol_bench.py [--iterations 100000]
+"""
+
+import argparse
+import contextlib
+import os
+import time
+
+import warehouse_pb2
+from common.events import EventPipeline
+from services.fresh_service import FreshService
+
+
+class _Context:
+    """处理函数需要的最小 ServicerContext"""
+
+    def peer(self):
+        return "ipv4:127.0.0.1:0"
+
+
+def _per_call_us(fn, iterations):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - started) / iterations * 1e6
+
+
+def _formats(sku_id):
+    return {
+        "legacy": warehouse_pb2.OrderRequest(category="Vegetables", subcategory="Lettuce", item="1"),
+        "v2": warehouse_pb2.OrderRequest(sku_id=sku_id, quantity=1),
+        "dual": warehouse_pb2.OrderRequest(category="Vegetables", subcategory="Lettuce", item="1",
+                                           sku_id=sku_id, quantity=1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Protocol v2 message size / CPU benchmark")
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+    n = args.iterations
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        service = FreshService(event_pipeline=EventPipeline("fresh", None))
+    sku_id = service.skus.id_for(("vegetables", "lettuce"))
+    context = _Context()
+
+    print(f"{'format':<8} {'bytes':>6} {'parse us':>9} {'resolve us':>11} {'handler us':>11}")
+    for name, request in _formats(sku_id).items():
+        data = request.SerializeToString()
+        parse = _per_call_us(lambda: warehouse_pb2.OrderRequest.FromString(data), n)
+        resolve = _per_call_us(lambda: service._order_line(request), n)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            with service.lock:
+                service.store.set(("vegetables", "lettuce"), n + 1)
+            handler = _per_call_us(lambda: service.PlaceOrder(request, context), n)
+        print(f"{name:<8} {len(data):>6} {parse:>9.3f} {resolve:>11.3f} {handler:>11.3f}")
+
+    print()
+    for message, legacy, v2 in [
+        ("PutItemRequest",
+         warehouse_pb2.PutItemRequest(category="vegetables", subcategory="lettuce", item="25"),
+         warehouse_pb2.PutItemRequest(sku_id=sku_id, quantity=25)),
+        ("UpdateItemRequest",
+         warehouse_pb2.UpdateItemRequest(category="vegetables", subcategory="lettuce", item=25),
+         warehouse_pb2.UpdateItemRequest(sku_id=sku_id, quantity=25)),
+    ]:
+        print(f"{message:<18} legacy={legacy.ByteSize()} bytes, v2={v2.ByteSize()} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+读写分池调度的混合负载测试
+FreshService (SQLite 后端, 默认 fsync, 写操作较慢) 经 localhost gRPC 提供服务, 同时运行:
+    - 批量导入线程: 连续的 ImportStock 流
+    - 下单线程: PutItem / PlaceOrder 交替
+    - 读线程: ListItems
+对比原来的单一线程池 (ThreadPoolExecutor(10)) 与 MethodScheduler 的各类延迟, 并输出各池的排队与等待指标
+
+用法: PYTHONPATH=. python benchmarks/scheduler_bench.py [--seconds 10] [--importers 6] [--orderers 2] [--readers 2]
+          [--no-fsync] [--modes single scheduled]
+调度模式的池大小取自 POOL_* 环境变量 (见 common/scheduling.py)
+"""
+
+import argparse
+import contextlib
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent import futures
+
+import grpc
+
+import warehouse_pb2
+import warehouse_pb2_grpc
+from common.events import EventPipeline
+from common.scheduling import MethodScheduler, SchedulingInterceptor
+from common.store import SqliteStore
+from services.fresh_service import FreshService
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _serve(mode, service):
+    scheduler = None
+    if mode == "single":
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+    else:
+        scheduler = MethodScheduler.from_env()
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=scheduler.max_threads()),
+                             interceptors=[SchedulingInterceptor(scheduler)],
+                             maximum_concurrent_rpcs=scheduler.max_threads())
+    warehouse_pb2_grpc.add_OrderServiceServicer_to_server(service, server)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    return server, port, scheduler
+
+
+def run(mode, seconds, importers, orderers, readers, fsync, rows_per_chunk=2000, chunks_per_stream=5):
+    directory = tempfile.mkdtemp(prefix="scheduler_bench_")
+    latencies = {"import chunk": [], "order": [], "read": []}
+    errors = {}
+    lock = threading.Lock()
+    stop = threading.Event()
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            store = SqliteStore(2, os.path.join(directory, "fresh.sqlite3"), fsync=fsync)
+            store.set(("fruits", "apple"), 1000)
+            service = FreshService(event_pipeline=EventPipeline("fresh", None), store=store)
+            server, port, scheduler = _serve(mode, service)
+            stub = warehouse_pb2_grpc.OrderServiceStub(grpc.insecure_channel(f"localhost:{port}"))
+
+            def record(kind, started, error=None):
+                with lock:
+                    if error is None:
+                        latencies[kind].append(time.perf_counter() - started)
+                    else:
+                        errors[error] = errors.get(error, 0) + 1
+
+            def importer(index):
+                serial = 0
+                while not stop.is_set():
+                    def chunks():
+                        nonlocal serial
+                        for _ in range(chunks_per_stream):
+                            rows = [warehouse_pb2.StockRow(category=f"bulk{index}", subcategory=f"s{serial + i}", quantity=1)
+                                    for i in range(rows_per_chunk)]
+                            serial += rows_per_chunk
+                            yield warehouse_pb2.ImportStockChunk(rows=rows)
+                    started = time.perf_counter()
+                    try:
+                        stub.ImportStock(chunks())
+                        # 按数据块折算, 与单个下单/读请求可比
+                        with lock:
+                            latencies["import chunk"].append((time.perf_counter() - started) / chunks_per_stream)
+                    except grpc.RpcError as e:
+                        record("import chunk", started, e.code().name)
+
+            def orderer():
+                put = warehouse_pb2.PutItemRequest(category="fruits", subcategory="apple", item="1")
+                order = warehouse_pb2.OrderRequest(category="fruits", subcategory="apple", item="1")
+                while not stop.is_set():
+                    for method, request in (("PutItem", put), ("PlaceOrder", order)):
+                        started = time.perf_counter()
+                        try:
+                            getattr(stub, method)(request)
+                            record("order", started)
+                        except grpc.RpcError as e:
+                            record("order", started, e.code().name)
+
+            def reader():
+                request = warehouse_pb2.ListItemsRequest(category="fruits", subcategory="apple")
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    try:
+                        stub.ListItems(request)
+                        record("read", started)
+                    except grpc.RpcError as e:
+                        record("read", started, e.code().name)
+
+            threads = ([threading.Thread(target=importer, args=(i,)) for i in range(importers)]
+                       + [threading.Thread(target=orderer) for _ in range(orderers)]
+                       + [threading.Thread(target=reader) for _ in range(readers)])
+            for thread in threads:
+                thread.start()
+            time.sleep(seconds)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            pool_stats = scheduler.stats() if scheduler else {}
+            server.stop(0)
+            store.close()
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return latencies, errors, pool_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read/write pool scheduling under mixed load")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--importers", type=int, default=6)
+    parser.add_argument("--orderers", type=int, default=2)
+    parser.add_argument("--readers", type=int, default=2)
+    parser.add_argument("--no-fsync", action="store_true")
+    parser.add_argument("--modes", nargs="+", default=["single", "scheduled"])
+    args = parser.parse_args()
+
+    print(f"{'mode':<10} {'kind':<13} {'count':>7} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for mode in args.modes:
+        latencies, errors, pool_stats = run(mode, args.seconds, args.importers, args.orderers,
+                                            args.readers, not args.no_fsync)
+        for kind, values in latencies.items():
+            print(f"{mode:<10} {kind:<13} {len(values):>7} {_percentile(values, 0.5) * 1000:>8.1f} "
+                  f"{_percentile(values, 0.99) * 1000:>8.1f} {max(values or [0]) * 1000:>8.1f}")
+        if errors:
+            print(f"{mode:<10} errors: {errors}")
+        for key in sorted(pool_stats):
+            if "wait_ms" in key or key.endswith(("max_queued", "rejected")):
+                print(f"{'':<10} pools.{key} = {pool_stats[key]:.2f}")
+
+
+if __name__ == "__main__":
+    main()
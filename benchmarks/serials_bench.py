@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+ApplianceService 序列号跟踪 (common/serials.py) 的内存与耗时
+每种分布放入 --serials 个序列号, 用 tracemalloc 对比 SerialSet 与 Python set 的内存:
+    - contiguous: 一个区间 (整批连续入库)
+    - batches:    每批 --batch 个连续序列号, 批与批之间有间隔
+    - dense:      在 4 倍的范围内随机取 (碎片化, 块转换为位图)
+    - sparse:     在 2^32 的范围内随机取 (每 65536 个序列号的块中平均 15 个)
+    - scattered:  在 2^48 的范围内随机取 (每块只有一个序列号, 最差情况: 每块的对象开销比 set 还大)
+然后在 ApplianceService 上 (直接调用处理函数):
+    - PutItem: 一次放入 --serials 个序列号 (一个区间) 的耗时
+    - PlaceOrder: 有无序列号时的 p50 / p99, 每单分配 --quantity 个序列号
+    - 分配: 按 dense 分布放入后逐个取出, 每个序列号的平均耗时
+
+用法: PYTHONPATH=. python benchmarks/serials_bench.py [--serials 1000000] [--batch 1000] [--orders 100000]
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import time
+import tracemalloc
+
+import warehouse_pb2
+from common.serials import SerialSet
+from common.store import DictStore
+from services.appliance_service import ApplianceService
+
+
+class _Context:
+    def peer(self):
+        return "bench"
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def distributions(serials, batch, seed=1):
+    """分布名 -> [(start, count)]"""
+    rng = random.Random(seed)
+    return {
+        "contiguous": [(10 ** 9, serials)],
+        "batches": [(10 ** 9 + index * batch * 3, batch) for index in range(serials // batch)],
+        "dense": [(serial, 1) for serial in rng.sample(range(4 * serials), serials)],
+        "sparse": [(serial, 1) for serial in rng.sample(range(1 << 32), serials)],
+        "scattered": [(serial, 1) for serial in rng.sample(range(1 << 48), serials)],
+    }
+
+
+def measure(build):
+    """build() 返回的对象占用的字节数"""
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def _serial_set(ranges):
+    serials = SerialSet()
+    for start, count in ranges:
+        serials.add_range(start, count)
+    return serials
+
+
+def _python_set(ranges):
+    return {serial for start, count in ranges for serial in range(start, start + count)}
+
+
+def _orders(service, path, count, quantity):
+    context = _Context()
+    latencies = []
+    for _ in range(count):
+        request = warehouse_pb2.OrderRequest(category=path[0], subcategory=path[1], item=path[2], quantity=quantity)
+        started = time.perf_counter()
+        response = service.PlaceOrder(request, context)
+        latencies.append(time.perf_counter() - started)
+    return latencies, response
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial-number tracking memory and allocation benchmark")
+    parser.add_argument("--serials", type=int, default=1000000)
+    parser.add_argument("--batch", type=int, default=1000)
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--quantity", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'distribution':>12} {'ranges':>9} {'chunks':>7} {'bitmaps':>8} {'SerialSet MB':>13} "
+          f"{'set MB':>8} {'ratio':>7} {'bytes/serial':>13}")
+    dense = None
+    for name, ranges in distributions(args.serials, args.batch).items():
+        serials, compact = measure(lambda: _serial_set(ranges))
+        reference, exact = measure(lambda: _python_set(ranges))
+        assert len(serials) == len(reference) == args.serials
+        chunks, bitmaps, _ = serials.layout()
+        print(f"{name:>12} {len(ranges):>9} {chunks:>7} {bitmaps:>8} {compact / 2 ** 20:>13.3f} "
+              f"{exact / 2 ** 20:>8.1f} {compact / exact:>7.3f} {compact / args.serials:>13.3f}")
+        if name == "dense":
+            dense = serials
+        del reference
+
+    started = time.perf_counter()
+    while dense:
+        dense.pop_first()
+    pop_us = (time.perf_counter() - started) / args.serials * 1e6
+
+    path = ("kitchen", "microwave", "microwave")
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        store = DictStore(3)
+        store.set(path, args.orders * args.quantity * 2)
+        service = ApplianceService(store=store)
+        base_latencies, _ = _orders(service, path, args.orders, args.quantity)
+        store.set(path, 0)
+        started = time.perf_counter()
+        put = service.PutItem(warehouse_pb2.PutItemRequest(
+            category=path[0], subcategory=path[1], item=path[2],
+            serials=[warehouse_pb2.SerialRange(start=10 ** 9, count=args.serials)]), _Context())
+        put_ms = (time.perf_counter() - started) * 1000
+        serial_latencies, last = _orders(service, path, min(args.orders, args.serials // args.quantity), args.quantity)
+
+    assert put.serials_added == args.serials, put
+    assert len(last.serials) == args.quantity, last
+    print()
+    print(f"PutItem {args.serials} serials   {put_ms:8.2f} ms (one range)")
+    print(f"PlaceOrder no serials      {_percentile(base_latencies, 0.5) * 1e6:8.2f} us p50, "
+          f"{_percentile(base_latencies, 0.99) * 1e6:8.2f} us p99")
+    print(f"PlaceOrder with serials    {_percentile(serial_latencies, 0.5) * 1e6:8.2f} us p50, "
+          f"{_percentile(serial_latencies, 0.99) * 1e6:8.2f} us p99 ({args.quantity} per order)")
+    print(f"allocate (dense)           {pop_us:8.3f} us per serial")
+
+
+if __name__ == "__main__":
+    main()
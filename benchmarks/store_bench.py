@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+InventoryStore 后端的一致性检查与基准测试
+    - 一致性: 对每个后端执行同一串随机操作, 与参照字典比较结果、有序遍历、游标/前缀与快照隔离;
+      log / sqlite 后端额外检查重新打开后的恢复结果
+    - 基准: 装载耗时、内存占用 (tracemalloc, 不含 SQLite 自身的页缓存)、磁盘占用、
+      多线程混合读写吞吐 (与服务相同: 锁内操作, 锁外 sync)、快照耗时、恢复耗时,
+      以及全量遍历期间的写入吞吐与最长写入停顿 (遍历在锁外的快照上进行, 写线程持续运行)
+
+用法: PYTHONPATH=. python benchmarks/store_bench.py [--sizes 10000 100000] [--ops 200000] [--threads 8]
+          [--scan-writers 2] [--backends dict array log sqlite] [--fsync] [--skip-memory]
+     SQLite 与内存字典对比: --backends dict sqlite --sizes 10000 1000000 (10000000 需要数 GB 内存并运行较久)
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from common.store import ArrayStore, DictStore, LogStore, SqliteStore
+
+
+def _path(i):
+    return (f"cat{i % 100:02d}", f"sku{i:07d}")
+
+
+class _Backends:
+    """按名称创建后端; log / sqlite 后端的文件放在临时目录中"""
+
+    def __init__(self, fsync=False):
+        self.directory = tempfile.mkdtemp(prefix="store_bench_")
+        self.fsync = fsync
+        self.opened = 0
+
+    def open(self, name, reopen=False):
+        if name == "dict":
+            return DictStore(2)
+        if name == "array":
+            return ArrayStore(2)
+        if name in ("log", "sqlite"):
+            if not reopen:
+                self.opened += 1
+            path = os.path.join(self.directory, f"bench{self.opened}.{name}")
+            if name == "log":
+                return LogStore(2, path, fsync=self.fsync)
+            return SqliteStore(2, path, fsync=self.fsync)
+        raise ValueError(name)
+
+    def disk_bytes(self):
+        """最近一次打开的文件 (含 SQLite 的 -wal) 大小"""
+        prefix = f"bench{self.opened}."
+        return sum(os.path.getsize(os.path.join(self.directory, f))
+                   for f in os.listdir(self.directory) if f.startswith(prefix))
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def check_conformance(backends, name, operations=20000, seed=7):
+    """与参照字典对比; 返回发现的问题列表"""
+    rng = random.Random(seed)
+    store = backends.open(name)
+    model = {}
+    problems = []
+    keys = [_path(i) for i in range(500)]
+
+    def expect(label, actual, wanted):
+        if actual != wanted and len(problems) < 10:
+            problems.append(f"{label}: got {actual!r}, want {wanted!r}")
+
+    def mutate(step):
+        path = rng.choice(keys)
+        op = rng.random()
+        if op < 0.3:
+            delta = rng.randint(-3, 10)
+            expect(f"#{step} add", store.add(path, delta), model.get(path, 0) + delta)
+            model[path] = model.get(path, 0) + delta
+        elif op < 0.45:
+            count = rng.randint(0, 50)
+            expect(f"#{step} set", store.set(path, count), model.get(path))
+            model[path] = count
+        elif op < 0.55:
+            expect(f"#{step} delete", store.delete(path), model.pop(path, None))
+        elif op < 0.8:
+            quantity = rng.randint(1, 5)
+            current = model.get(path)
+            wanted = (current, None) if current is None or current < quantity else (current, current - quantity)
+            expect(f"#{step} take", store.take(path, quantity), wanted)
+            if wanted[1] is not None:
+                model[path] = wanted[1]
+        elif op < 0.85:
+            pairs = [(rng.choice(keys), rng.randint(1, 5)) for _ in range(rng.randint(1, 20))]
+            touched = store.add_batch(pairs)
+            for batch_path, delta in pairs:
+                model[batch_path] = model.get(batch_path, 0) + delta
+            expect(f"#{step} add_batch", touched, {p: model[p] for p, _ in pairs})
+        else:
+            expect(f"#{step} get", store.get(path), model.get(path))
+        store.sync()
+
+    for step in range(operations):
+        mutate(step)
+
+    ordered = sorted(model.items())
+    expect("len", len(store), len(model))
+    expect("scan", list(store.scan()), ordered)
+    cursor = ordered[len(ordered) // 2][0]
+    expect("scan after cursor", list(store.scan("", cursor)), [e for e in ordered if e[0] > cursor])
+    expect("scan prefix", list(store.scan("cat07/")), [e for e in ordered if e[0][0] == "cat07"])
+    expect("scan prefix + cursor", list(store.scan("cat0", ("cat05", "sku0000000"))),
+           [e for e in ordered if e[0][0].startswith("cat0") and e[0] > ("cat05", "sku0000000")])
+
+    snapshot = store.snapshot()
+    store.add(keys[0], 1000)
+    store.delete(keys[1])
+    expect("snapshot isolation", list(snapshot.scan()), ordered)
+    model[keys[0]] = model.get(keys[0], 0) + 1000
+    model.pop(keys[1], None)
+    del snapshot
+
+    # 多版本: 几个快照交错存活, 中途释放一个, 期间继续随机写入; 每个快照都保持创建时的内容
+    pinned = []
+    for version in range(4):
+        pinned.append((store.snapshot(), sorted(model.items())))
+        for step in range(500):
+            mutate(step)
+        if version == 1:
+            pinned.pop(0)
+    for version, (snapshot, wanted) in enumerate(pinned):
+        expect(f"snapshot {version} scan", list(snapshot.scan()), wanted)
+        expect(f"snapshot {version} get", snapshot.get(wanted[0][0]), wanted[0][1])
+        snapshot.close()
+    del pinned, snapshot
+    expect("scan after snapshots", list(store.scan()), sorted(model.items()))
+    if name in ("log", "sqlite"):
+        store.close()
+        store = backends.open(name, reopen=True)
+        expect("recovery", list(store.scan()), sorted(model.items()))
+        expect("recovered len", len(store), len(model))
+    store.close()
+    return problems
+
+
+def benchmark(backends, name, size, operations, threads=1, measure_memory=True, seed=11, scan_writers=2):
+    """单个后端在 size 个条目下的各项指标"""
+    rng = random.Random(seed)
+    result = {}
+    order = list(range(size))
+    rng.shuffle(order)
+
+    def load():
+        # 键字符串在装载时生成 (与服务解析请求时一样是新对象), 批次用完即释放
+        store = backends.open(name)
+        for start in range(0, size, 5000):
+            store.add_batch([(_path(i), 1 + i % 1000) for i in order[start:start + 5000]])
+            store.sync()
+        return store
+
+    # 内存单独装载一次测量, 避免 tracemalloc 的开销计入装载耗时
+    if measure_memory:
+        tracemalloc.start()
+        store = load()
+        result["memory_mb"] = tracemalloc.get_traced_memory()[0] / 1e6
+        tracemalloc.stop()
+        store.close()
+
+    started = time.perf_counter()
+    store = load()
+    result["load_s"] = time.perf_counter() - started
+    result["disk_mb"] = backends.disk_bytes() / 1e6 if name in ("log", "sqlite") else 0.0
+
+    # 热点分布: 一半的操作落在 1% 的键上
+    hot = max(1, size // 100)
+    paths = [_path(rng.randrange(hot) if rng.random() < 0.5 else rng.randrange(size)) for _ in range(operations)]
+    lock = threading.Lock()
+
+    def worker(part):
+        for index, path in enumerate(part):
+            kind = index % 4
+            with lock:
+                if kind == 0:
+                    store.take(path, 1)
+                elif kind == 1:
+                    store.add(path, 1)
+                else:
+                    store.get(path)
+            if kind < 2:
+                store.sync()
+
+    workers = [threading.Thread(target=worker, args=(paths[i::threads],)) for i in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    result["ops_per_s"] = operations / (time.perf_counter() - started)
+    result["commits"] = store.stats().get("commits")
+
+    # 全量遍历期间的写入: 写线程只修改已有的键, 记录各自的操作数与最长单次耗时
+    stop = threading.Event()
+    writes = [0] * scan_writers
+    stalls = [0.0] * scan_writers
+
+    def writer(slot):
+        part = paths[slot::scan_writers]
+        done = 0
+        longest = 0.0
+        while not stop.is_set():
+            path = part[done % len(part)]
+            started = time.perf_counter()
+            with lock:
+                if done % 2:
+                    store.take(path, 1)
+                else:
+                    store.add(path, 1)
+            store.sync()
+            longest = max(longest, time.perf_counter() - started)
+            done += 1
+        writes[slot] = done
+        stalls[slot] = longest
+
+    writers = [threading.Thread(target=writer, args=(i,)) for i in range(scan_writers)]
+    for thread in writers:
+        thread.start()
+    time.sleep(0.2)
+    started = time.perf_counter()
+    with lock:
+        snapshot = store.snapshot()
+    result["snapshot_ms"] = (time.perf_counter() - started) * 1000
+    scanned = sum(1 for _ in snapshot.scan())
+    result["scan_s"] = time.perf_counter() - started
+    stop.set()
+    for thread in writers:
+        thread.join()
+    snapshot.close()
+    del snapshot
+    result["scan_writes_per_s"] = sum(writes) / (time.perf_counter() - started + 0.2)
+    result["max_stall_ms"] = max(stalls) * 1000
+    assert scanned == size, (name, scanned, size)
+
+    store.close()
+    if name in ("log", "sqlite"):
+        started = time.perf_counter()
+        store = backends.open(name, reopen=True)
+        result["recovery_s"] = time.perf_counter() - started
+        store.close()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="InventoryStore conformance and benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--ops", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--scan-writers", type=int, default=2,
+                        help="writer threads running during the full scan (many busy threads on one core starve the scan)")
+    parser.add_argument("--backends", nargs="+", default=["dict", "array", "log", "sqlite"])
+    parser.add_argument("--fsync", action="store_true", help="fsync log / sqlite writes before sync() returns")
+    parser.add_argument("--skip-memory", action="store_true", help="skip the tracemalloc load (halves the run time)")
+    args = parser.parse_args()
+
+    backends = _Backends(args.fsync)
+    try:
+        print("🔍 Conformance")
+        failed = False
+        for name in args.backends:
+            problems = check_conformance(backends, name)
+            print(f"   {name:<6} {'ok' if not problems else 'FAILED'}")
+            for problem in problems:
+                print(f"      - {problem}")
+            failed = failed or bool(problems)
+
+        print("\n📊 Benchmark")
+        print(f"   {'backend':<7} {'entries':>9} {'load s':>8} {'memory MB':>10} {'disk MB':>8} {'ops/s':>10} "
+              f"{'commits':>8} {'snapshot ms':>12} {'scan s':>7} {'writes/s in scan':>17} {'max stall ms':>13} "
+              f"{'recovery s':>11}")
+        for size in args.sizes:
+            for name in args.backends:
+                r = benchmark(backends, name, size, args.ops, args.threads, not args.skip_memory,
+                              scan_writers=args.scan_writers)
+                memory = f"{r['memory_mb']:>10.1f}" if "memory_mb" in r else f"{'-':>10}"
+                commits = f"{r['commits']:>8}" if r["commits"] is not None else f"{'-':>8}"
+                recovery = f"{r['recovery_s']:>11.3f}" if "recovery_s" in r else f"{'-':>11}"
+                print(f"   {name:<7} {size:>9} {r['load_s']:>8.3f} {memory} {r['disk_mb']:>8.1f} "
+                      f"{r['ops_per_s']:>10,.0f} {commits} {r['snapshot_ms']:>12.1f} {r['scan_s']:>7.3f} "
+                      f"{r['scan_writes_per_s']:>17,.0f} {r['max_stall_ms']:>13.1f} {recovery}")
+    finally:
+        backends.cleanup()
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
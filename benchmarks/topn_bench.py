@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+畅销排行 (common/topn.py) 的精度与内存
+按 Zipf 分布生成下单流 (少数 SKU 占大部分销量), 对比 TopSellers 与精确计数 (Counter):
+    - recall: 估计的前 N 名中有多少是真实的前 N 名
+    - max err / mean err: 报告的件数相对真实件数的高估 (占窗口总件数的百分比)
+    - bound: sketch 给出的高估上界 e / width × 总件数 (同样按百分比)
+    - sketch KB: 与目录大小无关; exact KB 为精确计数所需的 dict 内存
+    - us/order: 每次 record 的耗时
+对每种目录大小扫描 sketch 宽度, 体现精度与内存的取舍
+
+用法: PYTHONPATH=. python benchmarks/topn_bench.py [--orders 200000] [--catalogs 10000 100000 1000000]
+          [--widths 256 1024 4096] [--depth 4] [--top 10] [--skew 1.1]
+"""
+
+import argparse
+import bisect
+import collections
+import itertools
+import random
+import sys
+import time
+
+from common.topn import TopSellers
+
+
+def zipf_stream(catalog, orders, skew, seed=1):
+    """Zipf 分布的下单流, 每单 1-3 件"""
+    rng = random.Random(seed)
+    weights = itertools.accumulate(1.0 / (rank ** skew) for rank in range(1, catalog + 1))
+    cumulative = list(weights)
+    total = cumulative[-1]
+    # SKU 编号打乱, 避免排名与键的顺序相关
+    labels = list(range(catalog))
+    rng.shuffle(labels)
+    return [(("bench", f"sku{labels[bisect.bisect(cumulative, rng.random() * total)]}"), rng.randint(1, 3))
+            for _ in range(orders)]
+
+
+def dict_bytes(counter):
+    """精确计数的近似内存: dict 本身 + 键字符串 + 计数整数"""
+    return (sys.getsizeof(counter) + sum(sys.getsizeof(key) for key in counter)
+            + sum(sys.getsizeof(count) for count in counter.values()))
+
+
+def run(stream, width, depth, top):
+    # 窗口足够长, 只测精度不测滑动
+    sellers = TopSellers(size=top, width=width, depth=depth, window=10 ** 9, slices=1)
+    started = time.perf_counter()
+    for path, quantity in stream:
+        sellers.record(path, quantity)
+    elapsed = time.perf_counter() - started
+    return sellers, elapsed / len(stream) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TopSellers accuracy versus memory")
+    parser.add_argument("--orders", type=int, default=200000)
+    parser.add_argument("--catalogs", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--widths", type=int, nargs="+", default=[256, 1024, 4096])
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--skew", type=float, default=1.1)
+    args = parser.parse_args()
+
+    print(f"{'catalog':>8} {'width':>6} {'sketch KB':>10} {'exact KB':>9} {'recall':>7} "
+          f"{'max err %':>10} {'mean err %':>11} {'bound %':>8} {'us/order':>9}")
+    for catalog in args.catalogs:
+        stream = zipf_stream(catalog, args.orders, args.skew)
+        exact = collections.Counter()
+        for path, quantity in stream:
+            exact["/".join(path)] += quantity
+        total = sum(exact.values())
+        truth = {key for key, _ in exact.most_common(args.top)}
+        for width in args.widths:
+            sellers, us = run(stream, width, args.depth, args.top)
+            reported = sellers.top("bench")
+            recall = len(truth & {key for key, _ in reported}) / len(truth)
+            errors = [(units - exact[key]) / total * 100 for key, units in reported]
+            print(f"{catalog:>8} {sellers.sketch.width:>6} {sellers.stats()['memory_bytes'] / 1024:>10.0f} "
+                  f"{dict_bytes(exact) / 1024:>9.0f} {recall:>7.2f} {max(errors):>10.3f} "
+                  f"{sum(errors) / len(errors):>11.3f} {sellers.error_bound() / total * 100:>8.3f} {us:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
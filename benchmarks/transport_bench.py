@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+层间传输: TCP 回环与 Unix 域套接字 (common/transport.py) 的对比
+所有服务以独立进程运行 (日志输出到 /dev/null), 客户端在本进程中逐个同步调用:
+    - 单跳: 一个 FreshService 同时监听 TCP 端口与 Unix 域套接字, 两条通道交替按块调用
+      ReplicaStatus (几乎没有处理逻辑, 只剩传输开销) 与 PlaceOrder
+    - 整条链路: 两套 FreshService → FoodService → API Gateway, 一套层间走 TCP, 一套走 Unix 域套接字
+      (客户端到网关也分别走 TCP / 套接字, 共三跳), 交替按块经网关 PlaceOrder
+    - 并发: --threads 个线程经单跳通道调用 ReplicaStatus 的吞吐
+两种传输交替测量, 机器负载的波动对两者的影响相同
+
+用法: PYTHONPATH=. python benchmarks/transport_bench.py [--calls 20000] [--block 500] [--threads 8] [--port 50160]
+"""
+
+import argparse
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import grpc
+
+import warehouse_pb2
+import warehouse_pb2_grpc
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def _start(script, port, env):
+    env = dict(os.environ, PYTHONPATH=os.getcwd(), SERVICE_PORT=str(port), **env)
+    return subprocess.Popen([sys.executable, script], env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _stub(address):
+    channel = grpc.insecure_channel(address)
+    grpc.channel_ready_future(channel).result(timeout=30)
+    return warehouse_pb2_grpc.OrderServiceStub(channel)
+
+
+def _chain(port, socket_dir):
+    """启动 FreshService → FoodService → API Gateway; socket_dir 非空时层间走 Unix 域套接字, 返回 (进程, 网关地址)"""
+    def socket(name):
+        return f"unix:{os.path.join(socket_dir, name)}.sock" if socket_dir else ""
+
+    def address(name, offset):
+        return socket(name) or f"localhost:{port + offset}"
+
+    processes = [
+        _start("services/fresh_service.py", port, {"SERVICE_SOCKET": socket("fresh")}),
+        _start("services/food_service.py", port + 1, {"SERVICE_SOCKET": socket("food"),
+                                                      "FRESH_SERVICE_ADDR": address("fresh", 0)}),
+        _start("api_gateway.py", port + 2, {"SERVICE_SOCKET": socket("gateway"),
+                                            "FOOD_SERVICE_ADDR": address("food", 1)}),
+    ]
+    return processes, address("gateway", 2)
+
+
+def _alternate(calls, block, targets):
+    """targets: {名称: 单次调用}; 交替按块调用, 返回 {名称: [延迟秒]}"""
+    latencies = {name: [] for name in targets}
+    for _ in range(max(1, calls // block)):
+        for name, call in targets.items():
+            values = latencies[name]
+            for _ in range(block):
+                started = time.perf_counter()
+                call()
+                values.append(time.perf_counter() - started)
+    return latencies
+
+
+def _throughput(call, threads, seconds):
+    stop = threading.Event()
+    counts = [0] * threads
+
+    def worker(index):
+        while not stop.is_set():
+            call()
+            counts[index] += 1
+
+    workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+    for worker_thread in workers:
+        worker_thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker_thread in workers:
+        worker_thread.join()
+    return sum(counts) / seconds
+
+
+def _report(label, latencies, hops=1):
+    tcp, uds = latencies["tcp"], latencies["unix"]
+    for name, values in (("tcp", tcp), ("unix", uds)):
+        print(f"{label:<24} {name:<5} {_percentile(values, 0.5) * 1e6:>9.1f} {_percentile(values, 0.99) * 1e6:>9.1f} "
+              f"{sum(values) / len(values) * 1e6:>9.1f}")
+    saved = (_percentile(tcp, 0.5) - _percentile(uds, 0.5)) * 1e6
+    print(f"{'':<24} saved {saved:>9.1f} us p50 ({saved / hops:.1f} us per hop, "
+          f"{saved / (_percentile(tcp, 0.5) * 1e6):.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TCP loopback vs Unix domain socket per hop")
+    parser.add_argument("--calls", type=int, default=20000, help="calls per transport and case")
+    parser.add_argument("--block", type=int, default=500, help="calls per block before switching transport")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each throughput run")
+    parser.add_argument("--port", type=int, default=50160, help="first of the 6 TCP ports used")
+    args = parser.parse_args()
+
+    socket_dir = tempfile.mkdtemp(prefix="warehouse-sockets-")
+    processes = []
+    try:
+        tcp_chain, tcp_gateway = _chain(args.port, "")
+        unix_chain, unix_gateway = _chain(args.port + 3, socket_dir)
+        processes = tcp_chain + unix_chain
+        # 单跳: unix 链路中的 FreshService 同时监听 TCP 端口与套接字
+        fresh = {"tcp": _stub(f"localhost:{args.port + 3}"),
+                 "unix": _stub(f"unix:{os.path.join(socket_dir, 'fresh')}.sock")}
+        gateway = {"tcp": _stub(tcp_gateway), "unix": _stub(unix_gateway)}
+        for stub in gateway.values():
+            response = stub.PutItem(warehouse_pb2.PutItemRequest(category="fruits", subcategory="apple",
+                                                                 quantity=1_000_000_000))
+            assert response.success, response
+        status = warehouse_pb2.ReplicaStatusRequest()
+        order = warehouse_pb2.OrderRequest(category="fruits", subcategory="apple", quantity=1)
+        # 预热
+        _alternate(1000, 500, {name: (lambda stub=stub: stub.ReplicaStatus(status)) for name, stub in fresh.items()})
+        _alternate(200, 100, {name: (lambda stub=stub: stub.PlaceOrder(order)) for name, stub in gateway.items()})
+
+        print(f"{args.calls} sequential calls per transport, alternating blocks of {args.block}")
+        print(f"{'case':<24} {'':<5} {'p50 us':>9} {'p99 us':>9} {'mean us':>9}")
+        _report("1 hop ReplicaStatus", _alternate(args.calls, args.block, {
+            name: (lambda stub=stub: stub.ReplicaStatus(status)) for name, stub in fresh.items()}))
+        _report("1 hop PlaceOrder", _alternate(args.calls, args.block, {
+            name: (lambda stub=stub: stub.PlaceOrder(order)) for name, stub in fresh.items()}))
+        _report("3 hops PlaceOrder", _alternate(args.calls // 4, args.block // 4 or 1, {
+            name: (lambda stub=stub: stub.PlaceOrder(order)) for name, stub in gateway.items()}), hops=3)
+
+        rates = {name: _throughput(lambda stub=stub: stub.ReplicaStatus(status), args.threads, args.seconds)
+                 for name, stub in fresh.items()}
+        print(f"1 hop ReplicaStatus, {args.threads} threads: tcp {rates['tcp']:,.0f}/s, unix {rates['unix']:,.0f}/s "
+              f"({rates['unix'] / rates['tcp'] - 1:+.0%})")
+    finally:
+        for process in processes:
+            process.send_signal(signal.SIGINT)
+        for process in processes:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        shutil.rmtree(socket_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+"""
+公共组件
+各层服务共用的基础设施 (管理接口、拦截器等)
+"""
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+AdminService - 管理接口
+挂载在每个服务进程上, 提供在线性能分析、线程栈导出、内存快照与故障注入
+"""
+
+import grpc
+
+import warehouse_pb2
+import warehouse_pb2_grpc
+from common import faults, profiling
+from common.interceptors import wrap_handler
+
+
+class ProfilingInterceptor(grpc.ServerInterceptor):
+    """
+    cProfile 拦截器
+    cProfile 会话运行时, 在工作线程上对每个 RPC 开启分析; 未运行时直接放行
+    """
+
+    def __init__(self, controller):
+        self.controller = controller
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        session = self.controller.cprofile_session
+        if session is None or handler_call_details.method.startswith('/warehouse.AdminService/'):
+            return handler
+
+        def decorator(behavior, response_streaming):
+            if not response_streaming:
+                return lambda request, context: session.call(behavior, request, context)
+
+            def streaming(request, context):
+                iterator = session.call(behavior, request, context)
+                while True:
+                    try:
+                        yield session.call(next, iterator)
+                    except StopIteration:
+                        return
+            return streaming
+
+        return wrap_handler(handler, decorator)
+
+
+class AdminService(warehouse_pb2_grpc.AdminServiceServicer):
+    """
+    AdminService - 管理服务
+    不重启进程即可查看服务内部状态
+    """
+
+    def __init__(self, service_name):
+        """Initialize AdminService"""
+        self.service_name = service_name
+        self.profiler = profiling.ProfilerController()
+        self.interceptor = ProfilingInterceptor(self.profiler)
+        # 故障注入拦截器装在拦截器列表的最后 (紧挨处理函数)
+        self.faults = faults.FaultInjector.from_env()
+        self.fault_interceptor = faults.FaultInterceptor(self.faults)
+        self._metric_providers = {"faults": self.faults.stats}
+        if self.faults.spec:
+            print(f"💥 Fault injection enabled for {service_name}: {self.faults.spec}")
+        print(f"🛠️ AdminService initialized for {service_name}")
+    
+    def register_metrics(self, name, provider):
+        """注册指标来源, provider() 返回 {指标名: 数值}, 对外以 name.指标名 暴露"""
+        self._metric_providers[name] = provider
+
+    def StartProfiler(self, request, context):
+        """启动性能分析"""
+        mode = request.mode or "sampling"
+        interval = (request.interval_ms or 5) / 1000.0
+        print(f"🛠️ [RECEIVED] {self.service_name} Admin - StartProfiler: mode={mode}, "
+              f"duration={request.duration_seconds}s, interval={interval * 1000:.0f}ms")
+        try:
+            self.profiler.start(mode, duration=request.duration_seconds, interval=interval)
+            return warehouse_pb2.StartProfilerResponse(success=True, message=f"{mode} profiler started")
+        except (RuntimeError, ValueError) as e:
+            print(f"❌ [ERROR] {self.service_name} Admin StartProfiler error: {e}")
+            return warehouse_pb2.StartProfilerResponse(success=False, message=str(e))
+
+    def StopProfiler(self, request, context):
+        """停止性能分析并返回结果"""
+        print(f"🛠️ [RECEIVED] {self.service_name} Admin - StopProfiler")
+        try:
+            output = self.profiler.stop()
+        except RuntimeError as e:
+            print(f"❌ [ERROR] {self.service_name} Admin StopProfiler error: {e}")
+            return warehouse_pb2.ProfileResult(success=False, message=str(e))
+        print(f"   📤 {output.mode}: {output.samples} samples in {output.duration:.1f}s, {len(output.data)} bytes")
+        return warehouse_pb2.ProfileResult(
+            success=True,
+            message=f"{output.mode} profile collected",
+            mode=output.mode,
+            format=output.format,
+            data=output.data,
+            duration_seconds=output.duration,
+            samples=output.samples,
+        )
+
+    def DumpStacks(self, request, context):
+        """导出所有线程栈"""
+        print(f"🛠️ [RECEIVED] {self.service_name} Admin - DumpStacks")
+        count, stacks = profiling.dump_stacks()
+        return warehouse_pb2.DumpStacksResponse(thread_count=count, stacks=stacks)
+
+    def TraceMalloc(self, request, context):
+        """启动/停止 tracemalloc 或拍摄快照"""
+        action = request.action or "snapshot"
+        print(f"🛠️ [RECEIVED] {self.service_name} Admin - TraceMalloc: action={action}")
+        try:
+            if action == "start":
+                started = profiling.tracemalloc_start(request.nframes or 25)
+                message = "tracemalloc started" if started else "tracemalloc already tracing"
+                return warehouse_pb2.TraceMallocResponse(success=True, message=message)
+            if action == "stop":
+                stopped = profiling.tracemalloc_stop()
+                message = "tracemalloc stopped" if stopped else "tracemalloc was not tracing"
+                return warehouse_pb2.TraceMallocResponse(success=True, message=message)
+            if action == "snapshot":
+                top_stats, snapshot, current, peak = profiling.tracemalloc_snapshot(request.top or 20)
+                return warehouse_pb2.TraceMallocResponse(
+                    success=True,
+                    message="snapshot taken",
+                    top_stats=top_stats,
+                    snapshot=snapshot,
+                    current_bytes=current,
+                    peak_bytes=peak,
+                )
+            return warehouse_pb2.TraceMallocResponse(success=False, message=f"unknown action: {action}")
+        except RuntimeError as e:
+            print(f"❌ [ERROR] {self.service_name} Admin TraceMalloc error: {e}")
+            return warehouse_pb2.TraceMallocResponse(success=False, message=str(e))
+
+    def GetMetrics(self, request, context):
+        """汇总所有已注册的运行指标"""
+        values = {}
+        for name, provider in self._metric_providers.items():
+            for metric, value in provider().items():
+                key = f"{name}.{metric}"
+                if key.startswith(request.prefix):
+                    values[key] = float(value)
+        return warehouse_pb2.MetricsResponse(values=values)
+
+    def Faults(self, request, context):
+        """设置、清除或查看故障注入规则"""
+        action = request.action or "show"
+        print(f"🛠️ [RECEIVED] {self.service_name} Admin - Faults: action={action} {request.spec}")
+        if action == "show":
+            return warehouse_pb2.FaultsResponse(success=True, message="current faults", spec=self.faults.spec)
+        if action not in ("set", "clear"):
+            return warehouse_pb2.FaultsResponse(success=False, message=f"unknown action: {action}",
+                                                spec=self.faults.spec)
+        try:
+            self.faults.set(request.spec if action == "set" else "", request.seed or None)
+        except ValueError as e:
+            print(f"❌ [ERROR] {self.service_name} Admin Faults error: {e}")
+            return warehouse_pb2.FaultsResponse(success=False, message=str(e), spec=self.faults.spec)
+        message = f"faults set: {self.faults.spec}" if self.faults.spec else "faults cleared"
+        print(f"💥 {self.service_name} {message}")
+        return warehouse_pb2.FaultsResponse(success=True, message=message, spec=self.faults.spec)
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+网关准入控制
+每个 (客户端, 方法) 一个令牌桶; 客户端取自请求元数据 (默认 x-client-id), 没有时退回对端地址 (去掉端口)。
+超限的调用在拦截器里直接以 RESOURCE_EXHAUSTED 拒绝, 不进入处理函数, 也不产生下游调用。
+令牌桶表有上限, 按最近使用淘汰 (被淘汰的客户端下次以满桶重新开始)
+"""
+
+import collections
+import threading
+import time
+
+import grpc
+
+from common.config import env_int, env_float, env_str
+from common.interceptors import method_name, wrap_handler
+
+
+def parse_rates(spec):
+    """
+    'PlaceOrder=50:100,ImportStock=1' -> {'PlaceOrder': (50.0, 100.0), 'ImportStock': (1.0, 1.0)}
+    每项为 方法=每秒令牌数[:桶容量], 省略容量时等于速率 (至少为 1)
+    """
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        method, _, value = item.partition("=")
+        rate, _, burst = value.partition(":")
+        rate = float(rate)
+        rates[method.strip()] = (rate, float(burst) if burst else max(rate, 1.0))
+    return rates
+
+
+class AdmissionController:
+    """
+    令牌桶表
+    rates: {方法名: (每秒令牌数, 桶容量)}, 未列出的方法使用 default; 速率为 0 表示不限制
+    """
+
+    def __init__(self, default=(0.0, 0.0), rates=None, max_clients=10000,
+                 client_header="x-client-id", clock=time.monotonic):
+        self.default = default
+        self.rates = dict(rates or {})
+        self.max_clients = max_clients
+        self.client_header = client_header
+        self.clock = clock
+        # (client, method) -> [tokens, last_refill]
+        self._buckets = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.rejected = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        按环境变量创建:
+            ADMISSION_DEFAULT_RATE / ADMISSION_DEFAULT_BURST  未单独配置的方法 (默认 0, 不限制)
+            ADMISSION_RATES        方法=速率[:容量], 逗号分隔
+            ADMISSION_MAX_CLIENTS  令牌桶表上限 (默认 10000)
+            ADMISSION_CLIENT_HEADER 客户端标识所在的元数据键 (默认 x-client-id)
+        """
+        rate = env_float("ADMISSION_DEFAULT_RATE", 0.0)
+        return cls(
+            default=(rate, env_float("ADMISSION_DEFAULT_BURST", max(rate, 1.0))),
+            rates=parse_rates(env_str("ADMISSION_RATES")),
+            max_clients=env_int("ADMISSION_MAX_CLIENTS", 10000),
+            client_header=env_str("ADMISSION_CLIENT_HEADER", "x-client-id"),
+        )
+
+    def limit(self, method):
+        """方法的 (速率, 容量); 速率为 0 时不限制"""
+        return self.rates.get(method, self.default)
+
+    def client_from_metadata(self, metadata):
+        for key, value in metadata or ():
+            if key == self.client_header:
+                return value
+        return None
+
+    def try_acquire(self, client, method):
+        """消耗一个令牌; 桶为空时返回 False"""
+        rate, burst = self.limit(method)
+        if rate <= 0:
+            return True
+        key = (client, method)
+        now = self.clock()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [burst, now]
+                if len(self._buckets) > self.max_clients:
+                    self._buckets.popitem(last=False)
+                    self.evicted += 1
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+                bucket[1] = now
+            if bucket[0] < 1:
+                self.rejected += 1
+                return False
+            bucket[0] -= 1
+            self.admitted += 1
+            return True
+
+    def stats(self):
+        """准入指标"""
+        return {
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "buckets": len(self._buckets),
+            "evicted": self.evicted,
+        }
+
+
+def _peer_host(peer):
+    """'ipv4:10.0.0.5:51234' -> 'ipv4:10.0.0.5' (同一主机的不同连接共用一个桶)"""
+    host, separator, port = peer.rpartition(":")
+    return host if separator and port.isdigit() else peer
+
+
+class AdmissionInterceptor(grpc.ServerInterceptor):
+    """
+    准入拦截器, 放在网关拦截器链的最前面
+    元数据中带客户端标识时在拦截器内直接判定; 否则包装处理函数, 在取得对端地址后判定
+    """
+
+    def __init__(self, controller, exempt_prefixes=("/warehouse.AdminService/",)):
+        self.controller = controller
+        self.exempt_prefixes = tuple(exempt_prefixes)
+
+    def _reject(self, context, client, method):
+        context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f"rate limit exceeded for {client!r} on {method}")
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        full_method = handler_call_details.method
+        method = method_name(handler_call_details)
+        if handler is None or full_method.startswith(self.exempt_prefixes) or self.controller.limit(method)[0] <= 0:
+            return handler
+
+        controller = self.controller
+        client = controller.client_from_metadata(handler_call_details.invocation_metadata)
+        if client is not None:
+            if controller.try_acquire(client, method):
+                return handler
+
+            def decorator(behavior, response_streaming):
+                if not response_streaming:
+                    return lambda request, context: self._reject(context, client, method)
+
+                def rejected(request, context):
+                    self._reject(context, client, method)
+                    yield
+                return rejected
+            return wrap_handler(handler, decorator)
+
+        def decorator(behavior, response_streaming):
+            def check(context):
+                peer = _peer_host(context.peer())
+                if not controller.try_acquire(peer, method):
+                    self._reject(context, peer, method)
+
+            if not response_streaming:
+                def admitted(request, context):
+                    check(context)
+                    return behavior(request, context)
+                return admitted
+
+            def admitted_stream(request, context):
+                check(context)
+                yield from behavior(request, context)
+            return admitted_stream
+
+        return wrap_handler(handler, decorator)
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+库存列式导出格式
+输出标准的 NumPy .npz 文件 (zip 中的多个 .npy 数组), 写入端不依赖 NumPy:
+
+    categories / subcategories / items       字典 (Unicode 字符串数组)
+    category_codes / subcategory_codes / item_codes   int32, 指向字典的下标
+    counts                                   int64 库存数量
+    service / exported_at                    元数据 (0 维数组)
+
+分析端读取:
+    data = numpy.load("fresh_inventory.npz")
+    data["categories"][data["category_codes"]]   # 每行的类别
+"""
+
+import io
+import sys
+import time
+import zipfile
+from array import array
+
+
+EXPORT_FORMAT = "npz"
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+def _npy_bytes(descr, shape, payload):
+    """按 .npy 1.0 格式拼接头部与数据"""
+    shape_repr = "(" + "".join(f"{n}," for n in shape) + ")"
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape_repr}, }}"
+    # 魔数(6) + 版本(2) + 头长度(2) + 头部, 总长度按 64 字节对齐并以换行结尾
+    padding = 64 - (10 + len(header) + 1) % 64
+    header = header + " " * padding + "\n"
+    return b"\x93NUMPY\x01\x00" + len(header).to_bytes(2, "little") + header.encode("latin1") + payload
+
+
+def _int_array_npy(values):
+    """array('i') / array('q') -> .npy (小端)"""
+    descr = "<i4" if values.typecode == "i" else "<i8"
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return _npy_bytes(descr, (len(values),), values.tobytes())
+
+
+def _str_array_npy(strings, shape=None):
+    """字符串列表 -> 定长 UTF-32 数组 (NumPy 的 <U 类型)"""
+    width = max([len(s) for s in strings] + [1])
+    payload = b"".join(s.encode("utf-32-le").ljust(width * 4, b"\0") for s in strings)
+    return _npy_bytes(f"<U{width}", (len(strings),) if shape is None else shape, payload)
+
+
+class _Dictionary:
+    """字典编码: 字符串 -> 连续的整数编码"""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def encode_npz(entries, service):
+    """
+    将 (path, count) 序列编码为 .npz 字节
+
+    Returns:
+        (npz 字节, 条目数)
+    """
+    categories, subcategories, items = _Dictionary(), _Dictionary(), _Dictionary()
+    category_codes, subcategory_codes, item_codes = array("i"), array("i"), array("i")
+    counts = array("q")
+    for path, count in entries:
+        category_codes.append(categories.encode(path[0]))
+        subcategory_codes.append(subcategories.encode(path[1] if len(path) > 1 else ""))
+        item_codes.append(items.encode(path[2] if len(path) > 2 else ""))
+        counts.append(count)
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as archive:
+        archive.writestr("categories.npy", _str_array_npy(categories.values))
+        archive.writestr("subcategories.npy", _str_array_npy(subcategories.values))
+        archive.writestr("items.npy", _str_array_npy(items.values))
+        archive.writestr("category_codes.npy", _int_array_npy(category_codes))
+        archive.writestr("subcategory_codes.npy", _int_array_npy(subcategory_codes))
+        archive.writestr("item_codes.npy", _int_array_npy(item_codes))
+        archive.writestr("counts.npy", _int_array_npy(counts))
+        archive.writestr("service.npy", _str_array_npy([service], shape=()))
+        archive.writestr("exported_at.npy", _npy_bytes("<f8", (), array("d", [time.time()]).tobytes()))
+    return buffer.getvalue(), len(counts)
+
+
+def iter_byte_chunks(data, chunk_bytes=STREAM_CHUNK_BYTES):
+    """把字节切成固定大小的块用于流式传输"""
+    view = memoryview(data)
+    for offset in range(0, len(data), chunk_bytes):
+        yield offset, bytes(view[offset:offset + chunk_bytes])
+
+
+def load_npz(path):
+    """读取导出文件 (需要 NumPy), 返回 {列名: ndarray}"""
+    import numpy
+    with numpy.load(path) as data:
+        return {name: data[name] for name in data.files}
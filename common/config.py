@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+环境变量配置
+服务的可调参数通过环境变量覆盖 (docker-compose 的 environment 段), 未设置时使用默认值
+"""
+
+import os
+
+
+def env_str(name, default=""):
+    """读取字符串配置"""
+    value = os.environ.get(name)
+    return default if value is None or value == "" else value
+
+
+def env_int(name, default):
+    """读取整数配置"""
+    value = os.environ.get(name)
+    return default if value is None or value == "" else int(value)
+
+
+def env_float(name, default):
+    """读取浮点数配置"""
+    value = os.environ.get(name)
+    return default if value is None or value == "" else float(value)
+
+
+def env_bool(name, default=False):
+    """读取布尔配置 (1/true/yes/on 为真)"""
+    value = os.environ.get(name)
+    if value is None or value == "":
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
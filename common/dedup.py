@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+幂等去重缓存
+按 (方法名, 幂等键) 缓存变更类 RPC 的响应, 重试时直接返回首次执行的结果
+条目按写入顺序过期 (TTL 固定, 写入顺序即过期顺序), 同时受条目数与字节数上限约束
+"""
+
+import collections
+import threading
+import time
+
+from common.config import env_float, env_int
+
+
+# execute() 的结果类型
+MISS = "miss"           # 首次执行
+HIT = "hit"             # 重放, 返回缓存结果
+CONFLICT = "conflict"   # 同一个键对应了不同的请求内容
+
+# 每个条目除响应本身外的估算开销 (键、指纹、记录对象、字典槽位)
+_ENTRY_OVERHEAD = 200
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "response", "expires_at", "size")
+
+    def __init__(self, fingerprint, response, expires_at, size):
+        self.fingerprint = fingerprint
+        self.response = response
+        self.expires_at = expires_at
+        self.size = size
+
+
+class DedupCache:
+    """
+    有界、按 TTL 淘汰的幂等缓存
+    同一个键的并发请求只执行一次, 其余请求等待首个请求完成后返回相同结果
+    """
+
+    def __init__(self, max_entries=100000, max_bytes=32 * 1024 * 1024, ttl_seconds=600.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = collections.OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.conflicts = 0
+        self.inflight_waits = 0
+        self.expired = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_env(cls):
+        """按环境变量 DEDUP_MAX_ENTRIES / DEDUP_MAX_BYTES / DEDUP_TTL_SECONDS 创建"""
+        return cls(
+            max_entries=env_int("DEDUP_MAX_ENTRIES", 100000),
+            max_bytes=env_int("DEDUP_MAX_BYTES", 32 * 1024 * 1024),
+            ttl_seconds=env_float("DEDUP_TTL_SECONDS", 600.0),
+        )
+
+    def _expire(self, now):
+        entries = self._entries
+        while entries:
+            entry = next(iter(entries.values()))
+            if entry.expires_at > now:
+                break
+            entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.expired += 1
+
+    def _evict_to_limits(self):
+        entries = self._entries
+        while entries and (len(entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = entries.popitem(last=False)
+            self._bytes -= entry.size
+            self.evicted += 1
+
+    def execute(self, method, key, fingerprint, compute, cacheable=None):
+        """
+        执行或重放一次调用
+
+        Args:
+            method: RPC 方法名, 与 key 一起组成缓存键
+            key: 幂等键
+            fingerprint: 请求内容指纹, 用于发现键被复用于不同请求
+            compute: 无参函数, 实际执行并返回响应
+            cacheable: 可选, cacheable(response) 为 False 时不缓存 (例如内部错误)
+
+        Returns:
+            (response, MISS / HIT / CONFLICT), CONFLICT 时 response 为 None
+        """
+        cache_key = (method, key)
+        while True:
+            with self._lock:
+                self._expire(time.monotonic())
+                entry = self._entries.get(cache_key)
+                if entry is not None:
+                    if entry.fingerprint != fingerprint:
+                        self.conflicts += 1
+                        return None, CONFLICT
+                    self.hits += 1
+                    return entry.response, HIT
+                pending = self._inflight.get(cache_key)
+                if pending is None:
+                    pending = self._inflight[cache_key] = threading.Event()
+                    self.misses += 1
+                    break
+                self.inflight_waits += 1
+            # 同一个键正在执行, 等待其完成后重新查缓存
+            pending.wait()
+
+        # 未缓存 (异常或不可缓存) 时, 等待者被唤醒后会自己重新执行
+        try:
+            response = compute()
+            if cacheable is None or cacheable(response):
+                size = response.ByteSize() + len(key) + len(fingerprint) + _ENTRY_OVERHEAD
+                with self._lock:
+                    self._entries[cache_key] = _Entry(fingerprint, response,
+                                                      time.monotonic() + self.ttl_seconds, size)
+                    self._bytes += size
+                    self._evict_to_limits()
+            return response, MISS
+        finally:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+            pending.set()
+
+    def stats(self):
+        """缓存指标"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "conflicts": self.conflicts,
+                "inflight_waits": self.inflight_waits,
+                "expired": self.expired,
+                "evicted": self.evicted,
+            }
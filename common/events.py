@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+低库存事件管道
+变更类 RPC 只把一个小元组放入无界 SimpleQueue (不阻塞、不做 I/O),
+后台消费线程负责去重、攒批并写入本地接收端 (JSONL 文件或 Unix 数据报套接字)
+"""
+
+import collections
+import json
+import queue
+import socket
+import threading
+import time
+
+from common.config import env_float, env_int, env_str
+
+
+LOW_STOCK = "low_stock"     # 库存从阈值以上降到阈值以下
+DEPLETED = "depleted"       # UpdateItem 将数量设为 0, 子类别被删除
+
+_STOP = object()
+
+
+class Thresholds:
+    """
+    每个 SKU 的补货阈值, 未配置的 SKU 使用默认值
+    配置文件格式: {"default": 5, "skus": {"fruits/apple": 20}}
+    """
+
+    def __init__(self, default=5, skus=None):
+        self.default = default
+        self.skus = {key.lower(): value for key, value in (skus or {}).items()}
+
+    @classmethod
+    def from_env(cls):
+        """按环境变量 LOW_STOCK_DEFAULT / LOW_STOCK_THRESHOLDS_FILE 创建"""
+        default = env_int("LOW_STOCK_DEFAULT", 5)
+        path = env_str("LOW_STOCK_THRESHOLDS_FILE")
+        if not path:
+            return cls(default)
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        return cls(config.get("default", default), config.get("skus", {}))
+
+    def get(self, key):
+        return self.skus.get(key, self.default)
+
+
+class FileSink:
+    """追加写入 JSONL 文件, 每批一次 write + flush"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, events):
+        self._file.write("".join(json.dumps(event) + "\n" for event in events))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class UnixSocketSink:
+    """每个事件发送一个 Unix 数据报 (本机消息总线的替身), 无人监听时报错由管道计数"""
+
+    def __init__(self, path):
+        self.path = path
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+    def write(self, events):
+        for event in events:
+            self._socket.sendto(json.dumps(event).encode("utf-8"), self.path)
+
+    def close(self):
+        self._socket.close()
+
+
+def sink_from_env():
+    """
+    按环境变量 LOW_STOCK_SINK 创建接收端:
+    file:<path> (默认 file:low_stock_events.jsonl)、unix:<path> 或 none
+    """
+    spec = env_str("LOW_STOCK_SINK", "file:low_stock_events.jsonl")
+    kind, _, target = spec.partition(":")
+    if kind == "none":
+        return None
+    if kind == "file":
+        return FileSink(target)
+    if kind == "unix":
+        return UnixSocketSink(target)
+    raise ValueError(f"unknown LOW_STOCK_SINK: {spec!r}")
+
+
+class EventPipeline:
+    """
+    低库存事件管道
+    stock_changed() 在请求线程上调用, 只做阈值比较和入队;
+    消费线程按 batch_size / flush_seconds 攒批, 同一批内同一 (事件, SKU) 只保留最新一条,
+    并在 dedup_seconds 内抑制重复事件 (库存在阈值附近反复波动时)
+    """
+
+    def __init__(self, service, sink, thresholds=None, batch_size=256,
+                 flush_seconds=0.5, dedup_seconds=60.0, max_recent=100000):
+        self.service = service
+        self.sink = sink
+        self.thresholds = thresholds or Thresholds()
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.dedup_seconds = dedup_seconds
+        self.max_recent = max_recent
+        self._queue = queue.SimpleQueue()
+        self._recent = collections.OrderedDict()
+        self.enqueued = 0
+        self.delivered = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.sink_errors = 0
+        self._thread = None
+        if sink is not None:
+            self._thread = threading.Thread(target=self._run, name=f"{service}-events", daemon=True)
+            self._thread.start()
+
+    @classmethod
+    def from_env(cls, service):
+        """按环境变量 LOW_STOCK_* 创建"""
+        return cls(
+            service,
+            sink_from_env(),
+            Thresholds.from_env(),
+            batch_size=env_int("LOW_STOCK_BATCH_SIZE", 256),
+            flush_seconds=env_float("LOW_STOCK_FLUSH_SECONDS", 0.5),
+            dedup_seconds=env_float("LOW_STOCK_DEDUP_SECONDS", 60.0),
+        )
+
+    def stock_changed(self, path, old_count, new_count, deleted=False):
+        """库存变化后调用; 跨过阈值或被删除时入队一个事件"""
+        if self._thread is None:
+            return
+        key = "/".join(path)
+        if deleted:
+            self._queue.put((DEPLETED, key, 0, 0, time.time()))
+        else:
+            threshold = self.thresholds.get(key)
+            if not new_count < threshold <= old_count:
+                return
+            self._queue.put((LOW_STOCK, key, new_count, threshold, time.time()))
+        self.enqueued += 1
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch = [first]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                batch.append(event)
+            self._deliver(batch)
+
+    def _deliver(self, batch):
+        """去重后写入接收端 (仅在消费线程上运行)"""
+        latest = {}
+        for event in batch:
+            latest[event[:2]] = event
+        self.deduplicated += len(batch) - len(latest)
+
+        now = time.time()
+        while self._recent and (len(self._recent) > self.max_recent
+                                or next(iter(self._recent.values())) < now - self.dedup_seconds):
+            self._recent.popitem(last=False)
+        events = []
+        for ident, (kind, key, count, threshold, timestamp) in latest.items():
+            if ident in self._recent:
+                self.deduplicated += 1
+                continue
+            self._recent[ident] = now
+            events.append({
+                "event": kind,
+                "service": self.service,
+                "sku": key,
+                "count": count,
+                "threshold": threshold,
+                "timestamp": timestamp,
+            })
+        if not events:
+            return
+        try:
+            self.sink.write(events)
+        except OSError as e:
+            self.sink_errors += 1
+            print(f"❌ [ERROR] {self.service} low-stock sink error: {e}")
+            return
+        self.batches += 1
+        self.delivered += len(events)
+
+    def close(self, timeout=5.0):
+        """发送剩余事件并关闭接收端"""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._thread = None
+        self.sink.close()
+
+    def stats(self):
+        """事件管道指标"""
+        return {
+            "enqueued": self.enqueued,
+            "queue_depth": self._queue.qsize(),
+            "delivered": self.delivered,
+            "deduplicated": self.deduplicated,
+            "batches": self.batches,
+            "sink_errors": self.sink_errors,
+        }
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+中层服务的主备切换
+配置了热备 (common/replication.py) 时, FailoverStub 代替指向底层服务的 OrderServiceStub, 平时把调用发给主机:
+    - 后台线程每 FAILOVER_PROBE_INTERVAL_SECONDS 以 ReplicaStatus 探测主机, 连续 FAILOVER_PROBE_FAILURES 次
+      连接失败或超过 FAILOVER_PROBE_TIMEOUT_SECONDS 即切换 (主机挂起时的检测时间上限)
+    - 请求收到 UNAVAILABLE (主机进程退出, 连接被拒) 时立即补一次探测, 失败则当场切换, 不等下一个探测周期
+切换时先对备机调用 Promote, 成功后所有调用改发备机; 切换期间到达的请求等待切换完成
+一元调用在切换后对备机重试一次: 切换时关闭主机的连接, 发往已挂起主机的请求不等它自行超时, 立即结束并重试。
+主机在执行后、回复前宕机且该变更已复制时, 重试会让订单在备机上再执行一次 (benchmarks/failover_bench.py 统计)
+流式调用不重试, 由调用方按原有的 UNAVAILABLE 处理。切换是单向的, 原主机恢复后不会切回
+"""
+
+import threading
+import time
+
+import grpc
+
+import warehouse_pb2
+import warehouse_pb2_grpc
+from common.config import env_float, env_int
+
+
+# 探测失败的状态码; RESOURCE_EXHAUSTED 等说明主机仍在响应
+_DOWN_CODES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+
+_UNARY_METHODS = frozenset(
+    method.name
+    for method in warehouse_pb2.DESCRIPTOR.services_by_name["OrderService"].methods
+    if not method.client_streaming and not method.server_streaming)
+
+
+class FailoverStub:
+    """主备两个 OrderServiceStub, 按方法名转发给当前的主机"""
+
+    def __init__(self, name, primary_channel, standby_channel, probe_interval=0.2, probe_timeout=0.5,
+                 probe_failures=3, promote_timeout=5.0):
+        self.name = name
+        self.probe_interval = probe_interval
+        self.probe_timeout = probe_timeout
+        self.probe_failures = probe_failures
+        self.promote_timeout = promote_timeout
+        self._primary_channel = primary_channel
+        self._primary = warehouse_pb2_grpc.OrderServiceStub(primary_channel)
+        self._standby = warehouse_pb2_grpc.OrderServiceStub(standby_channel)
+        self.active = self._primary
+        self._lock = threading.Lock()
+        self.probes = 0
+        self.failed_probes = 0
+        self.failovers = 0
+        self.failover_ms = 0.0
+        # 切换完成的时刻 (time.perf_counter)
+        self.failed_over_at = None
+        self.promote_failures = 0
+        self.retried = 0
+        self._stop = threading.Event()
+        self._prober = threading.Thread(target=self._probe_loop, name=f"{name}-failover", daemon=True)
+        self._prober.start()
+
+    @classmethod
+    def from_env(cls, name, primary_channel, standby_channel):
+        """
+        按环境变量创建:
+            FAILOVER_PROBE_INTERVAL_SECONDS  探测主机的间隔 (默认 0.2 秒)
+            FAILOVER_PROBE_TIMEOUT_SECONDS   单次探测的超时 (默认 0.5 秒)
+            FAILOVER_PROBE_FAILURES          连续失败多少次后切换 (默认 3)
+        """
+        return cls(name, primary_channel, standby_channel,
+                   env_float("FAILOVER_PROBE_INTERVAL_SECONDS", 0.2),
+                   env_float("FAILOVER_PROBE_TIMEOUT_SECONDS", 0.5),
+                   env_int("FAILOVER_PROBE_FAILURES", 3))
+
+    def __getattr__(self, method):
+        if method.startswith("_"):
+            raise AttributeError(method)
+        if method not in _UNARY_METHODS:
+            return lambda *args, **kwargs: getattr(self.active, method)(*args, **kwargs)
+        return lambda request, **kwargs: self._call(method, request, kwargs)
+
+    def _call(self, method, request, kwargs):
+        stub = self.active
+        try:
+            return getattr(stub, method)(request, **kwargs)
+        except (grpc.RpcError, ValueError) as e:
+            # 切换时关闭了主机的连接: 进行中的请求以 CANCELLED 结束, 之后才发出的调用抛出 ValueError
+            if stub is not self._primary:
+                raise
+            if self.active is stub and not (isinstance(e, grpc.RpcError) and e.code() == grpc.StatusCode.UNAVAILABLE
+                                            and self.fail_over(f"{method}: {e.details()}", confirm=True)):
+                raise
+        self.retried += 1
+        return getattr(self.active, method)(request, **kwargs)
+
+    def _probe(self):
+        """探测主机, 返回是否存活"""
+        self.probes += 1
+        try:
+            self._primary.ReplicaStatus(warehouse_pb2.ReplicaStatusRequest(), timeout=self.probe_timeout)
+        except grpc.RpcError as e:
+            if e.code() in _DOWN_CODES:
+                self.failed_probes += 1
+                return False
+        except ValueError:
+            # 已切换, 主机的连接已关闭
+            return False
+        return True
+
+    def _probe_loop(self):
+        failures = 0
+        while not self._stop.wait(self.probe_interval) and self.active is self._primary:
+            if self._probe():
+                failures = 0
+                continue
+            failures += 1
+            if failures >= self.probe_failures:
+                self.fail_over(f"{failures} failed probes")
+
+    def fail_over(self, reason, confirm=False):
+        """
+        提升备机并改发备机; confirm 时先探测一次主机, 主机存活则不切换
+
+        Returns:
+            是否已切换到备机
+        """
+        with self._lock:
+            if self.active is self._standby:
+                return True
+            if confirm and self._probe():
+                return False
+            started = time.perf_counter()
+            try:
+                response = self._standby.Promote(warehouse_pb2.PromoteRequest(reason=reason),
+                                                 timeout=self.promote_timeout)
+            except grpc.RpcError as e:
+                self.promote_failures += 1
+                print(f"❌ [FAILOVER] {self.name} primary down ({reason}), standby promotion failed: {e.code().name}")
+                return False
+            if not response.success:
+                self.promote_failures += 1
+                print(f"❌ [FAILOVER] {self.name} primary down ({reason}), standby refused: {response.message}")
+                return False
+            self.active = self._standby
+            self.failovers += 1
+            self.failed_over_at = time.perf_counter()
+            self.failover_ms = (self.failed_over_at - started) * 1000
+            # 主机挂起时发往它的请求不会自行失败, 关闭连接让它们立即结束并改发备机
+            self._primary_channel.close()
+        print(f"🚨 [FAILOVER] {self.name} primary down ({reason}), promoted standby at seq {response.seq} "
+              f"in {self.failover_ms:.1f}ms")
+        return True
+
+    def close(self):
+        """停止探测线程"""
+        self._stop.set()
+        self._prober.join(self.probe_interval + self.probe_timeout + 1.0)
+
+    def stats(self):
+        """切换指标"""
+        return {
+            "on_standby": int(self.active is self._standby),
+            "failovers": self.failovers,
+            "failover_ms": self.failover_ms,
+            "probes": self.probes,
+            "failed_probes": self.failed_probes,
+            "promote_failures": self.promote_failures,
+            "retried": self.retried,
+        }
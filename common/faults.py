@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+故障与延迟注入
+FaultInterceptor 挂在每个服务上 (AdminService 提供, 与 ProfilingInterceptor 一起安装), 按方法名注入:
+    - delay: 按分布抽取的延迟 (处理函数执行前在工作线程上等待, 相当于变慢的处理函数, 占用线程与调度槽位)
+    - error: 以给定状态码结束调用, 不执行处理函数
+    - drop:  吞掉请求, 不执行也不回复, 直到客户端截止时间到达/调用被取消或等待上限, 然后以 UNAVAILABLE 结束
+      (调用方没有设置截止时间时, 它的线程会一直等待, 与对端失联时相同)
+规则在运行时通过 AdminService.Faults 设置或清除 (admin_client.py faults), 启动时可由 FAULTS 环境变量给出。
+没有规则时拦截器直接放行; AdminService 自身的方法不受影响, 以便随时清除规则
+"""
+
+import math
+import random
+import threading
+import time
+
+import grpc
+
+from common.config import env_float, env_int, env_str
+from common.interceptors import method_name, wrap_handler
+
+
+# 延迟分布: 名称 -> (参数个数, 抽样函数 (rng, *参数) -> 毫秒)
+_DISTRIBUTIONS = {
+    "fixed": (1, lambda rng, ms: ms),
+    "uniform": (2, lambda rng, low, high: rng.uniform(low, high)),
+    "exp": (1, lambda rng, mean: rng.expovariate(1.0 / mean) if mean > 0 else 0.0),
+    "normal": (2, lambda rng, mean, std: max(0.0, rng.gauss(mean, std))),
+    "lognormal": (2, lambda rng, median, sigma: rng.lognormvariate(math.log(median), sigma)),
+    "pareto": (2, lambda rng, scale, alpha: scale * rng.paretovariate(alpha)),
+}
+
+DELAY = "delay"
+ERROR = "error"
+DROP = "drop"
+
+
+class Fault:
+    """一条注入效果: 以概率 probability 生效"""
+
+    def __init__(self, kind, probability=1.0, distribution=None, params=(), code=grpc.StatusCode.UNAVAILABLE,
+                 hold=None):
+        self.kind = kind
+        self.probability = probability
+        self.distribution = distribution
+        self.params = tuple(params)
+        self.code = code
+        # drop 的等待上限 (秒), None 时使用注入器的默认值
+        self.hold = hold
+
+    def delay_ms(self, rng):
+        return _DISTRIBUTIONS[self.distribution][1](rng, *self.params)
+
+
+def _parse_fault(text):
+    """'delay:lognormal:5:1@0.1' / 'error:UNAVAILABLE@0.01' / 'drop:2@0.001' -> Fault"""
+    body, _, probability = text.partition("@")
+    probability = float(probability) if probability else 1.0
+    if not 0.0 <= probability <= 1.0:
+        raise ValueError(f"probability out of range in {text!r}")
+    kind, *args = body.split(":")
+    if kind == DELAY:
+        if not args or args[0] not in _DISTRIBUTIONS:
+            raise ValueError(f"unknown delay distribution in {text!r}, expected one of {', '.join(_DISTRIBUTIONS)}")
+        count = _DISTRIBUTIONS[args[0]][0]
+        if len(args) != count + 1:
+            raise ValueError(f"delay:{args[0]} takes {count} parameter(s) in milliseconds: {text!r}")
+        return Fault(DELAY, probability, args[0], [float(arg) for arg in args[1:]])
+    if kind == ERROR:
+        name = args[0].upper() if args else "UNAVAILABLE"
+        code = getattr(grpc.StatusCode, name, None)
+        if len(args) > 1 or code is None or code == grpc.StatusCode.OK:
+            raise ValueError(f"unknown status code in {text!r}")
+        return Fault(ERROR, probability, code=code)
+    if kind == DROP:
+        if len(args) > 1:
+            raise ValueError(f"drop takes at most a hold time in seconds: {text!r}")
+        return Fault(DROP, probability, hold=float(args[0]) if args else None)
+    raise ValueError(f"unknown fault {kind!r} in {text!r}, expected delay / error / drop")
+
+
+def parse_faults(spec):
+    """
+    'PlaceOrder=delay:lognormal:5:1,error:UNAVAILABLE@0.01;*=delay:fixed:100@0.001'
+        -> {'PlaceOrder': [Fault, Fault], '*': [Fault]}
+    规则以分号分隔, 每条为 方法=效果[,效果...], * 匹配其他方法; 效果按顺序执行, 延迟累加,
+    第一个生效的 error / drop 结束调用。延迟参数的单位为毫秒, @概率 省略时为 1
+    """
+    rules = {}
+    for item in filter(None, (part.strip() for part in spec.split(";"))):
+        method, separator, effects = item.partition("=")
+        if not separator or not method.strip():
+            raise ValueError(f"expected method=fault[,fault...], got {item!r}")
+        rules[method.strip()] = [_parse_fault(effect.strip()) for effect in effects.split(",") if effect.strip()]
+    return rules
+
+
+class FaultInjector:
+    """按方法的注入规则与计数; set() 整体替换规则, 处理中的调用读到的是替换前或替换后的完整规则"""
+
+    def __init__(self, spec="", seed=None, drop_hold=30.0):
+        self.drop_hold = drop_hold
+        self.rng = random.Random(seed)
+        self.spec = ""
+        self.rules = {}
+        self._lock = threading.Lock()
+        # 被 drop 挂起的调用, 清除规则时放行
+        self._held = set()
+        self.calls = 0
+        self.delayed = 0
+        self.delay_ms = 0.0
+        self.errors = 0
+        self.drops = 0
+        self.set(spec)
+
+    @classmethod
+    def from_env(cls):
+        """
+        按环境变量创建:
+            FAULTS                  启动时的注入规则 (默认无)
+            FAULT_SEED              随机数种子 (默认不固定)
+            FAULT_DROP_HOLD_SECONDS drop 挂起调用的上限 (默认 30 秒)
+        """
+        seed = env_int("FAULT_SEED", -1)
+        return cls(env_str("FAULTS"), None if seed < 0 else seed, env_float("FAULT_DROP_HOLD_SECONDS", 30.0))
+
+    def set(self, spec, seed=None):
+        """替换注入规则 (为空时清除), 规则无效时抛出 ValueError 且保持原规则"""
+        rules = parse_faults(spec)
+        with self._lock:
+            if seed is not None:
+                self.rng.seed(seed)
+            self.rules = rules
+            self.spec = spec.strip()
+            if not rules:
+                for event in self._held:
+                    event.set()
+
+    def match(self, method):
+        """方法的效果列表, 没有规则时为 None"""
+        rules = self.rules
+        return rules.get(method, rules.get("*")) if rules else None
+
+    def inject(self, faults, context):
+        """在处理函数之前执行: 延迟, 或以 error / drop 结束调用"""
+        self.calls += 1
+        rng = self.rng
+        for fault in faults:
+            if fault.probability < 1.0 and rng.random() >= fault.probability:
+                continue
+            if fault.kind == DELAY:
+                delay = fault.delay_ms(rng)
+                self.delayed += 1
+                self.delay_ms += delay
+                time.sleep(delay / 1000.0)
+            elif fault.kind == ERROR:
+                self.errors += 1
+                context.abort(fault.code, "injected fault")
+            else:
+                self.drops += 1
+                self._hold(fault.hold or self.drop_hold, context)
+                context.abort(grpc.StatusCode.UNAVAILABLE, "injected drop")
+
+    def _hold(self, hold, context):
+        """等待到客户端截止时间、调用结束或规则被清除, 最多 hold 秒"""
+        remaining = context.time_remaining()
+        event = threading.Event()
+        context.add_callback(event.set)
+        with self._lock:
+            self._held.add(event)
+        try:
+            event.wait(hold if remaining is None else min(hold, remaining))
+        finally:
+            with self._lock:
+                self._held.discard(event)
+
+    def stats(self):
+        """注入指标"""
+        return {
+            "rules": len(self.rules),
+            "calls": self.calls,
+            "delayed": self.delayed,
+            "delay_ms": self.delay_ms,
+            "errors": self.errors,
+            "drops": self.drops,
+            "held": len(self._held),
+        }
+
+
+class FaultInterceptor(grpc.ServerInterceptor):
+    """按 FaultInjector 的规则在处理函数之前注入故障; 没有规则时直接放行"""
+
+    def __init__(self, injector):
+        self.injector = injector
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if handler is None or not self.injector.rules or handler_call_details.method.startswith(
+                "/warehouse.AdminService/"):
+            return handler
+        faults = self.injector.match(method_name(handler_call_details))
+        if not faults:
+            return handler
+        inject = self.injector.inject
+
+        def decorator(behavior, response_streaming):
+            if response_streaming:
+                def streaming(request, context):
+                    inject(faults, context)
+                    yield from behavior(request, context)
+                return streaming
+
+            def unary(request, context):
+                inject(faults, context)
+                return behavior(request, context)
+            return unary
+
+        return wrap_handler(handler, decorator)
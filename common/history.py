@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+按 SKU 记录的库存时间序列 (StockHistory)
+每个被记录的 SKU 占用一个固定槽位, 每个精度层 (默认 1 秒 × 60、1 分钟 × 60、1 小时 × 48) 是一个环形缓冲:
+    - 同一层所有槽位共用预先分配的 array('i') (桶结束时的库存、桶内的下单件数), 内存 = 槽位数 × 每个 SKU 的字节数,
+      启动时即确定, 与目录大小无关
+    - 各层在记录时直接按自己的精度累加 (相当于逐层降采样), 没有变化的桶沿用上一个库存值
+    - 槽位用满后淘汰最久没有变化的 SKU; 批量导入只更新已在记录的 SKU, 不会挤掉活跃的 SKU
+HISTORY_MAX_SKUS 为 0 (默认) 时不记录
+"""
+
+import array
+import collections
+import threading
+import time
+
+from common.config import env_int, env_str
+
+
+DEFAULT_TIERS = "1s:60,1m:60,1h:48"
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_tiers(spec):
+    """'1s:60,1m:60,1h:48' -> [(1, 60), (60, 60), (3600, 48)] (精度秒数, 桶数), 按精度升序"""
+    tiers = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        resolution, _, length = item.partition(":")
+        unit = _UNITS.get(resolution[-1])
+        seconds = int(resolution[:-1]) * unit if unit else int(resolution)
+        tiers.append((seconds, int(length)))
+    return sorted(tiers)
+
+
+class _Tier:
+    """一个精度层: 所有槽位的环形缓冲首尾相接存放在同一对数组中"""
+
+    def __init__(self, resolution, length, capacity):
+        self.resolution = resolution
+        self.length = length
+        self.levels = array.array("i", bytes(4 * length * capacity))
+        self.orders = array.array("i", bytes(4 * length * capacity))
+        # 每个槽位开始记录的桶序号与最后写入的桶序号
+        self.first = array.array("q", bytes(8 * capacity))
+        self.last = array.array("q", bytes(8 * capacity))
+
+    def nbytes(self):
+        return sum(a.itemsize * len(a) for a in (self.levels, self.orders, self.first, self.last))
+
+    def start(self, slot, bucket, level):
+        """槽位分配给新的 SKU: 只重置起点, 起点之前的旧数据不会被读取"""
+        index = slot * self.length + bucket % self.length
+        self.levels[index] = level
+        self.orders[index] = 0
+        self.first[slot] = self.last[slot] = bucket
+
+    def record(self, slot, bucket, level, ordered):
+        base = slot * self.length
+        last = self.last[slot]
+        if bucket > last:
+            # 跳过的桶沿用上一个库存值, 下单为 0 (最多补满一圈)
+            previous = self.levels[base + last % self.length]
+            for skipped in range(max(last + 1, bucket - self.length + 1), bucket + 1):
+                self.levels[base + skipped % self.length] = previous
+                self.orders[base + skipped % self.length] = 0
+            self.last[slot] = bucket
+        else:
+            # 时钟回拨时计入最后一个桶
+            bucket = last
+        index = base + bucket % self.length
+        self.levels[index] = level
+        self.orders[index] += ordered
+
+    def series(self, slot, now_bucket):
+        """(第一个桶的开始时间, 库存列表, 下单列表), 截至 now_bucket"""
+        base = slot * self.length
+        last = self.last[slot]
+        end = max(now_bucket, last)
+        begin = max(self.first[slot], end - self.length + 1)
+        levels = []
+        orders = []
+        for bucket in range(begin, min(last, end) + 1):
+            levels.append(self.levels[base + bucket % self.length])
+            orders.append(self.orders[base + bucket % self.length])
+        # 最后一次变化之后的桶: 库存不变, 没有下单
+        idle = end - max(last, begin - 1)
+        if idle > 0:
+            levels.extend([self.levels[base + last % self.length]] * idle)
+            orders.extend([0] * idle)
+        return begin * self.resolution, levels, orders
+
+
+class StockHistory:
+    """固定容量的 SKU 时间序列表"""
+
+    def __init__(self, capacity=0, tiers=DEFAULT_TIERS, clock=time.time):
+        self.capacity = capacity
+        self.clock = clock
+        self.tiers = [_Tier(resolution, length, capacity) for resolution, length in parse_tiers(tiers)]
+        # 键 -> 槽位, 按最近变化排列
+        self._slots = collections.OrderedDict()
+        self._free = list(range(capacity - 1, -1, -1))
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.evicted = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        按环境变量创建:
+            HISTORY_MAX_SKUS  同时记录的 SKU 数上限 (默认 0, 不记录)
+            HISTORY_TIERS     精度层, 精度:桶数 逗号分隔 (默认 1s:60,1m:60,1h:48)
+        """
+        return cls(env_int("HISTORY_MAX_SKUS", 0), env_str("HISTORY_TIERS", DEFAULT_TIERS))
+
+    def record(self, path, level, ordered=0, create=True):
+        """
+        记录一次库存变化 (调用方持有库存锁, 保证同一 SKU 的记录顺序)
+
+        Args:
+            level: 变化后的库存
+            ordered: 本次下单 (或预留) 的件数, 回滚时为负数
+            create: 为 False 时只更新已在记录的 SKU (批量导入)
+        """
+        if not self.capacity:
+            return
+        key = "/".join(path)
+        now = self.clock()
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                if not create:
+                    return
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    slot = self._slots.popitem(last=False)[1]
+                    self.evicted += 1
+                self._slots[key] = slot
+                for tier in self.tiers:
+                    tier.start(slot, int(now // tier.resolution), level)
+            else:
+                self._slots.move_to_end(key)
+            for tier in self.tiers:
+                tier.record(slot, int(now // tier.resolution), level, ordered)
+            self.recorded += 1
+
+    def series(self, path, resolution=0):
+        """
+        SKU 的各层序列 [(精度秒数, 开始时间, 库存列表, 下单列表)]; 没有记录时返回 None
+        resolution 非 0 时只返回该精度的层
+        """
+        now = self.clock()
+        with self._lock:
+            slot = self._slots.get("/".join(path))
+            if slot is None:
+                return None
+            return [(tier.resolution,) + tier.series(slot, int(now // tier.resolution))
+                    for tier in self.tiers if not resolution or tier.resolution == resolution]
+
+    def stats(self):
+        """时间序列指标"""
+        return {
+            "tracked": len(self._slots),
+            "capacity": self.capacity,
+            "recorded": self.recorded,
+            "evicted": self.evicted,
+            "memory_bytes": sum(tier.nbytes() for tier in self.tiers),
+        }
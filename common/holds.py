@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+购物车预留 (Reserve / CommitHold / ReleaseHold)
+预留不修改 InventoryStore 中的库存, 只记录每个路径被占用的件数:
+    - 可售 = 在库 - 有效预留; Reserve、PlaceOrder、PrepareOrder 都按可售检查
+    - PlaceOrder 只多一次字典查找 (路径的预留件数), 与预留总数无关
+    - CommitHold 把预留转为下单 (扣减库存), ReleaseHold 与过期只归还预留件数
+    - 过期由分层时间轮 (common/timerwheel.py) 按 tick 批量取出, 不在请求中扫描;
+      已提交或释放的预留在时间轮中惰性跳过
+预留编号与 SKU 编号一样以服务命名空间为高位, 网关按编号即可路由
+结束的预留保留有限数量的墓碑, 重复的 Commit/Release 返回首次的结果
+预留只在内存中, 重启后全部失效
+不加锁, 调用方需持有服务的库存锁
+"""
+
+import collections
+import time
+
+from common.config import env_float, env_int
+from common.sku import NAMESPACE_SHIFT
+from common.timerwheel import TimerWheel
+
+
+COMMITTED = "committed"
+RELEASED = "released"
+EXPIRED = "expired"
+
+# 预留: [编号, 路径, 件数, 过期时间]
+HOLD_ID, PATH, QUANTITY, EXPIRES = range(4)
+
+
+def take(store, holds, path, quantity):
+    """
+    按可售件数检查并扣减库存, 同 InventoryStore.take
+
+    Returns:
+        (current, new): 在库件数 (条目不存在时为 None) 与扣减后的在库件数 (可售不足时为 None)
+    """
+    held = holds.held(path)
+    if not held:
+        return store.take(path, quantity)
+    current = store.get(path)
+    if current is None or current - held < quantity:
+        return current, None
+    return current, store.add(path, -quantity)
+
+
+def replay(finished, state):
+    """对已结束 (或未知) 的预留重复 Commit (state 为 COMMITTED) 或 Release 时的结果: (是否成功, 说明)"""
+    if finished is None:
+        return False, "unknown hold"
+    previous = finished[0]
+    if previous == state or (state == RELEASED and previous == EXPIRED):
+        return True, f"already {previous}"
+    return False, f"hold already {previous}"
+
+
+class HoldTable:
+    """有效预留 + 每个路径的预留件数 + 过期时间轮"""
+
+    def __init__(self, namespace, default_ttl=900.0, max_ttl=86400.0, tick=1.0, batch_size=1000,
+                 max_finished=100000, clock=time.time):
+        self.default_ttl = default_ttl
+        self.max_ttl = max_ttl
+        self.batch_size = batch_size
+        self.max_finished = max_finished
+        self.clock = clock
+        self.wheel = TimerWheel(tick, clock())
+        self._base = namespace << NAMESPACE_SHIFT
+        self._next_id = 1
+        # 编号 -> 预留, 路径 -> 预留件数
+        self._holds = {}
+        self._held = {}
+        # 已结束的预留: 编号 -> (状态, 件数)
+        self._finished = collections.OrderedDict()
+        # 时间轮已取出、尚未处理的到期预留
+        self._expiring = collections.deque()
+        self.reserved = 0
+        self.committed = 0
+        self.released = 0
+        self.expired = 0
+
+    @classmethod
+    def from_env(cls, namespace):
+        """
+        按环境变量创建:
+            HOLD_DEFAULT_TTL_SECONDS  Reserve 未指定 ttl 时的有效期 (默认 900 秒)
+            HOLD_MAX_TTL_SECONDS      有效期上限 (默认 86400 秒)
+            HOLD_TICK_SECONDS         过期检查的粒度 (默认 1 秒), 预留最多在过期后一个 tick 内释放
+            HOLD_EXPIRY_BATCH         每次持锁释放的预留数上限 (默认 1000)
+        """
+        return cls(namespace, env_float("HOLD_DEFAULT_TTL_SECONDS", 900.0), env_float("HOLD_MAX_TTL_SECONDS", 86400.0),
+                   env_float("HOLD_TICK_SECONDS", 1.0), env_int("HOLD_EXPIRY_BATCH", 1000))
+
+    def held(self, path):
+        """路径下有效预留的件数"""
+        return self._held.get(path, 0)
+
+    def reserve(self, store, path, quantity, ttl=0.0):
+        """
+        可售件数足够时创建预留
+
+        Returns:
+            (预留, 在库件数, 可售件数): 失败时预留为 None; 条目不存在时在库件数为 None;
+            可售件数为预留后 (失败时为当前) 的值
+        """
+        current = store.get(path)
+        available = (current or 0) - self.held(path)
+        if current is None or available < quantity:
+            return None, current, max(available, 0)
+        return self.add(path, quantity, ttl), current, available - quantity
+
+    def add(self, path, quantity, ttl=0.0):
+        """创建预留 (不检查库存), ttl 为 0 时使用默认有效期; 返回预留"""
+        ttl = min(ttl or self.default_ttl, self.max_ttl)
+        hold = [self._base + self._next_id, path, quantity, self.clock() + ttl]
+        self._next_id += 1
+        self._holds[hold[HOLD_ID]] = hold
+        self._held[path] = self._held.get(path, 0) + quantity
+        self.wheel.schedule(hold[EXPIRES], hold)
+        self.reserved += 1
+        return hold
+
+    def pop(self, hold_id):
+        """
+        取出有效的预留并归还预留件数, 之后由调用方 finish()
+
+        Returns:
+            (预留, None): 有效的预留; (None, (状态, 件数)): 已结束的预留; (None, None): 未知编号
+        """
+        hold = self._holds.pop(hold_id, None)
+        if hold is None:
+            return None, self._finished.get(hold_id)
+        self._unhold(hold)
+        return hold, None
+
+    def finish(self, hold, state):
+        """记录 pop() 取出的预留的结果 (COMMITTED 或 RELEASED)"""
+        self._finish(hold, state)
+        if state == COMMITTED:
+            self.committed += 1
+        else:
+            self.released += 1
+
+    def _unhold(self, hold):
+        path = hold[PATH]
+        left = self._held[path] - hold[QUANTITY]
+        if left:
+            self._held[path] = left
+        else:
+            del self._held[path]
+
+    def _finish(self, hold, state):
+        self._finished[hold[HOLD_ID]] = (state, hold[QUANTITY])
+        while len(self._finished) > self.max_finished:
+            self._finished.popitem(last=False)
+
+    def expire(self, now=None):
+        """
+        释放一批到期的预留 (最多 batch_size 个)
+
+        Returns:
+            (释放的预留数, 是否还有未处理的到期预留)
+        """
+        self._expiring.extend(self.wheel.advance(self.clock() if now is None else now, self.batch_size))
+        count = 0
+        for _ in range(min(self.batch_size, len(self._expiring))):
+            hold = self._expiring.popleft()
+            if self._holds.get(hold[HOLD_ID]) is not hold:
+                # 已提交或释放
+                continue
+            del self._holds[hold[HOLD_ID]]
+            self._unhold(hold)
+            self._finish(hold, EXPIRED)
+            count += 1
+        self.expired += count
+        return count, bool(self._expiring or self.wheel.cascading)
+
+    def stats(self):
+        """预留指标"""
+        return {
+            "active": len(self._holds),
+            "held_units": sum(self._held.values()),
+            "paths": len(self._held),
+            "reserved": self.reserved,
+            "committed": self.committed,
+            "released": self.released,
+            "expired": self.expired,
+            "wheel_entries": len(self.wheel),
+            "expiring": len(self._expiring),
+        }
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+"""
+进程内 gRPC 传输
+InProcessServer 提供与 grpc.Server 相同的注册接口 (add_*Servicer_to_server 可直接使用, 拦截器照常生效),
+InProcessChannel 提供与 grpc.Channel 相同的 unary_unary / unary_stream / stream_unary 接口
+(生成的 Stub 可直接使用)。调用在调用方线程上直接执行处理函数, 不经过套接字:
+    - serialize=False 时请求/响应对象原样传递, 只剩处理函数本身的开销
+    - serialize=True 时按 protobuf 往返序列化, 计入编解码开销
+流式响应在消费方调用 next() 时才执行处理函数; .future() 在线程池上执行
+"""
+
+import functools
+import itertools
+import threading
+import time
+from concurrent import futures
+
+import grpc
+
+
+class InProcessRpcError(grpc.RpcError):
+    """进程内调用失败, 与 grpc 客户端异常一样提供 code() / details()"""
+
+    def __init__(self, code, details):
+        super().__init__(f"{code.name}: {details}")
+        self._code = code
+        self._details = details
+
+    def code(self):
+        return self._code
+
+    def details(self):
+        return self._details
+
+    def trailing_metadata(self):
+        return ()
+
+
+class _Abort(Exception):
+    """context.abort() 抛出, 终止处理函数"""
+
+
+class _CallDetails(grpc.HandlerCallDetails):
+    def __init__(self, method, metadata):
+        self.method = method
+        self.invocation_metadata = metadata
+
+
+class _Context(grpc.ServicerContext):
+    """服务端上下文: 截止时间、取消回调、abort 与调用元数据"""
+
+    _peer_ids = itertools.count(1)
+
+    def __init__(self, metadata, timeout):
+        self._metadata = tuple(metadata or ())
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+        self._peer = f"inprocess:{next(self._peer_ids)}"
+        self._lock = threading.Lock()
+        self._callbacks = []
+        self._done = False
+        self.cancelled = False
+        self.status = None
+        self.status_details = ""
+
+    # RPC 状态
+    def is_active(self):
+        if self._done:
+            return False
+        return self._deadline is None or time.monotonic() < self._deadline
+
+    def time_remaining(self):
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def expired(self):
+        return self._deadline is not None and time.monotonic() >= self._deadline
+
+    def add_callback(self, callback):
+        with self._lock:
+            if self._done:
+                return False
+            self._callbacks.append(callback)
+        return True
+
+    def cancel(self):
+        """客户端取消: 标记结束并运行回调"""
+        self.cancelled = True
+        self.finish()
+
+    def finish(self):
+        """RPC 结束 (正常、出错或取消), 回调只运行一次"""
+        with self._lock:
+            if self._done:
+                return
+            self._done = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    # 调用信息
+    def invocation_metadata(self):
+        return self._metadata
+
+    def peer(self):
+        return self._peer
+
+    def peer_identities(self):
+        return None
+
+    def peer_identity_key(self):
+        return None
+
+    def auth_context(self):
+        return {}
+
+    # 状态与元数据
+    def abort(self, code, details):
+        self.status = code
+        self.status_details = details
+        raise _Abort(details)
+
+    def abort_with_status(self, status):
+        self.abort(status.code, status.details)
+
+    def set_code(self, code):
+        self.status = code
+
+    def set_details(self, details):
+        self.status_details = details
+
+    def send_initial_metadata(self, initial_metadata):
+        pass
+
+    def set_trailing_metadata(self, trailing_metadata):
+        pass
+
+    def set_compression(self, compression):
+        pass
+
+    def disable_next_message_compression(self):
+        pass
+
+    def error(self, exception=None):
+        """处理函数结束后的错误 (没有错误时为 None)"""
+        if self.cancelled:
+            return InProcessRpcError(grpc.StatusCode.CANCELLED, "Locally cancelled by application!")
+        if self.status is not None and self.status != grpc.StatusCode.OK:
+            return InProcessRpcError(self.status, self.status_details)
+        if exception is not None:
+            return InProcessRpcError(grpc.StatusCode.UNKNOWN, f"Exception calling application: {exception}")
+        if self.expired():
+            return InProcessRpcError(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline Exceeded")
+        return None
+
+
+class InProcessServer:
+    """
+    不监听端口的服务端: 收集方法处理函数, 按调用解析 (经过拦截器链)
+    .future() 与客户端流的 future 在 executor 上执行
+    """
+
+    def __init__(self, interceptors=(), max_workers=10):
+        self._handlers = {}
+        self._generic_handlers = []
+        self._interceptors = tuple(interceptors)
+        self._executor = futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inprocess")
+
+    # grpc.Server 的注册接口
+    def add_generic_rpc_handlers(self, generic_rpc_handlers):
+        self._generic_handlers.extend(generic_rpc_handlers)
+
+    def add_registered_method_handlers(self, service_name, method_handlers):
+        for name, handler in method_handlers.items():
+            self._handlers[f"/{service_name}/{name}"] = handler
+
+    def _lookup(self, handler_call_details):
+        handler = self._handlers.get(handler_call_details.method)
+        if handler is not None:
+            return handler
+        for generic_handler in self._generic_handlers:
+            handler = generic_handler.service(handler_call_details)
+            if handler is not None:
+                return handler
+        return None
+
+    def resolve(self, method, metadata):
+        """与 grpc 服务端相同: 第一个拦截器在最外层"""
+        continuation = self._lookup
+        for interceptor in reversed(self._interceptors):
+            continuation = functools.partial(interceptor.intercept_service, continuation)
+        handler = continuation(_CallDetails(method, tuple(metadata or ())))
+        if handler is None:
+            raise InProcessRpcError(grpc.StatusCode.UNIMPLEMENTED, "Method not found!")
+        return handler
+
+    def submit(self, function, *args):
+        return self._executor.submit(function, *args)
+
+    def channel(self, serialize=False):
+        return InProcessChannel(self, serialize)
+
+    def stop(self, grace=None):
+        self._executor.shutdown(wait=False)
+
+
+class _Future(grpc.Future):
+    """executor 上运行的调用; cancel() 同时取消服务端上下文"""
+
+    def __init__(self, server, call, context):
+        self._context = context
+        self._future = server.submit(call)
+
+    def cancel(self):
+        self._context.cancel()
+        self._future.cancel()
+        return True
+
+    def cancelled(self):
+        return self._context.cancelled
+
+    def running(self):
+        return self._future.running()
+
+    def done(self):
+        return self._future.done() or self._context.cancelled
+
+    def result(self, timeout=None):
+        if self._context.cancelled:
+            raise InProcessRpcError(grpc.StatusCode.CANCELLED, "Locally cancelled by application!")
+        # 与 grpc 一样, 截止时间到达时不再等待处理函数
+        remaining = self._context.time_remaining()
+        wait = remaining if timeout is None else timeout if remaining is None else min(timeout, remaining)
+        try:
+            return self._future.result(wait)
+        except futures.TimeoutError:
+            if timeout is not None and (remaining is None or timeout < remaining):
+                raise grpc.FutureTimeoutError()
+            self._context.finish()
+            raise InProcessRpcError(grpc.StatusCode.DEADLINE_EXCEEDED, "Deadline Exceeded")
+
+    def exception(self, timeout=None):
+        try:
+            self.result(timeout)
+        except grpc.RpcError as e:
+            return e
+        return None
+
+    def traceback(self, timeout=None):
+        return None
+
+    def add_done_callback(self, fn):
+        self._future.add_done_callback(lambda _: fn(self))
+
+
+class _ResponseStream:
+    """服务端流式响应: 消费方 next() 时推进处理函数的生成器"""
+
+    def __init__(self, channel, handler, request, timeout, metadata):
+        self._channel = channel
+        self._handler = handler
+        self._context = _Context(metadata, timeout)
+        self._responses = handler.unary_stream(channel._request(handler, request), self._context)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._context.cancelled:
+            raise self._context.error()
+        try:
+            response = next(self._responses)
+        except StopIteration:
+            error = self._context.error()
+            self._context.finish()
+            if error is not None:
+                raise error
+            raise
+        except _Abort:
+            self._context.finish()
+            raise self._context.error()
+        except Exception as e:
+            error = self._context.error(e)
+            self._context.finish()
+            raise error
+        if self._context.cancelled:
+            raise self._context.error()
+        return self._channel._response(self._handler, response)
+
+    def cancel(self):
+        self._context.cancel()
+        return True
+
+    def is_active(self):
+        return self._context.is_active()
+
+    def time_remaining(self):
+        return self._context.time_remaining()
+
+    def add_callback(self, callback):
+        return self._context.add_callback(callback)
+
+    def code(self):
+        error = self._context.error()
+        return error.code() if error is not None else grpc.StatusCode.OK
+
+    def details(self):
+        return self._context.status_details
+
+
+class _MultiCallable:
+    def __init__(self, channel, method):
+        self._channel = channel
+        self._method = method
+
+    def _handler(self, metadata):
+        return self._channel._server.resolve(self._method, metadata)
+
+
+class _UnaryUnary(_MultiCallable):
+    def __call__(self, request, timeout=None, metadata=None, **kwargs):
+        return self._invoke(request, timeout, metadata, _Context(metadata, timeout))
+
+    def _invoke(self, request, timeout, metadata, context):
+        handler = self._handler(metadata)
+        return self._channel._call(handler, handler.unary_unary, self._channel._request(handler, request), context)
+
+    def with_call(self, request, timeout=None, metadata=None, **kwargs):
+        return self(request, timeout, metadata), None
+
+    def future(self, request, timeout=None, metadata=None, **kwargs):
+        context = _Context(metadata, timeout)
+        return _Future(self._channel._server,
+                       functools.partial(self._invoke, request, timeout, metadata, context), context)
+
+
+class _UnaryStream(_MultiCallable):
+    def __call__(self, request, timeout=None, metadata=None, **kwargs):
+        return _ResponseStream(self._channel, self._handler(metadata), request, timeout, metadata)
+
+
+class _StreamUnary(_MultiCallable):
+    def __call__(self, request_iterator, timeout=None, metadata=None, **kwargs):
+        return self._invoke(request_iterator, timeout, metadata, _Context(metadata, timeout))
+
+    def _invoke(self, request_iterator, timeout, metadata, context):
+        handler = self._handler(metadata)
+        requests = (self._channel._request(handler, request) for request in request_iterator)
+        return self._channel._call(handler, handler.stream_unary, requests, context)
+
+    def with_call(self, request_iterator, timeout=None, metadata=None, **kwargs):
+        return self(request_iterator, timeout, metadata), None
+
+    def future(self, request_iterator, timeout=None, metadata=None, **kwargs):
+        context = _Context(metadata, timeout)
+        return _Future(self._channel._server,
+                       functools.partial(self._invoke, request_iterator, timeout, metadata, context), context)
+
+
+class InProcessChannel:
+    """连接 InProcessServer 的通道, 可直接用于生成的 Stub"""
+
+    def __init__(self, server, serialize=False):
+        self._server = server
+        self.serialize = serialize
+
+    def _request(self, handler, request):
+        if not self.serialize or handler.request_deserializer is None:
+            return request
+        return handler.request_deserializer(request.SerializeToString())
+
+    def _response(self, handler, response):
+        if not self.serialize or handler.response_serializer is None:
+            return response
+        return type(response).FromString(handler.response_serializer(response))
+
+    def _call(self, handler, behavior, request, context):
+        """执行一元响应的处理函数, 把 abort / 异常 / 超时转换为 InProcessRpcError"""
+        try:
+            response = behavior(request, context)
+        except _Abort:
+            context.finish()
+            raise context.error()
+        except Exception as e:
+            error = context.error(e)
+            context.finish()
+            raise error
+        error = context.error()
+        context.finish()
+        if error is not None:
+            raise error
+        return self._response(handler, response)
+
+    # grpc.Channel 接口
+    def unary_unary(self, method, request_serializer=None, response_deserializer=None, **kwargs):
+        return _UnaryUnary(self, method)
+
+    def unary_stream(self, method, request_serializer=None, response_deserializer=None, **kwargs):
+        return _UnaryStream(self, method)
+
+    def stream_unary(self, method, request_serializer=None, response_deserializer=None, **kwargs):
+        return _StreamUnary(self, method)
+
+    def stream_stream(self, method, request_serializer=None, response_deserializer=None, **kwargs):
+        raise NotImplementedError("stream-stream RPCs are not supported in process")
+
+    def subscribe(self, callback, try_to_connect=False):
+        pass
+
+    def unsubscribe(self, callback):
+        pass
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+gRPC 服务端拦截器工具
+用于在不修改服务实现的情况下包装 RPC 处理函数
+"""
+
+import grpc
+
+
+_HANDLER_FACTORIES = {
+    (False, False): grpc.unary_unary_rpc_method_handler,
+    (False, True): grpc.unary_stream_rpc_method_handler,
+    (True, False): grpc.stream_unary_rpc_method_handler,
+    (True, True): grpc.stream_stream_rpc_method_handler,
+}
+
+
+def handler_behavior(handler):
+    """取出 handler 中实际的处理函数"""
+    if handler.request_streaming and handler.response_streaming:
+        return handler.stream_stream
+    if handler.request_streaming:
+        return handler.stream_unary
+    if handler.response_streaming:
+        return handler.unary_stream
+    return handler.unary_unary
+
+
+def wrap_handler(handler, decorator):
+    """
+    用 decorator 包装 handler 的处理函数
+
+    Args:
+        handler: grpc.RpcMethodHandler, 可以为 None
+        decorator: decorator(behavior, response_streaming) -> 新的 behavior
+    """
+    if handler is None:
+        return None
+    key = (handler.request_streaming, handler.response_streaming)
+    return _HANDLER_FACTORIES[key](
+        decorator(handler_behavior(handler), handler.response_streaming),
+        request_deserializer=handler.request_deserializer,
+        response_serializer=handler.response_serializer,
+    )
+
+
+def method_name(handler_call_details):
+    """'/warehouse.OrderService/PlaceOrder' -> 'PlaceOrder'"""
+    return handler_call_details.method.rsplit('/', 1)[-1]
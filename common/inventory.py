@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+库存遍历工具
+底层服务的库存是嵌套字典, 叶子为数量:
+    FreshService:     {category: {subcategory: count}}
+    ApplianceService: {category: {subcategory: {item: count}}}
+键统一表示为 category/subcategory[/item], 按每一层排序后的顺序遍历
+"""
+
+import warehouse_pb2
+
+
+DEFAULT_CHUNK_SIZE = 100
+
+
+def split_key(key):
+    """'fruits/apple' -> ('fruits', 'apple')"""
+    return tuple(key.split("/")) if key else ()
+
+
+def _may_contain(path_key, prefix):
+    """以 path_key 为根的子树中是否可能存在匹配 prefix 的键"""
+    return path_key.startswith(prefix) or prefix.startswith(path_key + "/")
+
+
+def iter_inventory(node, prefix="", after=(), _path=()):
+    """
+    按键顺序遍历库存, 逐个生成 (path, count), 不复制整个库存
+
+    Args:
+        node: 嵌套库存字典
+        prefix: 键前缀过滤
+        after: 游标路径, 只返回严格位于其后的条目
+    """
+    # 每次只复制当前层的键
+    for name in sorted(node):
+        path = _path + (name,)
+        if path < after[:len(path)]:
+            continue
+        key = "/".join(path)
+        if not _may_contain(key, prefix):
+            continue
+        value = node.get(name)
+        if isinstance(value, dict):
+            yield from iter_inventory(value, prefix, after, path)
+        elif value is not None and path > after and key.startswith(prefix):
+            yield path, value
+
+
+def get_count(inventory, path):
+    """按路径读取数量, 不存在时返回 None"""
+    node = inventory
+    for name in path:
+        if not isinstance(node, dict):
+            return None
+        node = node.get(name)
+        if node is None:
+            return None
+    return None if isinstance(node, dict) else node
+
+
+def add_count(inventory, path, delta):
+    """按路径增加数量 (可为负), 必要时创建中间层, 返回新数量"""
+    node = inventory
+    for name in path[:-1]:
+        node = node.setdefault(name, {})
+    node[path[-1]] = node.get(path[-1], 0) + delta
+    return node[path[-1]]
+
+
+def copy_inventory(node):
+    """复制嵌套库存字典 (只复制字典结构, 叶子是不可变的整数)"""
+    return {name: copy_inventory(value) if isinstance(value, dict) else value
+            for name, value in node.items()}
+
+
+def make_entry(path, count, sku_id=0):
+    """路径与数量 -> InventoryEntry"""
+    return warehouse_pb2.InventoryEntry(
+        category=path[0],
+        subcategory=path[1] if len(path) > 1 else "",
+        item=path[2] if len(path) > 2 else "",
+        count=count,
+        sku_id=sku_id,
+    )
+
+
+def scan_chunks(entries, cursor="", page_size=0, chunk_size=0, skus=None):
+    """
+    将 (path, count) 迭代器切分为 ScanInventoryChunk 流
+
+    至少产出一个消息; 最后一个消息的 has_more 表示是否因 page_size 截断
+    传入 skus (SkuRegistry) 时为每个条目填写 sku_id
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    chunk = []
+    sent = 0
+    next_cursor = cursor
+    for path, count in entries:
+        if page_size and sent >= page_size:
+            yield warehouse_pb2.ScanInventoryChunk(entries=chunk, next_cursor=next_cursor, has_more=True)
+            return
+        chunk.append(make_entry(path, count, skus.id_for(path) if skus is not None else 0))
+        next_cursor = "/".join(path)
+        sent += 1
+        if len(chunk) >= chunk_size:
+            yield warehouse_pb2.ScanInventoryChunk(entries=chunk, next_cursor=next_cursor)
+            chunk = []
+    yield warehouse_pb2.ScanInventoryChunk(entries=chunk, next_cursor=next_cursor, has_more=False)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+易腐商品的批次 (lot) 跟踪 (FreshService)
+InventoryStore 中的数量仍是总库存, 批次记录其中带过期时间的部分:
+    - PutItem 带 expires_at 时创建批次; 每个 SKU 的批次按 (过期时间, 批次号) 放在最小堆中
+    - 扣减库存时从最早过期的批次开始消耗, 每个用完的批次出堆一次, 下单为 O(log 批次数)
+    - 过期由分层时间轮 (common/timerwheel.py) 按 tick 批量取出, 不在请求中扫描;
+      已被下单用完的批次在时间轮中惰性跳过
+    - 没有批次的库存 (初始库存、ImportStock、UpdateItem) 视为不过期, 在所有批次之后消耗
+    - 两阶段提交回滚时, Prepare 消耗的件数归还到原批次, 保留原过期时间
+批次只在内存中, 重启后全部库存变为不过期
+不加锁, 调用方需持有服务的库存锁
+"""
+
+import collections
+import heapq
+import time
+
+from common.config import env_float, env_int
+from common.timerwheel import TimerWheel
+
+
+# 批次: [过期时间, 批次号, 剩余件数, 库存路径], 按前两项在堆中排序
+EXPIRES, LOT_ID, REMAINING, PATH = range(4)
+
+
+class LotTracker:
+    """每个 SKU 的批次堆 + 过期时间轮"""
+
+    def __init__(self, tick=1.0, batch_size=1000, clock=time.time):
+        self.batch_size = batch_size
+        self.clock = clock
+        self.wheel = TimerWheel(tick, clock())
+        # 路径 -> 批次堆, 路径 -> 批次内的总件数
+        self._heaps = {}
+        self._units = {}
+        # 时间轮已取出、尚未处理的到期批次
+        self._expiring = collections.deque()
+        self._next_id = 1
+        self.lots = 0
+        self.created = 0
+        self.expired_lots = 0
+        self.expired_units = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        按环境变量创建:
+            LOT_TICK_SECONDS   过期检查的粒度 (默认 1 秒), 批次最多在过期后一个 tick 内被清除
+            LOT_EXPIRY_BATCH   每次持锁清除的批次数上限 (默认 1000)
+        """
+        return cls(env_float("LOT_TICK_SECONDS", 1.0), env_int("LOT_EXPIRY_BATCH", 1000))
+
+    def add(self, path, units, expires_at):
+        """创建批次, 返回批次号"""
+        lot = [expires_at, self._next_id, units, path]
+        self._next_id += 1
+        heapq.heappush(self._heaps.setdefault(path, []), lot)
+        self._units[path] = self._units.get(path, 0) + units
+        self.wheel.schedule(expires_at, lot)
+        self.lots += 1
+        self.created += 1
+        return lot[LOT_ID]
+
+    def units(self, path):
+        """路径下批次的总件数"""
+        return self._units.get(path, 0)
+
+    def consume(self, path, units, taken_lots=None):
+        """
+        从最早过期的批次开始消耗, 返回实际从批次中扣除的件数 (其余来自不过期的库存)
+        taken_lots 为列表时追加 (批次, 件数), 供 give_back 归还
+        """
+        heap = self._heaps.get(path)
+        if not heap:
+            return 0
+        taken = 0
+        while heap and taken < units:
+            lot = heap[0]
+            used = min(lot[REMAINING], units - taken)
+            lot[REMAINING] -= used
+            taken += used
+            if taken_lots is not None and used:
+                taken_lots.append((lot, used))
+            if not lot[REMAINING]:
+                heapq.heappop(heap)
+                # 剩余为 0 的堆顶也可能是已过期清除的批次, 已经计过数
+                if used:
+                    self.lots -= 1
+        self._release(path, taken)
+        return taken
+
+    def give_back(self, path, taken):
+        """
+        把 consume 记录的 (批次, 件数) 归还到原批次 (两阶段提交回滚)
+        已用完出堆的批次重新入堆并重新放入时间轮: 期间已过期的批次在下一个 tick 被清除
+        """
+        for lot, units in taken:
+            if not lot[REMAINING]:
+                heapq.heappush(self._heaps.setdefault(path, []), lot)
+                self.wheel.schedule(lot[EXPIRES], lot)
+                self.lots += 1
+            lot[REMAINING] += units
+            self._units[path] = self._units.get(path, 0) + units
+
+    def trim(self, path, count):
+        """库存被直接设为 count 时, 从最早过期的批次开始扣除超出的部分"""
+        excess = self.units(path) - count
+        if excess > 0:
+            self.consume(path, excess)
+
+    def _release(self, path, units):
+        left = self._units[path] - units
+        if left:
+            self._units[path] = left
+        else:
+            del self._units[path]
+            del self._heaps[path]
+
+    def expire(self, now=None):
+        """
+        清除一批到期的批次 (最多 batch_size 个); 时间轮每次最多下放 batch_size 个条目,
+        一次下放大量批次 (高层槽位到期) 时也分多批完成
+
+        Returns:
+            ({path: 清除的件数}, 是否还有未处理的到期批次)
+        """
+        self._expiring.extend(self.wheel.advance(self.clock() if now is None else now, self.batch_size))
+        removed = {}
+        for _ in range(min(self.batch_size, len(self._expiring))):
+            lot = self._expiring.popleft()
+            units = lot[REMAINING]
+            if not units:
+                # 已被下单用完
+                continue
+            path = lot[PATH]
+            lot[REMAINING] = 0
+            self.lots -= 1
+            self.expired_lots += 1
+            self.expired_units += units
+            removed[path] = removed.get(path, 0) + units
+            # 到期的批次在堆顶附近, 弹出堆顶所有已清空的批次
+            heap = self._heaps[path]
+            while heap and not heap[0][REMAINING]:
+                heapq.heappop(heap)
+            self._release(path, units)
+        return removed, bool(self._expiring or self.wheel.cascading)
+
+    def stats(self):
+        """批次指标"""
+        return {
+            "lots": self.lots,
+            "skus": len(self._heaps),
+            "units": sum(self._units.values()),
+            "created": self.created,
+            "expired_lots": self.expired_lots,
+            "expired_units": self.expired_units,
+            "wheel_entries": len(self.wheel),
+            "expiring": len(self._expiring),
+            "cascading": self.wheel.cascading,
+        }
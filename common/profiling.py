@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+运行时性能分析工具
+支持采样分析 (输出火焰图 collapsed 格式)、cProfile (输出 pstats)、线程栈与 tracemalloc
+"""
+
+import cProfile
+import collections
+import marshal
+import os
+import pickle
+import pstats
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+
+
+class ProfileOutput:
+    """一次分析的结果"""
+
+    def __init__(self, mode, fmt, data, duration, samples):
+        self.mode = mode
+        self.format = fmt
+        self.data = data
+        self.duration = duration
+        self.samples = samples
+
+
+def _frame_label(code):
+    """函数级别的栈帧标签, 例如 PlaceOrder (fresh_service.py:40)"""
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    采样分析器
+    后台线程定期读取 sys._current_frames(), 按调用栈聚合计数
+    """
+
+    mode = "sampling"
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.counts = collections.Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._started_at = None
+
+    def start(self):
+        """启动采样线程"""
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        own_ident = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack.append(names.get(ident, f"thread-{ident}"))
+            stack.reverse()
+            self.counts[";".join(stack)] += 1
+        self.samples += 1
+
+    def stop(self):
+        """停止采样, 返回 collapsed 格式 (每行 '栈;帧 次数')"""
+        self._stop_event.set()
+        self._thread.join()
+        lines = [f"{stack} {count}" for stack, count in sorted(self.counts.items())]
+        data = ("\n".join(lines) + "\n").encode() if lines else b""
+        return ProfileOutput(self.mode, "collapsed", data,
+                             time.monotonic() - self._started_at, self.samples)
+
+
+class CProfileSession:
+    """
+    cProfile 分析会话
+    cProfile 只能分析调用 enable() 的线程, 因此每个工作线程各自持有一个 Profile,
+    由拦截器在 RPC 前后 enable/disable, 结束时合并
+    """
+
+    mode = "cprofile"
+
+    def __init__(self):
+        self._profiles = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._inflight = 0
+        self._started_at = None
+        self.active = False
+
+    def start(self):
+        self._started_at = time.monotonic()
+        self.active = True
+
+    def profile_for_current_thread(self):
+        """当前线程的 Profile 对象"""
+        ident = threading.get_ident()
+        profile = self._profiles.get(ident)
+        if profile is None:
+            with self._lock:
+                profile = self._profiles.setdefault(ident, cProfile.Profile())
+        return profile
+
+    def call(self, fn, *args):
+        """在当前线程的 Profile 下执行 fn"""
+        profile = self.profile_for_current_thread()
+        with self._lock:
+            self._inflight += 1
+        profile.enable()
+        try:
+            return fn(*args)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._inflight -= 1
+                if self._inflight == 0:
+                    self._idle.notify_all()
+
+    def stop(self, timeout=5.0):
+        """停止分析, 返回 marshal 后的 pstats 数据 (与 Stats.dump_stats 格式相同)"""
+        self.active = False
+        with self._lock:
+            # 等待正在分析中的调用结束, 避免读取仍在写入的 Profile
+            self._idle.wait_for(lambda: self._inflight == 0, timeout)
+            profiles = list(self._profiles.values())
+        stats = pstats.Stats()
+        for profile in profiles:
+            stats.add(profile)
+        return ProfileOutput(self.mode, "pstats", marshal.dumps(stats.stats),
+                             time.monotonic() - self._started_at, stats.total_calls)
+
+
+class ProfilerController:
+    """
+    管理当前进程中的分析会话
+    同一时间只允许一个会话; 指定时长的会话到期后自动停止, 结果保留到下次取回
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._session = None
+        self._timer = None
+        self._last_output = None
+
+    @property
+    def cprofile_session(self):
+        """正在运行的 cProfile 会话, 没有则返回 None"""
+        session = self._session
+        if isinstance(session, CProfileSession) and session.active:
+            return session
+        return None
+
+    def start(self, mode, duration=0, interval=0.005):
+        """启动分析, 已有会话运行时抛出 RuntimeError"""
+        with self._lock:
+            if self._session is not None:
+                raise RuntimeError(f"{self._session.mode} profiler already running")
+            if mode == "sampling":
+                session = SamplingProfiler(interval=interval)
+            elif mode == "cprofile":
+                session = CProfileSession()
+            else:
+                raise ValueError(f"unknown profiler mode: {mode}")
+            self._last_output = None
+            session.start()
+            self._session = session
+            if duration > 0:
+                self._timer = threading.Timer(duration, self._finish)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _finish(self):
+        with self._lock:
+            if self._session is None:
+                return
+            self._last_output = self._session.stop()
+            self._session = None
+            self._timer = None
+
+    def stop(self):
+        """停止当前会话 (或取回已自动停止的结果), 没有结果时抛出 RuntimeError"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self._finish()
+        with self._lock:
+            output, self._last_output = self._last_output, None
+        if output is None:
+            raise RuntimeError("profiler is not running")
+        return output
+
+
+def dump_stacks():
+    """导出所有线程的当前调用栈, 返回 (线程数, 文本)"""
+    names = {t.ident: t.name for t in threading.enumerate()}
+    frames = sys._current_frames()
+    blocks = []
+    for ident, frame in frames.items():
+        header = f'Thread "{names.get(ident, "?")}" (ident={ident}):'
+        blocks.append(header + "\n" + "".join(traceback.format_stack(frame)))
+    return len(frames), "\n".join(blocks)
+
+
+def tracemalloc_start(nframes=25):
+    """开始跟踪内存分配"""
+    if tracemalloc.is_tracing():
+        return False
+    tracemalloc.start(nframes)
+    return True
+
+
+def tracemalloc_stop():
+    """停止跟踪并释放跟踪数据"""
+    if not tracemalloc.is_tracing():
+        return False
+    tracemalloc.stop()
+    return True
+
+
+def tracemalloc_snapshot(top=20):
+    """
+    拍摄内存快照
+
+    Returns:
+        (摘要文本, pickle 后的快照, 当前字节数, 峰值字节数)
+    """
+    if not tracemalloc.is_tracing():
+        raise RuntimeError("tracemalloc is not tracing, start it first")
+    snapshot = tracemalloc.take_snapshot()
+    current, peak = tracemalloc.get_traced_memory()
+    lines = [str(stat) for stat in snapshot.statistics("lineno")[:top]]
+    return "\n".join(lines), pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL), current, peak
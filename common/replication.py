@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+底层服务的热备 (hot standby)
+备机 (STANDBY_OF=主机地址) 启动后向主机发起 Replicate 流:
+    - 主机在库存锁内同时拍快照并订阅变更流 (common/watch.py), 先发全量快照, 再持续推送之后的每条变更,
+      两者之间不会漏掉或重复变更
+    - 变更携带绝对数量, 同一个键的多次变更在主机的订阅缓冲中合并, 备机落后时只追最新值
+    - 备机按主机的序号与版本号 epoch 重放, 提升后 WatchInventory 的续传点与 UpdateItem 的版本号保持连续
+    - SKU 编号按主机的分配顺序同步, 提升后协议 v2 的 sku_id 不变
+    - 复制流断开 (主机重启等) 后, 备机按 REPLICATION_RETRY_SECONDS 重连并重新全量同步
+提升前备机不对外服务 (StandbyInterceptor 以 UNAVAILABLE 拒绝), 由中层服务 (common/failover.py) 检测到主机故障后调用 Promote
+复制是异步的: 主机在变更发出前宕机时, 已确认的最后几笔写入会丢失 (benchmarks/failover_bench.py 统计丢失的件数)
+只复制库存数量、版本号与 SKU 编号; 幂等缓存、两阶段提交、预留、批次、序列号、库存历史与畅销排行不复制, 提升后从空开始
+"""
+
+import socket
+import sys
+import threading
+import time
+
+import grpc
+
+import warehouse_pb2
+import warehouse_pb2_grpc
+from common import watch
+from common.config import env_float, env_int
+from common.interceptors import method_name, wrap_handler
+
+
+DEFAULT_BATCH = 1000
+# 备机在提升前也要响应的方法
+REPLICATION_METHODS = ("Replicate", "Promote", "ReplicaStatus")
+
+
+def _batch(source, skus, sent, deltas, **fields):
+    """一批复制消息, 附带 sent 之后主机新分配的 SKU 编号; 返回 (消息, 已发送的 SKU 数)"""
+    paths = skus.paths_from(sent)
+    message = warehouse_pb2.ReplicationBatch(
+        deltas=[watch.make_delta(source, delta) for delta in deltas],
+        sku_offset=sent,
+        skus=["/".join(path) for path in paths],
+        **fields)
+    return message, sent + len(paths)
+
+
+def stream_changes(source, lock, store, feed, skus, request, context):
+    """Replicate 的主机一侧: 快照 + 持续变更, 直到备机断开"""
+    max_batch = request.max_batch or DEFAULT_BATCH
+    with lock:
+        snapshot = store.snapshot()
+        # 备机要追上每个键, 按键合并的缓冲不设上限 (最多为键的个数)
+        subscription = feed.subscribe((), max_pending=sys.maxsize)
+        seq, epoch, floor = feed.seq, feed.epoch, feed.version_floor
+    context.add_callback(subscription.close)
+    sent = 0
+    try:
+        try:
+            # 版本号在锁外读取: 快照之后又变更的键读到更新的版本, 其变更也在订阅中, 备机重放后一致
+            deltas = []
+            for path, count in snapshot.scan():
+                key = "/".join(path)
+                deltas.append((feed.versions.get(key, floor), key, count, False, "Snapshot", 0.0))
+                if len(deltas) >= max_batch:
+                    message, sent = _batch(source, skus, sent, deltas, snapshot=True)
+                    yield message
+                    deltas = []
+        finally:
+            snapshot.close()
+        message, sent = _batch(source, skus, sent, deltas, snapshot=True, snapshot_done=True,
+                               seq=seq, epoch=epoch, version_floor=floor)
+        yield message
+        while context.is_active():
+            deltas = subscription.next_batch(max_batch=max_batch)
+            if deltas is None:
+                return
+            # 空批 (1 秒内没有变更) 作为心跳
+            message, sent = _batch(source, skus, sent, deltas)
+            yield message
+    finally:
+        subscription.close()
+
+
+def _path(delta, depth):
+    return (delta.category, delta.subcategory, delta.item)[:depth]
+
+
+class Standby:
+    """备机一侧: 后台线程跟随主机的 Replicate 流, 直到 promote()"""
+
+    def __init__(self, source, lock, store, feed, skus, primary, retry_interval=1.0, batch_size=DEFAULT_BATCH,
+                 channel=None):
+        self.source = source
+        # 与服务共用库存锁、存储、变更流与 SKU 注册表
+        self.lock = lock
+        self.store = store
+        self.feed = feed
+        self.skus = skus
+        self.primary = primary
+        self.retry_interval = retry_interval
+        self.batch_size = batch_size
+        self.channel = channel or grpc.insecure_channel(primary)
+        self.stub = warehouse_pb2_grpc.OrderServiceStub(self.channel)
+        # promoted 在库存锁内修改, 重放前在同一把锁内检查, 提升后不会再写入复制的数据
+        self.promoted = False
+        self.synced = False
+        self.connected = False
+        self.syncs = 0
+        self.disconnects = 0
+        self.batches = 0
+        self.applied = 0
+        self.snapshot_ms = 0.0
+        self.delay_ms = 0.0
+        self._stream = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"{source}-standby", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_env(cls, source, lock, store, feed, skus, primary):
+        """
+        按环境变量创建:
+            REPLICATION_RETRY_SECONDS  复制流断开后重连的间隔 (默认 1 秒)
+            REPLICATION_BATCH          每批复制的最多条目数 (默认 1000)
+        """
+        return cls(source, lock, store, feed, skus, primary,
+                   env_float("REPLICATION_RETRY_SECONDS", 1.0), env_int("REPLICATION_BATCH", DEFAULT_BATCH))
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._stream = self.stub.Replicate(warehouse_pb2.ReplicateRequest(
+                    replica=socket.gethostname(), max_batch=self.batch_size))
+                self._follow(self._stream)
+            except grpc.RpcError as e:
+                if self._stop.is_set():
+                    return
+                print(f"⚠️ [STANDBY] {self.source} replication from {self.primary} interrupted: {e.code().name}")
+            if self.connected:
+                self.disconnects += 1
+            self.connected = False
+            self._stop.wait(self.retry_interval)
+
+    def _follow(self, stream):
+        snapshot = []
+        started = time.perf_counter()
+        for batch in stream:
+            if not batch.snapshot:
+                self._apply(batch)
+                continue
+            snapshot.append(batch)
+            if batch.snapshot_done:
+                entries = self._load(snapshot)
+                self.snapshot_ms = (time.perf_counter() - started) * 1000
+                print(f"🔁 [STANDBY] {self.source} synced {entries} entries from {self.primary} "
+                      f"at seq {batch.seq} in {self.snapshot_ms:.0f}ms")
+                snapshot = []
+
+    def _mirror_skus(self, batch):
+        if batch.skus:
+            self.skus.mirror(batch.sku_offset, [key.split("/") for key in batch.skus])
+
+    def _load(self, batches):
+        """全量同步: 用主机的快照替换本地库存, 返回条目数; 最后一批带有快照对应的序号与版本号"""
+        with self.lock:
+            if self.promoted:
+                return 0
+            paths = {}
+            for batch in batches:
+                self._mirror_skus(batch)
+                for delta in batch.deltas:
+                    paths[_path(delta, self.skus.depth)] = delta
+            stale = [path for path, _ in self.store.scan() if path not in paths]
+            for path in stale:
+                self.store.delete(path)
+            for path, delta in paths.items():
+                self.store.set(path, delta.count)
+            last = batches[-1]
+            self.feed.reset(last.seq, last.epoch, last.version_floor,
+                            {"/".join(path): delta.seq for path, delta in paths.items()})
+            self.synced = self.connected = True
+            self.syncs += 1
+        self.store.sync()
+        return len(paths)
+
+    def _apply(self, batch):
+        """重放一批变更"""
+        with self.lock:
+            if self.promoted:
+                return
+            self._mirror_skus(batch)
+            for delta in batch.deltas:
+                path = _path(delta, self.skus.depth)
+                if delta.deleted:
+                    self.store.delete(path)
+                else:
+                    self.store.set(path, delta.count)
+                self.feed.apply((delta.seq, "/".join(path), delta.count, delta.deleted, delta.op, delta.timestamp))
+        if batch.deltas:
+            self.store.sync()
+            self.batches += 1
+            self.applied += len(batch.deltas)
+            self.delay_ms = (time.time() - batch.deltas[-1].timestamp) * 1000
+
+    def promote(self):
+        """
+        停止复制并接管
+
+        Returns:
+            (是否成功, 说明, 已复制到的主机序号)
+        """
+        with self.lock:
+            if self.promoted:
+                return True, "already promoted", self.feed.seq
+            if not self.synced:
+                return False, f"standby has not synced from {self.primary} yet", 0
+            self.promoted = True
+            self.connected = False
+            seq = self.feed.seq
+            # 主机在发出新 SKU 编号前宕机时, 已复制的路径在本地补分配 (与服务启动时相同)
+            for path, _ in self.store.scan():
+                self.skus.id_for(path)
+        self._stop.set()
+        stream = self._stream
+        if stream is not None:
+            stream.cancel()
+        return True, "promoted", seq
+
+    def role(self):
+        return "promoted" if self.promoted else "standby"
+
+    def close(self, timeout=5.0):
+        """停止复制线程"""
+        self._stop.set()
+        stream = self._stream
+        if stream is not None:
+            stream.cancel()
+        self._thread.join(timeout)
+        self.channel.close()
+
+    def stats(self):
+        """复制指标"""
+        return {
+            "promoted": int(self.promoted),
+            "synced": int(self.synced),
+            "connected": int(self.connected),
+            "seq": self.feed.seq,
+            "syncs": self.syncs,
+            "disconnects": self.disconnects,
+            "batches": self.batches,
+            "applied": self.applied,
+            "snapshot_ms": self.snapshot_ms,
+            "delay_ms": self.delay_ms,
+        }
+
+
+def status(standby, feed):
+    """ReplicaStatus 的实现 (中层服务的健康探测, 不输出日志)"""
+    if standby is None:
+        return warehouse_pb2.ReplicaStatusResponse(role="primary", seq=feed.seq)
+    return warehouse_pb2.ReplicaStatusResponse(role=standby.role(), seq=feed.seq, connected=standby.connected)
+
+
+class StandbyInterceptor(grpc.ServerInterceptor):
+    """提升前以 UNAVAILABLE 拒绝 OrderService 的请求 (复制相关的方法除外); 提升后直接放行"""
+
+    def __init__(self, standby):
+        self.standby = standby
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        if (self.standby.promoted or not handler_call_details.method.startswith("/warehouse.OrderService/")
+                or method_name(handler_call_details) in REPLICATION_METHODS):
+            return handler
+
+        def decorator(behavior, response_streaming):
+            def reject(request, context):
+                context.abort(grpc.StatusCode.UNAVAILABLE, f"{self.standby.source} standby, not promoted")
+            return reject
+
+        return wrap_handler(handler, decorator)
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+底层服务的按方法分类调度
+读 (ListItems / ScanInventory / ExportInventory / StockHistory / TopSellers) 与写 (下单、改库存、两阶段提交、ImportStock) 各有一个槽位池:
+    - 每个池有固定的并发槽位 (workers) 和有界的等待队列 (queue_size), 队列满时以 RESOURCE_EXHAUSTED 拒绝
+    - 等待者按优先级出队 (priority 开启时), 下单等交互写入优先于批量导入
+    - ImportStock 每个数据块单独取一次低优先级写槽位, 块与块之间下单可以插队
+    - 流式响应每生成一条消息取一次槽位, 等待客户端读取时不占用槽位
+处理函数仍在 gRPC 工作线程上运行 (取得槽位后), 不额外切换线程; gRPC 线程池按各池的槽位 + 队列容量之和设置,
+所以写操作排满时读操作仍有线程可用。WatchInventory 等长连接不参与调度
+"""
+
+import heapq
+import itertools
+import threading
+import time
+
+import grpc
+
+from common.config import env_bool, env_int
+from common.interceptors import method_name, wrap_handler
+
+
+HIGH = 0
+LOW = 1
+_PRIORITY_NAMES = {HIGH: "high", LOW: "low"}
+# 单次等待的上限 (秒)
+_MAX_WAIT = 60.0
+
+READ_METHODS = ("ListItems", "ScanInventory", "ExportInventory", "StockHistory", "TopSellers")
+WRITE_METHODS = ("PlaceOrder", "PutItem", "UpdateItem", "PrepareOrder", "CommitOrder", "AbortOrder",
+                 "Reserve", "CommitHold", "ReleaseHold")
+BULK_METHODS = ("ImportStock",)
+
+
+class PriorityPool:
+    """固定槽位数的池, 等待者按 (优先级, 到达顺序) 出队"""
+
+    def __init__(self, name, workers, queue_size, priority=True):
+        self.name = name
+        self.workers = workers
+        self.queue_size = queue_size
+        self.priority = priority
+        self._cond = threading.Condition()
+        self._busy = 0
+        self._waiting = []
+        self._seq = itertools.count()
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.max_queued = 0
+        # 优先级 -> [次数, 等待总时间, 最大等待时间]
+        self._waits = {HIGH: [0, 0.0, 0.0], LOW: [0, 0.0, 0.0]}
+
+    def acquire(self, priority=HIGH, timeout=None):
+        """
+        取得一个槽位
+
+        Returns:
+            True 已取得; False 队列已满或等待超时 (由 timeout 区分调用方的处理)
+        """
+        started = time.monotonic()
+        with self._cond:
+            if self._busy < self.workers and not self._waiting:
+                self._busy += 1
+                self._record(priority, 0.0)
+                return True
+            if len(self._waiting) >= self.queue_size:
+                self.rejected += 1
+                return False
+            ticket = (priority if self.priority else HIGH, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            self.max_queued = max(self.max_queued, len(self._waiting))
+            deadline = None if timeout is None else started + timeout
+            try:
+                while not (self._busy < self.workers and self._waiting[0] == ticket):
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        self._abandon(ticket)
+                        self.timeouts += 1
+                        return False
+                    # 没有 deadline 的 gRPC 调用 time_remaining() 是一个极大值, 直接传给 wait 会溢出
+                    self._cond.wait(None if remaining is None else min(remaining, _MAX_WAIT))
+            except BaseException:
+                self._abandon(ticket)
+                raise
+            heapq.heappop(self._waiting)
+            self._busy += 1
+            if self._busy < self.workers and self._waiting:
+                self._cond.notify_all()
+            self._record(priority, time.monotonic() - started)
+        return True
+
+    def _abandon(self, ticket):
+        """放弃等待: 移出队列并唤醒其他等待者 (队首可能因此变化)"""
+        self._waiting.remove(ticket)
+        heapq.heapify(self._waiting)
+        self._cond.notify_all()
+
+    def release(self):
+        with self._cond:
+            self._busy -= 1
+            self.completed += 1
+            if self._waiting:
+                self._cond.notify_all()
+
+    def _record(self, priority, waited):
+        stats = self._waits[priority]
+        stats[0] += 1
+        stats[1] += waited
+        stats[2] = max(stats[2], waited)
+
+    def stats(self):
+        """池指标 (持有锁读取, 保证一致)"""
+        with self._cond:
+            result = {
+                "workers": self.workers,
+                "busy": self._busy,
+                "queued": len(self._waiting),
+                "max_queued": self.max_queued,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
+            for priority, (count, total, longest) in self._waits.items():
+                if count:
+                    name = _PRIORITY_NAMES[priority]
+                    result[f"{name}.acquired"] = count
+                    result[f"{name}.wait_ms_avg"] = total / count * 1000
+                    result[f"{name}.wait_ms_max"] = longest * 1000
+        return result
+
+
+class MethodScheduler:
+    """方法名 -> (池, 优先级)"""
+
+    def __init__(self, read_workers=4, read_queue=32, write_workers=4, write_queue=32,
+                 priority=True, stream_threads=16):
+        self.pools = {
+            "read": PriorityPool("read", read_workers, read_queue, priority),
+            "write": PriorityPool("write", write_workers, write_queue, priority),
+        }
+        self.stream_threads = stream_threads
+        self.routes = {}
+        for method in READ_METHODS:
+            self.routes[method] = (self.pools["read"], HIGH)
+        for method in WRITE_METHODS:
+            self.routes[method] = (self.pools["write"], HIGH)
+        for method in BULK_METHODS:
+            self.routes[method] = (self.pools["write"], LOW)
+
+    @classmethod
+    def from_env(cls):
+        """
+        按环境变量创建:
+            POOL_READ_WORKERS / POOL_READ_QUEUE    读池槽位与等待队列 (默认 4 / 32)
+            POOL_WRITE_WORKERS / POOL_WRITE_QUEUE  写池槽位与等待队列 (默认 4 / 32)
+            POOL_PRIORITY        写池中下单优先于 ImportStock (默认开启)
+            POOL_STREAM_THREADS  不参与调度的长连接 (WatchInventory、AdminService) 预留线程 (默认 16)
+        """
+        return cls(
+            read_workers=env_int("POOL_READ_WORKERS", 4),
+            read_queue=env_int("POOL_READ_QUEUE", 32),
+            write_workers=env_int("POOL_WRITE_WORKERS", 4),
+            write_queue=env_int("POOL_WRITE_QUEUE", 32),
+            priority=env_bool("POOL_PRIORITY", True),
+            stream_threads=env_int("POOL_STREAM_THREADS", 16),
+        )
+
+    def max_threads(self):
+        """gRPC 线程池大小: 每个排队或运行中的调用占一个线程"""
+        return sum(pool.workers + pool.queue_size for pool in self.pools.values()) + self.stream_threads
+
+    def route(self, method):
+        return self.routes.get(method)
+
+    def stats(self):
+        return {f"{name}.{key}": value
+                for name, pool in self.pools.items()
+                for key, value in pool.stats().items()}
+
+
+def _acquire(pool, priority, context):
+    """取得槽位, 失败时终止 RPC"""
+    if pool.acquire(priority, context.time_remaining()):
+        return
+    if context.time_remaining() is not None and context.time_remaining() <= 0:
+        context.abort(grpc.StatusCode.DEADLINE_EXCEEDED, f"deadline exceeded waiting for {pool.name} pool")
+    context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f"{pool.name} queue full")
+
+
+class _ChunkSlots:
+    """客户端流的请求迭代器: 每取出一个数据块持有一个槽位, 取下一块 (等待客户端) 前释放"""
+
+    def __init__(self, requests, pool, priority, context):
+        self._requests = requests
+        self._pool = pool
+        self._priority = priority
+        self._context = context
+        self._held = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self.release()
+        chunk = next(self._requests)
+        _acquire(self._pool, self._priority, self._context)
+        self._held = True
+        return chunk
+
+    def release(self):
+        if self._held:
+            self._held = False
+            self._pool.release()
+
+
+class SchedulingInterceptor(grpc.ServerInterceptor):
+    """按 MethodScheduler 的路由为处理函数取得槽位; 未路由的方法直接放行"""
+
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        route = self.scheduler.route(method_name(handler_call_details))
+        if handler is None or route is None or handler_call_details.method.startswith("/warehouse.AdminService/"):
+            return handler
+        pool, priority = route
+        request_streaming = handler.request_streaming
+
+        def decorator(behavior, response_streaming):
+            if request_streaming:
+                def per_chunk(request_iterator, context):
+                    slots = _ChunkSlots(request_iterator, pool, priority, context)
+                    try:
+                        return behavior(slots, context)
+                    finally:
+                        slots.release()
+                return per_chunk
+
+            if response_streaming:
+                def per_message(request, context):
+                    responses = behavior(request, context)
+                    while True:
+                        _acquire(pool, priority, context)
+                        try:
+                            response = next(responses)
+                        except StopIteration:
+                            return
+                        finally:
+                            pool.release()
+                        yield response
+                return per_message
+
+            def unary(request, context):
+                _acquire(pool, priority, context)
+                try:
+                    return behavior(request, context)
+                finally:
+                    pool.release()
+            return unary
+
+        return wrap_handler(handler, decorator)
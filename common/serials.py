@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+家电序列号跟踪 (ApplianceService)
+InventoryStore 中的数量仍是总库存, 序列号记录其中登记过序列号的部分:
+    - 每个 SKU 的在库序列号按 serial >> 16 分块 (类似 Roaring bitmap), 每块按内容选择表示:
+        - 游程: 两个 array('H') 保存闭区间的起点与终点, 连续入库的一段序列号只占 4 字节
+        - 位图: 8 KB 的 bytearray, 每个序列号 1 bit; 游程超过 BITMAP_RUNS 个 (碎片化) 时转换
+      位图块的件数降到 RUNS_CARDINALITY 以下时转换回游程, 两个阈值之间留有余量避免来回转换
+    - PutItem 按区间批量入库, 每块只做一次二分查找与合并
+    - 下单分配最小的在库序列号: 游程块只改第一个区间, 位图块从游标向后找第一个非零字节,
+      每个字节只被跳过一次, 均摊 O(1)
+    - 没有序列号的库存 (初始库存、ImportStock、UpdateItem) 在所有序列号之后出库, 订单中不返回序列号
+每块有固定的对象开销 (约 300 字节): 序列号成批连续入库时可以忽略, 但序列号零散到每块只有一两个时比 set 更大
+序列号只在内存中, 重启后全部库存变为没有序列号
+修改不加锁, 调用方需持有服务的库存锁 (即构造时传入的 lock); stats() 自行持有该锁
+"""
+
+import array
+import bisect
+import heapq
+import threading
+
+from common.config import env_int
+
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS
+CHUNK_MASK = CHUNK_SIZE - 1
+# 游程块超过该区间数 (每个区间 4 字节, 即超过位图的 8 KB) 时转换为位图
+BITMAP_RUNS = CHUNK_SIZE // 32
+# 位图块的件数低于该值时转换回游程
+RUNS_CARDINALITY = BITMAP_RUNS // 2
+MAX_SERIAL = (1 << 63) - 1
+
+
+class _Runs:
+    """游程块: 有序且互不相邻的闭区间 [starts[i], lasts[i]]"""
+
+    __slots__ = ("starts", "lasts", "count")
+
+    def __init__(self):
+        self.starts = array.array("H")
+        self.lasts = array.array("H")
+        self.count = 0
+
+    def nbytes(self):
+        return (len(self.starts) + len(self.lasts)) * 2
+
+    def add_range(self, low, high):
+        """加入 [low, high], 返回新加入的个数"""
+        starts, lasts = self.starts, self.lasts
+        # 与 [low, high] 重叠或相邻的区间为 [i, j), 合并为一个区间
+        i = bisect.bisect_left(lasts, low - 1)
+        j = bisect.bisect_right(starts, high + 1)
+        covered = sum(max(0, min(lasts[k], high) - max(starts[k], low) + 1) for k in range(i, j))
+        added = high - low + 1 - covered
+        if i < j:
+            low = min(low, starts[i])
+            high = max(high, lasts[j - 1])
+        starts[i:j] = array.array("H", (low,))
+        lasts[i:j] = array.array("H", (high,))
+        self.count += added
+        return added
+
+    def pop_first(self):
+        value = self.starts[0]
+        if value == self.lasts[0]:
+            del self.starts[0]
+            del self.lasts[0]
+        else:
+            self.starts[0] = value + 1
+        self.count -= 1
+        return value
+
+    def pop_last(self):
+        value = self.lasts[-1]
+        if value == self.starts[-1]:
+            del self.starts[-1]
+            del self.lasts[-1]
+        else:
+            self.lasts[-1] = value - 1
+        self.count -= 1
+        return value
+
+    def to_bitmap(self):
+        bitmap = _Bitmap()
+        for low, high in zip(self.starts, self.lasts):
+            bitmap.add_range(low, high)
+        return bitmap
+
+
+class _Bitmap:
+    """位图块: 第 i 位表示块内偏移 i 在库"""
+
+    __slots__ = ("bits", "count", "low")
+
+    def __init__(self):
+        self.bits = bytearray(CHUNK_SIZE // 8)
+        self.count = 0
+        # 第一个非零字节不早于 low
+        self.low = len(self.bits)
+
+    def nbytes(self):
+        return len(self.bits)
+
+    def add_range(self, low, high):
+        bits = self.bits
+        first, last = low >> 3, high >> 3
+        before = int.from_bytes(bits[first:last + 1], "little").bit_count()
+        if first == last:
+            bits[first] |= ((1 << (high - low + 1)) - 1) << (low & 7)
+        else:
+            bits[first] |= (0xFF << (low & 7)) & 0xFF
+            bits[first + 1:last] = b"\xff" * (last - first - 1)
+            bits[last] |= (1 << ((high & 7) + 1)) - 1
+        added = int.from_bytes(bits[first:last + 1], "little").bit_count() - before
+        self.count += added
+        self.low = min(self.low, first)
+        return added
+
+    def pop_first(self):
+        bits = self.bits
+        index = self.low
+        while not bits[index]:
+            index += 1
+        self.low = index
+        byte = bits[index]
+        bits[index] = byte & (byte - 1)
+        self.count -= 1
+        return index * 8 + (byte & -byte).bit_length() - 1
+
+    def pop_last(self):
+        bits = self.bits
+        index = len(bits.rstrip(b"\0")) - 1
+        byte = bits[index]
+        bit = byte.bit_length() - 1
+        bits[index] = byte & ~(1 << bit)
+        self.count -= 1
+        return index * 8 + bit
+
+    def to_runs(self):
+        runs = _Runs()
+        value = int.from_bytes(self.bits, "little")
+        while value:
+            # 加上最低位的 1 会进位穿过最低的一段连续 1: 进位停下的位置即该段的结束
+            lowest = value & -value
+            carried = value + lowest
+            runs.add_range(lowest.bit_length() - 1, (carried & -carried).bit_length() - 2)
+            value &= carried
+        return runs
+
+
+class SerialSet:
+    """一个 SKU 的在库序列号"""
+
+    def __init__(self):
+        # 块号 -> 块; 块号的最小堆用于分配时找最小的块, 清空的块在出堆时惰性跳过
+        self._chunks = {}
+        self._keys = []
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def add_range(self, start, count):
+        """加入 [start, start + count), 已在库的序列号忽略, 返回新加入的个数"""
+        added = 0
+        end = start + count - 1
+        for key in range(start >> CHUNK_BITS, (end >> CHUNK_BITS) + 1):
+            chunk = self._chunks.get(key)
+            if chunk is None:
+                chunk = self._chunks[key] = _Runs()
+                heapq.heappush(self._keys, key)
+            low = start & CHUNK_MASK if key == start >> CHUNK_BITS else 0
+            high = end & CHUNK_MASK if key == end >> CHUNK_BITS else CHUNK_MASK
+            added += chunk.add_range(low, high)
+            if isinstance(chunk, _Runs) and len(chunk.starts) > BITMAP_RUNS:
+                self._chunks[key] = chunk.to_bitmap()
+        self.count += added
+        return added
+
+    def pop_first(self):
+        """取出最小的序列号"""
+        keys = self._keys
+        while keys[0] not in self._chunks:
+            heapq.heappop(keys)
+        key = keys[0]
+        return key << CHUNK_BITS | self._removed(key, self._chunks[key].pop_first())
+
+    def pop_last(self, count):
+        """取出最大的 count 个序列号 (只用于按数量裁剪, 不要求 O(1))"""
+        taken = []
+        for key in sorted(self._chunks, reverse=True):
+            # 位图块可能在取出过程中转换为游程块, 每次重新取块
+            while key in self._chunks and len(taken) < count:
+                taken.append(key << CHUNK_BITS | self._removed(key, self._chunks[key].pop_last()))
+            if len(taken) == count:
+                break
+        return taken
+
+    def _removed(self, key, offset):
+        chunk = self._chunks[key]
+        self.count -= 1
+        if not chunk.count:
+            del self._chunks[key]
+            # 块反复清空又重建时堆中会有重复的块号, 过多时按现有的块重建
+            if len(self._keys) > 2 * len(self._chunks) + 64:
+                self._keys = list(self._chunks)
+                heapq.heapify(self._keys)
+        elif isinstance(chunk, _Bitmap) and chunk.count < RUNS_CARDINALITY:
+            self._chunks[key] = chunk.to_runs()
+        return offset
+
+    def __iter__(self):
+        for key in sorted(self._chunks):
+            chunk = self._chunks[key]
+            if isinstance(chunk, _Runs):
+                for low, high in zip(chunk.starts, chunk.lasts):
+                    yield from range(key << CHUNK_BITS | low, (key << CHUNK_BITS | high) + 1)
+            else:
+                for index, byte in enumerate(chunk.bits):
+                    while byte:
+                        lowest = byte & -byte
+                        yield key << CHUNK_BITS | index * 8 + lowest.bit_length() - 1
+                        byte ^= lowest
+
+    def layout(self):
+        """(块数, 位图块数, 块内数据的字节数)"""
+        bitmaps = sum(isinstance(chunk, _Bitmap) for chunk in self._chunks.values())
+        return len(self._chunks), bitmaps, sum(chunk.nbytes() for chunk in self._chunks.values())
+
+
+class SerialTracker:
+    """每个 SKU 的在库序列号"""
+
+    def __init__(self, max_range=10_000_000, lock=None):
+        self.max_range = max_range
+        # 保护修改的锁 (服务的库存锁), stats() 遍历各 SKU 时持有
+        self.lock = lock or threading.Lock()
+        # 路径 -> SerialSet
+        self._sets = {}
+        self.received = 0
+        self.duplicates = 0
+        self.allocated = 0
+        self.returned = 0
+
+    @classmethod
+    def from_env(cls, lock=None):
+        """
+        按环境变量创建:
+            SERIAL_MAX_RANGE   单个 PutItem 区间的序列号个数上限 (默认 10000000)
+        """
+        return cls(env_int("SERIAL_MAX_RANGE", 10_000_000), lock)
+
+    def validate(self, ranges):
+        """校验 [(start, count)], 不合法时抛出 ValueError (在锁外调用)"""
+        for start, count in ranges:
+            if start < 0 or count <= 0 or start + count - 1 > MAX_SERIAL:
+                raise ValueError(f"invalid serial range start={start} count={count}")
+            if count > self.max_range:
+                raise ValueError(f"serial range of {count} exceeds SERIAL_MAX_RANGE={self.max_range}")
+
+    def add_ranges(self, path, ranges):
+        """
+        按区间入库, 已在库的序列号忽略
+
+        Returns:
+            (新入库的个数, 已在库而被忽略的个数)
+        """
+        serials = self._sets.get(path)
+        if serials is None:
+            serials = self._sets[path] = SerialSet()
+        added = total = 0
+        for start, count in ranges:
+            added += serials.add_range(start, count)
+            total += count
+        if not serials:
+            del self._sets[path]
+        self.received += added
+        self.duplicates += total - added
+        return added, total - added
+
+    def count(self, path):
+        """路径下在库的序列号个数"""
+        serials = self._sets.get(path)
+        return len(serials) if serials else 0
+
+    def take(self, path, quantity):
+        """出库 quantity 件, 按从小到大分配序列号; 序列号不足时其余件数没有序列号"""
+        serials = self._sets.get(path)
+        if not serials:
+            return []
+        taken = [serials.pop_first() for _ in range(min(quantity, len(serials)))]
+        if not serials:
+            del self._sets[path]
+        self.allocated += len(taken)
+        return taken
+
+    def give_back(self, path, taken):
+        """归还出库的序列号 (回滚)"""
+        if not taken:
+            return
+        serials = self._sets.setdefault(path, SerialSet())
+        for serial in taken:
+            serials.add_range(serial, 1)
+        self.returned += len(taken)
+
+    def trim(self, path, count):
+        """库存被直接设为 count 时, 从最大的序列号开始移除超出的部分"""
+        serials = self._sets.get(path)
+        if not serials:
+            return
+        if len(serials) > count:
+            serials.pop_last(len(serials) - count)
+        if not serials:
+            del self._sets[path]
+
+    def serials(self, path):
+        """路径下在库的序列号 (升序迭代)"""
+        return iter(self._sets.get(path, ()))
+
+    def stats(self):
+        """序列号指标"""
+        chunks = bitmaps = payload = 0
+        with self.lock:
+            for serials in self._sets.values():
+                count, bitmap_count, nbytes = serials.layout()
+                chunks += count
+                bitmaps += bitmap_count
+                payload += nbytes
+            return {
+                "skus": len(self._sets),
+                "serials": sum(len(serials) for serials in self._sets.values()),
+                "chunks": chunks,
+                "bitmap_chunks": bitmaps,
+                "payload_bytes": payload,
+                "received": self.received,
+                "duplicates": self.duplicates,
+                "allocated": self.allocated,
+                "returned": self.returned,
+            }
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+SKU 编号 (协议 v2)
+每个底层服务为自己的库存路径分配 int64 编号: 高位为服务命名空间, 低 40 位为数组下标
+    - 网关只看命名空间即可路由, 不需要解析类别名
+    - 底层服务按下标直接取出路径, 省去字符串解析与小写化
+编号在进程内只增不减, 删除后重新创建的路径沿用原编号
+"""
+
+import threading
+
+
+NAMESPACE_SHIFT = 40
+LOCAL_MASK = (1 << NAMESPACE_SHIFT) - 1
+
+# 服务命名空间
+FRESH = 1
+APPLIANCE = 2
+
+
+def namespace_of(sku_id):
+    """SKU 编号所属的服务命名空间"""
+    return sku_id >> NAMESPACE_SHIFT
+
+
+def request_sku_id(request):
+    """请求中的 sku_id (未设置或消息没有该字段时返回 None)"""
+    if "sku_id" in request.DESCRIPTOR.fields_by_name and request.HasField("sku_id"):
+        return request.sku_id
+    return None
+
+
+class SkuRegistry:
+    """
+    一个底层服务的 路径 <-> 编号 映射
+    查找不加锁 (列表按下标读取、字典读取), 只有分配新编号时加锁
+    """
+
+    def __init__(self, namespace, depth):
+        self.namespace = namespace
+        self.depth = depth
+        self._base = namespace << NAMESPACE_SHIFT
+        self._ids = {}
+        self._paths = []
+        self._lock = threading.Lock()
+
+    def id_for(self, path):
+        """路径的编号, 首次出现时分配; 层数不符的路径返回 0"""
+        path = tuple(path)
+        sku_id = self._ids.get(path)
+        if sku_id is not None:
+            return sku_id
+        if len(path) != self.depth:
+            return 0
+        with self._lock:
+            sku_id = self._ids.get(path)
+            if sku_id is None:
+                sku_id = self._base + len(self._paths)
+                self._paths.append(path)
+                self._ids[path] = sku_id
+        return sku_id
+
+    def path(self, sku_id):
+        """
+        编号对应的路径
+
+        Raises:
+            ValueError: 编号不属于本服务或尚未分配
+        """
+        index = sku_id - self._base
+        if not 0 <= index < len(self._paths):
+            raise ValueError(f"unknown sku_id {sku_id}")
+        return self._paths[index]
+
+    def paths_from(self, index):
+        """下标 index 起已分配的路径 (按编号顺序)"""
+        return self._paths[index:]
+
+    def mirror(self, start, paths):
+        """
+        按另一个注册表 (热备的主机) 的分配顺序登记: paths[i] 的下标为 start + i, 已登记的下标跳过;
+        start 为 0 时先清空本地的分配
+
+        Raises:
+            ValueError: start 之前还有未登记的下标
+        """
+        with self._lock:
+            if start == 0:
+                self._ids = {}
+                self._paths = []
+            if start > len(self._paths):
+                raise ValueError(f"sku index gap: have {len(self._paths)}, got {start}")
+            for path in paths[len(self._paths) - start:]:
+                path = tuple(path)
+                self._ids[path] = self._base + len(self._paths)
+                self._paths.append(path)
+
+    def __len__(self):
+        return len(self._paths)
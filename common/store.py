@@ -0,0 +1,837 @@
+#!/usr/bin/env python3
+"""
+库存存储接口 (InventoryStore) 与可替换的后端
+键是定长的路径元组: FreshService 为 (category, subcategory), ApplianceService 为 (category, subcategory, item)
+    - dict:  嵌套字典 (原来的 self.inventory)
+    - array: 有序键列表 + array('q') 计数, 每个条目的内存更少
+    - log:   嵌套字典 + 追加写日志, 重启时重放日志恢复
+    - sqlite: 嵌入式 SQLite (WAL), 库存不必全部放在内存中
+后端由环境变量 INVENTORY_BACKEND 选择。
+除 sync() 外的方法都不加锁, 调用方需持有服务的库存锁; sync() 在锁外调用, 等待此前的写入落盘。
+snapshot() 是多版本读: 在锁内固定一个版本 (不复制数据), 之后在锁外遍历, 写入者照常进行;
+快照不再被引用后旧版本随之回收
+"""
+
+import array
+import bisect
+import collections
+import os
+import sqlite3
+import struct
+import threading
+import time
+import weakref
+
+from common.config import env_bool, env_int, env_str
+from common.inventory import get_count, iter_inventory
+
+
+class InventoryStore:
+    """存储接口, 子类实现 get / add / set / delete / scan / snapshot"""
+
+    backend = None
+
+    def get(self, path):
+        """读取数量, 不存在时返回 None"""
+        raise NotImplementedError
+
+    def add(self, path, delta):
+        """增加数量 (可为负), 不存在时从 0 开始, 返回新数量"""
+        raise NotImplementedError
+
+    def set(self, path, count):
+        """设置数量, 返回旧数量 (不存在时为 None)"""
+        raise NotImplementedError
+
+    def delete(self, path):
+        """删除条目, 返回旧数量 (不存在时为 None)"""
+        raise NotImplementedError
+
+    def scan(self, prefix="", after=()):
+        """按键顺序生成 (path, count), 只返回匹配 prefix 且严格位于 after 之后的条目"""
+        raise NotImplementedError
+
+    def snapshot(self):
+        """一致性快照 (只读, 支持 get / scan); 在锁内调用, 之后可在锁外遍历, 不阻塞写入"""
+        raise NotImplementedError
+
+    def take(self, path, quantity):
+        """
+        检查并扣减库存
+
+        Returns:
+            (current, new): 条目不存在时 current 为 None, 库存不足时 new 为 None
+        """
+        current = self.get(path)
+        if current is None or current < quantity:
+            return current, None
+        return current, self.add(path, -quantity)
+
+    def add_batch(self, pairs):
+        """批量增加 [(path, delta)], 返回 {path: 最终数量}"""
+        return {path: self.add(path, delta) for path, delta in pairs}
+
+    def sync(self):
+        """等待此前的写入持久化 (内存后端无操作)"""
+
+    def close(self):
+        """释放资源"""
+
+    def stats(self):
+        """存储指标"""
+        return {"entries": len(self)}
+
+
+class DictStore(InventoryStore):
+    """
+    嵌套字典后端
+    快照为节点级写时复制: snapshot() 只记下当前根节点; 有快照存活时, 写入者在首次修改某个节点前
+    复制它及其到根的路径, 快照引用的旧节点保持不变, 快照释放后由引用计数回收
+    """
+
+    backend = "dict"
+
+    def __init__(self, depth, inventory=None, count=None):
+        self.depth = depth
+        self._root = inventory if inventory is not None else {}
+        self._count = count if count is not None else sum(1 for _ in iter_inventory(self._root))
+        # 存活的快照; 非空时 _owned 为本次快照之后复制出的节点 {id: node}, 只有它们可以原地修改
+        self._readers = weakref.WeakSet()
+        self._owned = None
+        self.copied_nodes = 0
+
+    def __len__(self):
+        return self._count
+
+    def _parent(self, path, create):
+        node = self._root
+        for name in path[:-1]:
+            child = node.get(name)
+            if child is None:
+                if not create:
+                    return None
+                child = node[name] = {}
+            node = child
+        return node
+
+    def _writable(self, path, create=True):
+        """
+        可原地修改的父节点; 有存活快照时先复制路径上与快照共享的节点
+        create 为 False 且父节点不存在时返回 None
+        """
+        if not self._readers:
+            self._owned = None
+            return self._parent(path, create)
+        if not create and self._parent(path, False) is None:
+            return None
+        owned = self._owned
+        node = self._root
+        if id(node) not in owned:
+            node = self._root = dict(node)
+            owned[id(node)] = node
+            self.copied_nodes += 1
+        for name in path[:-1]:
+            child = node.get(name)
+            if child is None:
+                child = node[name] = {}
+                owned[id(child)] = child
+            elif id(child) not in owned:
+                child = node[name] = dict(child)
+                owned[id(child)] = child
+                self.copied_nodes += 1
+            node = child
+        return node
+
+    def get(self, path):
+        return get_count(self._root, path)
+
+    def add(self, path, delta):
+        node = self._writable(path)
+        old = node.get(path[-1])
+        if old is None:
+            self._count += 1
+            old = 0
+        node[path[-1]] = old + delta
+        return old + delta
+
+    def set(self, path, count):
+        node = self._writable(path)
+        old = node.get(path[-1])
+        if old is None:
+            self._count += 1
+        node[path[-1]] = count
+        return old
+
+    def delete(self, path):
+        node = self._writable(path, False)
+        old = node.pop(path[-1], None) if node is not None else None
+        if old is not None:
+            self._count -= 1
+        return old
+
+    def add_batch(self, pairs):
+        # 同一批次内相邻行通常属于同一父节点, 复用上一次查找的结果
+        touched = {}
+        parent_path = None
+        node = None
+        for path, delta in pairs:
+            if path[:-1] != parent_path:
+                parent_path = path[:-1]
+                node = self._writable(path)
+            old = node.get(path[-1])
+            if old is None:
+                self._count += 1
+                old = 0
+            node[path[-1]] = touched[path] = old + delta
+        return touched
+
+    def scan(self, prefix="", after=()):
+        return iter_inventory(self._root, prefix, after)
+
+    def snapshot(self):
+        # 新的一代: 现有节点都与这个快照共享, 写入前需要复制
+        snapshot = DictStore(self.depth, self._root, self._count)
+        self._readers.add(snapshot)
+        self._owned = {}
+        return snapshot
+
+    def stats(self):
+        return {
+            "entries": len(self),
+            "snapshots": len(self._readers),
+            "copied_nodes": self.copied_nodes,
+        }
+
+
+class ArrayStore(InventoryStore):
+    """
+    紧凑数组后端
+    有序的键列表 + 平行的 array('q') 计数, 没有逐条目的字典槽位与 int 对象;
+    键用 '\\x00' 连接各层, 使字符串顺序与路径元组顺序一致, 查找为二分查找 O(log n)。
+    插入/删除需要移动数组 O(n); 批量导入的新键先排序再一次性归并。
+    快照与存储共享两个数组, 有快照存活时写入者先复制要修改的数组 (写时复制, 每个快照至多一次)
+    """
+
+    backend = "array"
+    _SEP = "\x00"
+
+    def __init__(self, depth):
+        self.depth = depth
+        self._keys = []
+        self._counts = array.array("q")
+        # 插入/删除键时递增, 未加锁的 scan() 据此重新定位
+        self._version = 0
+        # 与当前 _keys / _counts 共享数组的存活快照
+        self._key_readers = weakref.WeakSet()
+        self._count_readers = weakref.WeakSet()
+        self.copied_arrays = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _find(self, key):
+        index = bisect.bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return index, True
+        return index, False
+
+    def _own_counts(self):
+        """修改计数前调用: 与快照共享时先复制"""
+        if self._count_readers:
+            self._counts = array.array("q", self._counts)
+            self._count_readers = weakref.WeakSet()
+            self.copied_arrays += 1
+
+    def _own_keys(self):
+        """增删键前调用: 键与计数都要修改"""
+        if self._key_readers:
+            self._keys = list(self._keys)
+            self._key_readers = weakref.WeakSet()
+            self.copied_arrays += 1
+        self._own_counts()
+
+    def _insert(self, index, key, count):
+        self._own_keys()
+        self._keys.insert(index, key)
+        self._counts.insert(index, count)
+        self._version += 1
+
+    def get(self, path):
+        index, found = self._find(self._SEP.join(path))
+        return self._counts[index] if found else None
+
+    def add(self, path, delta):
+        key = self._SEP.join(path)
+        index, found = self._find(key)
+        if not found:
+            self._insert(index, key, delta)
+            return delta
+        self._own_counts()
+        self._counts[index] += delta
+        return self._counts[index]
+
+    def set(self, path, count):
+        key = self._SEP.join(path)
+        index, found = self._find(key)
+        if not found:
+            self._insert(index, key, count)
+            return None
+        self._own_counts()
+        old = self._counts[index]
+        self._counts[index] = count
+        return old
+
+    def delete(self, path):
+        index, found = self._find(self._SEP.join(path))
+        if not found:
+            return None
+        self._own_keys()
+        del self._keys[index]
+        old = self._counts.pop(index)
+        self._version += 1
+        return old
+
+    def take(self, path, quantity):
+        index, found = self._find(self._SEP.join(path))
+        if not found:
+            return None, None
+        current = self._counts[index]
+        if current < quantity:
+            return current, None
+        self._own_counts()
+        self._counts[index] = current - quantity
+        return current, current - quantity
+
+    def add_batch(self, pairs):
+        touched = {}
+        new = {}
+        for path, delta in pairs:
+            key = self._SEP.join(path)
+            index, found = self._find(key)
+            if found:
+                self._own_counts()
+                self._counts[index] += delta
+                touched[path] = self._counts[index]
+            else:
+                touched[path] = new[key] = new.get(key, 0) + delta
+        if new:
+            self._merge(sorted(new.items()))
+        return touched
+
+    def _merge(self, items):
+        """把一批有序的新键归并进数组 (O(n + k))"""
+        keys = []
+        counts = array.array("q")
+        old_keys = self._keys
+        old_counts = self._counts
+        position = 0
+        for key, count in items:
+            end = bisect.bisect_left(old_keys, key, position)
+            keys.extend(old_keys[position:end])
+            counts.extend(old_counts[position:end])
+            keys.append(key)
+            counts.append(count)
+            position = end
+        keys.extend(old_keys[position:])
+        counts.extend(old_counts[position:])
+        # 归并生成新数组, 快照仍引用旧数组
+        self._keys = keys
+        self._counts = counts
+        self._key_readers = weakref.WeakSet()
+        self._count_readers = weakref.WeakSet()
+        self._version += 1
+
+    def scan(self, prefix="", after=()):
+        sep = self._SEP
+        prefix = prefix.replace("/", sep)
+        last = sep.join(after) if after else None
+        version = None
+        index = 0
+        while True:
+            keys, counts = self._keys, self._counts
+            if version != self._version:
+                # 首次或遍历期间有键增删: 从上一个已返回的键之后重新定位
+                version = self._version
+                index = bisect.bisect_left(keys, prefix)
+                if last is not None:
+                    index = max(index, bisect.bisect_right(keys, last))
+            if index >= len(keys):
+                return
+            key, count = keys[index], counts[index]
+            if version != self._version:
+                continue
+            if not key.startswith(prefix):
+                return
+            yield tuple(key.split(sep)), count
+            last = key
+            index += 1
+
+    def snapshot(self):
+        snapshot = ArrayStore(self.depth)
+        snapshot._keys = self._keys
+        snapshot._counts = self._counts
+        self._key_readers.add(snapshot)
+        self._count_readers.add(snapshot)
+        return snapshot
+
+    def stats(self):
+        return {
+            "entries": len(self),
+            "snapshots": len(self._key_readers | self._count_readers),
+            "copied_arrays": self.copied_arrays,
+        }
+
+
+class LogStore(DictStore):
+    """
+    日志结构的磁盘后端
+    每次变更在锁内追加一条 (数量, 标志, 键) 记录到缓冲文件, sync() 在锁外 flush (可选 fsync),
+    并发请求共享一次刷盘; 启动时重放日志恢复, 日志中的过期记录过多时重写为紧凑快照。
+    内存中保存完整的计数 (每个计数只有 8 字节, 保存文件偏移并不更省)
+    """
+
+    backend = "log"
+    _RECORD = struct.Struct("<qBH")
+    _DELETED = 1
+
+    def __init__(self, depth, path, fsync=False, compact_min_records=10000):
+        super().__init__(depth)
+        self.path = path
+        self.fsync = fsync
+        self.compact_min_records = compact_min_records
+        self.compactions = 0
+        self._records = 0
+        self._written = 0
+        self._synced = 0
+        self._sync_lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        started = time.perf_counter()
+        self._recover()
+        self.recovery_seconds = time.perf_counter() - started
+        self._file = open(path, "ab")
+
+    def _recover(self):
+        """重放日志; 末尾不完整的记录 (写入时崩溃) 被截断"""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = f.read()
+        header = self._RECORD.size
+        offset = 0
+        while offset + header <= len(data):
+            count, flags, length = self._RECORD.unpack_from(data, offset)
+            end = offset + header + length
+            if end > len(data):
+                break
+            path = tuple(data[offset + header:end].decode("utf-8").split("/"))
+            if flags & self._DELETED:
+                DictStore.delete(self, path)
+            else:
+                DictStore.set(self, path, count)
+            self._records += 1
+            offset = end
+        if offset < len(data):
+            print(f"⚠️ Truncating {len(data) - offset} bytes of incomplete log records in {self.path}")
+            with open(self.path, "r+b") as f:
+                f.truncate(offset)
+
+    def _record(self, path, count, flags=0):
+        key = "/".join(path).encode("utf-8")
+        return self._RECORD.pack(count, flags, len(key)) + key
+
+    def _append(self, data, records):
+        self._file.write(data)
+        self._records += records
+        self._written += 1
+        if self._records > max(self.compact_min_records, 2 * len(self)):
+            self._compact()
+
+    def add(self, path, delta):
+        count = DictStore.add(self, path, delta)
+        self._append(self._record(path, count), 1)
+        return count
+
+    def set(self, path, count):
+        old = DictStore.set(self, path, count)
+        self._append(self._record(path, count), 1)
+        return old
+
+    def delete(self, path):
+        old = DictStore.delete(self, path)
+        if old is not None:
+            self._append(self._record(path, 0, self._DELETED), 1)
+        return old
+
+    def add_batch(self, pairs):
+        touched = DictStore.add_batch(self, pairs)
+        self._append(b"".join(self._record(path, count) for path, count in touched.items()), len(touched))
+        return touched
+
+    def _compact(self):
+        """把当前内容写成新日志并原子替换 (持有库存锁时调用)"""
+        temp_path = self.path + ".compact"
+        with open(temp_path, "wb") as f:
+            for path, count in self.scan():
+                f.write(self._record(path, count))
+            f.flush()
+            os.fsync(f.fileno())
+        with self._sync_lock:
+            self._file.close()
+            os.replace(temp_path, self.path)
+            self._file = open(self.path, "ab")
+            self._synced = self._written
+        self._records = len(self)
+        self.compactions += 1
+
+    def sync(self):
+        # 多个线程同时等待时只有一个执行 flush/fsync, 其余线程发现已覆盖自己的写入后直接返回
+        target = self._written
+        if self._synced >= target:
+            return
+        with self._sync_lock:
+            if self._synced >= target:
+                return
+            written = self._written
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self._synced = written
+
+    def close(self):
+        with self._sync_lock:
+            self._file.close()
+
+    def stats(self):
+        return {
+            "entries": len(self),
+            "snapshots": len(self._readers),
+            "copied_nodes": self.copied_nodes,
+            "log_records": self._records,
+            "compactions": self.compactions,
+            "recovery_seconds": self.recovery_seconds,
+        }
+
+
+class _SqliteReader:
+    """按键顺序分页读取 inventory 表; 每页单独查询, 两页之间不占用连接"""
+
+    # 只给出一个下界, 两个下界时查询计划可能选中较小的那个, 每页都从前缀开头扫描
+    _SCAN_FROM = "SELECT key, count FROM inventory WHERE key >= ? ORDER BY key LIMIT ?"
+    _SCAN_AFTER = "SELECT key, count FROM inventory WHERE key > ? ORDER BY key LIMIT ?"
+    _SELECT = "SELECT count FROM inventory WHERE key = ?"
+    _PAGE = 512
+    _SEP = "\x00"
+
+    def _query(self, sql, params):
+        raise NotImplementedError
+
+    def get(self, path):
+        rows = self._query(self._SELECT, (self._SEP.join(path).encode("utf-8"),))
+        return rows[0][0] if rows else None
+
+    def scan(self, prefix="", after=()):
+        sep = self._SEP
+        prefix = prefix.replace("/", sep).encode("utf-8")
+        last = sep.join(after).encode("utf-8") if after else b""
+        while True:
+            if last and last >= prefix:
+                rows = self._query(self._SCAN_AFTER, (last, self._PAGE))
+            else:
+                rows = self._query(self._SCAN_FROM, (prefix, self._PAGE))
+            for key, count in rows:
+                if not key.startswith(prefix):
+                    return
+                yield tuple(key.decode("utf-8").split(sep)), count
+            if len(rows) < self._PAGE:
+                return
+            last = rows[-1][0]
+
+
+class _SqliteSnapshot(_SqliteReader):
+    """SQLite 快照: 独立连接上的只读事务 (WAL 下读不阻塞写)"""
+
+    def __init__(self, path):
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("BEGIN")
+        # 第一次读取时才确定事务看到的版本
+        self._conn.execute("SELECT 1 FROM inventory LIMIT 1").fetchall()
+
+    def _query(self, sql, params):
+        return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def __del__(self):
+        self.close()
+
+
+class SqliteStore(_SqliteReader, InventoryStore):
+    """
+    SQLite 后端 (WAL 日志模式), 适用于超出内存的目录
+        - 键为各层以 '\x00' 连接的 UTF-8 BLOB 主键 (WITHOUT ROWID), 按字节排序即按路径排序
+        - take() 是一条带条件的 UPDATE (count >= ?), 不先读后写
+        - 写操作进入当前打开的事务, sync() 在服务锁外提交: 并发请求的写入共享一次提交;
+          synchronous=NORMAL 下 COMMIT 只写入 WAL 文件, fsync=True 时由 sync() 在连接锁外 fsync WAL,
+          等待 fsync 期间其他请求的写入继续进入下一次提交
+        - 热点行缓存 (LRU, 最多 cache_rows 行, 直写), 批量导入不挤占缓存
+        - SQL 都是固定字符串, 由 sqlite3 的 cached_statements 复用预编译语句
+    连接由 _db_lock 串行化
+    """
+
+    backend = "sqlite"
+    _UPSERT = ("INSERT INTO inventory (key, count) VALUES (?, ?) "
+               "ON CONFLICT (key) DO UPDATE SET count = excluded.count")
+    _DELETE = "DELETE FROM inventory WHERE key = ?"
+    _TAKE = "UPDATE inventory SET count = count - ? WHERE key = ? AND count >= ?"
+    _TAKE_RETURNING = _TAKE + " RETURNING count"
+    _BATCH_SELECT = 500
+
+    def __init__(self, depth, path, fsync=False, cache_rows=100000, page_cache_mb=64):
+        self.depth = depth
+        self.path = path
+        self.fsync = fsync
+        self.cache_rows = cache_rows
+        self._wal_fd = None
+        self._cache = collections.OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.commits = 0
+        self._written = 0
+        self._synced = 0
+        self._db_lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        started = time.perf_counter()
+        self._conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False,
+                                     cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # SQLite 自身的页缓存 (负数单位为 KiB), 与热点行缓存一起限定内存
+        self._conn.execute(f"PRAGMA cache_size=-{page_cache_mb * 1024}")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS inventory "
+                           "(key BLOB PRIMARY KEY, count INTEGER NOT NULL) WITHOUT ROWID")
+        self._count = self._conn.execute("SELECT COUNT(*) FROM inventory").fetchone()[0]
+        self.recovery_seconds = time.perf_counter() - started
+        # RETURNING 需要 SQLite 3.35+
+        self._returning = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+    def __len__(self):
+        return self._count
+
+    def _key(self, path):
+        return self._SEP.join(path).encode("utf-8")
+
+    def _cache_put(self, key, count):
+        if not self.cache_rows:
+            return
+        self._cache[key] = count
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.cache_rows:
+            self._cache.popitem(last=False)
+
+    def _lookup(self, key):
+        """读取数量 (先查缓存), 持有 _db_lock 时调用"""
+        count = self._cache.get(key)
+        if count is not None:
+            self.cache_hits += 1
+            self._cache.move_to_end(key)
+            return count
+        self.cache_misses += 1
+        row = self._conn.execute(self._SELECT, (key,)).fetchone()
+        if row is None:
+            return None
+        self._cache_put(key, row[0])
+        return row[0]
+
+    def _write(self, sql, params):
+        """在当前事务中执行写语句 (没有打开的事务时开始一个)"""
+        if not self._conn.in_transaction:
+            self._conn.execute("BEGIN")
+        self._written += 1
+        return self._conn.execute(sql, params)
+
+    def get(self, path):
+        with self._db_lock:
+            return self._lookup(self._key(path))
+
+    def add(self, path, delta):
+        key = self._key(path)
+        with self._db_lock:
+            old = self._lookup(key)
+            if old is None:
+                self._count += 1
+                old = 0
+            self._write(self._UPSERT, (key, old + delta))
+            self._cache_put(key, old + delta)
+        return old + delta
+
+    def set(self, path, count):
+        key = self._key(path)
+        with self._db_lock:
+            old = self._lookup(key)
+            if old is None:
+                self._count += 1
+            self._write(self._UPSERT, (key, count))
+            self._cache_put(key, count)
+        return old
+
+    def delete(self, path):
+        key = self._key(path)
+        with self._db_lock:
+            old = self._lookup(key)
+            if old is not None:
+                self._write(self._DELETE, (key,))
+                self._cache.pop(key, None)
+                self._count -= 1
+        return old
+
+    def take(self, path, quantity):
+        key = self._key(path)
+        with self._db_lock:
+            current = self._cache.get(key)
+            if current is not None:
+                # 缓存是直写的, 命中时即为当前数量
+                self.cache_hits += 1
+                self._cache.move_to_end(key)
+                if current < quantity:
+                    return current, None
+                self._write(self._TAKE, (quantity, key, quantity))
+            elif self._returning:
+                self.cache_misses += 1
+                row = self._write(self._TAKE_RETURNING, (quantity, key, quantity)).fetchone()
+                if row is None:
+                    # 不存在或库存不足, 再读一次区分
+                    return self._lookup(key), None
+                current = row[0] + quantity
+            else:
+                current = self._lookup(key)
+                if current is None or current < quantity:
+                    return current, None
+                self._write(self._TAKE, (quantity, key, quantity))
+            self._cache_put(key, current - quantity)
+        return current, current - quantity
+
+    def add_batch(self, pairs):
+        keys = {}
+        for path, delta in pairs:
+            keys.setdefault(path, self._key(path))
+        with self._db_lock:
+            # 未缓存的键排序后按批 IN 查询 (B 树顺序访问); 导入的行只更新已缓存的条目, 不挤出热点行
+            counts = {}
+            missing = []
+            for key in keys.values():
+                count = self._cache.get(key)
+                if count is None:
+                    missing.append(key)
+                else:
+                    counts[key] = count
+            missing.sort()
+            for start in range(0, len(missing), self._BATCH_SELECT):
+                part = missing[start:start + self._BATCH_SELECT]
+                sql = f"SELECT key, count FROM inventory WHERE key IN ({','.join('?' * len(part))})"
+                counts.update(self._conn.execute(sql, part).fetchall())
+            touched = {}
+            for path, delta in pairs:
+                key = keys[path]
+                old = counts.get(key)
+                if old is None:
+                    self._count += 1
+                    old = 0
+                counts[key] = touched[path] = old + delta
+            if not self._conn.in_transaction:
+                self._conn.execute("BEGIN")
+            self._conn.executemany(self._UPSERT, sorted((keys[path], count) for path, count in touched.items()))
+            self._written += 1
+            for path, count in touched.items():
+                if keys[path] in self._cache:
+                    self._cache[keys[path]] = count
+        return touched
+
+    def _query(self, sql, params):
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _commit(self):
+        """提交当前事务 (持有 _sync_lock 时调用), 返回提交覆盖的写入序号"""
+        with self._db_lock:
+            written = self._written
+            if self._conn.in_transaction:
+                self._conn.execute("COMMIT")
+                self.commits += 1
+        if self.fsync:
+            if self._wal_fd is None:
+                self._wal_fd = os.open(self.path + "-wal", os.O_RDONLY)
+            os.fsync(self._wal_fd)
+        self._synced = written
+
+    def snapshot(self):
+        # 快照连接只能看到已提交的数据, 先提交当前事务
+        with self._sync_lock:
+            self._commit()
+        return _SqliteSnapshot(self.path)
+
+    def sync(self):
+        # 多个线程同时等待时只有一个提交, 其余线程发现已覆盖自己的写入后直接返回
+        target = self._written
+        if self._synced >= target:
+            return
+        with self._sync_lock:
+            if self._synced >= target:
+                return
+            self._commit()
+
+    def close(self):
+        with self._sync_lock:
+            self._commit()
+            with self._db_lock:
+                self._conn.close()
+            if self._wal_fd is not None:
+                os.close(self._wal_fd)
+
+    def stats(self):
+        return {
+            "entries": len(self),
+            "cached_rows": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "commits": self.commits,
+            "writes": self._written,
+            "recovery_seconds": self.recovery_seconds,
+        }
+
+
+def open_store(name, depth, seed=None):
+    """
+    按环境变量创建存储:
+        INVENTORY_BACKEND     dict (默认) / array / log / sqlite
+        INVENTORY_DATA_DIR    log / sqlite 后端的数据目录 (默认 data), 文件名为 <name>.log / <name>.sqlite3
+        INVENTORY_FSYNC       sync() 时是否 fsync (默认否; log 只写入操作系统缓冲, sqlite 使用 synchronous=NORMAL)
+        INVENTORY_CACHE_ROWS  sqlite 后端热点行缓存的行数 (默认 100000, 0 为关闭)
+    存储为空时写入 seed (嵌套字典) 作为初始库存
+    """
+    backend = env_str("INVENTORY_BACKEND", "dict")
+    if backend == "dict":
+        store = DictStore(depth)
+    elif backend == "array":
+        store = ArrayStore(depth)
+    elif backend == "log":
+        path = os.path.join(env_str("INVENTORY_DATA_DIR", "data"), f"{name}.log")
+        store = LogStore(depth, path, fsync=env_bool("INVENTORY_FSYNC"))
+    elif backend == "sqlite":
+        path = os.path.join(env_str("INVENTORY_DATA_DIR", "data"), f"{name}.sqlite3")
+        store = SqliteStore(depth, path, fsync=env_bool("INVENTORY_FSYNC"),
+                            cache_rows=env_int("INVENTORY_CACHE_ROWS", 100000))
+    else:
+        raise ValueError(f"unknown INVENTORY_BACKEND: {backend!r}")
+    if seed and not len(store):
+        for path, count in iter_inventory(seed):
+            store.set(path, count)
+        store.sync()
+    return store
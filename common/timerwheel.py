@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+分层时间轮
+到期时间按 tick 取整, 放入 levels 层、每层 slots 个槽位的轮中 (第 L 层一个槽位跨 slots^L 个 tick):
+    - schedule() 为 O(1): 按到期 tick 与当前 tick 最高的不同位数选层, 按该位选槽位
+    - advance() 每走过一个 tick 只处理一个槽位; 低层转完一圈时把上一层的一个槽位重新分配到下层 (cascade);
+      低层为空时直接跳到下一次 cascade, 长时间空闲后推进的开销与跨过的 tick 数无关
+    - 高层的一个槽位可能有大量条目 (例如一小时内到期的全部条目), advance(limit=...) 每次最多下放 limit 个,
+      下放未完成时停在当前 tick (cascading 非 0), 调用方可以分多次持锁完成
+    - 超出最高层范围的条目放在溢出表, 最高层转完一圈时重新分配
+到期的条目按批返回, 调用方统一处理, 不需要逐个请求扫描
+不加锁, 调用方需自行同步
+"""
+
+
+class TimerWheel:
+    """分层时间轮, 条目为任意对象, 不支持取消 (调用方在到期时跳过已失效的条目)"""
+
+    def __init__(self, tick=1.0, start=0.0, slots=256, levels=4):
+        self.tick = tick
+        self.bits = (slots - 1).bit_length()
+        self.slots = 1 << self.bits
+        self.mask = self.slots - 1
+        self.levels = [[[] for _ in range(self.slots)] for _ in range(levels)]
+        self.overflow = []
+        # 每层的条目数, 用于跳过空层
+        self._sizes = [0] * levels
+        self.current = int(start // tick)
+        # 当前 tick 待下放的条目; 下放完成后才取出第 0 层当前槽位
+        self._backlog = []
+        self._collect = False
+        # 已到期但尚未取走的条目 (调度时已经过期)
+        self._due = []
+        self._count = 0
+        self.cascaded = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def cascading(self):
+        """当前 tick 尚未下放完的条目数"""
+        return len(self._backlog)
+
+    def schedule(self, deadline, item):
+        """在 deadline (与 start 同一时间基准) 到期"""
+        self._place(int(deadline // self.tick), item)
+        self._count += 1
+
+    def _place(self, tick, item):
+        if tick <= self.current:
+            self._due.append(item)
+            return
+        diff = tick ^ self.current
+        for level, slots in enumerate(self.levels):
+            # tick 与 current 在本层之上的位全部相同时放在本层 (本层的位与 current 不同, 不会落回正在下放的槽位)
+            if diff >> (self.bits * (level + 1)) == 0:
+                slots[(tick >> (self.bits * level)) & self.mask].append((tick, item))
+                self._sizes[level] += 1
+                return
+        self.overflow.append((tick, item))
+
+    def _take(self, level):
+        slot = (self.current >> (self.bits * level)) & self.mask
+        entries = self.levels[level][slot]
+        self.levels[level][slot] = []
+        self._sizes[level] -= len(entries)
+        self._backlog.extend(entries)
+
+    def _step(self, target):
+        """走到下一个需要处理的 tick, 把到期的高层槽位放入待下放列表"""
+        span = self.bits * len(self.levels)
+        # 最低的非空层为 L 时, 下一个需要处理的 tick 是 slots^L 的倍数
+        level = next((level for level, size in enumerate(self._sizes) if size), len(self.levels))
+        if level == len(self.levels):
+            # 只剩溢出表: 跳到最早的溢出条目所在那一圈的开始
+            first = min(tick for tick, _ in self.overflow) >> span << span
+            self.current = min(target - 1, max(self.current, first - 1))
+        elif level:
+            step = 1 << (self.bits * level)
+            self.current = min(target - 1, self.current | (step - 1))
+        self.current += 1
+        if self.current & ((1 << span) - 1) == 0 and self.overflow:
+            self._backlog.extend(self.overflow)
+            self.overflow = []
+        for level in range(len(self.levels) - 1, 0, -1):
+            if self.current & ((1 << (self.bits * level)) - 1) == 0:
+                self._take(level)
+        self._collect = True
+
+    def advance(self, now, limit=0):
+        """
+        走到 now 所在的 tick, 返回此前到期的条目
+        limit 非 0 时本次最多下放 limit 个条目; 未下放完时返回已到期的部分, cascading 非 0
+        """
+        target = int(now // self.tick)
+        due = self._due
+        self._due = []
+        budget = limit or -1
+        while True:
+            if self._backlog:
+                count = len(self._backlog) if budget < 0 else min(budget, len(self._backlog))
+                for _ in range(count):
+                    self._place(*self._backlog.pop())
+                self.cascaded += count
+                if budget >= 0:
+                    budget -= count
+                if self._backlog:
+                    break
+            if self._collect:
+                slot = self.current & self.mask
+                due.extend(item for _, item in self.levels[0][slot])
+                self._sizes[0] -= len(self.levels[0][slot])
+                self.levels[0][slot] = []
+                due.extend(self._due)
+                self._due = []
+                self._collect = False
+            if self.current >= target:
+                break
+            if self._count == len(due):
+                # 轮中没有条目, 直接跳到目标 tick
+                self.current = target
+                break
+            self._step(target)
+        self._count -= len(due)
+        return due
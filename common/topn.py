@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+畅销商品排行 (TopSellers)
+每次成功下单在 count-min sketch 中累加件数, 同时维护每个类别 (以及全部类别) 的 N 个候选的最小堆:
+    - sketch 为 depth 行 × width 列的计数器, 按时间切成 slices 个子窗口, 每个子窗口一个预先分配的 array('i');
+      估计值为各子窗口中 depth 行的最小值之和, 只会高估, 以概率 1 - e^-depth 高估不超过 e / width × 窗口内总件数
+    - 滑动窗口: 当前子窗口到期时清零最旧的子窗口并重新估计全部候选, 窗口外的销量整体移出
+    - 候选堆有界 (每个类别 N 个, 最多 max_categories 个类别), 新 SKU 的估计值超过堆顶时替换堆顶
+内存 = sketch + 候选表, 启动时即确定, 与目录大小无关
+TOPN_SIZE 为 0 时不记录
+"""
+
+import array
+import heapq
+import random
+import threading
+import time
+
+from common.config import env_int
+
+
+# 全部类别的总排行
+ALL = ""
+
+_MASK64 = (1 << 64) - 1
+
+
+class CountMinSketch:
+    """按时间切片的 count-min sketch (不加锁, 由 TopSellers 持有锁调用)"""
+
+    def __init__(self, width, depth, slices):
+        # 列数取 2 的幂, 下标取乘积的高位
+        self.width = 1 << max(width - 1, 1).bit_length()
+        self.depth = depth
+        self.shift = 64 - (self.width.bit_length() - 1)
+        # 每行 (起始下标, 奇数乘数), 乘数固定种子生成
+        rng = random.Random(depth)
+        self.rows = [(row * self.width, rng.getrandbits(64) | 1) for row in range(depth)]
+        self.slices = [array.array("i", bytes(4 * self.width * depth)) for _ in range(slices)]
+        # 每个子窗口的总件数 (用于误差上界)
+        self.totals = [0] * slices
+        self.current = 0
+
+    def nbytes(self):
+        return sum(counters.itemsize * len(counters) for counters in self.slices)
+
+    def _cells(self, key):
+        # 一次 hash() 经每行各自的乘法-移位哈希得到 depth 个下标; 不能用 h1 + row * h2 的双重哈希,
+        # 那样列数较小时两个键在所有行同时碰撞的概率只有 1 / width^2
+        h = hash(key) & _MASK64
+        return [offset + (((h * multiplier) & _MASK64) >> self.shift) for offset, multiplier in self.rows]
+
+    def add(self, key, count):
+        """累加到当前子窗口, 返回整个窗口的估计值"""
+        counters = self.slices[self.current]
+        cells = self._cells(key)
+        for cell in cells:
+            counters[cell] += count
+        self.totals[self.current] += count
+        return self._estimate(cells)
+
+    def estimate(self, key):
+        return self._estimate(self._cells(key))
+
+    def _estimate(self, cells):
+        return sum(min(counters[cell] for cell in cells) for counters in self.slices)
+
+    def rotate(self):
+        """进入下一个子窗口: 清零其中最旧的数据"""
+        self.current = (self.current + 1) % len(self.slices)
+        self.slices[self.current] = array.array("i", bytes(4 * self.width * self.depth))
+        self.totals[self.current] = 0
+
+    def error_bound(self):
+        """估计值的高估上界 e / width × 窗口内总件数 (概率 1 - e^-depth)"""
+        return int(2.718281828 / self.width * max(sum(self.totals), 0)) + 1
+
+
+class _Candidates:
+    """一个排行的候选: 键 -> 估计值, 加上惰性删除的最小堆 (过期条目在出堆时丢弃)"""
+
+    def __init__(self, size):
+        self.size = size
+        self.counts = {}
+        self.heap = []
+
+    def offer(self, key, estimate):
+        counts = self.counts
+        if estimate <= 0:
+            # 回滚后没有销量的候选移出排行
+            counts.pop(key, None)
+            return
+        if key in counts or len(counts) < self.size:
+            counts[key] = estimate
+        elif estimate > self._min():
+            del counts[heapq.heappop(self.heap)[1]]
+            counts[key] = estimate
+        else:
+            return
+        heapq.heappush(self.heap, (estimate, key))
+        # 过期条目过多时按当前值重建
+        if len(self.heap) > 4 * self.size:
+            self.rebuild()
+
+    def _min(self):
+        heap = self.heap
+        while heap[0][1] not in self.counts or self.counts[heap[0][1]] != heap[0][0]:
+            heapq.heappop(heap)
+        return heap[0][0]
+
+    def rebuild(self):
+        self.heap = [(estimate, key) for key, estimate in self.counts.items()]
+        heapq.heapify(self.heap)
+
+
+class TopSellers:
+    """按类别的滑动窗口畅销排行"""
+
+    def __init__(self, size=10, width=2048, depth=4, window=3600, slices=6, max_categories=64, clock=time.time):
+        self.size = size
+        self.window = window
+        self.slice_seconds = window / slices
+        self.max_categories = max_categories
+        self.clock = clock
+        self.sketch = CountMinSketch(width, depth, slices)
+        # 类别 -> 候选 (ALL 为全部类别的总排行)
+        self._rankings = {ALL: _Candidates(size)}
+        self._slice = int(clock() // self.slice_seconds)
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.rotations = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        按环境变量创建:
+            TOPN_SIZE            每个排行保留的条数 (默认 10, 0 为不记录)
+            TOPN_WIDTH           sketch 列数, 取整到 2 的幂 (默认 2048)
+            TOPN_DEPTH           sketch 行数 (默认 4)
+            TOPN_WINDOW_SECONDS  滑动窗口长度 (默认 3600)
+            TOPN_SLICES          窗口切分的子窗口数, 即窗口滑动的粒度 (默认 6)
+            TOPN_MAX_CATEGORIES  单独排行的类别数上限, 超出的类别只计入总排行 (默认 64)
+        """
+        return cls(env_int("TOPN_SIZE", 10), env_int("TOPN_WIDTH", 2048), env_int("TOPN_DEPTH", 4),
+                   env_int("TOPN_WINDOW_SECONDS", 3600), env_int("TOPN_SLICES", 6),
+                   env_int("TOPN_MAX_CATEGORIES", 64))
+
+    def _advance(self):
+        """按时钟轮换子窗口 (持有 self._lock)"""
+        current = int(self.clock() // self.slice_seconds)
+        if current <= self._slice:
+            return
+        # 空闲超过一个窗口时最多清零一圈
+        for _ in range(min(current - self._slice, len(self.sketch.slices))):
+            self.sketch.rotate()
+            self.rotations += 1
+        self._slice = current
+        for ranking in self._rankings.values():
+            for key in list(ranking.counts):
+                estimate = self.sketch.estimate(key)
+                if estimate > 0:
+                    ranking.counts[key] = estimate
+                else:
+                    del ranking.counts[key]
+            ranking.rebuild()
+
+    def record(self, path, quantity):
+        """
+        记录一次成功下单 (或预留) 的件数, 回滚时为负数
+
+        Args:
+            path: 库存路径, 第一段为类别
+        """
+        if not self.size:
+            return
+        key = "/".join(path)
+        with self._lock:
+            self._advance()
+            estimate = self.sketch.add(key, quantity)
+            self.recorded += 1
+            self._rankings[ALL].offer(key, estimate)
+            ranking = self._rankings.get(path[0])
+            if ranking is None:
+                if len(self._rankings) > self.max_categories:
+                    return
+                ranking = self._rankings[path[0]] = _Candidates(self.size)
+            ranking.offer(key, estimate)
+
+    def top(self, category=ALL, limit=0):
+        """排行 [(键, 估计件数)], 按件数降序; 没有该类别时返回空列表"""
+        with self._lock:
+            self._advance()
+            ranking = self._rankings.get(category)
+            if ranking is None:
+                return []
+            # 候选的值只在该 SKU 下单时更新, 返回前按 sketch 重新估计
+            entries = sorted(((key, self.sketch.estimate(key)) for key in ranking.counts),
+                             key=lambda entry: (-entry[1], entry[0]))
+        return entries[:limit] if limit else entries
+
+    def error_bound(self):
+        with self._lock:
+            return self.sketch.error_bound()
+
+    def stats(self):
+        """排行指标"""
+        with self._lock:
+            return {
+                "recorded": self.recorded,
+                "rotations": self.rotations,
+                "categories": len(self._rankings) - 1,
+                "candidates": sum(len(ranking.counts) for ranking in self._rankings.values()),
+                "window_units": sum(self.sketch.totals),
+                "memory_bytes": self.sketch.nbytes(),
+            }
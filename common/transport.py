@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+服务的监听与连接地址
+地址为 host:port (TCP) 或 unix:路径 (Unix 域套接字, gRPC 原生支持: unix:相对路径 / unix:///绝对路径)。
+同一台机器上的层间调用可以改用 Unix 域套接字, 不经过 TCP 回环的协议栈:
+    - SERVICE_SOCKET 服务在 TCP 端口之外再监听的套接字, 如 unix:/run/warehouse/fresh.sock
+    - 每一跳的下游地址单独配置, 未设置时使用 docker-compose 的服务名与端口:
+        FOOD_SERVICE_ADDR / ELECTRONICS_SERVICE_ADDR   (API Gateway)
+        FRESH_SERVICE_ADDR                             (FoodService)
+        APPLIANCE_SERVICE_ADDR                         (ElectronicsService)
+热备的 STANDBY_OF / FRESH_STANDBY / APPLIANCE_STANDBY 同样接受 unix: 地址
+"""
+
+import os
+import stat
+
+import grpc
+
+from common.config import env_str
+
+
+UNIX_PREFIX = "unix:"
+
+
+def is_unix(address):
+    return address.startswith(UNIX_PREFIX)
+
+
+def unix_address(path):
+    """'/run/x.sock' 或 'unix:/run/x.sock' -> 'unix:/run/x.sock'"""
+    return path if is_unix(path) else f"{UNIX_PREFIX}{path}"
+
+
+def socket_path(address):
+    """'unix:/run/x.sock' / 'unix:///run/x.sock' -> '/run/x.sock'"""
+    path = address[len(UNIX_PREFIX):]
+    return path[2:] if path.startswith("//") else path
+
+
+def listen(server, port, socket=""):
+    """
+    监听 TCP 端口, socket 非空时再监听 Unix 域套接字 (先删除上次运行留下的套接字文件)
+
+    Returns:
+        监听的地址列表, 用于启动日志
+    """
+    addresses = [f"[::]:{port}"]
+    server.add_insecure_port(addresses[0])
+    if socket:
+        address = unix_address(socket)
+        path = socket_path(address)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            if stat.S_ISSOCK(os.stat(path).st_mode):
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        server.add_insecure_port(address)
+        addresses.append(address)
+    return addresses
+
+
+def dial_env(name):
+    """按环境变量 name 给出的下游地址建立通道, 未设置时返回 None (由服务使用默认的主机名与端口)"""
+    address = env_str(name)
+    return grpc.insecure_channel(address) if address else None
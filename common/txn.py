@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+两阶段提交 - 参与者 (底层服务) 一侧
+PrepareOrder 一次性检查并扣减所有行的库存, 记录预留;
+CommitOrder 丢弃预留记录, AbortOrder 归还库存。
+库存通过 InventoryStore 访问; 以下函数与类都不加锁, 调用方需持有服务的库存锁
+"""
+
+import collections
+
+
+PREPARED = "prepared"
+COMMITTED = "committed"
+ABORTED = "aborted"
+
+
+def reserve_lines(store, lines, held=None):
+    """
+    检查并扣减一组订单行, 全部满足才修改库存
+
+    Args:
+        lines: [(path, quantity)], 同一路径可出现多次
+        held: 路径 -> 购物车预留的件数 (common/holds.py), 按 在库 - 预留 检查
+
+    Returns:
+        ([(status, left)], 总状态), 总状态为 ok 或第一个失败行的状态
+    """
+    demand = collections.Counter()
+    for path, quantity in lines:
+        demand[path] += quantity
+
+    results = []
+    status = "ok"
+    for path, quantity in lines:
+        current = store.get(path)
+        if current is None:
+            line_status = "item not found"
+        elif current - (held(path) if held else 0) < demand[path] or quantity <= 0:
+            line_status = "out of stock"
+        else:
+            line_status = "ok"
+        if line_status != "ok" and status == "ok":
+            status = line_status
+        results.append([line_status, 0])
+
+    if status == "ok":
+        left = {path: store.add(path, -quantity) for path, quantity in demand.items()}
+        for result, (path, _) in zip(results, lines):
+            result[1] = left[path]
+    return [tuple(result) for result in results], status
+
+
+def release_lines(store, lines):
+    """归还预留的库存, 返回 {path: 归还后的数量}"""
+    return {path: store.add(path, quantity) for path, quantity in lines}
+
+
+class TransactionLog:
+    """
+    参与者的事务状态
+    prepared 保存尚未结束的预留; 已结束的事务保留有限数量的墓碑,
+    用于幂等地处理重复的 Commit/Abort 以及迟到的 Prepare
+    """
+
+    def __init__(self, max_finished=10000):
+        self.prepared = {}
+        self.max_finished = max_finished
+        self._finished = collections.OrderedDict()
+
+    def state(self, txn_id):
+        if txn_id in self.prepared:
+            return PREPARED
+        return self._finished.get(txn_id)
+
+    def _finish(self, txn_id, state):
+        self._finished[txn_id] = state
+        while len(self._finished) > self.max_finished:
+            self._finished.popitem(last=False)
+
+    def add_prepared(self, txn_id, lines):
+        self.prepared[txn_id] = lines
+
+    def commit(self, txn_id):
+        """提交事务, 返回 (是否成功, 说明)"""
+        state = self.state(txn_id)
+        if state == PREPARED:
+            del self.prepared[txn_id]
+            self._finish(txn_id, COMMITTED)
+            return True, "committed"
+        if state == COMMITTED:
+            return True, "already committed"
+        if state == ABORTED:
+            return False, "transaction was aborted"
+        return False, "unknown transaction"
+
+    def abort(self, txn_id):
+        """回滚事务, 返回需要归还的订单行 (未预留过则为空)"""
+        state = self.state(txn_id)
+        if state == COMMITTED:
+            return None
+        lines = self.prepared.pop(txn_id, [])
+        # 未知事务也记录墓碑, 使迟到的 Prepare 被拒绝
+        self._finish(txn_id, ABORTED)
+        return lines
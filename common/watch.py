@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+库存变更流 (WatchInventory)
+底层服务在持有库存锁时发布变更, 每个订阅者有独立的有界缓冲:
+    - 同一个键的多次变更在缓冲中合并, 只保留最新值
+    - 缓冲中待发送的键超过上限时断开慢消费者
+    - 最近的变更保存在环形历史中, 支持从序号续传
+同时按键记录最后一次变更的序号, 作为 UpdateItem 比较并设置所用的版本号
+热备 (common/replication.py) 订阅主机的变更流, 在备机上按主机的序号重放, 提升后序号与版本号保持连续
+"""
+
+import collections
+import threading
+import time
+
+import grpc
+
+import warehouse_pb2
+
+
+class ResumeError(Exception):
+    """续传点已不在历史范围内, 客户端需要重新扫描后再订阅"""
+
+
+class SlowConsumer(Exception):
+    """订阅者消费过慢, 缓冲溢出"""
+
+
+class Subscription:
+    """单个订阅者的合并缓冲"""
+
+    def __init__(self, feed, prefixes, max_pending):
+        self.feed = feed
+        self.prefixes = tuple(prefixes)
+        self.max_pending = max_pending
+        self.pending = collections.OrderedDict()
+        self.overflowed = False
+        self.closed = False
+        self.coalesced = 0
+
+    def matches(self, key):
+        return not self.prefixes or key.startswith(self.prefixes)
+
+    def offer(self, delta):
+        """加入一条变更 (调用方持有 feed 锁)"""
+        key = delta[1]
+        if key in self.pending:
+            # 移到末尾, 让缓冲始终按序号排列, 分批发送时续传点不会越过未发送的变更
+            del self.pending[key]
+            self.coalesced += 1
+        elif len(self.pending) >= self.max_pending:
+            self.overflowed = True
+            return
+        self.pending[key] = delta
+
+    def next_batch(self, timeout=1.0, max_batch=500):
+        """
+        取出一批待发送的变更 (按序号递增); 超时返回空列表, 订阅关闭返回 None
+
+        Raises:
+            SlowConsumer: 缓冲曾经溢出
+        """
+        with self.feed.changed:
+            if not self.pending and not self.closed and not self.overflowed:
+                self.feed.changed.wait(timeout)
+            if self.overflowed:
+                raise SlowConsumer(f"more than {self.max_pending} keys pending")
+            if self.closed:
+                return None
+            batch = []
+            while self.pending and len(batch) < max_batch:
+                batch.append(self.pending.popitem(last=False)[1])
+        return batch
+
+    def close(self):
+        self.feed.unsubscribe(self)
+
+
+class ChangeFeed:
+    """
+    一个底层服务的变更源
+    变更记录为元组 (seq, key, count, deleted, op, timestamp)
+    """
+
+    def __init__(self, source, history_size=10000, max_pending=10000, max_versions=1000000):
+        self.source = source
+        self.max_pending = max_pending
+        self.history = collections.deque(maxlen=history_size)
+        self.seq = 0
+        # 键 -> 最后一次变更的序号, 按变更先后排列; 超出上限时淘汰最久未变的键,
+        # 其序号并入 version_floor (未记录的键都取这个值), 版本号只增不减, 不会出现 ABA
+        self.versions = collections.OrderedDict()
+        self.max_versions = max_versions
+        self.version_floor = 0
+        self.versions_evicted = 0
+        # 版本号 = epoch + 序号; epoch 为启动时的微秒时间戳, 重启前发出的版本号都更小, 不会误匹配
+        self.epoch = time.time_ns() // 1000
+        self.subscribers = []
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)
+        self.published = 0
+        self.disconnected = 0
+
+    def publish(self, path, count, op, deleted=False):
+        """记录一条变更并分发给匹配的订阅者 (调用方应持有库存锁以保证顺序)"""
+        key = "/".join(path)
+        with self.lock:
+            self.seq += 1
+            self._record((self.seq, key, count, deleted, op, time.time()))
+
+    def apply(self, delta):
+        """重放主机的一条变更 (热备), 序号沿用主机的; 调用方持有库存锁"""
+        with self.lock:
+            self.seq = delta[0]
+            self._record(delta)
+
+    def reset(self, seq, epoch, version_floor, versions):
+        """用主机的快照替换序号与版本号 (热备全量同步), 清空历史; versions 为 键 -> 序号"""
+        with self.lock:
+            self.seq = seq
+            self.epoch = epoch
+            self.version_floor = version_floor
+            self.versions = collections.OrderedDict(sorted(versions.items(), key=lambda item: item[1]))
+            self.history.clear()
+
+    def _record(self, delta):
+        """记录变更并分发 (调用方持有 self.lock)"""
+        key = delta[1]
+        self.history.append(delta)
+        self.published += 1
+        if key in self.versions:
+            self.versions.move_to_end(key)
+        self.versions[key] = delta[0]
+        if len(self.versions) > self.max_versions:
+            self.version_floor = self.versions.popitem(last=False)[1]
+            self.versions_evicted += 1
+        notify = False
+        for subscription in self.subscribers:
+            if subscription.matches(key):
+                subscription.offer(delta)
+                notify = True
+        if notify:
+            self.changed.notify_all()
+
+    def version(self, path):
+        """键的当前版本号 (调用方持有库存锁, 与 publish 互斥)"""
+        return self.epoch + self.versions.get("/".join(path), self.version_floor)
+
+    def subscribe(self, prefixes, resume_from=None, max_pending=None):
+        """
+        新建订阅; resume_from 为客户端最后收到的序号, 会先补发其后的历史变更;
+        max_pending 为缓冲上限, 默认为 feed 的 max_pending
+
+        Raises:
+            ResumeError: 续传点早于保留的历史或晚于当前序号 (服务已重启)
+        """
+        with self.lock:
+            subscription = Subscription(self, prefixes, max_pending or self.max_pending)
+            if resume_from is not None:
+                oldest = self.history[0][0] if self.history else self.seq + 1
+                if resume_from > self.seq or resume_from < oldest - 1:
+                    raise ResumeError(
+                        f"cannot resume {self.source} from seq {resume_from}: "
+                        f"history covers {oldest}..{self.seq}, rescan and watch again")
+                for delta in self.history:
+                    if delta[0] > resume_from and subscription.matches(delta[1]):
+                        subscription.offer(delta)
+            self.subscribers.append(subscription)
+            return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            if subscription.closed:
+                return
+            subscription.closed = True
+            if subscription.overflowed:
+                self.disconnected += 1
+            self.subscribers.remove(subscription)
+            self.changed.notify_all()
+
+    def stats(self):
+        """变更流指标"""
+        with self.lock:
+            return {
+                "seq": self.seq,
+                "published": self.published,
+                "subscribers": len(self.subscribers),
+                "pending": sum(len(s.pending) for s in self.subscribers),
+                "coalesced": sum(s.coalesced for s in self.subscribers),
+                "slow_consumer_disconnects": self.disconnected,
+                "versions": len(self.versions),
+                "versions_evicted": self.versions_evicted,
+            }
+
+
+def make_delta(source, delta):
+    """变更元组 -> InventoryDelta"""
+    seq, key, count, deleted, op, timestamp = delta
+    path = key.split("/")
+    return warehouse_pb2.InventoryDelta(
+        seq=seq,
+        source=source,
+        category=path[0],
+        subcategory=path[1] if len(path) > 1 else "",
+        item=path[2] if len(path) > 2 else "",
+        count=count,
+        deleted=deleted,
+        op=op,
+        timestamp=timestamp,
+    )
+
+
+def stream_deltas(feed, request, context):
+    """WatchInventory 的底层实现: 订阅 feed 并按批推送, 直到客户端断开"""
+    prefixes = [prefix.lower() for prefix in request.prefixes]
+    resume_from = request.resume_from[feed.source] if feed.source in request.resume_from else None
+    try:
+        subscription = feed.subscribe(prefixes, resume_from)
+    except ResumeError as e:
+        context.abort(grpc.StatusCode.OUT_OF_RANGE, str(e))
+    context.add_callback(subscription.close)
+    try:
+        while context.is_active():
+            batch = subscription.next_batch(max_batch=request.max_batch or 500)
+            if batch is None:
+                return
+            if batch:
+                yield warehouse_pb2.WatchInventoryResponse(
+                    deltas=[make_delta(feed.source, delta) for delta in batch])
+    except SlowConsumer as e:
+        subscription.close()
+        context.abort(grpc.StatusCode.RESOURCE_EXHAUSTED, f"slow consumer disconnected: {e}")
+    finally:
+        subscription.close()
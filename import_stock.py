@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Stock Import Client
+从 CSV / JSONL 文件批量导入期初库存, 通过 API Gateway 的 ImportStock 客户端流发送
+
+文件格式 (列 / 字段): category, subcategory, item, quantity
+    CSV:   category,subcategory,item,quantity
+           fruits,apple,,500
+           kitchen,refrigerator,oven,20
+    JSONL: {"category": "fruits", "subcategory": "apple", "quantity": 500}
+quantity 必填且为整数; 0 与负数照常发送, 由服务端计入 rejected。无法解析的行 (缺少列、数量不是整数) 打印后跳过
+
+示例:
+    python import_stock.py opening_stock.csv --target localhost:50050 --chunk-size 5000
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+import grpc
+
+import warehouse_pb2
+import warehouse_pb2_grpc
+
+
+def _quantity(value):
+    """数量必须是整数 (JSON 的小数、布尔值不接受)"""
+    if isinstance(value, (bool, float)):
+        raise ValueError(f"quantity {value!r} is not an integer")
+    return int(value)
+
+
+def read_rows(path, fmt, progress):
+    """逐行读取文件, 生成 StockRow; 无法解析的行打印文件名与行号后跳过, 计入 progress.skipped"""
+    with open(path, newline="") as f:
+        if fmt == "csv":
+            reader = csv.DictReader(f)
+            records = ((reader.line_num, record) for record in reader)
+        else:
+            records = ((number, line) for number, line in enumerate(f, 1) if line.strip())
+        for number, record in records:
+            try:
+                if fmt != "csv":
+                    record = json.loads(record)
+                row = warehouse_pb2.StockRow(
+                    category=record["category"],
+                    subcategory=record["subcategory"],
+                    item=record.get("item") or "",
+                    quantity=_quantity(record["quantity"]),
+                )
+            except (KeyError, TypeError, ValueError) as e:
+                progress.skipped += 1
+                print(f"   ⚠️ {path}:{number}: skipped unparsable row ({type(e).__name__}: {e})")
+                continue
+            yield row
+
+
+class ImportProgress:
+    """导入进度与吞吐量统计"""
+
+    def __init__(self, report_every):
+        self.report_every = report_every
+        self.started = time.time()
+        self.rows = 0
+        self.chunks = 0
+        self.skipped = 0
+
+    def update(self, rows):
+        self.rows += rows
+        self.chunks += 1
+        if self.chunks % self.report_every == 0:
+            elapsed = time.time() - self.started
+            print(f"   📦 {self.chunks} chunks, {self.rows} rows sent, {self.rows / max(elapsed, 1e-9):,.0f} rows/s")
+
+    def elapsed(self):
+        return time.time() - self.started
+
+
+def make_chunks(paths, fmt, chunk_size, progress):
+    """把所有文件的行按 chunk_size 分组成 ImportStockChunk 流"""
+    rows = []
+    for path in paths:
+        file_fmt = fmt or ("jsonl" if path.endswith((".jsonl", ".json")) else "csv")
+        print(f"📄 Reading {path} ({file_fmt})")
+        for row in read_rows(path, file_fmt, progress):
+            rows.append(row)
+            if len(rows) >= chunk_size:
+                progress.update(len(rows))
+                yield warehouse_pb2.ImportStockChunk(rows=rows)
+                rows = []
+    if rows:
+        progress.update(len(rows))
+        yield warehouse_pb2.ImportStockChunk(rows=rows)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Bulk import opening stock through the API Gateway")
+    parser.add_argument("files", nargs="+", help="CSV or JSONL files")
+    parser.add_argument("--target", default="localhost:50050", help="API Gateway host:port")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="override format detection")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="rows per streamed chunk")
+    parser.add_argument("--report-every", type=int, default=10, help="print progress every N chunks")
+    args = parser.parse_args()
+
+    progress = ImportProgress(args.report_every)
+    with grpc.insecure_channel(args.target) as channel:
+        stub = warehouse_pb2_grpc.OrderServiceStub(channel)
+        print(f"🚚 Importing into {args.target}, {args.chunk_size} rows per chunk")
+        try:
+            response = stub.ImportStock(make_chunks(args.files, args.format, args.chunk_size, progress))
+        except grpc.RpcError as e:
+            print(f"❌ gRPC error: {e.code()} {e.details()}")
+            return 1
+
+    elapsed = progress.elapsed()
+    print(f"{'✅' if response.success else '❌'} {response.message}")
+    print(f"📊 {progress.rows} rows sent, {response.rows_applied} applied, {response.rows_rejected} rejected, "
+          f"+{response.units_added} units")
+    if progress.skipped:
+        print(f"⚠️ {progress.skipped} unparsable rows skipped")
+    print(f"⏱️ {elapsed:.2f}s total, {progress.rows / max(elapsed, 1e-9):,.0f} rows/s")
+    return 0 if response.success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
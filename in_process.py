@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+进程内拓扑
+在一个进程中组装全部五个服务:
+    APIGateway → FoodService → FreshService
+               → ElectronicsService → ApplianceService
+每层与独立进程部署时一样注册 AdminService、拦截器与指标, 只是层间传输可以替换:
+    - transport="inprocess": InProcessChannel 直接调用下一层的处理函数, 没有网络与线程切换
+      (serialize=True 时仍做 protobuf 往返, 计入编解码开销)
+    - transport="grpc": 每层一个监听 localhost 随机端口的 grpc.server, 用于对比网络开销
+用于测量处理函数自身的开销 (benchmarks/inprocess_bench.py), 以及不依赖 Docker 的回归排查
+"""
+
+from concurrent import futures
+
+import grpc
+
+import warehouse_pb2_grpc
+from api_gateway import APIGateway
+from common.admin import AdminService
+from common.admission import AdmissionController, AdmissionInterceptor
+from common.inprocess import InProcessServer
+from common.scheduling import MethodScheduler, SchedulingInterceptor
+from services.appliance_service import ApplianceService
+from services.electronics_service import ElectronicsService
+from services.food_service import FoodService
+from services.fresh_service import FreshService
+
+
+class InProcessTopology:
+    """
+    进程内的完整服务拓扑
+    self.stub 是连接网关的 OrderServiceStub; admin_stub(name) 返回某一层的 AdminServiceStub
+    """
+
+    def __init__(self, transport="inprocess", serialize=False, fresh_service=None, appliance_service=None,
+                 admission=None):
+        if transport not in ("inprocess", "grpc"):
+            raise ValueError(f"unknown transport: {transport!r}")
+        self.transport = transport
+        self.serialize = serialize
+        self.servers = {}
+        self._channels = {}
+        self._ports = {}
+
+        # 底层服务的读写分池调度 (进程内模式下由调用方线程占用槽位)
+        self.schedulers = {"FreshService": MethodScheduler.from_env(), "ApplianceService": MethodScheduler.from_env()}
+        self.fresh = fresh_service or FreshService()
+        self._serve("FreshService", self.fresh, {
+            "dedup": self.fresh.dedup.stats,
+            "watch": self.fresh.feed.stats,
+            "events": self.fresh.events.stats,
+            "store": self.fresh.store.stats,
+            "history": self.fresh.history.stats,
+            "topn": self.fresh.top_sellers.stats,
+            "lots": self.fresh.lots.stats,
+            "holds": self.fresh.holds.stats,
+            "pools": self.schedulers["FreshService"].stats,
+        }, [SchedulingInterceptor(self.schedulers["FreshService"])])
+        self.appliance = appliance_service or ApplianceService()
+        self._serve("ApplianceService", self.appliance, {
+            "dedup": self.appliance.dedup.stats,
+            "watch": self.appliance.feed.stats,
+            "store": self.appliance.store.stats,
+            "history": self.appliance.history.stats,
+            "topn": self.appliance.top_sellers.stats,
+            "serials": self.appliance.serials.stats,
+            "holds": self.appliance.holds.stats,
+            "pools": self.schedulers["ApplianceService"].stats,
+        }, [SchedulingInterceptor(self.schedulers["ApplianceService"])])
+        self.food = FoodService(fresh_service_channel=self.channel("FreshService"))
+        self._serve("FoodService", self.food)
+        self.electronics = ElectronicsService(appliance_service_channel=self.channel("ApplianceService"))
+        self._serve("ElectronicsService", self.electronics)
+        self.gateway = APIGateway(food_service_channel=self.channel("FoodService"),
+                                  electronics_service_channel=self.channel("ElectronicsService"))
+        self.admission = admission or AdmissionController.from_env()
+        self._serve("APIGateway", self.gateway, {"admission": self.admission.stats},
+                    [AdmissionInterceptor(self.admission)])
+
+        self.stub = warehouse_pb2_grpc.OrderServiceStub(self.channel("APIGateway"))
+        print(f"🎯 In-process topology ready ({transport}{', serialized' if serialize and transport == 'inprocess' else ''})")
+
+    def _serve(self, name, servicer, metrics=None, interceptors=()):
+        """与 run_*_service 相同的注册方式: AdminService + 拦截器 + 指标"""
+        admin_service = AdminService(name)
+        for metric_name, provider in (metrics or {}).items():
+            admin_service.register_metrics(metric_name, provider)
+        interceptors = list(interceptors) + [admin_service.interceptor, admin_service.fault_interceptor]
+        if self.transport == "inprocess":
+            server = InProcessServer(interceptors=interceptors)
+        else:
+            server = grpc.server(futures.ThreadPoolExecutor(max_workers=10), interceptors=interceptors)
+            self._ports[name] = server.add_insecure_port("localhost:0")
+        warehouse_pb2_grpc.add_OrderServiceServicer_to_server(servicer, server)
+        warehouse_pb2_grpc.add_AdminServiceServicer_to_server(admin_service, server)
+        if self.transport == "grpc":
+            server.start()
+        self.servers[name] = server
+
+    def channel(self, name):
+        """连接某一层的通道 (同一层共用一个)"""
+        if name not in self._channels:
+            if self.transport == "inprocess":
+                self._channels[name] = self.servers[name].channel(self.serialize)
+            else:
+                self._channels[name] = grpc.insecure_channel(f"localhost:{self._ports[name]}")
+        return self._channels[name]
+
+    def admin_stub(self, name):
+        return warehouse_pb2_grpc.AdminServiceStub(self.channel(name))
+
+    def close(self):
+        """自上而下关闭各层"""
+        self.gateway.close()
+        self.food.close()
+        self.electronics.close()
+        for name in ("APIGateway", "FoodService", "ElectronicsService", "FreshService", "ApplianceService"):
+            self.servers[name].stop(0)
+        for channel in self._channels.values():
+            channel.close()
+        self.fresh.stop_lot_expiry()
+        self.fresh.stop_hold_expiry()
+        self.appliance.stop_hold_expiry()
+        self.fresh.events.close()
+        self.fresh.store.close()
+        self.appliance.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
@@ -9,10 +9,18 @@ import grpc
 import time
 import signal
 import sys
+import threading
 from concurrent import futures
 
 import warehouse_pb2
 import warehouse_pb2_grpc
+from common import dedup, history, holds, replication, serials, sku, topn, transport, txn, watch
+from common.admin import AdminService
+from common.config import env_int, env_str
+from common.scheduling import MethodScheduler, SchedulingInterceptor
+from common import columnar
+from common.inventory import scan_chunks, split_key
+from common.store import open_store
 
 
 class ApplianceService(warehouse_pb2_grpc.OrderServiceServicer):
@@ -21,52 +29,135 @@ class ApplianceService(warehouse_pb2_grpc.OrderServiceServicer):
     处理家电类别的库存管理
     """
     
-    def __init__(self):
+    def __init__(self, dedup_cache=None, store=None, stock_history=None, top_sellers=None, serial_tracker=None,
+                 hold_table=None, standby_of=None):
         """Initialize ApplianceService"""
-        self.inventory = {
+        # 每个子类别下的默认商品与子类别同名 (旧格式的 UpdateItem 没有商品名, 按此约定定位商品)
+        seed = {
             "kitchen": {
-                "refrigerator": 5,
-                "microwave": 8,
-                "dishwasher": 3
+                "refrigerator": {"refrigerator": 5},
+                "microwave": {"microwave": 8},
+                "dishwasher": {"dishwasher": 3}
             },
             "living": {
-                "tv": 12,
-                "sofa": 6,
-                "coffee_table": 4
+                "tv": {"tv": 12},
+                "sofa": {"sofa": 6},
+                "coffee_table": {"coffee_table": 4}
             }
         }
+        # 库存存储 (后端由 INVENTORY_BACKEND 选择), 路径为 (category, subcategory, item)
+        self.store = store or open_store("appliance", depth=3, seed=seed)
+        # 保护库存的写操作及快照
+        self.lock = threading.Lock()
+        # 变更类 RPC 的幂等去重缓存
+        self.dedup = dedup_cache or dedup.DedupCache.from_env()
+        # 两阶段提交 (Checkout) 的事务状态
+        self.txns = txn.TransactionLog()
+        # 库存变更流 (WatchInventory), 在持有 self.lock 时发布以保证顺序
+        self.feed = watch.ChangeFeed("appliance")
+        # 每个 SKU 的库存时间序列 (HISTORY_MAX_SKUS 为 0 时不记录), 在持有 self.lock 时记录
+        self.history = stock_history or history.StockHistory.from_env()
+        # 滑动窗口畅销排行 (TopSellers), 自带锁, 在库存锁外记录
+        self.top_sellers = top_sellers or topn.TopSellers.from_env()
+        # 在库序列号 (PutItem 的 serials), 在持有 self.lock 时修改; 预留中的事务 -> [(路径, 序列号)]
+        self.serials = serial_tracker or serials.SerialTracker.from_env(lock=self.lock)
+        self._txn_serials = {}
+        # 购物车预留 (Reserve), 在持有 self.lock 时修改; 到期预留由后台线程按 tick 释放
+        self.holds = hold_table or holds.HoldTable.from_env(sku.APPLIANCE)
+        self._hold_expiry_stop = threading.Event()
+        self._hold_expiry = threading.Thread(target=self._expire_holds_loop, name="appliance-holds", daemon=True)
+        self._hold_expiry.start()
+        # 协议 v2 的 SKU 编号 (category, subcategory, item)
+        self.skus = sku.SkuRegistry(sku.APPLIANCE, depth=3)
+        for path, _ in self.store.scan():
+            self.skus.id_for(path)
+        # 热备: standby_of 为主机地址时作为备机, 持续复制主机的库存, 直到中层服务调用 Promote
+        self.standby = None
+        if standby_of:
+            self.standby = replication.Standby.from_env("appliance", self.lock, self.store, self.feed, self.skus, standby_of)
+            print(f"🔁 ApplianceService running as standby of {standby_of}")
         print("🏠 ApplianceService initialized")
     
+    def _idempotent(self, method, request, context, handler, conflict_response, cacheable):
+        """携带幂等键的请求经去重缓存执行, 重试时返回首次执行的结果"""
+        key = request.idempotency_key
+        if not key:
+            return handler(request, context)
+        
+        response, outcome = self.dedup.execute(
+            method, key, request.SerializeToString(deterministic=True),
+            lambda: handler(request, context), cacheable)
+        if outcome == dedup.HIT:
+            print(f"♻️ [REPLAY] ApplianceService - {method} idempotency key {key!r}, returning cached response")
+        elif outcome == dedup.CONFLICT:
+            print(f"❌ [CONFLICT] ApplianceService - {method} idempotency key {key!r} reused with a different request")
+            return conflict_response
+        return response
+    
     def PlaceOrder(self, request, context):
+        """处理下单请求 (支持幂等键)"""
+        return self._idempotent(
+            "PlaceOrder", request, context, self._place_order,
+            warehouse_pb2.OrderResponse(status="idempotency key conflict", left=0),
+            lambda response: response.status != "error")
+    
+    def PutItem(self, request, context):
+        """放入货物 (支持幂等键)"""
+        return self._idempotent(
+            "PutItem", request, context, self._put_item,
+            warehouse_pb2.PutItemResponse(success=False, message="Idempotency key conflict"),
+            lambda response: response.success)
+    
+    def UpdateItem(self, request, context):
+        """更新货物 (支持幂等键)"""
+        return self._idempotent(
+            "UpdateItem", request, context, self._update_item,
+            warehouse_pb2.UpdateItemResponse(success=False, message="Idempotency key conflict"),
+            lambda response: response.success)
+    
+    def _request_path(self, request):
+        """请求的库存路径: 协议 v2 按 sku_id 查表, 旧格式解析类别名"""
+        if request.HasField("sku_id"):
+            return self.skus.path(request.sku_id)
+        return request.category.lower(), request.subcategory.lower(), request.item.lower()
+    
+    def _place_order(self, request, context):
         """处理下单请求"""
         try:
-            category = request.category.lower()
-            subcategory = request.subcategory.lower()
-            item = request.item.lower()
+            category, subcategory, item = self._request_path(request)
+            quantity = request.quantity if request.HasField("quantity") else 1
             
             print(f"🏠 [RECEIVED] ApplianceService - PlaceOrder Request:")
             print(f"   📥 Category: {category}")
             print(f"   📥 Subcategory: {subcategory}")
-            print(f"   📥 Item: {item}")
+            print(f"   📥 Item: {item} x{quantity}")
             print(f"   📥 Client IP: {context.peer()}")
             
-            # 检查库存
-            if (category in self.inventory and 
-                subcategory in self.inventory[category] and 
-                item in self.inventory[category][subcategory]):
-                
-                current_stock = self.inventory[category][subcategory][item]
+            if quantity <= 0:
+                raise ValueError(f"invalid quantity {quantity}")
+            # 检查并扣减库存 (加锁保证原子性, 日志在锁外输出)
+            taken = []
+            with self.lock:
+                current_stock, new_stock = holds.take(self.store, self.holds, (category, subcategory, item), quantity)
+                if new_stock is not None:
+                    taken = self.serials.take((category, subcategory, item), quantity)
+                    self.feed.publish((category, subcategory, item), new_stock, "PlaceOrder")
+                    self.history.record((category, subcategory, item), new_stock, quantity)
+            self.store.sync()
+            if new_stock is not None:
+                self.top_sellers.record((category, subcategory, item), quantity)
+            
+            if current_stock is not None:
                 print(f"   📊 Current stock: {current_stock}")
                 
-                if current_stock > 0:
-                    # 减少库存
-                    self.inventory[category][subcategory][item] -= 1
-                    new_stock = self.inventory[category][subcategory][item]
-                    
+                if new_stock is not None:
                     print(f"   ✅ [SENDING] Order successful - Stock reduced to: {new_stock}")
+                    if taken:
+                        print(f"   🔢 Serials: {taken[0]}" + (f" .. {taken[-1]} ({len(taken)})" if len(taken) > 1 else ""))
                     response = warehouse_pb2.OrderResponse(
                         status="ok",
-                        left=new_stock
+                        left=new_stock,
+                        serials=taken
                     )
                     print(f"   📤 Response: status={response.status}, left={response.left}")
                     return response
@@ -97,38 +188,50 @@ class ApplianceService(warehouse_pb2_grpc.OrderServiceServicer):
             print(f"   📤 Response: status={response.status}, left={response.left}")
             return response
     
-    def PutItem(self, request, context):
+    def _put_item(self, request, context):
         """放入货物"""
         try:
-            category = request.category.lower()
-            subcategory = request.subcategory.lower()
-            item = request.item.lower()
+            category, subcategory, item = self._request_path(request)
+            quantity = request.quantity if request.HasField("quantity") else 1
             
             print(f"🏠 [RECEIVED] ApplianceService - PutItem Request:")
             print(f"   📥 Category: {category}")
             print(f"   📥 Subcategory: {subcategory}")
             print(f"   📥 Item: {item}")
+            ranges = [(serial_range.start, serial_range.count) for serial_range in request.serials]
+            if ranges:
+                print(f"   📥 Serial ranges: {len(ranges)} ({sum(count for _, count in ranges)} serials)")
             print(f"   📥 Client IP: {context.peer()}")
             
-            if category not in self.inventory:
-                self.inventory[category] = {}
-                print(f"   📝 Created new category: {category}")
-            if subcategory not in self.inventory[category]:
-                self.inventory[category][subcategory] = {}
-                print(f"   📝 Created new subcategory: {subcategory}")
-            
-            old_count = self.inventory[category][subcategory].get(item, 0)
-            if item in self.inventory[category][subcategory]:
-                self.inventory[category][subcategory][item] += 1
-                print(f"   📈 Incremented existing item: {item} ({old_count} → {self.inventory[category][subcategory][item]})")
+            if not ranges and quantity <= 0:
+                raise ValueError(f"invalid quantity {quantity}")
+            self.serials.validate(ranges)
+            added = duplicates = 0
+            with self.lock:
+                if ranges:
+                    # 带序列号时件数为新入库的序列号个数
+                    added, duplicates = self.serials.add_ranges((category, subcategory, item), ranges)
+                    quantity = added
+                old_count = self.store.get((category, subcategory, item))
+                new_count = self.store.add((category, subcategory, item), quantity)
+                self.feed.publish((category, subcategory, item), new_count, "PutItem")
+                self.history.record((category, subcategory, item), new_count)
+            self.store.sync()
+            
+            if old_count:
+                print(f"   📈 Incremented existing item: {item} ({old_count} → {new_count})")
             else:
-                self.inventory[category][subcategory][item] = 1
-                print(f"   🆕 Added new item: {item} (count: 1)")
+                print(f"   🆕 Added new item: {item} (count: {new_count})")
+            if ranges:
+                print(f"   🔢 Serials: {added} added, {duplicates} already in stock")
             
             print(f"   ✅ [SENDING] PutItem successful")
             response = warehouse_pb2.PutItemResponse(
                 success=True,
                 message=f"Added {item} to {category}/{subcategory}"
+                        + (f" ({added} serials, {duplicates} already in stock)" if ranges else ""),
+                sku_id=self.skus.id_for((category, subcategory, item)),
+                serials_added=added
             )
             print(f"   📤 Response: success={response.success}, message={response.message}")
             return response
@@ -143,34 +246,61 @@ class ApplianceService(warehouse_pb2_grpc.OrderServiceServicer):
             print(f"   📤 Response: success={response.success}, message={response.message}")
             return response
     
-    def UpdateItem(self, request, context):
-        """更新货物"""
+    def _update_item(self, request, context):
+        """更新货物 (旧格式没有商品名, 更新与子类别同名的默认商品)"""
         try:
-            category = request.category.lower()
-            subcategory = request.subcategory.lower()
-            item = request.item
+            if request.HasField("sku_id"):
+                path = self.skus.path(request.sku_id)
+            else:
+                category = request.category.lower()
+                subcategory = request.subcategory.lower()
+                path = (category, subcategory, subcategory)
+            item = request.quantity if request.HasField("quantity") else request.item
             
             print(f"🏠 [RECEIVED] ApplianceService - UpdateItem Request:")
-            print(f"   📥 Category: {category}")
-            print(f"   📥 Subcategory: {subcategory}")
-            print(f"   📥 Item: {item}")
+            print(f"   📥 Category: {path[0]}")
+            print(f"   📥 Subcategory: {path[1]}")
+            print(f"   📥 Item: {path[2]} → {item}")
+            if request.HasField("expected_version"):
+                print(f"   📥 Expected version: {request.expected_version}")
             print(f"   📥 Client IP: {context.peer()}")
             
-            if category not in self.inventory:
-                self.inventory[category] = {}
-                print(f"   📝 Created new category: {category}")
-            if subcategory not in self.inventory[category]:
-                self.inventory[category][subcategory] = 0
-                print(f"   📝 Created new subcategory: {subcategory}")
+            with self.lock:
+                # 比较并设置: 版本不一致时不更新, 返回当前版本与数量
+                version = self.feed.version(path)
+                conflict = request.HasField("expected_version") and version != request.expected_version
+                if conflict:
+                    old_count = self.store.get(path)
+                else:
+                    old_count = self.store.set(path, item)
+                    self.serials.trim(path, item)
+                    self.feed.publish(path, item, "UpdateItem")
+                    self.history.record(path, item)
+                    version = self.feed.version(path)
             
-            old_count = self.inventory[category][subcategory]
-            self.inventory[category][subcategory] = item
-            print(f"   📈 Updated {category}/{subcategory}: {old_count} → {item}")
+            if conflict:
+                print(f"   ⚠️ [SENDING] Version conflict - current version {version}, count {old_count or 0}")
+                response = warehouse_pb2.UpdateItemResponse(
+                    success=False,
+                    message=f"Version conflict on {'/'.join(path)}: "
+                            f"expected {request.expected_version}, current {version}",
+                    version=version,
+                    conflict=True,
+                    current=old_count or 0
+                )
+                print(f"   📤 Response: success={response.success}, message={response.message}")
+                return response
+            self.store.sync()
+            
+            if old_count is None:
+                print(f"   🆕 Added new item: {path[2]}")
+            print(f"   📈 Updated {'/'.join(path)}: {old_count or 0} → {item}")
             
             print(f"   ✅ [SENDING] UpdateItem successful")
             response = warehouse_pb2.UpdateItemResponse(
                 success=True,
-                message=f"Updated {category}/{subcategory} to {item}"
+                message=f"Updated {'/'.join(path)} to {item}",
+                version=version
             )
             print(f"   📤 Response: success={response.success}, message={response.message}")
             return response
@@ -196,19 +326,20 @@ class ApplianceService(warehouse_pb2_grpc.OrderServiceServicer):
             print(f"   📥 Subcategory: {subcategory}")
             print(f"   📥 Client IP: {context.peer()}")
             
-            items = []
-            if (category in self.inventory and 
-                subcategory in self.inventory[category]):
-                items = list(self.inventory[category][subcategory].keys())
+            # 数量与版本在同一次加锁中读取, 保证版本对应返回的数量
+            with self.lock:
+                entries = list(self.store.scan(f"{category}/{subcategory}/"))
+                versions = [self.feed.version(path) for path, _ in entries]
+            items = [path[2] for path, _ in entries]
+            if entries:
                 print(f"   📋 Found {len(items)} items in {category}/{subcategory}")
-                for item in items:
-                    count = self.inventory[category][subcategory][item]
-                    print(f"     - {item}: {count} units")
+                for path, count in entries:
+                    print(f"     - {path[2]}: {count} units")
             else:
                 print(f"   📋 No items found in {category}/{subcategory}")
             
             print(f"   ✅ [SENDING] ListItems successful")
-            response = warehouse_pb2.ListItemsResponse(items=items)
+            response = warehouse_pb2.ListItemsResponse(items=items, versions=versions)
             print(f"   📤 Response: {len(response.items)} items")
             return response
             
@@ -218,16 +349,454 @@ class ApplianceService(warehouse_pb2_grpc.OrderServiceServicer):
             response = warehouse_pb2.ListItemsResponse(items=[])
             print(f"   📤 Response: {len(response.items)} items")
             return response
-
+    
+    def ScanInventory(self, request, context):
+        """按键顺序流式扫描库存 (游标分页)"""
+        prefix = request.prefix.lower()
+        cursor = request.cursor.lower()
+        
+        print(f"🏠 [RECEIVED] ApplianceService - ScanInventory Request:")
+        print(f"   📥 Prefix: {prefix!r}, Cursor: {cursor!r}")
+        print(f"   📥 Page size: {request.page_size}, Chunk size: {request.chunk_size}")
+        print(f"   📥 Client IP: {context.peer()}")
+        
+        # 在快照上遍历: 整个流看到同一个版本, 且不阻塞期间的写入
+        with self.lock:
+            snapshot = self.store.snapshot()
+        total = 0
+        try:
+            entries = snapshot.scan(prefix, split_key(cursor))
+            for chunk in scan_chunks(entries, cursor, request.page_size, request.chunk_size, self.skus):
+                total += len(chunk.entries)
+                yield chunk
+        finally:
+            snapshot.close()
+        print(f"   ✅ [SENT] ScanInventory streamed {total} entries")
+    
+    def ImportStock(self, request_iterator, context):
+        """批量导入库存 - 每个数据块一次性应用"""
+        print(f"🏠 [RECEIVED] ApplianceService - ImportStock stream:")
+        print(f"   📥 Client IP: {context.peer()}")
+        started = time.time()
+        chunks = rows_applied = rows_rejected = units_added = 0
+        try:
+            for chunk in request_iterator:
+                pairs, rejected, units = self._stock_pairs(chunk.rows)
+                with self.lock:
+                    # 每个键只发布一次最终数量
+                    for path, count in self.store.add_batch(pairs).items():
+                        self.feed.publish(path, count, "ImportStock")
+                        self.history.record(path, count, create=False)
+                self.store.sync()
+                applied = len(pairs)
+                chunks += 1
+                rows_applied += applied
+                rows_rejected += rejected
+                units_added += units
+                print(f"   📦 Chunk {chunks}: {applied} rows applied, {rejected} rejected, +{units} units")
+            
+            elapsed = time.time() - started
+            print(f"   ✅ [SENDING] ImportStock successful")
+            response = warehouse_pb2.ImportStockResponse(
+                success=True,
+                message=f"Imported {rows_applied} rows (+{units_added} units) in {chunks} chunks",
+                rows_applied=rows_applied,
+                rows_rejected=rows_rejected,
+                units_added=units_added,
+                chunks=chunks,
+                elapsed_seconds=elapsed
+            )
+            print(f"   📤 Response: success={response.success}, message={response.message}")
+            return response
+            
+        except Exception as e:
+            print(f"❌ [ERROR] ApplianceService ImportStock error: {e}")
+            print(f"   📤 [SENDING] Error response")
+            response = warehouse_pb2.ImportStockResponse(
+                success=False,
+                message=f"Error after {chunks} chunks: {str(e)}",
+                rows_applied=rows_applied,
+                rows_rejected=rows_rejected,
+                units_added=units_added,
+                chunks=chunks,
+                elapsed_seconds=time.time() - started
+            )
+            print(f"   📤 Response: success={response.success}, message={response.message}")
+            return response
+    
+    def ExportInventory(self, request, context):
+        """导出库存快照为列式 .npz 文件, 分块流式返回"""
+        prefix = request.prefix.lower()
+        
+        print(f"🏠 [RECEIVED] ApplianceService - ExportInventory Request:")
+        print(f"   📥 Prefix: {prefix!r}")
+        print(f"   📥 Client IP: {context.peer()}")
+        
+        # 只在生成快照时持有锁, 编码与传输都在锁外进行
+        started = time.time()
+        with self.lock:
+            snapshot = self.store.snapshot()
+        locked_ms = (time.time() - started) * 1000
+        
+        try:
+            data, entries = columnar.encode_npz(snapshot.scan(prefix), "appliance")
+        finally:
+            snapshot.close()
+        print(f"   📸 Snapshot: {entries} entries, lock held {locked_ms:.2f}ms, {len(data)} bytes")
+        for offset, payload in columnar.iter_byte_chunks(data):
+            yield warehouse_pb2.ExportChunk(
+                data=payload,
+                offset=offset,
+                total_bytes=len(data),
+                entries=entries,
+                format=columnar.EXPORT_FORMAT,
+                service="appliance"
+            )
+        print(f"   ✅ [SENT] ExportInventory streamed {len(data)} bytes")
+    
+    def StockHistory(self, request, context):
+        """查询 SKU 的库存时间序列"""
+        try:
+            path = self._request_path(request)
+            if not path[2]:
+                # 没有商品名时为与子类别同名的默认商品 (同旧格式的 UpdateItem)
+                path = (path[0], path[1], path[1])
+            
+            print(f"🏠 [RECEIVED] ApplianceService - StockHistory Request:")
+            print(f"   📥 SKU: {'/'.join(path)}")
+            print(f"   📥 Resolution: {request.resolution_seconds or 'all'}")
+            print(f"   📥 Client IP: {context.peer()}")
+            
+            series = self.history.series(path, request.resolution_seconds)
+            if series is None:
+                message = "history disabled" if not self.history.capacity else f"no history for {'/'.join(path)}"
+                print(f"   ❌ [SENDING] {message}")
+                return warehouse_pb2.StockHistoryResponse(found=False, message=message)
+            
+            response = warehouse_pb2.StockHistoryResponse(found=True, series=[
+                warehouse_pb2.StockSeries(resolution_seconds=resolution, start_time=start, levels=levels, orders=orders)
+                for resolution, start, levels, orders in series
+            ])
+            print(f"   ✅ [SENDING] StockHistory: {', '.join(f'{len(s.levels)}x{s.resolution_seconds}s' for s in response.series)}")
+            return response
+            
+        except Exception as e:
+            print(f"❌ [ERROR] ApplianceService StockHistory error: {e}")
+            print(f"   📤 [SENDING] Error response")
+            return warehouse_pb2.StockHistoryResponse(found=False, message=f"Error: {str(e)}")
+    
+    def TopSellers(self, request, context):
+        """滑动窗口内的畅销排行 (按类别, 为空时为全部类别)"""
+        try:
+            category = request.category.lower()
+            
+            print(f"🏠 [RECEIVED] ApplianceService - TopSellers Request:")
+            print(f"   📥 Category: {category or 'all'}")
+            print(f"   📥 Limit: {request.limit or 'all'}")
+            print(f"   📥 Client IP: {context.peer()}")
+            
+            sellers = []
+            for key, units in self.top_sellers.top(category, request.limit):
+                path = tuple(key.split("/"))
+                sellers.append(warehouse_pb2.TopSeller(
+                    category=path[0], subcategory=path[1], item=path[2],
+                    sku_id=self.skus.id_for(path), units=units))
+            response = warehouse_pb2.TopSellersResponse(
+                sellers=sellers,
+                error_bound=self.top_sellers.error_bound(),
+                window_seconds=self.top_sellers.window,
+                message="" if self.top_sellers.size else "top sellers disabled"
+            )
+            print(f"   ✅ [SENDING] TopSellers: {len(sellers)} sellers, error bound {response.error_bound}")
+            return response
+            
+        except Exception as e:
+            print(f"❌ [ERROR] ApplianceService TopSellers error: {e}")
+            print(f"   📤 [SENDING] Error response")
+            return warehouse_pb2.TopSellersResponse(message=f"Error: {str(e)}")
+    
+    def WatchInventory(self, request, context):
+        """订阅库存变更流 (按前缀过滤, 合并同键变更, 支持按序号续传)"""
+        print(f"🏠 [RECEIVED] ApplianceService - WatchInventory Request:")
+        print(f"   📥 Prefixes: {list(request.prefixes)}")
+        print(f"   📥 Resume from: {dict(request.resume_from)}")
+        print(f"   📥 Client IP: {context.peer()}")
+        
+        yield from watch.stream_deltas(self.feed, request, context)
+        print(f"   🔌 WatchInventory stream from {context.peer()} closed")
+    
+    def PrepareOrder(self, request, context):
+        """两阶段提交 - 预留库存: 所有行都满足时才一并扣减"""
+        try:
+            txn_id = request.txn_id
+            print(f"🏠 [RECEIVED] ApplianceService - PrepareOrder Request:")
+            print(f"   📥 Transaction: {txn_id}")
+            print(f"   📥 Lines: {len(request.orders)}")
+            print(f"   📥 Client IP: {context.peer()}")
+            
+            lines = [self._order_line(order) for order in request.orders]
+            # 每行分配的序列号 (失败时为空)
+            taken = [()] * len(lines)
+            with self.lock:
+                state = self.txns.state(txn_id)
+                if state is None:
+                    results, status = txn.reserve_lines(self.store, lines, self.holds.held)
+                    if status == "ok":
+                        self.txns.add_prepared(txn_id, lines)
+                        taken = [self.serials.take(path, quantity) for path, quantity in lines]
+                        self._txn_serials[txn_id] = [(path, line_serials) for (path, _), line_serials in zip(lines, taken)]
+                        for (path, quantity), (_, left) in zip(lines, results):
+                            self.feed.publish(path, left, "PrepareOrder")
+                            self.history.record(path, left, quantity)
+            self.store.sync()
+            if state is None and status == "ok":
+                for path, quantity in lines:
+                    self.top_sellers.record(path, quantity)
+            
+            if state is not None:
+                # 重复的 Prepare: 已预留则视为成功, 已结束则拒绝
+                success = state == txn.PREPARED
+                print(f"   ⚠️ Transaction already {state}")
+                response = warehouse_pb2.PrepareOrderResponse(
+                    success=success,
+                    status="ok" if success else f"transaction {state}"
+                )
+                print(f"   📤 Response: success={response.success}, status={response.status}")
+                return response
+            
+            for (path, quantity), (line_status, left) in zip(lines, results):
+                print(f"   📊 {'/'.join(path)} x{quantity}: {line_status}, left={left}")
+            print(f"   {'✅' if status == 'ok' else '❌'} [SENDING] PrepareOrder {status}")
+            response = warehouse_pb2.PrepareOrderResponse(
+                success=status == "ok",
+                status=status,
+                results=[warehouse_pb2.OrderResponse(status=s, left=left, serials=line_serials)
+                         for (s, left), line_serials in zip(results, taken)]
+            )
+            print(f"   📤 Response: success={response.success}, status={response.status}")
+            return response
+            
+        except Exception as e:
+            print(f"❌ [ERROR] ApplianceService PrepareOrder error: {e}")
+            print(f"   📤 [SENDING] Error response")
+            response = warehouse_pb2.PrepareOrderResponse(success=False, status="error")
+            print(f"   📤 Response: success={response.success}, status={response.status}")
+            return response
+    
+    def CommitOrder(self, request, context):
+        """两阶段提交 - 提交预留"""
+        print(f"🏠 [RECEIVED] ApplianceService - CommitOrder: {request.txn_id}")
+        with self.lock:
+            success, message = self.txns.commit(request.txn_id)
+            if success:
+                self._txn_serials.pop(request.txn_id, None)
+        response = warehouse_pb2.TxnResponse(success=success, message=message)
+        print(f"   📤 Response: success={response.success}, message={response.message}")
+        return response
+    
+    def AbortOrder(self, request, context):
+        """两阶段提交 - 回滚预留, 归还库存"""
+        print(f"🏠 [RECEIVED] ApplianceService - AbortOrder: {request.txn_id}")
+        with self.lock:
+            lines = self.txns.abort(request.txn_id)
+            for path, taken in self._txn_serials.pop(request.txn_id, ()):
+                self.serials.give_back(path, taken)
+            if lines:
+                returned = {}
+                for path, quantity in lines:
+                    returned[path] = returned.get(path, 0) + quantity
+                for path, count in txn.release_lines(self.store, lines).items():
+                    self.feed.publish(path, count, "AbortOrder")
+                    self.history.record(path, count, -returned[path])
+        self.store.sync()
+        for path, quantity in lines or ():
+            self.top_sellers.record(path, -quantity)
+        if lines is None:
+            response = warehouse_pb2.TxnResponse(success=False, message="transaction already committed")
+        else:
+            response = warehouse_pb2.TxnResponse(success=True, message=f"aborted, released {len(lines)} lines")
+        print(f"   📤 Response: success={response.success}, message={response.message}")
+        return response
+    
+    def Reserve(self, request, context):
+        """购物车预留 (支持幂等键)"""
+        return self._idempotent(
+            "Reserve", request, context, self._reserve,
+            warehouse_pb2.ReserveResponse(success=False, message="Idempotency key conflict"),
+            lambda response: response.success)
+    
+    def _reserve(self, request, context):
+        """在有效期内占用件数: 不扣减库存, 只减少可售件数"""
+        try:
+            path = tuple(self._request_path(request))
+            
+            print(f"🏠 [RECEIVED] ApplianceService - Reserve Request:")
+            print(f"   📥 SKU: {'/'.join(path)} x{request.quantity}")
+            print(f"   📥 TTL: {request.ttl_seconds or 'default'}")
+            print(f"   📥 Client IP: {context.peer()}")
+            
+            if request.quantity <= 0:
+                raise ValueError(f"invalid quantity {request.quantity}")
+            with self.lock:
+                hold, current, available = self.holds.reserve(self.store, path, request.quantity, request.ttl_seconds)
+            
+            if hold is None:
+                message = "item not found" if current is None else "out of stock"
+                print(f"   ❌ [SENDING] {message} (available {available})")
+                return warehouse_pb2.ReserveResponse(success=False, message=message, available=available)
+            
+            print(f"   ✅ [SENDING] Hold {hold[holds.HOLD_ID]} created, available {available}")
+            response = warehouse_pb2.ReserveResponse(
+                success=True,
+                message="reserved",
+                hold_id=hold[holds.HOLD_ID],
+                available=available,
+                expires_at=hold[holds.EXPIRES]
+            )
+            print(f"   📤 Response: success={response.success}, hold_id={response.hold_id}")
+            return response
+            
+        except Exception as e:
+            print(f"❌ [ERROR] ApplianceService Reserve error: {e}")
+            print(f"   📤 [SENDING] Error response")
+            return warehouse_pb2.ReserveResponse(success=False, message=f"Error: {str(e)}")
+    
+    def CommitHold(self, request, context):
+        """把预留转为下单: 按预留的件数扣减库存并分配序列号"""
+        print(f"🏠 [RECEIVED] ApplianceService - CommitHold: {request.hold_id}")
+        new_stock = None
+        with self.lock:
+            hold, finished = self.holds.pop(request.hold_id)
+            if hold is not None:
+                path, quantity = hold[holds.PATH], hold[holds.QUANTITY]
+                _, new_stock = holds.take(self.store, self.holds, path, quantity)
+                # 预留期间库存被 UpdateItem 调低时可能不足, 此时预留作废
+                self.holds.finish(hold, holds.COMMITTED if new_stock is not None else holds.RELEASED)
+                if new_stock is not None:
+                    taken = self.serials.take(path, quantity)
+                    self.feed.publish(path, new_stock, "CommitHold")
+                    self.history.record(path, new_stock, quantity)
+        self.store.sync()
+        
+        if hold is None:
+            success, message = holds.replay(finished, holds.COMMITTED)
+            response = warehouse_pb2.HoldResponse(success=success, message=message)
+        elif new_stock is None:
+            response = warehouse_pb2.HoldResponse(success=False, message="out of stock, hold released")
+        else:
+            self.top_sellers.record(path, quantity)
+            response = warehouse_pb2.HoldResponse(success=True, message="committed", left=new_stock, serials=taken)
+        print(f"   📤 Response: success={response.success}, message={response.message}")
+        return response
+    
+    def ReleaseHold(self, request, context):
+        """释放预留, 归还可售件数"""
+        print(f"🏠 [RECEIVED] ApplianceService - ReleaseHold: {request.hold_id}")
+        with self.lock:
+            hold, finished = self.holds.pop(request.hold_id)
+            if hold is not None:
+                self.holds.finish(hold, holds.RELEASED)
+        if hold is None:
+            success, message = holds.replay(finished, holds.RELEASED)
+        else:
+            success, message = True, "released"
+        response = warehouse_pb2.HoldResponse(success=success, message=message)
+        print(f"   📤 Response: success={response.success}, message={response.message}")
+        return response
+    
+    def Replicate(self, request, context):
+        """热备复制: 全量快照 + 持续变更流, 直到备机断开"""
+        print(f"🏠 [RECEIVED] ApplianceService - Replicate Request:")
+        print(f"   📥 Replica: {request.replica}")
+        print(f"   📥 Client IP: {context.peer()}")
+        
+        yield from replication.stream_changes("appliance", self.lock, self.store, self.feed, self.skus, request, context)
+        print(f"   🔌 Replication stream to {request.replica} closed")
+    
+    def Promote(self, request, context):
+        """提升备机为主机 (中层服务检测到主机故障后调用)"""
+        print(f"🚨 [RECEIVED] ApplianceService - Promote: {request.reason}")
+        if self.standby is None:
+            response = warehouse_pb2.PromoteResponse(success=True, message="already primary", seq=self.feed.seq)
+        else:
+            success, message, seq = self.standby.promote()
+            response = warehouse_pb2.PromoteResponse(success=success, message=message, seq=seq)
+        print(f"   📤 Response: success={response.success}, message={response.message}, seq={response.seq}")
+        return response
+    
+    def ReplicaStatus(self, request, context):
+        """主备角色与复制进度 (中层服务的健康探测, 不输出日志)"""
+        return replication.status(self.standby, self.feed)
+    
+    def expire_holds(self, now=None):
+        """释放到期的预留: 每次持锁处理一批 (HOLD_EXPIRY_BATCH); 返回释放的预留数"""
+        expired = 0
+        more = True
+        while more:
+            with self.lock:
+                count, more = self.holds.expire(now)
+            expired += count
+        if expired:
+            print(f"⏰ [EXPIRED] ApplianceService - released {expired} expired holds")
+        return expired
+    
+    def _expire_holds_loop(self):
+        while not self._hold_expiry_stop.wait(self.holds.wheel.tick):
+            try:
+                self.expire_holds()
+            except Exception as e:
+                print(f"❌ [ERROR] ApplianceService hold expiry error: {e}")
+    
+    def stop_hold_expiry(self, timeout=5.0):
+        """停止后台的预留过期线程"""
+        self._hold_expiry_stop.set()
+        self._hold_expiry.join(timeout)
+    
+    def _order_line(self, order):
+        """订单 -> (库存路径, 数量)"""
+        quantity = order.quantity if order.HasField("quantity") else 1
+        return tuple(self._request_path(order)), quantity
+    
+    def _stock_pairs(self, rows):
+        """校验一批导入行 (在锁外进行), 返回 ([(path, quantity)], rejected, units)"""
+        pairs = []
+        rejected = units = 0
+        for row in rows:
+            if row.quantity <= 0 or not row.category or not row.subcategory or not row.item:
+                rejected += 1
+                continue
+            pairs.append(((row.category.lower(), row.subcategory.lower(), row.item.lower()), row.quantity))
+            units += row.quantity
+        return pairs, rejected, units
 
 def run_appliance_service(port=50054):
     """运行ApplianceService"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    warehouse_pb2_grpc.add_OrderServiceServicer_to_server(ApplianceService(), server)
-    server.add_insecure_port(f'[::]:{port}')
+    admin_service = AdminService("ApplianceService")
+    # 读写分池调度; 线程池按各池槽位 + 等待队列之和设置, 超出时由 gRPC 直接拒绝
+    scheduler = MethodScheduler.from_env()
+    admin_service.register_metrics("pools", scheduler.stats)
+    # STANDBY_OF 为主机地址时作为热备启动, 提升前拒绝 OrderService 的请求
+    appliance_service = ApplianceService(standby_of=env_str("STANDBY_OF") or None)
+    interceptors = [SchedulingInterceptor(scheduler), admin_service.interceptor, admin_service.fault_interceptor]
+    if appliance_service.standby is not None:
+        interceptors.insert(0, replication.StandbyInterceptor(appliance_service.standby))
+        admin_service.register_metrics("replication", appliance_service.standby.stats)
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=scheduler.max_threads()),
+                         interceptors=interceptors,
+                         maximum_concurrent_rpcs=scheduler.max_threads())
+    admin_service.register_metrics("dedup", appliance_service.dedup.stats)
+    admin_service.register_metrics("watch", appliance_service.feed.stats)
+    admin_service.register_metrics("history", appliance_service.history.stats)
+    admin_service.register_metrics("topn", appliance_service.top_sellers.stats)
+    admin_service.register_metrics("serials", appliance_service.serials.stats)
+    admin_service.register_metrics("holds", appliance_service.holds.stats)
+    admin_service.register_metrics("store", appliance_service.store.stats)
+    warehouse_pb2_grpc.add_OrderServiceServicer_to_server(appliance_service, server)
+    warehouse_pb2_grpc.add_AdminServiceServicer_to_server(admin_service, server)
+    addresses = transport.listen(server, port, env_str("SERVICE_SOCKET"))
     server.start()
     
-    print(f"🏠 ApplianceService started on port {port}")
+    print(f"🏠 ApplianceService started on {', '.join(addresses)}")
     
     try:
         while True:
@@ -235,7 +804,12 @@ def run_appliance_service(port=50054):
     except KeyboardInterrupt:
         print("\n🛑 Stopping ApplianceService...")
         server.stop(0)
+        if appliance_service.standby is not None:
+            appliance_service.standby.close()
+        appliance_service.stop_hold_expiry()
+        appliance_service.store.close()
 
 
 if __name__ == "__main__":
-    run_appliance_service()
+    # SERVICE_PORT 覆盖监听端口 (同一台机器上再起一个热备时使用); SERVICE_SOCKET 另外监听 Unix 域套接字
+    run_appliance_service(env_int("SERVICE_PORT", 50054))
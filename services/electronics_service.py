@@ -13,6 +13,9 @@ from concurrent import futures
 
 import warehouse_pb2
 import warehouse_pb2_grpc
+from common import failover, transport
+from common.admin import AdminService
+from common.config import env_int, env_str
 
 
 class ElectronicsService(warehouse_pb2_grpc.OrderServiceServicer):
@@ -21,10 +24,18 @@ class ElectronicsService(warehouse_pb2_grpc.OrderServiceServicer):
     处理电子产品类别的请求，转发给ApplianceService
     """
     
-    def __init__(self, appliance_service_host='appliance-service', appliance_service_port=50054):
-        """Initialize ElectronicsService"""
-        self.appliance_service_channel = grpc.insecure_channel(f'{appliance_service_host}:{appliance_service_port}')
-        self.appliance_service_stub = warehouse_pb2_grpc.OrderServiceStub(self.appliance_service_channel)
+    def __init__(self, appliance_service_host='appliance-service', appliance_service_port=50054,
+                 appliance_service_channel=None, appliance_standby_channel=None):
+        """Initialize ElectronicsService (传入 appliance_service_channel 时不建立网络连接, 用于进程内拓扑)"""
+        self.appliance_service_channel = (appliance_service_channel
+                                          or grpc.insecure_channel(f'{appliance_service_host}:{appliance_service_port}'))
+        # 配置了热备时, 主机故障后自动提升备机并切换 (common/failover.py)
+        self.appliance_standby_channel = appliance_standby_channel
+        if appliance_standby_channel is not None:
+            self.appliance_service_stub = failover.FailoverStub.from_env(
+                "ApplianceService", self.appliance_service_channel, appliance_standby_channel)
+        else:
+            self.appliance_service_stub = warehouse_pb2_grpc.OrderServiceStub(self.appliance_service_channel)
         print("📱 ElectronicsService initialized")
     
     def PlaceOrder(self, request, context):
@@ -173,21 +184,229 @@ class ElectronicsService(warehouse_pb2_grpc.OrderServiceServicer):
             print(f"   📤 Response: {len(response.items)} items")
             return response
     
+    def ScanInventory(self, request, context):
+        """流式扫描库存 - 逐块转发ApplianceService的响应流"""
+        print(f"📱 [RECEIVED] ElectronicsService - ScanInventory Request:")
+        print(f"   📥 Prefix: {request.prefix!r}, Cursor: {request.cursor!r}")
+        print(f"   📥 Client IP: {context.peer()}")
+        print(f"   🔄 [FORWARDING] Streaming from ApplianceService...")
+        
+        responses = self.appliance_service_stub.ScanInventory(request)
+        # 客户端断开时取消下游流
+        context.add_callback(responses.cancel)
+        total = 0
+        try:
+            for chunk in responses:
+                total += len(chunk.entries)
+                yield chunk
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                return
+            print(f"❌ [ERROR] ElectronicsService ScanInventory gRPC error: {e}")
+            context.abort(grpc.StatusCode.UNAVAILABLE, f"ApplianceService unavailable after {total} entries")
+        print(f"   ✅ [SENT] Forwarded {total} entries from ApplianceService")
+    
+    def ImportStock(self, request_iterator, context):
+        """批量导入库存 - 将客户端流直接接到ApplianceService"""
+        try:
+            print(f"📱 [RECEIVED] ElectronicsService - ImportStock stream:")
+            print(f"   📥 Client IP: {context.peer()}")
+            print(f"   🔄 [FORWARDING] Streaming chunks to ApplianceService...")
+            
+            # 请求迭代器原样交给下游, 逐块转发不缓存
+            response = self.appliance_service_stub.ImportStock(request_iterator)
+            
+            print(f"   📨 [RECEIVED] Response from ApplianceService:")
+            print(f"   📨 Success: {response.success}")
+            print(f"   📨 Message: {response.message}")
+            print(f"   ✅ [SENDING] Forwarding response to client")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] ElectronicsService ImportStock gRPC error: {e}")
+            print(f"   📤 [SENDING] Service unavailable response")
+            response = warehouse_pb2.ImportStockResponse(
+                success=False,
+                message="Service unavailable"
+            )
+            print(f"   📤 Response: success={response.success}, message={response.message}")
+            return response
+    
+    def ExportInventory(self, request, context):
+        """导出库存快照 - 逐块转发ApplianceService的响应流"""
+        print(f"📱 [RECEIVED] ElectronicsService - ExportInventory Request:")
+        print(f"   📥 Prefix: {request.prefix!r}")
+        print(f"   📥 Client IP: {context.peer()}")
+        print(f"   🔄 [FORWARDING] Streaming from ApplianceService...")
+        
+        responses = self.appliance_service_stub.ExportInventory(request)
+        context.add_callback(responses.cancel)
+        sent = 0
+        try:
+            for chunk in responses:
+                sent += len(chunk.data)
+                yield chunk
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                return
+            print(f"❌ [ERROR] ElectronicsService ExportInventory gRPC error: {e}")
+            context.abort(grpc.StatusCode.UNAVAILABLE, f"ApplianceService unavailable after {sent} bytes")
+        print(f"   ✅ [SENT] Forwarded {sent} bytes from ApplianceService")
+    
+    def WatchInventory(self, request, context):
+        """订阅库存变更流 - 逐批转发ApplianceService的响应流"""
+        print(f"📱 [RECEIVED] ElectronicsService - WatchInventory Request:")
+        print(f"   📥 Prefixes: {list(request.prefixes)}")
+        print(f"   📥 Client IP: {context.peer()}")
+        print(f"   🔄 [FORWARDING] Streaming from ApplianceService...")
+        
+        responses = self.appliance_service_stub.WatchInventory(request)
+        context.add_callback(responses.cancel)
+        try:
+            for batch in responses:
+                yield batch
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                return
+            # 续传越界/消费过慢由订阅方处理, 原样透传状态码
+            if e.code() in (grpc.StatusCode.OUT_OF_RANGE, grpc.StatusCode.RESOURCE_EXHAUSTED):
+                context.abort(e.code(), e.details())
+            print(f"❌ [ERROR] ElectronicsService WatchInventory gRPC error: {e}")
+            context.abort(grpc.StatusCode.UNAVAILABLE, "ApplianceService unavailable")
+    
+    def PrepareOrder(self, request, context):
+        """两阶段提交 - 预留库存, 转发给ApplianceService"""
+        try:
+            print(f"📱 [RECEIVED] ElectronicsService - PrepareOrder Request:")
+            print(f"   📥 Transaction: {request.txn_id}, {len(request.orders)} lines")
+            print(f"   🔄 [FORWARDING] Sending to ApplianceService...")
+            
+            response = self.appliance_service_stub.PrepareOrder(request, timeout=context.time_remaining())
+            
+            print(f"   📨 [RECEIVED] Response from ApplianceService: success={response.success}, status={response.status}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] ElectronicsService PrepareOrder gRPC error: {e}")
+            print(f"   📤 [SENDING] Service unavailable response")
+            return warehouse_pb2.PrepareOrderResponse(success=False, status="service unavailable")
+    
+    def CommitOrder(self, request, context):
+        """两阶段提交 - 提交, 转发给ApplianceService"""
+        try:
+            print(f"📱 [RECEIVED] ElectronicsService - CommitOrder: {request.txn_id}")
+            response = self.appliance_service_stub.CommitOrder(request, timeout=context.time_remaining())
+            print(f"   📨 [RECEIVED] Response from ApplianceService: success={response.success}, message={response.message}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] ElectronicsService CommitOrder gRPC error: {e}")
+            return warehouse_pb2.TxnResponse(success=False, message="Service unavailable")
+    
+    def AbortOrder(self, request, context):
+        """两阶段提交 - 回滚, 转发给ApplianceService"""
+        try:
+            print(f"📱 [RECEIVED] ElectronicsService - AbortOrder: {request.txn_id}")
+            response = self.appliance_service_stub.AbortOrder(request, timeout=context.time_remaining())
+            print(f"   📨 [RECEIVED] Response from ApplianceService: success={response.success}, message={response.message}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] ElectronicsService AbortOrder gRPC error: {e}")
+            return warehouse_pb2.TxnResponse(success=False, message="Service unavailable")
+    
+    def StockHistory(self, request, context):
+        """库存时间序列 - 转发给ApplianceService"""
+        try:
+            print(f"📱 [RECEIVED] ElectronicsService - StockHistory Request: {request.category}/{request.subcategory}")
+            print(f"   🔄 [FORWARDING] Sending to ApplianceService...")
+            response = self.appliance_service_stub.StockHistory(request)
+            print(f"   📨 [RECEIVED] Response from ApplianceService: found={response.found}, {len(response.series)} series")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] ElectronicsService StockHistory gRPC error: {e}")
+            return warehouse_pb2.StockHistoryResponse(found=False, message="Service unavailable")
+    
+    def TopSellers(self, request, context):
+        """畅销排行 - 转发给ApplianceService"""
+        try:
+            print(f"📱 [RECEIVED] ElectronicsService - TopSellers Request: {request.category or 'all'}")
+            print(f"   🔄 [FORWARDING] Sending to ApplianceService...")
+            response = self.appliance_service_stub.TopSellers(request)
+            print(f"   📨 [RECEIVED] Response from ApplianceService: {len(response.sellers)} sellers")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] ElectronicsService TopSellers gRPC error: {e}")
+            return warehouse_pb2.TopSellersResponse(message="Service unavailable")
+    
+    def Reserve(self, request, context):
+        """购物车预留 - 转发给ApplianceService"""
+        try:
+            print(f"📱 [RECEIVED] ElectronicsService - Reserve Request: {request.category}/{request.subcategory} x{request.quantity}")
+            print(f"   🔄 [FORWARDING] Sending to ApplianceService...")
+            response = self.appliance_service_stub.Reserve(request)
+            print(f"   📨 [RECEIVED] Response from ApplianceService: success={response.success}, hold_id={response.hold_id}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] ElectronicsService Reserve gRPC error: {e}")
+            return warehouse_pb2.ReserveResponse(success=False, message="Service unavailable")
+    
+    def CommitHold(self, request, context):
+        """提交预留 - 转发给ApplianceService"""
+        try:
+            print(f"📱 [RECEIVED] ElectronicsService - CommitHold: {request.hold_id}")
+            print(f"   🔄 [FORWARDING] Sending to ApplianceService...")
+            response = self.appliance_service_stub.CommitHold(request)
+            print(f"   📨 [RECEIVED] Response from ApplianceService: success={response.success}, message={response.message}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] ElectronicsService CommitHold gRPC error: {e}")
+            return warehouse_pb2.HoldResponse(success=False, message="Service unavailable")
+    
+    def ReleaseHold(self, request, context):
+        """释放预留 - 转发给ApplianceService"""
+        try:
+            print(f"📱 [RECEIVED] ElectronicsService - ReleaseHold: {request.hold_id}")
+            print(f"   🔄 [FORWARDING] Sending to ApplianceService...")
+            response = self.appliance_service_stub.ReleaseHold(request)
+            print(f"   📨 [RECEIVED] Response from ApplianceService: success={response.success}, message={response.message}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] ElectronicsService ReleaseHold gRPC error: {e}")
+            return warehouse_pb2.HoldResponse(success=False, message="Service unavailable")
+    
     def close(self):
         """关闭连接"""
+        if self.appliance_standby_channel is not None:
+            self.appliance_service_stub.close()
+            self.appliance_standby_channel.close()
         if self.appliance_service_channel:
             self.appliance_service_channel.close()
 
 
 def run_electronics_service(port=50051):
     """运行ElectronicsService"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    electronics_service = ElectronicsService()
+    admin_service = AdminService("ElectronicsService")
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10),
+                         interceptors=[admin_service.interceptor, admin_service.fault_interceptor])
+    # APPLIANCE_STANDBY 为 ApplianceService 热备的地址时启用自动切换
+    standby = env_str("APPLIANCE_STANDBY")
+    electronics_service = ElectronicsService(
+        appliance_service_channel=transport.dial_env("APPLIANCE_SERVICE_ADDR"),
+        appliance_standby_channel=grpc.insecure_channel(standby) if standby else None)
+    if standby:
+        admin_service.register_metrics("failover", electronics_service.appliance_service_stub.stats)
     warehouse_pb2_grpc.add_OrderServiceServicer_to_server(electronics_service, server)
-    server.add_insecure_port(f'[::]:{port}')
+    warehouse_pb2_grpc.add_AdminServiceServicer_to_server(admin_service, server)
+    addresses = transport.listen(server, port, env_str("SERVICE_SOCKET"))
     server.start()
     
-    print(f"📱 ElectronicsService started on port {port}")
+    print(f"📱 ElectronicsService started on {', '.join(addresses)}")
     
     try:
         while True:
@@ -199,4 +418,5 @@ def run_electronics_service(port=50051):
 
 
 if __name__ == "__main__":
-    run_electronics_service()
+    # SERVICE_PORT 覆盖监听端口; SERVICE_SOCKET 另外监听 Unix 域套接字
+    run_electronics_service(env_int("SERVICE_PORT", 50051))
@@ -13,6 +13,9 @@ from concurrent import futures
 
 import warehouse_pb2
 import warehouse_pb2_grpc
+from common import failover, transport
+from common.admin import AdminService
+from common.config import env_int, env_str
 
 
 class FoodService(warehouse_pb2_grpc.OrderServiceServicer):
@@ -21,10 +24,17 @@ class FoodService(warehouse_pb2_grpc.OrderServiceServicer):
     处理食品类别的请求，转发给FreshService
     """
     
-    def __init__(self, fresh_service_host='fresh-service', fresh_service_port=50053):
-        """Initialize FoodService"""
-        self.fresh_service_channel = grpc.insecure_channel(f'{fresh_service_host}:{fresh_service_port}')
-        self.fresh_service_stub = warehouse_pb2_grpc.OrderServiceStub(self.fresh_service_channel)
+    def __init__(self, fresh_service_host='fresh-service', fresh_service_port=50053, fresh_service_channel=None,
+                 fresh_standby_channel=None):
+        """Initialize FoodService (传入 fresh_service_channel 时不建立网络连接, 用于进程内拓扑)"""
+        self.fresh_service_channel = fresh_service_channel or grpc.insecure_channel(f'{fresh_service_host}:{fresh_service_port}')
+        # 配置了热备时, 主机故障后自动提升备机并切换 (common/failover.py)
+        self.fresh_standby_channel = fresh_standby_channel
+        if fresh_standby_channel is not None:
+            self.fresh_service_stub = failover.FailoverStub.from_env(
+                "FreshService", self.fresh_service_channel, fresh_standby_channel)
+        else:
+            self.fresh_service_stub = warehouse_pb2_grpc.OrderServiceStub(self.fresh_service_channel)
         print("🍎 FoodService initialized")
     
     def PlaceOrder(self, request, context):
@@ -173,21 +183,228 @@ class FoodService(warehouse_pb2_grpc.OrderServiceServicer):
             print(f"   📤 Response: {len(response.items)} items")
             return response
     
+    def ScanInventory(self, request, context):
+        """流式扫描库存 - 逐块转发FreshService的响应流"""
+        print(f"🍎 [RECEIVED] FoodService - ScanInventory Request:")
+        print(f"   📥 Prefix: {request.prefix!r}, Cursor: {request.cursor!r}")
+        print(f"   📥 Client IP: {context.peer()}")
+        print(f"   🔄 [FORWARDING] Streaming from FreshService...")
+        
+        responses = self.fresh_service_stub.ScanInventory(request)
+        # 客户端断开时取消下游流
+        context.add_callback(responses.cancel)
+        total = 0
+        try:
+            for chunk in responses:
+                total += len(chunk.entries)
+                yield chunk
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                return
+            print(f"❌ [ERROR] FoodService ScanInventory gRPC error: {e}")
+            context.abort(grpc.StatusCode.UNAVAILABLE, f"FreshService unavailable after {total} entries")
+        print(f"   ✅ [SENT] Forwarded {total} entries from FreshService")
+    
+    def ImportStock(self, request_iterator, context):
+        """批量导入库存 - 将客户端流直接接到FreshService"""
+        try:
+            print(f"🍎 [RECEIVED] FoodService - ImportStock stream:")
+            print(f"   📥 Client IP: {context.peer()}")
+            print(f"   🔄 [FORWARDING] Streaming chunks to FreshService...")
+            
+            # 请求迭代器原样交给下游, 逐块转发不缓存
+            response = self.fresh_service_stub.ImportStock(request_iterator)
+            
+            print(f"   📨 [RECEIVED] Response from FreshService:")
+            print(f"   📨 Success: {response.success}")
+            print(f"   📨 Message: {response.message}")
+            print(f"   ✅ [SENDING] Forwarding response to client")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] FoodService ImportStock gRPC error: {e}")
+            print(f"   📤 [SENDING] Service unavailable response")
+            response = warehouse_pb2.ImportStockResponse(
+                success=False,
+                message="Service unavailable"
+            )
+            print(f"   📤 Response: success={response.success}, message={response.message}")
+            return response
+    
+    def ExportInventory(self, request, context):
+        """导出库存快照 - 逐块转发FreshService的响应流"""
+        print(f"🍎 [RECEIVED] FoodService - ExportInventory Request:")
+        print(f"   📥 Prefix: {request.prefix!r}")
+        print(f"   📥 Client IP: {context.peer()}")
+        print(f"   🔄 [FORWARDING] Streaming from FreshService...")
+        
+        responses = self.fresh_service_stub.ExportInventory(request)
+        context.add_callback(responses.cancel)
+        sent = 0
+        try:
+            for chunk in responses:
+                sent += len(chunk.data)
+                yield chunk
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                return
+            print(f"❌ [ERROR] FoodService ExportInventory gRPC error: {e}")
+            context.abort(grpc.StatusCode.UNAVAILABLE, f"FreshService unavailable after {sent} bytes")
+        print(f"   ✅ [SENT] Forwarded {sent} bytes from FreshService")
+    
+    def WatchInventory(self, request, context):
+        """订阅库存变更流 - 逐批转发FreshService的响应流"""
+        print(f"🍎 [RECEIVED] FoodService - WatchInventory Request:")
+        print(f"   📥 Prefixes: {list(request.prefixes)}")
+        print(f"   📥 Client IP: {context.peer()}")
+        print(f"   🔄 [FORWARDING] Streaming from FreshService...")
+        
+        responses = self.fresh_service_stub.WatchInventory(request)
+        context.add_callback(responses.cancel)
+        try:
+            for batch in responses:
+                yield batch
+        except grpc.RpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED and not context.is_active():
+                return
+            # 续传越界/消费过慢由订阅方处理, 原样透传状态码
+            if e.code() in (grpc.StatusCode.OUT_OF_RANGE, grpc.StatusCode.RESOURCE_EXHAUSTED):
+                context.abort(e.code(), e.details())
+            print(f"❌ [ERROR] FoodService WatchInventory gRPC error: {e}")
+            context.abort(grpc.StatusCode.UNAVAILABLE, "FreshService unavailable")
+    
+    def PrepareOrder(self, request, context):
+        """两阶段提交 - 预留库存, 转发给FreshService"""
+        try:
+            print(f"🍎 [RECEIVED] FoodService - PrepareOrder Request:")
+            print(f"   📥 Transaction: {request.txn_id}, {len(request.orders)} lines")
+            print(f"   🔄 [FORWARDING] Sending to FreshService...")
+            
+            response = self.fresh_service_stub.PrepareOrder(request, timeout=context.time_remaining())
+            
+            print(f"   📨 [RECEIVED] Response from FreshService: success={response.success}, status={response.status}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] FoodService PrepareOrder gRPC error: {e}")
+            print(f"   📤 [SENDING] Service unavailable response")
+            return warehouse_pb2.PrepareOrderResponse(success=False, status="service unavailable")
+    
+    def CommitOrder(self, request, context):
+        """两阶段提交 - 提交, 转发给FreshService"""
+        try:
+            print(f"🍎 [RECEIVED] FoodService - CommitOrder: {request.txn_id}")
+            response = self.fresh_service_stub.CommitOrder(request, timeout=context.time_remaining())
+            print(f"   📨 [RECEIVED] Response from FreshService: success={response.success}, message={response.message}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] FoodService CommitOrder gRPC error: {e}")
+            return warehouse_pb2.TxnResponse(success=False, message="Service unavailable")
+    
+    def AbortOrder(self, request, context):
+        """两阶段提交 - 回滚, 转发给FreshService"""
+        try:
+            print(f"🍎 [RECEIVED] FoodService - AbortOrder: {request.txn_id}")
+            response = self.fresh_service_stub.AbortOrder(request, timeout=context.time_remaining())
+            print(f"   📨 [RECEIVED] Response from FreshService: success={response.success}, message={response.message}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] FoodService AbortOrder gRPC error: {e}")
+            return warehouse_pb2.TxnResponse(success=False, message="Service unavailable")
+    
+    def StockHistory(self, request, context):
+        """库存时间序列 - 转发给FreshService"""
+        try:
+            print(f"🍎 [RECEIVED] FoodService - StockHistory Request: {request.category}/{request.subcategory}")
+            print(f"   🔄 [FORWARDING] Sending to FreshService...")
+            response = self.fresh_service_stub.StockHistory(request)
+            print(f"   📨 [RECEIVED] Response from FreshService: found={response.found}, {len(response.series)} series")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] FoodService StockHistory gRPC error: {e}")
+            return warehouse_pb2.StockHistoryResponse(found=False, message="Service unavailable")
+    
+    def TopSellers(self, request, context):
+        """畅销排行 - 转发给FreshService"""
+        try:
+            print(f"🍎 [RECEIVED] FoodService - TopSellers Request: {request.category or 'all'}")
+            print(f"   🔄 [FORWARDING] Sending to FreshService...")
+            response = self.fresh_service_stub.TopSellers(request)
+            print(f"   📨 [RECEIVED] Response from FreshService: {len(response.sellers)} sellers")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] FoodService TopSellers gRPC error: {e}")
+            return warehouse_pb2.TopSellersResponse(message="Service unavailable")
+    
+    def Reserve(self, request, context):
+        """购物车预留 - 转发给FreshService"""
+        try:
+            print(f"🍎 [RECEIVED] FoodService - Reserve Request: {request.category}/{request.subcategory} x{request.quantity}")
+            print(f"   🔄 [FORWARDING] Sending to FreshService...")
+            response = self.fresh_service_stub.Reserve(request)
+            print(f"   📨 [RECEIVED] Response from FreshService: success={response.success}, hold_id={response.hold_id}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] FoodService Reserve gRPC error: {e}")
+            return warehouse_pb2.ReserveResponse(success=False, message="Service unavailable")
+    
+    def CommitHold(self, request, context):
+        """提交预留 - 转发给FreshService"""
+        try:
+            print(f"🍎 [RECEIVED] FoodService - CommitHold: {request.hold_id}")
+            print(f"   🔄 [FORWARDING] Sending to FreshService...")
+            response = self.fresh_service_stub.CommitHold(request)
+            print(f"   📨 [RECEIVED] Response from FreshService: success={response.success}, message={response.message}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] FoodService CommitHold gRPC error: {e}")
+            return warehouse_pb2.HoldResponse(success=False, message="Service unavailable")
+    
+    def ReleaseHold(self, request, context):
+        """释放预留 - 转发给FreshService"""
+        try:
+            print(f"🍎 [RECEIVED] FoodService - ReleaseHold: {request.hold_id}")
+            print(f"   🔄 [FORWARDING] Sending to FreshService...")
+            response = self.fresh_service_stub.ReleaseHold(request)
+            print(f"   📨 [RECEIVED] Response from FreshService: success={response.success}, message={response.message}")
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] FoodService ReleaseHold gRPC error: {e}")
+            return warehouse_pb2.HoldResponse(success=False, message="Service unavailable")
+    
     def close(self):
         """关闭连接"""
+        if self.fresh_standby_channel is not None:
+            self.fresh_service_stub.close()
+            self.fresh_standby_channel.close()
         if self.fresh_service_channel:
             self.fresh_service_channel.close()
 
 
 def run_food_service(port=50052):
     """运行FoodService"""
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
-    food_service = FoodService()
+    admin_service = AdminService("FoodService")
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=10),
+                         interceptors=[admin_service.interceptor, admin_service.fault_interceptor])
+    # FRESH_STANDBY 为 FreshService 热备的地址时启用自动切换
+    standby = env_str("FRESH_STANDBY")
+    food_service = FoodService(fresh_service_channel=transport.dial_env("FRESH_SERVICE_ADDR"),
+                               fresh_standby_channel=grpc.insecure_channel(standby) if standby else None)
+    if standby:
+        admin_service.register_metrics("failover", food_service.fresh_service_stub.stats)
     warehouse_pb2_grpc.add_OrderServiceServicer_to_server(food_service, server)
-    server.add_insecure_port(f'[::]:{port}')
+    warehouse_pb2_grpc.add_AdminServiceServicer_to_server(admin_service, server)
+    addresses = transport.listen(server, port, env_str("SERVICE_SOCKET"))
     server.start()
     
-    print(f"🍎 FoodService started on port {port}")
+    print(f"🍎 FoodService started on {', '.join(addresses)}")
     
     try:
         while True:
@@ -199,4 +416,5 @@ def run_food_service(port=50052):
 
 
 if __name__ == "__main__":
-    run_food_service()
+    # SERVICE_PORT 覆盖监听端口; SERVICE_SOCKET 另外监听 Unix 域套接字
+    run_food_service(env_int("SERVICE_PORT", 50052))
@@ -2,6 +2,8 @@
 """
 启动所有服务的脚本
 按照分层架构顺序启动服务
+各层的下游地址通过环境变量传给子进程 (common/transport.py): 默认为本机 TCP 端口;
+设置 SERVICE_SOCKET_DIR 时每个服务另外监听该目录下的 Unix 域套接字, 层间调用改走套接字 (对外仍监听 TCP 端口)
 """
 
 import subprocess
@@ -10,13 +12,17 @@ import signal
 import sys
 import os
 
+from common.config import env_str
+
 
 class ServiceManager:
     """服务管理器"""
     
-    def __init__(self):
+    def __init__(self, socket_dir=""):
         self.processes = []
         self.running = False
+        # 非空时层间调用使用该目录下的 Unix 域套接字
+        self.socket_dir = os.path.abspath(socket_dir) if socket_dir else ""
         
         # 设置信号处理
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -28,10 +34,21 @@ class ServiceManager:
         self.stop_all_services()
         sys.exit(0)
     
-    def start_service(self, name, command, port, delay=2):
-        """启动单个服务"""
+    def socket(self, name):
+        """服务的 Unix 域套接字地址, 未配置 socket_dir 时为空"""
+        return f"unix:{os.path.join(self.socket_dir, f'{name}.sock')}" if self.socket_dir else ""
+    
+    def address(self, name, port):
+        """层间调用的下游地址"""
+        return self.socket(name) or f"localhost:{port}"
+    
+    def start_service(self, name, command, port, delay=2, env=None):
+        """启动单个服务, env 为额外的环境变量"""
         try:
             print(f"🚀 Starting {name} on port {port}...")
+            env = dict(env or {})
+            if self.socket_dir:
+                env["SERVICE_SOCKET"] = self.socket(name)
             
             # 启动服务进程
             process = subprocess.Popen(
@@ -39,7 +56,8 @@ class ServiceManager:
                 shell=True,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                env=dict(os.environ, **env)
             )
             
             self.processes.append({
@@ -76,12 +94,16 @@ class ServiceManager:
         
         # 2. 启动中层服务
         print("\n🏢 Starting Middle Layer Services...")
-        self.start_service("FoodService", "python services/food_service.py", 50052)
-        self.start_service("ElectronicsService", "python services/electronics_service.py", 50051)
+        self.start_service("FoodService", "python services/food_service.py", 50052,
+                           env={"FRESH_SERVICE_ADDR": self.address("FreshService", 50053)})
+        self.start_service("ElectronicsService", "python services/electronics_service.py", 50051,
+                           env={"APPLIANCE_SERVICE_ADDR": self.address("ApplianceService", 50054)})
         
         # 3. 启动顶层服务
         print("\n🌐 Starting Top Layer Service...")
-        self.start_service("APIGateway", "python api_gateway.py", 50050)
+        self.start_service("APIGateway", "python api_gateway.py", 50050,
+                           env={"FOOD_SERVICE_ADDR": self.address("FoodService", 50052),
+                                "ELECTRONICS_SERVICE_ADDR": self.address("ElectronicsService", 50051)})
         
         self.running = True
         print("\n" + "=" * 50)
@@ -91,6 +113,8 @@ class ServiceManager:
         print("   🌐 API Gateway (50050) → Routes requests")
         print("   ├── 🍎 FoodService (50052) → 🥬 FreshService (50053)")
         print("   └── 📱 ElectronicsService (50051) → 🏠 ApplianceService (50054)")
+        if self.socket_dir:
+            print(f"   🔌 Layers connect over Unix domain sockets in {self.socket_dir}")
         print("\n💡 Use Ctrl+C to stop all services")
         print("=" * 50)
     
@@ -155,7 +179,8 @@ def main():
         sys.exit(1)
     
     # 创建并运行服务管理器
-    manager = ServiceManager()
+    # SERVICE_SOCKET_DIR: 层间调用改用该目录下的 Unix 域套接字
+    manager = ServiceManager(socket_dir=env_str("SERVICE_SOCKET_DIR"))
     manager.run()
 
 
@@ -186,6 +186,79 @@ class WarehouseTestClient:
             print(f"   📨 [FAILED] ListItems failed due to exception")
             return None
     
+    def test_scan_inventory(self, prefix="", page_size=0):
+        """测试流式扫描库存功能 (按游标翻页直到结束)"""
+        try:
+            print(f"\n🔎 [SENDING] TestClient - ScanInventory Request:")
+            print(f"   📤 Prefix: {prefix!r}")
+            print(f"   📤 Page size: {page_size}")
+            
+            cursor = ""
+            pages = 0
+            total = 0
+            while True:
+                request = warehouse_pb2.ScanInventoryRequest(
+                    prefix=prefix,
+                    cursor=cursor,
+                    page_size=page_size
+                )
+                print(f"   🔄 [CALLING] Streaming page {pages + 1} from API Gateway (cursor={cursor!r})...")
+                has_more = False
+                for chunk in self.stub.ScanInventory(request):
+                    for entry in chunk.entries:
+                        key = "/".join(p for p in (entry.category, entry.subcategory, entry.item) if p)
+                        print(f"   📨 {key}: {entry.count}")
+                    total += len(chunk.entries)
+                    cursor = chunk.next_cursor
+                    has_more = chunk.has_more
+                pages += 1
+                if not has_more:
+                    break
+            
+            print(f"   ✅ [SUCCESS] ScanInventory completed: {total} entries in {pages} pages")
+            return total
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] gRPC Error: {e}")
+            print(f"   📨 [FAILED] ScanInventory failed due to gRPC error")
+            return None
+        except Exception as e:
+            print(f"❌ [ERROR] ScanInventory failed: {e}")
+            print(f"   📨 [FAILED] ScanInventory failed due to exception")
+            return None
+    
+    def test_checkout(self, orders):
+        """测试多类别购物车结账功能"""
+        try:
+            print(f"\n🧾 [SENDING] TestClient - Checkout Request:")
+            for category, subcategory, item in orders:
+                print(f"   📤 Line: {category}/{subcategory} item={item}")
+            
+            request = warehouse_pb2.CheckoutRequest(orders=[
+                warehouse_pb2.OrderRequest(category=c, subcategory=s, item=i) for c, s, i in orders
+            ])
+            
+            print(f"   🔄 [CALLING] Sending request to API Gateway...")
+            response = self.stub.Checkout(request)
+            
+            print(f"   📨 [RECEIVED] Response from API Gateway:")
+            print(f"   📨 Status: {response.status}")
+            print(f"   📨 Message: {response.message}")
+            for i, result in enumerate(response.results):
+                print(f"   📨 Line {i+1}: status={result.status}, left={result.left}")
+            print(f"   ✅ [SUCCESS] Checkout completed")
+            
+            return response
+            
+        except grpc.RpcError as e:
+            print(f"❌ [ERROR] gRPC Error: {e}")
+            print(f"   📨 [FAILED] Checkout failed due to gRPC error")
+            return None
+        except Exception as e:
+            print(f"❌ [ERROR] Checkout failed: {e}")
+            print(f"   📨 [FAILED] Checkout failed due to exception")
+            return None
+    
     def run_comprehensive_test(self):
         """运行综合测试"""
         print("🎯 [START] Warehouse Test Client - Comprehensive Test")
@@ -238,6 +311,22 @@ class WarehouseTestClient:
         print("🔍 [STEP 1] Testing item update...")
         self.test_update_item("fruits", "apple", 100)
         self.test_update_item("kitchen", "refrigerator", 15)
+        
+        # 测试流式扫描
+        print("\n🔎 [TEST] Testing ScanInventory functionality")
+        print("-" * 30)
+        print("🔍 [STEP 1] Scanning fruits...")
+        self.test_scan_inventory("fruits/")
+        print("\n🔍 [STEP 2] Scanning whole warehouse, 3 entries per page...")
+        self.test_scan_inventory("", page_size=3)
+        
+        # 测试多类别结账
+        print("\n🧾 [TEST] Testing Checkout functionality")
+        print("-" * 30)
+        print("🔍 [STEP 1] Checkout fruits + appliance...")
+        self.test_checkout([("fruits", "apple", "5"), ("kitchen", "refrigerator", "oven")])
+        print("\n🔍 [STEP 2] Checkout exceeding stock (all lines rolled back)...")
+        self.test_checkout([("fruits", "apple", "5"), ("fruits", "banana", "100000")])
     
     def close(self):
         """关闭客户端连接"""
@@ -24,29 +24,131 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0fwarehouse.proto\x12\twarehouse\"C\n\x0cOrderRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\t\"-\n\rOrderResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0c\n\x04left\x18\x02 \x01(\x05\"E\n\x0ePutItemRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\t\"3\n\x0fPutItemResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"H\n\x11UpdateItemRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\x05\"6\n\x12UpdateItemResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"9\n\x10ListItemsRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\"\"\n\x11ListItemsResponse\x12\r\n\x05items\x18\x01 \x03(\t2\xa4\x02\n\x0cOrderService\x12?\n\nPlaceOrder\x12\x17.warehouse.OrderRequest\x1a\x18.warehouse.OrderResponse\x12@\n\x07PutItem\x12\x19.warehouse.PutItemRequest\x1a\x1a.warehouse.PutItemResponse\x12I\n\nUpdateItem\x12\x1c.warehouse.UpdateItemRequest\x1a\x1d.warehouse.UpdateItemResponse\x12\x46\n\tListItems\x12\x1b.warehouse.ListItemsRequest\x1a\x1c.warehouse.ListItemsResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0fwarehouse.proto\x12\twarehouse\"\xa0\x01\n\x0cOrderRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x04 \x01(\t\x12\x13\n\x06sku_id\x18\x05 \x01(\x03H\x00\x88\x01\x01\x12\x15\n\x08quantity\x18\x06 \x01(\x05H\x01\x88\x01\x01\x42\t\n\x07_sku_idB\x0b\n\t_quantity\">\n\rOrderResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0c\n\x04left\x18\x02 \x01(\x05\x12\x0f\n\x07serials\x18\x03 \x03(\x03\"\xf3\x01\n\x0ePutItemRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x04 \x01(\t\x12\x13\n\x06sku_id\x18\x05 \x01(\x03H\x00\x88\x01\x01\x12\x15\n\x08quantity\x18\x06 \x01(\x05H\x01\x88\x01\x01\x12\x17\n\nexpires_at\x18\x07 \x01(\x01H\x02\x88\x01\x01\x12\'\n\x07serials\x18\x08 \x03(\x0b\x32\x16.warehouse.SerialRangeB\t\n\x07_sku_idB\x0b\n\t_quantityB\r\n\x0b_expires_at\"+\n\x0bSerialRange\x12\r\n\x05start\x18\x01 \x01(\x03\x12\r\n\x05\x63ount\x18\x02 \x01(\x03\"j\n\x0fPutItemResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0e\n\x06sku_id\x18\x03 \x01(\x03\x12\x0e\n\x06lot_id\x18\x04 \x01(\x03\x12\x15\n\rserials_added\x18\x05 \x01(\x03\"\xd9\x01\n\x11UpdateItemRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\x05\x12\x17\n\x0fidempotency_key\x18\x04 \x01(\t\x12\x13\n\x06sku_id\x18\x05 \x01(\x03H\x00\x88\x01\x01\x12\x15\n\x08quantity\x18\x06 \x01(\x05H\x01\x88\x01\x01\x12\x1d\n\x10\x65xpected_version\x18\x07 \x01(\x03H\x02\x88\x01\x01\x42\t\n\x07_sku_idB\x0b\n\t_quantityB\x13\n\x11_expected_version\"j\n\x12UpdateItemResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07version\x18\x03 \x01(\x03\x12\x10\n\x08\x63onflict\x18\x04 \x01(\x08\x12\x0f\n\x07\x63urrent\x18\x05 \x01(\x05\"9\n\x10ListItemsRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\"4\n\x11ListItemsResponse\x12\r\n\x05items\x18\x01 \x03(\t\x12\x10\n\x08versions\x18\x02 \x03(\x03\"d\n\x0eInventoryEntry\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\t\x12\r\n\x05\x63ount\x18\x04 \x01(\x05\x12\x0e\n\x06sku_id\x18\x05 \x01(\x03\"]\n\x14ScanInventoryRequest\x12\x0e\n\x06prefix\x18\x01 \x01(\t\x12\x0e\n\x06\x63ursor\x18\x02 \x01(\t\x12\x11\n\tpage_size\x18\x03 \x01(\x05\x12\x12\n\nchunk_size\x18\x04 \x01(\x05\"g\n\x12ScanInventoryChunk\x12*\n\x07\x65ntries\x18\x01 \x03(\x0b\x32\x19.warehouse.InventoryEntry\x12\x13\n\x0bnext_cursor\x18\x02 \x01(\t\x12\x10\n\x08has_more\x18\x03 \x01(\x08\"Q\n\x08StockRow\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\t\x12\x10\n\x08quantity\x18\x04 \x01(\x05\"5\n\x10ImportStockChunk\x12!\n\x04rows\x18\x01 \x03(\x0b\x32\x13.warehouse.StockRow\"\xa2\x01\n\x13ImportStockResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x14\n\x0crows_applied\x18\x03 \x01(\x03\x12\x15\n\rrows_rejected\x18\x04 \x01(\x03\x12\x13\n\x0bunits_added\x18\x05 \x01(\x03\x12\x0e\n\x06\x63hunks\x18\x06 \x01(\x03\x12\x17\n\x0f\x65lapsed_seconds\x18\x07 \x01(\x01\":\n\x16\x45xportInventoryRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x0e\n\x06prefix\x18\x02 \x01(\t\"r\n\x0b\x45xportChunk\x12\x0c\n\x04\x64\x61ta\x18\x01 \x01(\x0c\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12\x13\n\x0btotal_bytes\x18\x03 \x01(\x03\x12\x0f\n\x07\x65ntries\x18\x04 \x01(\x03\x12\x0e\n\x06\x66ormat\x18\x05 \x01(\t\x12\x0f\n\x07service\x18\x06 \x01(\t\":\n\x0f\x43heckoutRequest\x12\'\n\x06orders\x18\x01 \x03(\x0b\x32\x17.warehouse.OrderRequest\"^\n\x10\x43heckoutResponse\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12)\n\x07results\x18\x03 \x03(\x0b\x32\x18.warehouse.OrderResponse\"N\n\x13PrepareOrderRequest\x12\x0e\n\x06txn_id\x18\x01 \x01(\t\x12\'\n\x06orders\x18\x02 \x03(\x0b\x32\x17.warehouse.OrderRequest\"b\n\x14PrepareOrderResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0e\n\x06status\x18\x02 \x01(\t\x12)\n\x07results\x18\x03 \x03(\x0b\x32\x18.warehouse.OrderResponse\"\x1c\n\nTxnRequest\x12\x0e\n\x06txn_id\x18\x01 \x01(\t\"/\n\x0bTxnResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\xb6\x01\n\x15WatchInventoryRequest\x12\x10\n\x08prefixes\x18\x01 \x03(\t\x12\x45\n\x0bresume_from\x18\x02 \x03(\x0b\x32\x30.warehouse.WatchInventoryRequest.ResumeFromEntry\x12\x11\n\tmax_batch\x18\x03 \x01(\x05\x1a\x31\n\x0fResumeFromEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x04:\x02\x38\x01\"\xa1\x01\n\x0eInventoryDelta\x12\x0b\n\x03seq\x18\x01 \x01(\x04\x12\x0e\n\x06source\x18\x02 \x01(\t\x12\x10\n\x08\x63\x61tegory\x18\x03 \x01(\t\x12\x13\n\x0bsubcategory\x18\x04 \x01(\t\x12\x0c\n\x04item\x18\x05 \x01(\t\x12\r\n\x05\x63ount\x18\x06 \x01(\x05\x12\x0f\n\x07\x64\x65leted\x18\x07 \x01(\x08\x12\n\n\x02op\x18\x08 \x01(\t\x12\x11\n\ttimestamp\x18\t \x01(\x01\"C\n\x16WatchInventoryResponse\x12)\n\x06\x64\x65ltas\x18\x01 \x03(\x0b\x32\x19.warehouse.InventoryDelta\"\x86\x01\n\x13StockHistoryRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\t\x12\x13\n\x06sku_id\x18\x04 \x01(\x03H\x00\x88\x01\x01\x12\x1a\n\x12resolution_seconds\x18\x05 \x01(\x05\x42\t\n\x07_sku_id\"]\n\x0bStockSeries\x12\x1a\n\x12resolution_seconds\x18\x01 \x01(\x05\x12\x12\n\nstart_time\x18\x02 \x01(\x03\x12\x0e\n\x06levels\x18\x03 \x03(\x05\x12\x0e\n\x06orders\x18\x04 \x03(\x05\"^\n\x14StockHistoryResponse\x12\r\n\x05\x66ound\x18\x01 \x01(\x08\x12&\n\x06series\x18\x02 \x03(\x0b\x32\x16.warehouse.StockSeries\x12\x0f\n\x07message\x18\x03 \x01(\t\"4\n\x11TopSellersRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\r\n\x05limit\x18\x02 \x01(\x05\"_\n\tTopSeller\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\t\x12\x0e\n\x06sku_id\x18\x04 \x01(\x03\x12\r\n\x05units\x18\x05 \x01(\x03\"y\n\x12TopSellersResponse\x12%\n\x07sellers\x18\x01 \x03(\x0b\x32\x14.warehouse.TopSeller\x12\x13\n\x0b\x65rror_bound\x18\x02 \x01(\x03\x12\x16\n\x0ewindow_seconds\x18\x03 \x01(\x05\x12\x0f\n\x07message\x18\x04 \x01(\t\"\xa5\x01\n\x0eReserveRequest\x12\x10\n\x08\x63\x61tegory\x18\x01 \x01(\t\x12\x13\n\x0bsubcategory\x18\x02 \x01(\t\x12\x0c\n\x04item\x18\x03 \x01(\t\x12\x17\n\x0fidempotency_key\x18\x04 \x01(\t\x12\x13\n\x06sku_id\x18\x05 \x01(\x03H\x00\x88\x01\x01\x12\x10\n\x08quantity\x18\x06 \x01(\x05\x12\x13\n\x0bttl_seconds\x18\x07 \x01(\x01\x42\t\n\x07_sku_id\"k\n\x0fReserveResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0f\n\x07hold_id\x18\x03 \x01(\x03\x12\x11\n\tavailable\x18\x04 \x01(\x05\x12\x12\n\nexpires_at\x18\x05 \x01(\x01\"\x1e\n\x0bHoldRequest\x12\x0f\n\x07hold_id\x18\x01 \x01(\x03\"O\n\x0cHoldResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0c\n\x04left\x18\x03 \x01(\x05\x12\x0f\n\x07serials\x18\x04 \x03(\x03\"6\n\x10ReplicateRequest\x12\x0f\n\x07replica\x18\x01 \x01(\t\x12\x11\n\tmax_batch\x18\x02 \x01(\x05\"\xbb\x01\n\x10ReplicationBatch\x12)\n\x06\x64\x65ltas\x18\x01 \x03(\x0b\x32\x19.warehouse.InventoryDelta\x12\x10\n\x08snapshot\x18\x02 \x01(\x08\x12\x15\n\rsnapshot_done\x18\x03 \x01(\x08\x12\x0b\n\x03seq\x18\x04 \x01(\x04\x12\r\n\x05\x65poch\x18\x05 \x01(\x03\x12\x15\n\rversion_floor\x18\x06 \x01(\x04\x12\x12\n\nsku_offset\x18\x07 \x01(\x03\x12\x0c\n\x04skus\x18\x08 \x03(\t\" \n\x0ePromoteRequest\x12\x0e\n\x06reason\x18\x01 \x01(\t\"@\n\x0fPromoteResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0b\n\x03seq\x18\x03 \x01(\x04\"\x16\n\x14ReplicaStatusRequest\"E\n\x15ReplicaStatusResponse\x12\x0c\n\x04role\x18\x01 \x01(\t\x12\x0b\n\x03seq\x18\x02 \x01(\x04\x12\x11\n\tconnected\x18\x03 \x01(\x08\"S\n\x14StartProfilerRequest\x12\x0c\n\x04mode\x18\x01 \x01(\t\x12\x18\n\x10\x64uration_seconds\x18\x02 \x01(\x01\x12\x13\n\x0binterval_ms\x18\x03 \x01(\x05\"9\n\x15StartProfilerResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\"\x15\n\x13StopProfilerRequest\"\x88\x01\n\rProfileResult\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0c\n\x04mode\x18\x03 \x01(\t\x12\x0e\n\x06\x66ormat\x18\x04 \x01(\t\x12\x0c\n\x04\x64\x61ta\x18\x05 \x01(\x0c\x12\x18\n\x10\x64uration_seconds\x18\x06 \x01(\x01\x12\x0f\n\x07samples\x18\x07 \x01(\x03\"\x13\n\x11\x44umpStacksRequest\":\n\x12\x44umpStacksResponse\x12\x14\n\x0cthread_count\x18\x01 \x01(\x05\x12\x0e\n\x06stacks\x18\x02 \x01(\t\"B\n\x12TraceMallocRequest\x12\x0e\n\x06\x61\x63tion\x18\x01 \x01(\t\x12\x0f\n\x07nframes\x18\x02 \x01(\x05\x12\x0b\n\x03top\x18\x03 \x01(\x05\"\x87\x01\n\x13TraceMallocResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x11\n\ttop_stats\x18\x03 \x01(\t\x12\x10\n\x08snapshot\x18\x04 \x01(\x0c\x12\x15\n\rcurrent_bytes\x18\x05 \x01(\x03\x12\x12\n\npeak_bytes\x18\x06 \x01(\x03\" \n\x0eMetricsRequest\x12\x0e\n\x06prefix\x18\x01 \x01(\t\"x\n\x0fMetricsResponse\x12\x36\n\x06values\x18\x01 \x03(\x0b\x32&.warehouse.MetricsResponse.ValuesEntry\x1a-\n\x0bValuesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x01:\x02\x38\x01\";\n\rFaultsRequest\x12\x0e\n\x06\x61\x63tion\x18\x01 \x01(\t\x12\x0c\n\x04spec\x18\x02 \x01(\t\x12\x0c\n\x04seed\x18\x03 \x01(\x03\"@\n\x0e\x46\x61ultsResponse\x12\x0f\n\x07success\x18\x01 \x01(\x08\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x0c\n\x04spec\x18\x03 \x01(\t2\xbb\x0b\n\x0cOrderService\x12?\n\nPlaceOrder\x12\x17.warehouse.OrderRequest\x1a\x18.warehouse.OrderResponse\x12@\n\x07PutItem\x12\x19.warehouse.PutItemRequest\x1a\x1a.warehouse.PutItemResponse\x12I\n\nUpdateItem\x12\x1c.warehouse.UpdateItemRequest\x1a\x1d.warehouse.UpdateItemResponse\x12\x46\n\tListItems\x12\x1b.warehouse.ListItemsRequest\x1a\x1c.warehouse.ListItemsResponse\x12Q\n\rScanInventory\x12\x1f.warehouse.ScanInventoryRequest\x1a\x1d.warehouse.ScanInventoryChunk0\x01\x12L\n\x0bImportStock\x12\x1b.warehouse.ImportStockChunk\x1a\x1e.warehouse.ImportStockResponse(\x01\x12N\n\x0f\x45xportInventory\x12!.warehouse.ExportInventoryRequest\x1a\x16.warehouse.ExportChunk0\x01\x12\x43\n\x08\x43heckout\x12\x1a.warehouse.CheckoutRequest\x1a\x1b.warehouse.CheckoutResponse\x12O\n\x0cPrepareOrder\x12\x1e.warehouse.PrepareOrderRequest\x1a\x1f.warehouse.PrepareOrderResponse\x12<\n\x0b\x43ommitOrder\x12\x15.warehouse.TxnRequest\x1a\x16.warehouse.TxnResponse\x12;\n\nAbortOrder\x12\x15.warehouse.TxnRequest\x1a\x16.warehouse.TxnResponse\x12W\n\x0eWatchInventory\x12 .warehouse.WatchInventoryRequest\x1a!.warehouse.WatchInventoryResponse0\x01\x12O\n\x0cStockHistory\x12\x1e.warehouse.StockHistoryRequest\x1a\x1f.warehouse.StockHistoryResponse\x12I\n\nTopSellers\x12\x1c.warehouse.TopSellersRequest\x1a\x1d.warehouse.TopSellersResponse\x12@\n\x07Reserve\x12\x19.warehouse.ReserveRequest\x1a\x1a.warehouse.ReserveResponse\x12=\n\nCommitHold\x12\x16.warehouse.HoldRequest\x1a\x17.warehouse.HoldResponse\x12>\n\x0bReleaseHold\x12\x16.warehouse.HoldRequest\x1a\x17.warehouse.HoldResponse\x12G\n\tReplicate\x12\x1b.warehouse.ReplicateRequest\x1a\x1b.warehouse.ReplicationBatch0\x01\x12@\n\x07Promote\x12\x19.warehouse.PromoteRequest\x1a\x1a.warehouse.PromoteResponse\x12R\n\rReplicaStatus\x12\x1f.warehouse.ReplicaStatusRequest\x1a .warehouse.ReplicaStatusResponse2\xc9\x03\n\x0c\x41\x64minService\x12R\n\rStartProfiler\x12\x1f.warehouse.StartProfilerRequest\x1a .warehouse.StartProfilerResponse\x12H\n\x0cStopProfiler\x12\x1e.warehouse.StopProfilerRequest\x1a\x18.warehouse.ProfileResult\x12I\n\nDumpStacks\x12\x1c.warehouse.DumpStacksRequest\x1a\x1d.warehouse.DumpStacksResponse\x12L\n\x0bTraceMalloc\x12\x1d.warehouse.TraceMallocRequest\x1a\x1e.warehouse.TraceMallocResponse\x12\x43\n\nGetMetrics\x12\x19.warehouse.MetricsRequest\x1a\x1a.warehouse.MetricsResponse\x12=\n\x06\x46\x61ults\x12\x18.warehouse.FaultsRequest\x1a\x19.warehouse.FaultsResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'warehouse_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_ORDERREQUEST']._serialized_start=30
-  _globals['_ORDERREQUEST']._serialized_end=97
-  _globals['_ORDERRESPONSE']._serialized_start=99
-  _globals['_ORDERRESPONSE']._serialized_end=144
-  _globals['_PUTITEMREQUEST']._serialized_start=146
-  _globals['_PUTITEMREQUEST']._serialized_end=215
-  _globals['_PUTITEMRESPONSE']._serialized_start=217
-  _globals['_PUTITEMRESPONSE']._serialized_end=268
-  _globals['_UPDATEITEMREQUEST']._serialized_start=270
-  _globals['_UPDATEITEMREQUEST']._serialized_end=342
-  _globals['_UPDATEITEMRESPONSE']._serialized_start=344
-  _globals['_UPDATEITEMRESPONSE']._serialized_end=398
-  _globals['_LISTITEMSREQUEST']._serialized_start=400
-  _globals['_LISTITEMSREQUEST']._serialized_end=457
-  _globals['_LISTITEMSRESPONSE']._serialized_start=459
-  _globals['_LISTITEMSRESPONSE']._serialized_end=493
-  _globals['_ORDERSERVICE']._serialized_start=496
-  _globals['_ORDERSERVICE']._serialized_end=788
+  _globals['_WATCHINVENTORYREQUEST_RESUMEFROMENTRY']._loaded_options = None
+  _globals['_WATCHINVENTORYREQUEST_RESUMEFROMENTRY']._serialized_options = b'8\001'
+  _globals['_METRICSRESPONSE_VALUESENTRY']._loaded_options = None
+  _globals['_METRICSRESPONSE_VALUESENTRY']._serialized_options = b'8\001'
+  _globals['_ORDERREQUEST']._serialized_start=31
+  _globals['_ORDERREQUEST']._serialized_end=191
+  _globals['_ORDERRESPONSE']._serialized_start=193
+  _globals['_ORDERRESPONSE']._serialized_end=255
+  _globals['_PUTITEMREQUEST']._serialized_start=258
+  _globals['_PUTITEMREQUEST']._serialized_end=501
+  _globals['_SERIALRANGE']._serialized_start=503
+  _globals['_SERIALRANGE']._serialized_end=546
+  _globals['_PUTITEMRESPONSE']._serialized_start=548
+  _globals['_PUTITEMRESPONSE']._serialized_end=654
+  _globals['_UPDATEITEMREQUEST']._serialized_start=657
+  _globals['_UPDATEITEMREQUEST']._serialized_end=874
+  _globals['_UPDATEITEMRESPONSE']._serialized_start=876
+  _globals['_UPDATEITEMRESPONSE']._serialized_end=982
+  _globals['_LISTITEMSREQUEST']._serialized_start=984
+  _globals['_LISTITEMSREQUEST']._serialized_end=1041
+  _globals['_LISTITEMSRESPONSE']._serialized_start=1043
+  _globals['_LISTITEMSRESPONSE']._serialized_end=1095
+  _globals['_INVENTORYENTRY']._serialized_start=1097
+  _globals['_INVENTORYENTRY']._serialized_end=1197
+  _globals['_SCANINVENTORYREQUEST']._serialized_start=1199
+  _globals['_SCANINVENTORYREQUEST']._serialized_end=1292
+  _globals['_SCANINVENTORYCHUNK']._serialized_start=1294
+  _globals['_SCANINVENTORYCHUNK']._serialized_end=1397
+  _globals['_STOCKROW']._serialized_start=1399
+  _globals['_STOCKROW']._serialized_end=1480
+  _globals['_IMPORTSTOCKCHUNK']._serialized_start=1482
+  _globals['_IMPORTSTOCKCHUNK']._serialized_end=1535
+  _globals['_IMPORTSTOCKRESPONSE']._serialized_start=1538
+  _globals['_IMPORTSTOCKRESPONSE']._serialized_end=1700
+  _globals['_EXPORTINVENTORYREQUEST']._serialized_start=1702
+  _globals['_EXPORTINVENTORYREQUEST']._serialized_end=1760
+  _globals['_EXPORTCHUNK']._serialized_start=1762
+  _globals['_EXPORTCHUNK']._serialized_end=1876
+  _globals['_CHECKOUTREQUEST']._serialized_start=1878
+  _globals['_CHECKOUTREQUEST']._serialized_end=1936
+  _globals['_CHECKOUTRESPONSE']._serialized_start=1938
+  _globals['_CHECKOUTRESPONSE']._serialized_end=2032
+  _globals['_PREPAREORDERREQUEST']._serialized_start=2034
+  _globals['_PREPAREORDERREQUEST']._serialized_end=2112
+  _globals['_PREPAREORDERRESPONSE']._serialized_start=2114
+  _globals['_PREPAREORDERRESPONSE']._serialized_end=2212
+  _globals['_TXNREQUEST']._serialized_start=2214
+  _globals['_TXNREQUEST']._serialized_end=2242
+  _globals['_TXNRESPONSE']._serialized_start=2244
+  _globals['_TXNRESPONSE']._serialized_end=2291
+  _globals['_WATCHINVENTORYREQUEST']._serialized_start=2294
+  _globals['_WATCHINVENTORYREQUEST']._serialized_end=2476
+  _globals['_WATCHINVENTORYREQUEST_RESUMEFROMENTRY']._serialized_start=2427
+  _globals['_WATCHINVENTORYREQUEST_RESUMEFROMENTRY']._serialized_end=2476
+  _globals['_INVENTORYDELTA']._serialized_start=2479
+  _globals['_INVENTORYDELTA']._serialized_end=2640
+  _globals['_WATCHINVENTORYRESPONSE']._serialized_start=2642
+  _globals['_WATCHINVENTORYRESPONSE']._serialized_end=2709
+  _globals['_STOCKHISTORYREQUEST']._serialized_start=2712
+  _globals['_STOCKHISTORYREQUEST']._serialized_end=2846
+  _globals['_STOCKSERIES']._serialized_start=2848
+  _globals['_STOCKSERIES']._serialized_end=2941
+  _globals['_STOCKHISTORYRESPONSE']._serialized_start=2943
+  _globals['_STOCKHISTORYRESPONSE']._serialized_end=3037
+  _globals['_TOPSELLERSREQUEST']._serialized_start=3039
+  _globals['_TOPSELLERSREQUEST']._serialized_end=3091
+  _globals['_TOPSELLER']._serialized_start=3093
+  _globals['_TOPSELLER']._serialized_end=3188
+  _globals['_TOPSELLERSRESPONSE']._serialized_start=3190
+  _globals['_TOPSELLERSRESPONSE']._serialized_end=3311
+  _globals['_RESERVEREQUEST']._serialized_start=3314
+  _globals['_RESERVEREQUEST']._serialized_end=3479
+  _globals['_RESERVERESPONSE']._serialized_start=3481
+  _globals['_RESERVERESPONSE']._serialized_end=3588
+  _globals['_HOLDREQUEST']._serialized_start=3590
+  _globals['_HOLDREQUEST']._serialized_end=3620
+  _globals['_HOLDRESPONSE']._serialized_start=3622
+  _globals['_HOLDRESPONSE']._serialized_end=3701
+  _globals['_REPLICATEREQUEST']._serialized_start=3703
+  _globals['_REPLICATEREQUEST']._serialized_end=3757
+  _globals['_REPLICATIONBATCH']._serialized_start=3760
+  _globals['_REPLICATIONBATCH']._serialized_end=3947
+  _globals['_PROMOTEREQUEST']._serialized_start=3949
+  _globals['_PROMOTEREQUEST']._serialized_end=3981
+  _globals['_PROMOTERESPONSE']._serialized_start=3983
+  _globals['_PROMOTERESPONSE']._serialized_end=4047
+  _globals['_REPLICASTATUSREQUEST']._serialized_start=4049
+  _globals['_REPLICASTATUSREQUEST']._serialized_end=4071
+  _globals['_REPLICASTATUSRESPONSE']._serialized_start=4073
+  _globals['_REPLICASTATUSRESPONSE']._serialized_end=4142
+  _globals['_STARTPROFILERREQUEST']._serialized_start=4144
+  _globals['_STARTPROFILERREQUEST']._serialized_end=4227
+  _globals['_STARTPROFILERRESPONSE']._serialized_start=4229
+  _globals['_STARTPROFILERRESPONSE']._serialized_end=4286
+  _globals['_STOPPROFILERREQUEST']._serialized_start=4288
+  _globals['_STOPPROFILERREQUEST']._serialized_end=4309
+  _globals['_PROFILERESULT']._serialized_start=4312
+  _globals['_PROFILERESULT']._serialized_end=4448
+  _globals['_DUMPSTACKSREQUEST']._serialized_start=4450
+  _globals['_DUMPSTACKSREQUEST']._serialized_end=4469
+  _globals['_DUMPSTACKSRESPONSE']._serialized_start=4471
+  _globals['_DUMPSTACKSRESPONSE']._serialized_end=4529
+  _globals['_TRACEMALLOCREQUEST']._serialized_start=4531
+  _globals['_TRACEMALLOCREQUEST']._serialized_end=4597
+  _globals['_TRACEMALLOCRESPONSE']._serialized_start=4600
+  _globals['_TRACEMALLOCRESPONSE']._serialized_end=4735
+  _globals['_METRICSREQUEST']._serialized_start=4737
+  _globals['_METRICSREQUEST']._serialized_end=4769
+  _globals['_METRICSRESPONSE']._serialized_start=4771
+  _globals['_METRICSRESPONSE']._serialized_end=4891
+  _globals['_METRICSRESPONSE_VALUESENTRY']._serialized_start=4846
+  _globals['_METRICSRESPONSE_VALUESENTRY']._serialized_end=4891
+  _globals['_FAULTSREQUEST']._serialized_start=4893
+  _globals['_FAULTSREQUEST']._serialized_end=4952
+  _globals['_FAULTSRESPONSE']._serialized_start=4954
+  _globals['_FAULTSRESPONSE']._serialized_end=5018
+  _globals['_ORDERSERVICE']._serialized_start=5021
+  _globals['_ORDERSERVICE']._serialized_end=6488
+  _globals['_ADMINSERVICE']._serialized_start=6491
+  _globals['_ADMINSERVICE']._serialized_end=6948
 # @@protoc_insertion_point(module_scope)
@@ -55,6 +55,86 @@ class OrderServiceStub(object):
                 request_serializer=warehouse__pb2.ListItemsRequest.SerializeToString,
                 response_deserializer=warehouse__pb2.ListItemsResponse.FromString,
                 _registered_method=True)
+        self.ScanInventory = channel.unary_stream(
+                '/warehouse.OrderService/ScanInventory',
+                request_serializer=warehouse__pb2.ScanInventoryRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.ScanInventoryChunk.FromString,
+                _registered_method=True)
+        self.ImportStock = channel.stream_unary(
+                '/warehouse.OrderService/ImportStock',
+                request_serializer=warehouse__pb2.ImportStockChunk.SerializeToString,
+                response_deserializer=warehouse__pb2.ImportStockResponse.FromString,
+                _registered_method=True)
+        self.ExportInventory = channel.unary_stream(
+                '/warehouse.OrderService/ExportInventory',
+                request_serializer=warehouse__pb2.ExportInventoryRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.ExportChunk.FromString,
+                _registered_method=True)
+        self.Checkout = channel.unary_unary(
+                '/warehouse.OrderService/Checkout',
+                request_serializer=warehouse__pb2.CheckoutRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.CheckoutResponse.FromString,
+                _registered_method=True)
+        self.PrepareOrder = channel.unary_unary(
+                '/warehouse.OrderService/PrepareOrder',
+                request_serializer=warehouse__pb2.PrepareOrderRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.PrepareOrderResponse.FromString,
+                _registered_method=True)
+        self.CommitOrder = channel.unary_unary(
+                '/warehouse.OrderService/CommitOrder',
+                request_serializer=warehouse__pb2.TxnRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.TxnResponse.FromString,
+                _registered_method=True)
+        self.AbortOrder = channel.unary_unary(
+                '/warehouse.OrderService/AbortOrder',
+                request_serializer=warehouse__pb2.TxnRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.TxnResponse.FromString,
+                _registered_method=True)
+        self.WatchInventory = channel.unary_stream(
+                '/warehouse.OrderService/WatchInventory',
+                request_serializer=warehouse__pb2.WatchInventoryRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.WatchInventoryResponse.FromString,
+                _registered_method=True)
+        self.StockHistory = channel.unary_unary(
+                '/warehouse.OrderService/StockHistory',
+                request_serializer=warehouse__pb2.StockHistoryRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.StockHistoryResponse.FromString,
+                _registered_method=True)
+        self.TopSellers = channel.unary_unary(
+                '/warehouse.OrderService/TopSellers',
+                request_serializer=warehouse__pb2.TopSellersRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.TopSellersResponse.FromString,
+                _registered_method=True)
+        self.Reserve = channel.unary_unary(
+                '/warehouse.OrderService/Reserve',
+                request_serializer=warehouse__pb2.ReserveRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.ReserveResponse.FromString,
+                _registered_method=True)
+        self.CommitHold = channel.unary_unary(
+                '/warehouse.OrderService/CommitHold',
+                request_serializer=warehouse__pb2.HoldRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.HoldResponse.FromString,
+                _registered_method=True)
+        self.ReleaseHold = channel.unary_unary(
+                '/warehouse.OrderService/ReleaseHold',
+                request_serializer=warehouse__pb2.HoldRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.HoldResponse.FromString,
+                _registered_method=True)
+        self.Replicate = channel.unary_stream(
+                '/warehouse.OrderService/Replicate',
+                request_serializer=warehouse__pb2.ReplicateRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.ReplicationBatch.FromString,
+                _registered_method=True)
+        self.Promote = channel.unary_unary(
+                '/warehouse.OrderService/Promote',
+                request_serializer=warehouse__pb2.PromoteRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.PromoteResponse.FromString,
+                _registered_method=True)
+        self.ReplicaStatus = channel.unary_unary(
+                '/warehouse.OrderService/ReplicaStatus',
+                request_serializer=warehouse__pb2.ReplicaStatusRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.ReplicaStatusResponse.FromString,
+                _registered_method=True)
 
 
 class OrderServiceServicer(object):
@@ -85,6 +165,102 @@ class OrderServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ScanInventory(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ImportStock(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExportInventory(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Checkout(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def PrepareOrder(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CommitOrder(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AbortOrder(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchInventory(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StockHistory(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TopSellers(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Reserve(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CommitHold(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReleaseHold(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Replicate(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Promote(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReplicaStatus(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_OrderServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -108,6 +284,86 @@ def add_OrderServiceServicer_to_server(servicer, server):
                     request_deserializer=warehouse__pb2.ListItemsRequest.FromString,
                     response_serializer=warehouse__pb2.ListItemsResponse.SerializeToString,
             ),
+            'ScanInventory': grpc.unary_stream_rpc_method_handler(
+                    servicer.ScanInventory,
+                    request_deserializer=warehouse__pb2.ScanInventoryRequest.FromString,
+                    response_serializer=warehouse__pb2.ScanInventoryChunk.SerializeToString,
+            ),
+            'ImportStock': grpc.stream_unary_rpc_method_handler(
+                    servicer.ImportStock,
+                    request_deserializer=warehouse__pb2.ImportStockChunk.FromString,
+                    response_serializer=warehouse__pb2.ImportStockResponse.SerializeToString,
+            ),
+            'ExportInventory': grpc.unary_stream_rpc_method_handler(
+                    servicer.ExportInventory,
+                    request_deserializer=warehouse__pb2.ExportInventoryRequest.FromString,
+                    response_serializer=warehouse__pb2.ExportChunk.SerializeToString,
+            ),
+            'Checkout': grpc.unary_unary_rpc_method_handler(
+                    servicer.Checkout,
+                    request_deserializer=warehouse__pb2.CheckoutRequest.FromString,
+                    response_serializer=warehouse__pb2.CheckoutResponse.SerializeToString,
+            ),
+            'PrepareOrder': grpc.unary_unary_rpc_method_handler(
+                    servicer.PrepareOrder,
+                    request_deserializer=warehouse__pb2.PrepareOrderRequest.FromString,
+                    response_serializer=warehouse__pb2.PrepareOrderResponse.SerializeToString,
+            ),
+            'CommitOrder': grpc.unary_unary_rpc_method_handler(
+                    servicer.CommitOrder,
+                    request_deserializer=warehouse__pb2.TxnRequest.FromString,
+                    response_serializer=warehouse__pb2.TxnResponse.SerializeToString,
+            ),
+            'AbortOrder': grpc.unary_unary_rpc_method_handler(
+                    servicer.AbortOrder,
+                    request_deserializer=warehouse__pb2.TxnRequest.FromString,
+                    response_serializer=warehouse__pb2.TxnResponse.SerializeToString,
+            ),
+            'WatchInventory': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchInventory,
+                    request_deserializer=warehouse__pb2.WatchInventoryRequest.FromString,
+                    response_serializer=warehouse__pb2.WatchInventoryResponse.SerializeToString,
+            ),
+            'StockHistory': grpc.unary_unary_rpc_method_handler(
+                    servicer.StockHistory,
+                    request_deserializer=warehouse__pb2.StockHistoryRequest.FromString,
+                    response_serializer=warehouse__pb2.StockHistoryResponse.SerializeToString,
+            ),
+            'TopSellers': grpc.unary_unary_rpc_method_handler(
+                    servicer.TopSellers,
+                    request_deserializer=warehouse__pb2.TopSellersRequest.FromString,
+                    response_serializer=warehouse__pb2.TopSellersResponse.SerializeToString,
+            ),
+            'Reserve': grpc.unary_unary_rpc_method_handler(
+                    servicer.Reserve,
+                    request_deserializer=warehouse__pb2.ReserveRequest.FromString,
+                    response_serializer=warehouse__pb2.ReserveResponse.SerializeToString,
+            ),
+            'CommitHold': grpc.unary_unary_rpc_method_handler(
+                    servicer.CommitHold,
+                    request_deserializer=warehouse__pb2.HoldRequest.FromString,
+                    response_serializer=warehouse__pb2.HoldResponse.SerializeToString,
+            ),
+            'ReleaseHold': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReleaseHold,
+                    request_deserializer=warehouse__pb2.HoldRequest.FromString,
+                    response_serializer=warehouse__pb2.HoldResponse.SerializeToString,
+            ),
+            'Replicate': grpc.unary_stream_rpc_method_handler(
+                    servicer.Replicate,
+                    request_deserializer=warehouse__pb2.ReplicateRequest.FromString,
+                    response_serializer=warehouse__pb2.ReplicationBatch.SerializeToString,
+            ),
+            'Promote': grpc.unary_unary_rpc_method_handler(
+                    servicer.Promote,
+                    request_deserializer=warehouse__pb2.PromoteRequest.FromString,
+                    response_serializer=warehouse__pb2.PromoteResponse.SerializeToString,
+            ),
+            'ReplicaStatus': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReplicaStatus,
+                    request_deserializer=warehouse__pb2.ReplicaStatusRequest.FromString,
+                    response_serializer=warehouse__pb2.ReplicaStatusResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'warehouse.OrderService', rpc_method_handlers)
@@ -227,3 +483,725 @@ class OrderService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ScanInventory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/warehouse.OrderService/ScanInventory',
+            warehouse__pb2.ScanInventoryRequest.SerializeToString,
+            warehouse__pb2.ScanInventoryChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ImportStock(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/warehouse.OrderService/ImportStock',
+            warehouse__pb2.ImportStockChunk.SerializeToString,
+            warehouse__pb2.ImportStockResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExportInventory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/warehouse.OrderService/ExportInventory',
+            warehouse__pb2.ExportInventoryRequest.SerializeToString,
+            warehouse__pb2.ExportChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Checkout(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/Checkout',
+            warehouse__pb2.CheckoutRequest.SerializeToString,
+            warehouse__pb2.CheckoutResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def PrepareOrder(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/PrepareOrder',
+            warehouse__pb2.PrepareOrderRequest.SerializeToString,
+            warehouse__pb2.PrepareOrderResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CommitOrder(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/CommitOrder',
+            warehouse__pb2.TxnRequest.SerializeToString,
+            warehouse__pb2.TxnResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def AbortOrder(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/AbortOrder',
+            warehouse__pb2.TxnRequest.SerializeToString,
+            warehouse__pb2.TxnResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def WatchInventory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/warehouse.OrderService/WatchInventory',
+            warehouse__pb2.WatchInventoryRequest.SerializeToString,
+            warehouse__pb2.WatchInventoryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StockHistory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/StockHistory',
+            warehouse__pb2.StockHistoryRequest.SerializeToString,
+            warehouse__pb2.StockHistoryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TopSellers(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/TopSellers',
+            warehouse__pb2.TopSellersRequest.SerializeToString,
+            warehouse__pb2.TopSellersResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Reserve(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/Reserve',
+            warehouse__pb2.ReserveRequest.SerializeToString,
+            warehouse__pb2.ReserveResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def CommitHold(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/CommitHold',
+            warehouse__pb2.HoldRequest.SerializeToString,
+            warehouse__pb2.HoldResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReleaseHold(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/ReleaseHold',
+            warehouse__pb2.HoldRequest.SerializeToString,
+            warehouse__pb2.HoldResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Replicate(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/warehouse.OrderService/Replicate',
+            warehouse__pb2.ReplicateRequest.SerializeToString,
+            warehouse__pb2.ReplicationBatch.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Promote(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/Promote',
+            warehouse__pb2.PromoteRequest.SerializeToString,
+            warehouse__pb2.PromoteResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReplicaStatus(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.OrderService/ReplicaStatus',
+            warehouse__pb2.ReplicaStatusRequest.SerializeToString,
+            warehouse__pb2.ReplicaStatusResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+
+class AdminServiceStub(object):
+    """------------------- Admin Service 定义 -------------------
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.StartProfiler = channel.unary_unary(
+                '/warehouse.AdminService/StartProfiler',
+                request_serializer=warehouse__pb2.StartProfilerRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.StartProfilerResponse.FromString,
+                _registered_method=True)
+        self.StopProfiler = channel.unary_unary(
+                '/warehouse.AdminService/StopProfiler',
+                request_serializer=warehouse__pb2.StopProfilerRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.ProfileResult.FromString,
+                _registered_method=True)
+        self.DumpStacks = channel.unary_unary(
+                '/warehouse.AdminService/DumpStacks',
+                request_serializer=warehouse__pb2.DumpStacksRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.DumpStacksResponse.FromString,
+                _registered_method=True)
+        self.TraceMalloc = channel.unary_unary(
+                '/warehouse.AdminService/TraceMalloc',
+                request_serializer=warehouse__pb2.TraceMallocRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.TraceMallocResponse.FromString,
+                _registered_method=True)
+        self.GetMetrics = channel.unary_unary(
+                '/warehouse.AdminService/GetMetrics',
+                request_serializer=warehouse__pb2.MetricsRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.MetricsResponse.FromString,
+                _registered_method=True)
+        self.Faults = channel.unary_unary(
+                '/warehouse.AdminService/Faults',
+                request_serializer=warehouse__pb2.FaultsRequest.SerializeToString,
+                response_deserializer=warehouse__pb2.FaultsResponse.FromString,
+                _registered_method=True)
+
+
+class AdminServiceServicer(object):
+    """------------------- Admin Service 定义 -------------------
+    """
+
+    def StartProfiler(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StopProfiler(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DumpStacks(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def TraceMalloc(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetMetrics(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Faults(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_AdminServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'StartProfiler': grpc.unary_unary_rpc_method_handler(
+                    servicer.StartProfiler,
+                    request_deserializer=warehouse__pb2.StartProfilerRequest.FromString,
+                    response_serializer=warehouse__pb2.StartProfilerResponse.SerializeToString,
+            ),
+            'StopProfiler': grpc.unary_unary_rpc_method_handler(
+                    servicer.StopProfiler,
+                    request_deserializer=warehouse__pb2.StopProfilerRequest.FromString,
+                    response_serializer=warehouse__pb2.ProfileResult.SerializeToString,
+            ),
+            'DumpStacks': grpc.unary_unary_rpc_method_handler(
+                    servicer.DumpStacks,
+                    request_deserializer=warehouse__pb2.DumpStacksRequest.FromString,
+                    response_serializer=warehouse__pb2.DumpStacksResponse.SerializeToString,
+            ),
+            'TraceMalloc': grpc.unary_unary_rpc_method_handler(
+                    servicer.TraceMalloc,
+                    request_deserializer=warehouse__pb2.TraceMallocRequest.FromString,
+                    response_serializer=warehouse__pb2.TraceMallocResponse.SerializeToString,
+            ),
+            'GetMetrics': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetMetrics,
+                    request_deserializer=warehouse__pb2.MetricsRequest.FromString,
+                    response_serializer=warehouse__pb2.MetricsResponse.SerializeToString,
+            ),
+            'Faults': grpc.unary_unary_rpc_method_handler(
+                    servicer.Faults,
+                    request_deserializer=warehouse__pb2.FaultsRequest.FromString,
+                    response_serializer=warehouse__pb2.FaultsResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'warehouse.AdminService', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+    server.add_registered_method_handlers('warehouse.AdminService', rpc_method_handlers)
+
+
+ # This class is part of an EXPERIMENTAL API.
+class AdminService(object):
+    """------------------- Admin Service 定义 -------------------
+    """
+
+    @staticmethod
+    def StartProfiler(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.AdminService/StartProfiler',
+            warehouse__pb2.StartProfilerRequest.SerializeToString,
+            warehouse__pb2.StartProfilerResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def StopProfiler(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.AdminService/StopProfiler',
+            warehouse__pb2.StopProfilerRequest.SerializeToString,
+            warehouse__pb2.ProfileResult.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def DumpStacks(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.AdminService/DumpStacks',
+            warehouse__pb2.DumpStacksRequest.SerializeToString,
+            warehouse__pb2.DumpStacksResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def TraceMalloc(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.AdminService/TraceMalloc',
+            warehouse__pb2.TraceMallocRequest.SerializeToString,
+            warehouse__pb2.TraceMallocResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetMetrics(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.AdminService/GetMetrics',
+            warehouse__pb2.MetricsRequest.SerializeToString,
+            warehouse__pb2.MetricsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Faults(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/warehouse.AdminService/Faults',
+            warehouse__pb2.FaultsRequest.SerializeToString,
+            warehouse__pb2.FaultsResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)